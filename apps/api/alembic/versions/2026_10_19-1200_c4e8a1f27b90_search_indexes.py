@@ -0,0 +1,79 @@
+"""search_indexes
+
+Full-text and trigram search for tasks, projects and users:
+- pg_trgm extension
+- generated `search_vector` tsvector columns (STORED) + GIN indexes
+- GIN trigram indexes on lower(title) / lower(name) / lower(username)
+
+Also merges the two existing heads (notifications rebuild and OKR/KPI system).
+
+Adding a STORED generated column rewrites the table; indexes are built
+CONCURRENTLY so reads/writes are only blocked for the column step.
+
+Revision ID: c4e8a1f27b90
+Revises: bfdc00ced49e, 2025_09_30_1314_enhanced_okr_kpi_system
+Create Date: 2026-10-19 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c4e8a1f27b90'
+down_revision: Union[str, Sequence[str], None] = ('bfdc00ced49e', '2025_09_30_1314_enhanced_okr_kpi_system')
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Must stay in sync with the Computed(...) expressions in the models
+SEARCH_VECTORS = {
+    "tasks": (
+        "setweight(to_tsvector('simple'::regconfig, coalesce(title, '')), 'A') || "
+        "setweight(to_tsvector('simple'::regconfig, coalesce(description, '')), 'B')"
+    ),
+    "projects": (
+        "setweight(to_tsvector('simple'::regconfig, coalesce(name, '')), 'A') || "
+        "setweight(to_tsvector('simple'::regconfig, coalesce(description, '')), 'B')"
+    ),
+    "users": (
+        "to_tsvector('simple'::regconfig, coalesce(username, '') || ' ' || coalesce(full_name, '') || ' ' || "
+        "coalesce(first_name, '') || ' ' || coalesce(last_name, '') || ' ' || split_part(email, '@', 1))"
+    ),
+}
+
+INDEXES = [
+    ("ix_task_search_vector", "tasks", "USING gin (search_vector)"),
+    ("ix_task_title_trgm", "tasks", "USING gin (lower(title) gin_trgm_ops)"),
+    ("ix_project_search_vector", "projects", "USING gin (search_vector)"),
+    ("ix_project_name_trgm", "projects", "USING gin (lower(name) gin_trgm_ops)"),
+    ("ix_user_search_vector", "users", "USING gin (search_vector)"),
+    ("ix_user_username_trgm", "users", "USING gin (lower(username) gin_trgm_ops)"),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm;")
+
+    for table, expression in SEARCH_VECTORS.items():
+        op.execute(
+            f"ALTER TABLE {table} ADD COLUMN IF NOT EXISTS search_vector tsvector "
+            f"GENERATED ALWAYS AS ({expression}) STORED;"
+        )
+
+    with op.get_context().autocommit_block():
+        for name, table, definition in INDEXES:
+            op.execute(f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {name} ON {table} {definition};")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        for name, _table, _definition in INDEXES:
+            op.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {name};")
+
+    for table in SEARCH_VECTORS:
+        op.execute(f"ALTER TABLE {table} DROP COLUMN IF EXISTS search_vector;")
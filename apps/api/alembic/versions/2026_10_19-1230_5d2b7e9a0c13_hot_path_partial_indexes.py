@@ -0,0 +1,75 @@
+"""hot_path_partial_indexes
+
+Partial composite indexes matching the hot query shapes. Almost every query
+filters live rows (deleted_at IS NULL) and then an owner column, so the
+indexes are partial on deleted_at and ordered like the queries sort.
+
+- memberships: "my orgs" lookups (list_tasks, list_projects, search scope)
+  and org member listings ordered by created_at DESC
+- project_members: "my projects" lookups in list_tasks
+- tasks: assignee/creator/project/org filters ordered by updated_at DESC
+- responsibility_scopes: guards._has_scope_permission
+- projects: org listings ordered by updated_at DESC
+- task_comments: keyset pages of threads and replies
+
+Verify with scripts/explain_hot_queries.py.
+
+Revision ID: 5d2b7e9a0c13
+Revises: c4e8a1f27b90
+Create Date: 2026-10-19 12:30:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5d2b7e9a0c13'
+down_revision: Union[str, Sequence[str], None] = 'c4e8a1f27b90'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+INDEXES = [
+    ("ix_membership_user_status_org", "memberships",
+     "(user_id, status, org_id) WHERE deleted_at IS NULL"),
+    ("ix_membership_org_created", "memberships",
+     "(org_id, created_at DESC) WHERE deleted_at IS NULL"),
+    ("ix_project_member_user_project", "project_members",
+     "(user_id, project_id) WHERE deleted_at IS NULL"),
+    ("ix_task_assignee_status_updated", "tasks",
+     "(assignee_id, status, updated_at DESC) WHERE deleted_at IS NULL"),
+    ("ix_task_creator_updated", "tasks",
+     "(creator_id, updated_at DESC) WHERE deleted_at IS NULL"),
+    ("ix_task_project_status_updated", "tasks",
+     "(project_id, status, updated_at DESC) WHERE deleted_at IS NULL"),
+    ("ix_task_org_updated", "tasks",
+     "(org_id, updated_at DESC) WHERE deleted_at IS NULL"),
+    ("ix_scope_org_user_type", "responsibility_scopes",
+     "(org_id, user_id, object_type) WHERE deleted_at IS NULL"),
+    ("ix_project_org_updated", "projects",
+     "(org_id, updated_at DESC) WHERE deleted_at IS NULL"),
+    ("ix_comment_task_threads", "task_comments",
+     "(task_id, created_at, id) WHERE deleted_at IS NULL AND parent_comment_id IS NULL"),
+    ("ix_comment_task_replies", "task_comments",
+     "(task_id, parent_comment_id, created_at, id) WHERE deleted_at IS NULL AND parent_comment_id IS NOT NULL"),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.get_context().autocommit_block():
+        for name, table, definition in INDEXES:
+            op.execute(f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {name} ON {table} {definition};")
+
+    for table in dict.fromkeys(table for _name, table, _definition in INDEXES):
+        op.execute(f"ANALYZE {table};")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        for name, _table, _definition in INDEXES:
+            op.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {name};")
@@ -0,0 +1,48 @@
+"""feature_flags_notify
+
+NOTIFY feature_flags_changed after any write to feature_flags, so every API
+process reloads its compiled flags (services/feature_flags.py).
+
+Revision ID: 8b1f0c6d2e47
+Revises: 5d2b7e9a0c13
+Create Date: 2026-10-19 13:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8b1f0c6d2e47'
+down_revision: Union[str, Sequence[str], None] = '5d2b7e9a0c13'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION notify_feature_flags_changed() RETURNS trigger AS $$
+        BEGIN
+            PERFORM pg_notify('feature_flags_changed', TG_OP);
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql;
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER trg_feature_flags_notify
+        AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON feature_flags
+        FOR EACH STATEMENT EXECUTE FUNCTION notify_feature_flags_changed();
+        """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("DROP TRIGGER IF EXISTS trg_feature_flags_notify ON feature_flags;")
+    op.execute("DROP FUNCTION IF EXISTS notify_feature_flags_changed();")
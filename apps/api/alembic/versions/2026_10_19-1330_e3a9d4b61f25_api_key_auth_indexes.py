@@ -0,0 +1,34 @@
+"""api_key_auth_indexes
+
+- unique index on api_keys.key_hash (SHA-256 of the key, looked up on cache miss)
+- unique (key, window_start) on rate_limits, so per-key usage is upserted
+  into one row per hour
+
+Revision ID: e3a9d4b61f25
+Revises: 8b1f0c6d2e47
+Create Date: 2026-10-19 13:30:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e3a9d4b61f25'
+down_revision: Union[str, Sequence[str], None] = '8b1f0c6d2e47'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_api_key_key_hash', 'api_keys', ['key_hash'], unique=True)
+    op.create_index('uq_rate_limit_key_window', 'rate_limits', ['key', 'window_start'], unique=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('uq_rate_limit_key_window', table_name='rate_limits')
+    op.drop_index('ix_api_key_key_hash', table_name='api_keys')
@@ -0,0 +1,63 @@
+"""resumable_uploads
+
+- uploads: chunk state of resumable uploads (received_bytes, parts,
+  expires_at) and the File they produce (file_id)
+- sizes become BIGINT: uploads.size, files.file_size and
+  task_attachments.file_size overflowed at 2 GiB
+
+Revision ID: a7c3e5f19d82
+Revises: e3a9d4b61f25
+Create Date: 2026-10-19 14:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a7c3e5f19d82'
+down_revision: Union[str, Sequence[str], None] = 'e3a9d4b61f25'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.alter_column('uploads', 'size', type_=sa.BigInteger(), existing_nullable=False)
+    op.alter_column('task_attachments', 'file_size', type_=sa.BigInteger(), existing_nullable=True)
+    # files is not created by earlier revisions on every install
+    op.execute("ALTER TABLE IF EXISTS files ALTER COLUMN file_size TYPE BIGINT")
+
+    op.add_column('uploads', sa.Column('file_id', sa.UUID(), nullable=True))
+    op.add_column('uploads', sa.Column('received_bytes', sa.BigInteger(), server_default='0', nullable=False))
+    op.add_column('uploads', sa.Column('parts', postgresql.JSONB(astext_type=sa.Text()), server_default='[]', nullable=False))
+    op.add_column('uploads', sa.Column('expires_at', sa.DateTime(timezone=True), nullable=True))
+    op.execute("""
+        DO $$ BEGIN
+            IF to_regclass('files') IS NOT NULL THEN
+                ALTER TABLE uploads ADD CONSTRAINT uploads_file_id_fkey
+                    FOREIGN KEY (file_id) REFERENCES files (id) ON DELETE SET NULL;
+            END IF;
+        END $$;
+    """)
+    op.create_index(op.f('ix_uploads_file_id'), 'uploads', ['file_id'], unique=False)
+    op.create_index('ix_uploads_expires_at', 'uploads', ['expires_at'], unique=False,
+                    postgresql_where=sa.text('expires_at IS NOT NULL'))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_uploads_expires_at', table_name='uploads')
+    op.drop_index(op.f('ix_uploads_file_id'), table_name='uploads')
+    op.execute("ALTER TABLE uploads DROP CONSTRAINT IF EXISTS uploads_file_id_fkey")
+    op.drop_column('uploads', 'expires_at')
+    op.drop_column('uploads', 'parts')
+    op.drop_column('uploads', 'received_bytes')
+    op.drop_column('uploads', 'file_id')
+
+    op.execute("ALTER TABLE IF EXISTS files ALTER COLUMN file_size TYPE INTEGER")
+    op.alter_column('task_attachments', 'file_size', type_=sa.Integer(), existing_nullable=True)
+    op.alter_column('uploads', 'size', type_=sa.Integer(), existing_nullable=False)
@@ -0,0 +1,32 @@
+"""file_access_log_bytes
+
+file_access_logs.bytes_served becomes BIGINT (downloads of files over
+2 GiB).
+
+Revision ID: f2b8d6a04c17
+Revises: a7c3e5f19d82
+Create Date: 2026-10-19 14:30:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f2b8d6a04c17'
+down_revision: Union[str, Sequence[str], None] = 'a7c3e5f19d82'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # file_access_logs is not created by earlier revisions on every install
+    op.execute("ALTER TABLE IF EXISTS file_access_logs ALTER COLUMN bytes_served TYPE BIGINT")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("ALTER TABLE IF EXISTS file_access_logs ALTER COLUMN bytes_served TYPE INTEGER")
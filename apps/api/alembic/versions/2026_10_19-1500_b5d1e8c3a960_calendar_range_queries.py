@@ -0,0 +1,81 @@
+"""calendar_range_queries
+
+- calendar_events.calendar_id: events belong to a calendar; existing events
+  are assigned to their creator's default calendar in the same organization
+- calendar_events.original_start_date: occurrence of the parent series an
+  exception instance replaces
+- indexes for range queries: GiST interval index over single events, a
+  partial index over recurring series and one over exceptions
+
+Revision ID: b5d1e8c3a960
+Revises: f2b8d6a04c17
+Create Date: 2026-10-19 15:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b5d1e8c3a960'
+down_revision: Union[str, Sequence[str], None] = 'f2b8d6a04c17'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # calendar tables are not created by earlier revisions on every install
+    op.execute("""
+        DO $$ BEGIN
+            IF to_regclass('calendar_events') IS NOT NULL THEN
+                ALTER TABLE calendar_events
+                    ADD COLUMN IF NOT EXISTS calendar_id UUID,
+                    ADD COLUMN IF NOT EXISTS original_start_date TIMESTAMPTZ;
+
+                IF to_regclass('calendars') IS NOT NULL THEN
+                    ALTER TABLE calendar_events ADD CONSTRAINT calendar_events_calendar_id_fkey
+                        FOREIGN KEY (calendar_id) REFERENCES calendars (id) ON DELETE CASCADE;
+
+                    UPDATE calendar_events e SET calendar_id = c.id
+                    FROM calendars c
+                    WHERE e.calendar_id IS NULL
+                      AND c.owner_id = e.creator_id
+                      AND c.org_id = e.org_id
+                      AND c.is_default
+                      AND NOT c.is_deleted;
+                END IF;
+
+                -- Instances of a series replaced the occurrence at their own start
+                UPDATE calendar_events SET original_start_date = start_date
+                WHERE parent_event_id IS NOT NULL AND original_start_date IS NULL;
+
+                CREATE INDEX IF NOT EXISTS ix_event_calendar_start
+                    ON calendar_events (calendar_id, start_date);
+                CREATE INDEX IF NOT EXISTS ix_event_series
+                    ON calendar_events (calendar_id, start_date)
+                    WHERE recurrence_type <> 'NONE' AND parent_event_id IS NULL;
+                CREATE INDEX IF NOT EXISTS ix_event_exception
+                    ON calendar_events (parent_event_id, original_start_date)
+                    WHERE parent_event_id IS NOT NULL;
+                CREATE INDEX IF NOT EXISTS ix_event_span
+                    ON calendar_events USING gist (tstzrange(start_date, end_date, '[]'))
+                    WHERE recurrence_type = 'NONE' AND is_deleted = false;
+            END IF;
+        END $$;
+    """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("DROP INDEX IF EXISTS ix_event_span")
+    op.execute("DROP INDEX IF EXISTS ix_event_exception")
+    op.execute("DROP INDEX IF EXISTS ix_event_series")
+    op.execute("DROP INDEX IF EXISTS ix_event_calendar_start")
+    op.execute("""
+        ALTER TABLE IF EXISTS calendar_events
+            DROP CONSTRAINT IF EXISTS calendar_events_calendar_id_fkey,
+            DROP COLUMN IF EXISTS original_start_date,
+            DROP COLUMN IF EXISTS calendar_id
+    """)
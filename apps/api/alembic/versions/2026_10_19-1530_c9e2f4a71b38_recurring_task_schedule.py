@@ -0,0 +1,52 @@
+"""recurring_task_schedule
+
+- tasks.next_run_at: next occurrence of a recurring template to generate,
+  with a partial index for the generator's due query
+- tasks.recurrence_parent_id / recurrence_date: instances point at their
+  template and occurrence; unique per (template, occurrence)
+- existing recurring templates are scheduled from now on
+
+Revision ID: c9e2f4a71b38
+Revises: b5d1e8c3a960
+Create Date: 2026-10-19 15:30:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c9e2f4a71b38'
+down_revision: Union[str, Sequence[str], None] = 'b5d1e8c3a960'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('tasks', sa.Column('next_run_at', sa.DateTime(timezone=True), nullable=True))
+    op.add_column('tasks', sa.Column('recurrence_parent_id', sa.UUID(), nullable=True))
+    op.add_column('tasks', sa.Column('recurrence_date', sa.DateTime(timezone=True), nullable=True))
+    op.create_foreign_key('tasks_recurrence_parent_id_fkey', 'tasks', 'tasks',
+                          ['recurrence_parent_id'], ['id'], ondelete='SET NULL')
+    op.create_index('ix_task_recurring_next_run', 'tasks', ['next_run_at'], unique=False,
+                    postgresql_where=sa.text('is_recurring AND next_run_at IS NOT NULL AND deleted_at IS NULL'))
+    op.create_index('uq_task_recurrence_occurrence', 'tasks', ['recurrence_parent_id', 'recurrence_date'],
+                    unique=True, postgresql_where=sa.text('recurrence_parent_id IS NOT NULL'))
+
+    op.execute("""
+        UPDATE tasks SET next_run_at = now()
+        WHERE is_recurring AND recurrence_pattern IS NOT NULL AND deleted_at IS NULL
+    """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('uq_task_recurrence_occurrence', table_name='tasks')
+    op.drop_index('ix_task_recurring_next_run', table_name='tasks')
+    op.drop_constraint('tasks_recurrence_parent_id_fkey', 'tasks', type_='foreignkey')
+    op.drop_column('tasks', 'recurrence_date')
+    op.drop_column('tasks', 'recurrence_parent_id')
+    op.drop_column('tasks', 'next_run_at')
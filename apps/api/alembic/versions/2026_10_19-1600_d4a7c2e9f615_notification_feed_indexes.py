@@ -0,0 +1,41 @@
+"""notification_feed_indexes
+
+- notifications: (user_id, created_at DESC, id DESC) for keyset paging of
+  the feed
+- partial index on unread notifications per user for badge recounts
+- partial index on expires_at for the expiry purge
+
+Revision ID: d4a7c2e9f615
+Revises: c9e2f4a71b38
+Create Date: 2026-10-19 16:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd4a7c2e9f615'
+down_revision: Union[str, Sequence[str], None] = 'c9e2f4a71b38'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_notification_user_feed', 'notifications',
+                    ['user_id', sa.text('created_at DESC'), sa.text('id DESC')], unique=False,
+                    postgresql_where=sa.text('is_deleted = false'))
+    op.create_index('ix_notification_user_unread', 'notifications', ['user_id'], unique=False,
+                    postgresql_where=sa.text('read_at IS NULL AND is_deleted = false'))
+    op.create_index('ix_notification_expires', 'notifications', ['expires_at'], unique=False,
+                    postgresql_where=sa.text('expires_at IS NOT NULL'))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_notification_expires', table_name='notifications')
+    op.drop_index('ix_notification_user_unread', table_name='notifications')
+    op.drop_index('ix_notification_user_feed', table_name='notifications')
@@ -0,0 +1,149 @@
+"""event_logs_partitions_rollups
+
+- event_logs becomes a table range-partitioned by month on created_at
+  (primary key (id, created_at)). The existing table is attached as the
+  partition event_logs_p_legacy covering everything up to the end of the
+  current month, so no rows are copied; retention drops it as a whole once
+  its last month expires
+- event_logs_ensure_partitions(months_ahead): creates the monthly
+  partitions event_logs_pYYYYMM up to months_ahead months from now; called
+  here and by the maintenance loop (services/event_logs.py)
+- index on created_at for time-range scans (partition pruning + index)
+- event_log_hourly: event counts per (hour, event_type, success) for the
+  monitoring endpoints, backfilled from the existing rows
+
+Revision ID: e6b3f9a2c471
+Revises: d4a7c2e9f615
+Create Date: 2026-10-19 16:30:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e6b3f9a2c471'
+down_revision: Union[str, Sequence[str], None] = 'd4a7c2e9f615'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _event_log_columns():
+    return [
+        sa.Column('id', sa.UUID(), nullable=False),
+        sa.Column('user_id', sa.UUID(), nullable=True),
+        sa.Column('org_id', sa.UUID(), nullable=True),
+        sa.Column('event_type', sa.String(length=100), nullable=False),
+        sa.Column('success', sa.Boolean(), nullable=False),
+        sa.Column('ip_address', sa.String(length=45), nullable=True),
+        sa.Column('user_agent', sa.String(length=255), nullable=True),
+        sa.Column('metadata', postgresql.JSONB(astext_type=sa.Text()), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), nullable=False),
+        sa.ForeignKeyConstraint(['org_id'], ['organizations.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+    ]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # The current table becomes the first partition
+    op.rename_table('event_logs', 'event_logs_p_legacy')
+    op.execute("ALTER INDEX ix_event_logs_event_type RENAME TO event_logs_p_legacy_event_type_idx")
+    op.execute("""
+        ALTER TABLE event_logs_p_legacy
+            DROP CONSTRAINT event_logs_pkey,
+            ADD CONSTRAINT event_logs_p_legacy_pkey PRIMARY KEY (id, created_at)
+    """)
+
+    op.create_table('event_logs',
+    *_event_log_columns(),
+    sa.PrimaryKeyConstraint('id', 'created_at', name='event_logs_pkey'),
+    postgresql_partition_by='RANGE (created_at)'
+    )
+
+    # A valid CHECK matching the bound lets ATTACH skip its validation scan
+    op.execute("""
+        DO $$
+        DECLARE
+            bound timestamptz := (date_trunc('month', now() AT TIME ZONE 'UTC') + interval '1 month') AT TIME ZONE 'UTC';
+        BEGIN
+            EXECUTE format(
+                'ALTER TABLE event_logs_p_legacy ADD CONSTRAINT event_logs_p_legacy_bound CHECK (created_at < %L)',
+                bound
+            );
+            EXECUTE format(
+                'ALTER TABLE event_logs ATTACH PARTITION event_logs_p_legacy FOR VALUES FROM (MINVALUE) TO (%L)',
+                bound
+            );
+            ALTER TABLE event_logs_p_legacy DROP CONSTRAINT event_logs_p_legacy_bound;
+        END $$;
+    """)
+
+    op.create_index('ix_event_logs_event_type', 'event_logs', ['event_type'], unique=False)
+    op.create_index('ix_event_logs_created_at', 'event_logs', ['created_at'], unique=False)
+
+    op.execute("""
+        CREATE OR REPLACE FUNCTION event_logs_ensure_partitions(months_ahead integer) RETURNS integer AS $$
+        DECLARE
+            first_month timestamp := date_trunc('month', now() AT TIME ZONE 'UTC');
+            month_start timestamp;
+            created integer := 0;
+        BEGIN
+            FOR i IN 0..months_ahead LOOP
+                month_start := first_month + make_interval(months => i);
+                IF to_regclass('event_logs_p' || to_char(month_start, 'YYYYMM')) IS NOT NULL THEN
+                    CONTINUE;
+                END IF;
+                BEGIN
+                    EXECUTE format(
+                        'CREATE TABLE %I PARTITION OF event_logs FOR VALUES FROM (%L) TO (%L)',
+                        'event_logs_p' || to_char(month_start, 'YYYYMM'),
+                        month_start AT TIME ZONE 'UTC',
+                        (month_start + interval '1 month') AT TIME ZONE 'UTC'
+                    );
+                    created := created + 1;
+                EXCEPTION WHEN invalid_object_definition THEN
+                    -- Month still covered by the legacy partition
+                    NULL;
+                END;
+            END LOOP;
+            RETURN created;
+        END;
+        $$ LANGUAGE plpgsql;
+    """)
+    op.execute("SELECT event_logs_ensure_partitions(3)")
+
+    op.create_table('event_log_hourly',
+    sa.Column('hour', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('event_type', sa.String(length=100), nullable=False),
+    sa.Column('success', sa.Boolean(), nullable=False),
+    sa.Column('event_count', sa.BigInteger(), nullable=False),
+    sa.PrimaryKeyConstraint('hour', 'event_type', 'success')
+    )
+    op.execute("""
+        INSERT INTO event_log_hourly (hour, event_type, success, event_count)
+        SELECT date_trunc('hour', created_at), event_type, success, count(*)
+        FROM event_logs
+        GROUP BY 1, 2, 3
+    """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('event_log_hourly')
+
+    op.rename_table('event_logs', 'event_logs_partitioned')
+    op.execute("ALTER INDEX ix_event_logs_event_type RENAME TO event_logs_partitioned_event_type_idx")
+    op.execute("ALTER INDEX ix_event_logs_created_at RENAME TO event_logs_partitioned_created_at_idx")
+    op.execute("ALTER TABLE event_logs_partitioned RENAME CONSTRAINT event_logs_pkey TO event_logs_partitioned_pkey")
+    op.create_table('event_logs',
+    *_event_log_columns(),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.execute("INSERT INTO event_logs SELECT * FROM event_logs_partitioned")
+    op.create_index(op.f('ix_event_logs_event_type'), 'event_logs', ['event_type'], unique=False)
+    op.execute("DROP TABLE event_logs_partitioned")
+    op.execute("DROP FUNCTION IF EXISTS event_logs_ensure_partitions(integer)")
@@ -0,0 +1,56 @@
+"""change_log_timeline
+
+- change_logs.action: created / updated / deleted / restored
+- change_logs.user_id nullable (changes made by background jobs), and
+  ON DELETE SET NULL so an entity's history outlives the user who edited it
+- (entity_type, entity_id, created_at DESC, id DESC) for keyset paging of
+  one entity's timeline; replaces the single-column entity indexes
+- (org_id, created_at DESC, id DESC) for the organization's timeline
+
+Revision ID: f2c8d5a1b937
+Revises: e6b3f9a2c471
+Create Date: 2026-10-19 17:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f2c8d5a1b937'
+down_revision: Union[str, Sequence[str], None] = 'e6b3f9a2c471'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('change_logs', sa.Column('action', sa.String(length=20), server_default='updated', nullable=False))
+    op.alter_column('change_logs', 'user_id', existing_type=sa.UUID(), nullable=True)
+    op.drop_constraint('change_logs_user_id_fkey', 'change_logs', type_='foreignkey')
+    op.create_foreign_key('change_logs_user_id_fkey', 'change_logs', 'users',
+                          ['user_id'], ['id'], ondelete='SET NULL')
+
+    op.create_index('ix_change_logs_entity_timeline', 'change_logs',
+                    ['entity_type', 'entity_id', sa.text('created_at DESC'), sa.text('id DESC')], unique=False)
+    op.create_index('ix_change_logs_org_timeline', 'change_logs',
+                    ['org_id', sa.text('created_at DESC'), sa.text('id DESC')], unique=False)
+    op.drop_index('ix_change_logs_entity_type', table_name='change_logs')
+    op.drop_index('ix_change_logs_entity_id', table_name='change_logs')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.create_index('ix_change_logs_entity_id', 'change_logs', ['entity_id'], unique=False)
+    op.create_index('ix_change_logs_entity_type', 'change_logs', ['entity_type'], unique=False)
+    op.drop_index('ix_change_logs_org_timeline', table_name='change_logs')
+    op.drop_index('ix_change_logs_entity_timeline', table_name='change_logs')
+
+    op.execute("DELETE FROM change_logs WHERE user_id IS NULL")
+    op.drop_constraint('change_logs_user_id_fkey', 'change_logs', type_='foreignkey')
+    op.create_foreign_key('change_logs_user_id_fkey', 'change_logs', 'users',
+                          ['user_id'], ['id'], ondelete='CASCADE')
+    op.alter_column('change_logs', 'user_id', existing_type=sa.UUID(), nullable=False)
+    op.drop_column('change_logs', 'action')
@@ -0,0 +1,69 @@
+"""background_jobs
+
+- jobs: queue and status of background jobs (services/jobs.py): kind,
+  payload, status, progress, result/error, attempts, cancel flag, lease
+- partial index on run_after of queued jobs: the claim query
+  (FOR UPDATE SKIP LOCKED) reads only the head of the queue
+- partial index on locked_until of running jobs for expired leases
+- partial index on finished_at for the retention purge
+
+Revision ID: a8d1e5c3f602
+Revises: f2c8d5a1b937
+Create Date: 2026-10-19 17:30:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a8d1e5c3f602'
+down_revision: Union[str, Sequence[str], None] = 'f2c8d5a1b937'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('jobs',
+    sa.Column('id', sa.UUID(), nullable=False),
+    sa.Column('kind', sa.String(length=100), nullable=False),
+    sa.Column('status', sa.String(length=20), server_default='queued', nullable=False),
+    sa.Column('payload', postgresql.JSONB(astext_type=sa.Text()), nullable=False),
+    sa.Column('result', postgresql.JSONB(astext_type=sa.Text()), nullable=True),
+    sa.Column('error', sa.Text(), nullable=True),
+    sa.Column('progress', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('progress_message', sa.String(length=255), nullable=True),
+    sa.Column('attempts', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('max_attempts', sa.Integer(), server_default='3', nullable=False),
+    sa.Column('cancel_requested', sa.Boolean(), server_default='false', nullable=False),
+    sa.Column('org_id', sa.UUID(), nullable=True),
+    sa.Column('created_by_id', sa.UUID(), nullable=True),
+    sa.Column('run_after', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.Column('locked_until', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.Column('started_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('finished_at', sa.DateTime(timezone=True), nullable=True),
+    sa.ForeignKeyConstraint(['created_by_id'], ['users.id'], ondelete='SET NULL'),
+    sa.ForeignKeyConstraint(['org_id'], ['organizations.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_jobs_org_id'), 'jobs', ['org_id'], unique=False)
+    op.create_index('ix_jobs_queue', 'jobs', ['run_after'], unique=False,
+                    postgresql_where=sa.text("status = 'queued'"))
+    op.create_index('ix_jobs_running_lease', 'jobs', ['locked_until'], unique=False,
+                    postgresql_where=sa.text("status = 'running'"))
+    op.create_index('ix_jobs_finished_at', 'jobs', ['finished_at'], unique=False,
+                    postgresql_where=sa.text('finished_at IS NOT NULL'))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_jobs_finished_at', table_name='jobs')
+    op.drop_index('ix_jobs_running_lease', table_name='jobs')
+    op.drop_index('ix_jobs_queue', table_name='jobs')
+    op.drop_index(op.f('ix_jobs_org_id'), table_name='jobs')
+    op.drop_table('jobs')
@@ -0,0 +1,46 @@
+"""upload_finalizing_status
+
+- uploadstatus gets FINALIZING: a resumable upload whose parts are being
+  assembled outside of a transaction (services/resumable_uploads.py)
+
+Revision ID: b3f7a9c2d415
+Revises: a8d1e5c3f602
+Create Date: 2026-10-19 18:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b3f7a9c2d415'
+down_revision: Union[str, Sequence[str], None] = 'a8d1e5c3f602'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # files (and its enum) is not created by earlier revisions on every install;
+    # ADD VALUE must commit before the value can be used
+    with op.get_context().autocommit_block():
+        op.execute("""
+            DO $$ BEGIN
+                IF to_regtype('uploadstatus') IS NOT NULL THEN
+                    ALTER TYPE uploadstatus ADD VALUE IF NOT EXISTS 'FINALIZING' AFTER 'UPLOADING';
+                END IF;
+            END $$;
+        """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # Enum values can't be dropped; interrupted finalizes become failed uploads
+    op.execute("""
+        DO $$ BEGIN
+            IF to_regclass('files') IS NOT NULL THEN
+                UPDATE files SET upload_status = 'FAILED' WHERE upload_status = 'FINALIZING';
+            END IF;
+        END $$;
+    """)
@@ -0,0 +1,117 @@
+"""event_logs_default_partition
+
+- event_logs_p_default: DEFAULT partition of event_logs, so rows keep being
+  written when no monthly partition covers them (partition maintenance
+  stalled); services/event_logs.py warns while it holds rows
+- event_logs_ensure_partitions(months_ahead): builds each new month as a
+  plain table, moves that month's rows out of the DEFAULT partition and
+  then attaches it (a DEFAULT partition holding rows of the new range would
+  make CREATE TABLE ... PARTITION OF fail)
+
+Revision ID: c5e2a8f4b609
+Revises: b3f7a9c2d415
+Create Date: 2026-10-19 18:30:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c5e2a8f4b609'
+down_revision: Union[str, Sequence[str], None] = 'b3f7a9c2d415'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute("CREATE TABLE IF NOT EXISTS event_logs_p_default PARTITION OF event_logs DEFAULT")
+
+    op.execute("""
+        CREATE OR REPLACE FUNCTION event_logs_ensure_partitions(months_ahead integer) RETURNS integer AS $$
+        DECLARE
+            first_month timestamp := date_trunc('month', now() AT TIME ZONE 'UTC');
+            month_start timestamp;
+            partition_name text;
+            created integer := 0;
+        BEGIN
+            FOR i IN 0..months_ahead LOOP
+                month_start := first_month + make_interval(months => i);
+                partition_name := 'event_logs_p' || to_char(month_start, 'YYYYMM');
+                IF to_regclass(partition_name) IS NOT NULL THEN
+                    CONTINUE;
+                END IF;
+                BEGIN
+                    EXECUTE format(
+                        'CREATE TABLE %I (LIKE event_logs INCLUDING DEFAULTS INCLUDING CONSTRAINTS)',
+                        partition_name
+                    );
+                    EXECUTE format(
+                        'WITH moved AS (DELETE FROM event_logs_p_default WHERE created_at >= %L AND created_at < %L RETURNING *) '
+                        'INSERT INTO %I SELECT * FROM moved',
+                        month_start AT TIME ZONE 'UTC',
+                        (month_start + interval '1 month') AT TIME ZONE 'UTC',
+                        partition_name
+                    );
+                    EXECUTE format(
+                        'ALTER TABLE event_logs ATTACH PARTITION %I FOR VALUES FROM (%L) TO (%L)',
+                        partition_name,
+                        month_start AT TIME ZONE 'UTC',
+                        (month_start + interval '1 month') AT TIME ZONE 'UTC'
+                    );
+                    created := created + 1;
+                EXCEPTION WHEN invalid_object_definition THEN
+                    -- Month still covered by the legacy partition
+                    NULL;
+                END;
+            END LOOP;
+            RETURN created;
+        END;
+        $$ LANGUAGE plpgsql;
+    """)
+    # Rows written while no monthly partition existed move to their month
+    op.execute("SELECT event_logs_ensure_partitions(3)")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("""
+        DO $$ BEGIN
+            IF EXISTS (SELECT 1 FROM event_logs_p_default) THEN
+                RAISE EXCEPTION 'event_logs_p_default holds rows; create their monthly partitions first';
+            END IF;
+        END $$;
+    """)
+    op.execute("DROP TABLE IF EXISTS event_logs_p_default")
+
+    op.execute("""
+        CREATE OR REPLACE FUNCTION event_logs_ensure_partitions(months_ahead integer) RETURNS integer AS $$
+        DECLARE
+            first_month timestamp := date_trunc('month', now() AT TIME ZONE 'UTC');
+            month_start timestamp;
+            created integer := 0;
+        BEGIN
+            FOR i IN 0..months_ahead LOOP
+                month_start := first_month + make_interval(months => i);
+                IF to_regclass('event_logs_p' || to_char(month_start, 'YYYYMM')) IS NOT NULL THEN
+                    CONTINUE;
+                END IF;
+                BEGIN
+                    EXECUTE format(
+                        'CREATE TABLE %I PARTITION OF event_logs FOR VALUES FROM (%L) TO (%L)',
+                        'event_logs_p' || to_char(month_start, 'YYYYMM'),
+                        month_start AT TIME ZONE 'UTC',
+                        (month_start + interval '1 month') AT TIME ZONE 'UTC'
+                    );
+                    created := created + 1;
+                EXCEPTION WHEN invalid_object_definition THEN
+                    -- Month still covered by the legacy partition
+                    NULL;
+                END;
+            END LOOP;
+            RETURN created;
+        END;
+        $$ LANGUAGE plpgsql;
+    """)
@@ -48,8 +48,79 @@ class Settings(BaseSettings):
     JWT_ISSUER: Optional[str] = None
     ACCESS_TTL_SEC: int = int(os.getenv("ACCESS_TTL_SEC", "900"))
     REFRESH_TTL_SEC: int = int(os.getenv("REFRESH_TTL_SEC", "2592000"))
+    # Кэш снимков прав между запросами (0 = только в пределах запроса)
+    PERMISSION_CACHE_TTL_SEC: int = int(os.getenv("PERMISSION_CACHE_TTL_SEC", "0"))
+    # Кэш дерева отделов в памяти воркера (сбрасывается через шину инвалидации; 0 = выкл.)
+    DEPARTMENT_TREE_CACHE_TTL_SEC: int = int(os.getenv("DEPARTMENT_TREE_CACHE_TTL_SEC", "300"))
+    # Квота на API-ключ (token bucket): средняя скорость и размер всплеска
+    API_KEY_RATE_LIMIT_PER_HOUR: int = int(os.getenv("API_KEY_RATE_LIMIT_PER_HOUR", "10000"))
+    API_KEY_RATE_LIMIT_BURST: int = int(os.getenv("API_KEY_RATE_LIMIT_BURST", "200"))
     REFRESH_COOKIE_NAME: str = os.getenv("REFRESH_COOKIE_NAME", "lrx_refresh")
 
+    # ---- File storage ----
+    STORAGE_BACKEND: str = os.getenv("STORAGE_BACKEND", "local")  # local | s3
+    STORAGE_LOCAL_ROOT: str = os.getenv("STORAGE_LOCAL_ROOT", "./storage")
+    # База публичных URL (аватары); для local раздаётся самим API
+    STORAGE_PUBLIC_URL: str = os.getenv("STORAGE_PUBLIC_URL", "/api/media")
+    S3_ENDPOINT_URL: Optional[str] = os.getenv("S3_ENDPOINT_URL")
+    S3_BUCKET: Optional[str] = os.getenv("S3_BUCKET")
+    S3_REGION: str = os.getenv("S3_REGION", "us-east-1")
+    S3_ACCESS_KEY_ID: Optional[str] = os.getenv("S3_ACCESS_KEY_ID")
+    S3_SECRET_ACCESS_KEY: Optional[str] = os.getenv("S3_SECRET_ACCESS_KEY")
+    S3_PUBLIC_URL: Optional[str] = os.getenv("S3_PUBLIC_URL")
+    MAX_UPLOAD_SIZE: int = int(os.getenv("MAX_UPLOAD_SIZE", str(50 * 1024 * 1024)))
+    # Докачиваемые загрузки (create / PATCH по смещению / complete)
+    RESUMABLE_UPLOAD_MAX_SIZE: int = int(os.getenv("RESUMABLE_UPLOAD_MAX_SIZE", str(10 * 1024 ** 3)))
+    RESUMABLE_UPLOAD_TTL_HOURS: int = int(os.getenv("RESUMABLE_UPLOAD_TTL_HOURS", "24"))
+    # Фоновая отмена брошенных загрузок (и прерванных complete) по истечении TTL
+    RESUMABLE_UPLOAD_PURGE_ENABLED: bool = str(os.getenv("RESUMABLE_UPLOAD_PURGE_ENABLED", "true")).lower() in ("1","true","yes")
+    RESUMABLE_UPLOAD_PURGE_INTERVAL_SEC: int = int(os.getenv("RESUMABLE_UPLOAD_PURGE_INTERVAL_SEC", "600"))
+    # Скачивание: TTL pre-signed ссылок S3; internal-location прокси для local (X-Accel-Redirect)
+    FILE_DOWNLOAD_URL_TTL_SEC: int = int(os.getenv("FILE_DOWNLOAD_URL_TTL_SEC", "300"))
+    STORAGE_ACCEL_REDIRECT_PREFIX: Optional[str] = os.getenv("STORAGE_ACCEL_REDIRECT_PREFIX")
+    # Процессы для обработки изображений (миниатюры, WebP)
+    IMAGE_WORKERS: int = int(os.getenv("IMAGE_WORKERS", "2"))
+
+    # ---- Recurring tasks ----
+    # Генератор экземпляров повторяющихся задач (фоновый цикл в каждом воркере)
+    RECURRING_TASKS_ENABLED: bool = str(os.getenv("RECURRING_TASKS_ENABLED", "true")).lower() in ("1","true","yes")
+    RECURRING_TASKS_INTERVAL_SEC: int = int(os.getenv("RECURRING_TASKS_INTERVAL_SEC", "60"))
+    # Экземпляр создаётся заранее, за столько часов до срока
+    RECURRING_TASKS_LOOKAHEAD_HOURS: int = int(os.getenv("RECURRING_TASKS_LOOKAHEAD_HOURS", "24"))
+    RECURRING_TASKS_BATCH_SIZE: int = int(os.getenv("RECURRING_TASKS_BATCH_SIZE", "500"))
+
+    # ---- In-app notifications ----
+    # Фоновая очистка уведомлений с истёкшим expires_at (пачками)
+    NOTIFICATIONS_PURGE_ENABLED: bool = str(os.getenv("NOTIFICATIONS_PURGE_ENABLED", "true")).lower() in ("1","true","yes")
+    NOTIFICATIONS_PURGE_INTERVAL_SEC: int = int(os.getenv("NOTIFICATIONS_PURGE_INTERVAL_SEC", "900"))
+    NOTIFICATIONS_PURGE_BATCH_SIZE: int = int(os.getenv("NOTIFICATIONS_PURGE_BATCH_SIZE", "1000"))
+
+    # ---- Event log (аудит) ----
+    # Месячные секции event_logs: создание заранее, удаление целыми секциями по сроку хранения,
+    # почасовые агрегаты для мониторинга (фоновый цикл; работу выполняет один воркер)
+    EVENT_LOG_MAINTENANCE_ENABLED: bool = str(os.getenv("EVENT_LOG_MAINTENANCE_ENABLED", "true")).lower() in ("1","true","yes")
+    EVENT_LOG_RETENTION_MONTHS: int = int(os.getenv("EVENT_LOG_RETENTION_MONTHS", "12"))
+    EVENT_LOG_PARTITIONS_AHEAD: int = int(os.getenv("EVENT_LOG_PARTITIONS_AHEAD", "3"))
+    EVENT_LOG_ROLLUP_INTERVAL_SEC: int = int(os.getenv("EVENT_LOG_ROLLUP_INTERVAL_SEC", "60"))
+
+    # ---- Change log (история изменений) ----
+    # Diff полей задач/проектов/KPI/OKR копится в памяти воркера и пишется пачкой
+    # раз в интервал или по достижении размера буфера
+    CHANGE_LOG_ENABLED: bool = str(os.getenv("CHANGE_LOG_ENABLED", "true")).lower() in ("1","true","yes")
+    CHANGE_LOG_FLUSH_INTERVAL_SEC: int = int(os.getenv("CHANGE_LOG_FLUSH_INTERVAL_SEC", "2"))
+    CHANGE_LOG_FLUSH_SIZE: int = int(os.getenv("CHANGE_LOG_FLUSH_SIZE", "500"))
+
+    # ---- Background jobs ----
+    # Очередь в таблице jobs; воркеры в процессе API (JOBS_ENABLED) и/или отдельным
+    # процессом (scripts/job_worker.py)
+    JOBS_ENABLED: bool = str(os.getenv("JOBS_ENABLED", "true")).lower() in ("1","true","yes")
+    JOB_WORKERS: int = int(os.getenv("JOB_WORKERS", "2"))
+    JOB_POLL_INTERVAL_SEC: int = int(os.getenv("JOB_POLL_INTERVAL_SEC", "2"))
+    # Аренда выполняющейся задачи; без пульса дольше — задача возвращается в очередь
+    JOB_LEASE_SEC: int = int(os.getenv("JOB_LEASE_SEC", "60"))
+    JOB_MAX_ATTEMPTS: int = int(os.getenv("JOB_MAX_ATTEMPTS", "3"))
+    JOB_RETENTION_DAYS: int = int(os.getenv("JOB_RETENTION_DAYS", "7"))
+
     # ---- Email ----
     RESEND_API_KEY: Optional[str] = None
     EMAIL_FROM: Optional[str] = None
@@ -82,6 +153,11 @@ class Settings(BaseSettings):
     ITSTEP_DB_USER: str = os.getenv("ITSTEP_DB_USER", "bi_app")
     ITSTEP_DB_PASSWORD: Optional[str] = os.getenv("ITSTEP_DB_PASSWORD")
 
+    # ---- Live metrics (SSE) ----
+    # Один опрос витрины за интервал на весь кластер, независимо от числа открытых дашбордов
+    LIVE_METRICS_INTERVAL_SEC: int = int(os.getenv("LIVE_METRICS_INTERVAL_SEC", "15"))
+    LIVE_METRICS_KEEPALIVE_SEC: int = int(os.getenv("LIVE_METRICS_KEEPALIVE_SEC", "20"))
+
     model_config = SettingsConfigDict(
         case_sensitive=False,
         extra="ignore",
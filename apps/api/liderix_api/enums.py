@@ -97,6 +97,15 @@ class InvitationStatus(str, Enum):
     CANCELLED = "cancelled"
 
 
+class JobStatus(str, Enum):
+    """Background job status (jobs table)"""
+    QUEUED = "queued"
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+    CANCELLED = "cancelled"
+
+
 # === OKR AND KPI ENUMS ===
 
 class OKRStatus(str, Enum):
@@ -183,6 +192,7 @@ class UploadStatus(str, Enum):
     """File upload status"""
     PENDING = "pending"
     UPLOADING = "uploading"
+    FINALIZING = "finalizing"
     COMPLETED = "completed"
     FAILED = "failed"
     CANCELLED = "cancelled"
@@ -1,4 +1,5 @@
 import logging
+import os
 import uuid
 import asyncio
 import inspect
@@ -12,6 +13,25 @@ from sqlalchemy.orm import sessionmaker
 from liderix_api.config.settings import settings
 from liderix_api.db import get_async_session as core_get_async_session
 from liderix_api.middleware.security import add_security_middleware
+from liderix_api.services.feature_flags import feature_flags
+from liderix_api.services.api_keys import (
+    ANALYTICS_READ_SCOPE,
+    optional_api_key,
+    start_usage_flusher,
+    stop_usage_flusher,
+)
+from liderix_api.services.file_download import access_log as file_access_log
+from liderix_api.services.images import shutdown_image_pool
+from liderix_api.services.live_metrics import live_metrics
+from liderix_api.services.board_events import board_hub
+from liderix_api.services.invalidation import invalidation_bus
+from liderix_api.services.notification_feed import start_notification_purger, stop_notification_purger
+from liderix_api.services.event_logs import start_event_log_maintenance, stop_event_log_maintenance
+from liderix_api.services.change_log import start_change_log_writer, stop_change_log_writer
+from liderix_api.services.jobs import start_job_runner, stop_job_runner
+from liderix_api.services.recurring_tasks import start_recurring_task_scheduler, stop_recurring_task_scheduler
+from liderix_api.services.resumable_uploads import start_upload_purger, stop_upload_purger
+from liderix_api.services.storage import PUBLIC_PREFIX, close_storage
 
 logger = logging.getLogger("uvicorn.error")
 
@@ -189,11 +209,40 @@ async def on_startup():
     
     # Глобальная подмена зависимости
     app.dependency_overrides[core_get_async_session] = get_liderix_session
+
+    # Feature flags: загрузка + LISTEN на изменения
+    await feature_flags.start()
+    start_usage_flusher()
+    file_access_log.start()
+    start_recurring_task_scheduler()
+    start_notification_purger()
+    start_upload_purger()
+    start_event_log_maintenance()
+    start_change_log_writer()
+    live_metrics.start()
+    board_hub.start()
+    invalidation_bus.start()
+    start_job_runner()
     logger.info("Application startup completed.")
 
 @app.on_event("shutdown")
 async def on_shutdown():
     logger.info("Shutting down application...")
+
+    await feature_flags.stop()
+    await stop_job_runner()
+    await stop_usage_flusher()
+    await file_access_log.stop()
+    await stop_recurring_task_scheduler()
+    await stop_notification_purger()
+    await stop_upload_purger()
+    await stop_event_log_maintenance()
+    await stop_change_log_writer()
+    await live_metrics.stop()
+    await board_hub.stop()
+    await invalidation_bus.stop()
+    await close_storage()
+    shutdown_image_pool()
     
     try:
         await engine_liderix.dispose()
@@ -267,7 +316,14 @@ from liderix_api.routes import (
     client as client_router,
     projects as projects_router,
     tasks as tasks_router,
+    uploads as uploads_router,
+    files as files_router,
+    calendar as calendar_router,
+    notifications as notifications_router,
+    board_events as board_events_router,
     okrs as okrs_router,
+    activity as activity_router,
+    jobs as jobs_router,
     # kpis as kpis_router,  # DISABLED
     auth as auth_router,
     analytics as analytics_router,
@@ -288,7 +344,14 @@ app.include_router(users_router.router, prefix=PREFIX, tags=["Users"])
 app.include_router(client_router.router, prefix=PREFIX, tags=["Clients"])
 app.include_router(projects_router.router, prefix=PREFIX, tags=["Projects"])
 app.include_router(tasks_router.router, prefix=PREFIX, tags=["Tasks"])
+app.include_router(uploads_router.router, prefix=PREFIX, tags=["Uploads"])
+app.include_router(files_router.router, prefix=PREFIX, tags=["Files"])
+app.include_router(calendar_router.router, prefix=PREFIX, tags=["Calendar"])
+app.include_router(notifications_router.router, prefix=PREFIX, tags=["Notifications"])
+app.include_router(board_events_router.router, prefix=PREFIX, tags=["Realtime"])
 app.include_router(okrs_router.router, prefix=PREFIX, tags=["OKRs"])
+app.include_router(activity_router.router, prefix=PREFIX, tags=["Activity"])
+app.include_router(jobs_router.router, prefix=PREFIX, tags=["Jobs"])
 # app.include_router(kpis_router.router, prefix=PREFIX, tags=["KPIs"]) # DISABLED: KPI model issues
 app.include_router(auth_router.router, prefix=PREFIX, tags=["Auth"])
 app.include_router(analytics_router.router, prefix=f"{PREFIX}/analytics", tags=["Analytics"])
@@ -297,11 +360,12 @@ app.include_router(analytics_router.router, prefix=f"{PREFIX}/analytics", tags=[
 if TEST_ANALYTICS_AVAILABLE:
     app.include_router(test_analytics_router, prefix=PREFIX, tags=["Test Analytics"])
 
-# Data Analytics router (ITstep client data)
+# Data Analytics router (ITstep client data): открыт как раньше; X-API-Key (scope analytics:read) проверяется и учитывается, если передан
 app.include_router(
     data_analytics_router.router,
     prefix=f"{PREFIX}/data-analytics",
     tags=["Data Analytics"],
+    dependencies=[Depends(optional_api_key(ANALYTICS_READ_SCOPE))],
 )
 
 # Direct test endpoints for ITstep analytics
@@ -545,6 +609,18 @@ async def validation_exception_handler(request: FastAPIRequest, exc: RequestVali
         content={"detail": error_detail}
     )
 
+# -----------------------------------------------------------------------------
+# Публичные файлы (аватары) при локальном хранилище; S3 отдаёт их сам
+# -----------------------------------------------------------------------------
+if settings.STORAGE_BACKEND != "s3" and settings.STORAGE_PUBLIC_URL.startswith("/"):
+    from fastapi.staticfiles import StaticFiles
+
+    app.mount(
+        settings.STORAGE_PUBLIC_URL.rstrip("/"),
+        StaticFiles(directory=os.path.join(settings.STORAGE_LOCAL_ROOT, PUBLIC_PREFIX), check_dir=False),
+        name="media",
+    )
+
 # -----------------------------------------------------------------------------
 # Fallback для неизвестных маршрутов API
 # -----------------------------------------------------------------------------
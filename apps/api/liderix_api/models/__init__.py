@@ -1,5 +1,5 @@
 from .api_keys import APIKey
-from .audit import EventLog
+from .audit import EventLog, EventLogHourly
 from .change_logs import ChangeLog
 from .client import Client
 
@@ -24,6 +24,7 @@ from .organization import (
 )
 
 from .feature_flags import FeatureFlag
+from .jobs import Job
 from .jwt_refresh_whitelists import JWTRefreshWhitelist
 from .kpi import KPI
 from .memberships import Membership
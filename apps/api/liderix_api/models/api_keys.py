@@ -1,7 +1,7 @@
 from __future__ import annotations
 import uuid
 from datetime import datetime
-from sqlalchemy import Column, String, DateTime, Boolean, ForeignKey
+from sqlalchemy import Column, String, DateTime, Boolean, ForeignKey, Index
 from sqlalchemy.dialects.postgresql import UUID as PG_UUID, JSONB
 from sqlalchemy.orm import relationship  # ✅ ДОБАВЛЕН ИМПОРТ
 from liderix_api.db import Base
@@ -12,6 +12,10 @@ class APIKey(Base, TimestampMixin, SoftDeleteMixin):
     Модель API ключа с поддержкой отметки времени и мягкого удаления.
     """
     __tablename__ = "api_keys"
+    __table_args__ = (
+        # SHA-256 ключа; поиск при аутентификации (services/api_keys.py)
+        Index("ix_api_key_key_hash", "key_hash", unique=True),
+    )
     
     id: uuid.UUID = Column(
         PG_UUID(as_uuid=True),
@@ -3,7 +3,7 @@ from __future__ import annotations
 import uuid
 from datetime import datetime
 
-from sqlalchemy import Column, String, Boolean, DateTime, ForeignKey
+from sqlalchemy import BigInteger, Column, String, Boolean, DateTime, ForeignKey, Index
 from sqlalchemy.dialects.postgresql import UUID as PG_UUID, JSONB
 from sqlalchemy.orm import relationship
 
@@ -12,8 +12,16 @@ from liderix_api.db import Base
 class EventLog(Base):
     """
     Модель для хранения записей аудита событий.
+
+    Таблица секционирована по месяцам (created_at), поэтому created_at входит
+    в первичный ключ. Секции создаются заранее и удаляются целиком по сроку
+    хранения (services/event_logs.py).
     """
     __tablename__ = "event_logs"
+    __table_args__ = (
+        Index("ix_event_logs_created_at", "created_at"),
+        {"postgresql_partition_by": "RANGE (created_at)"},
+    )
 
     id = Column(
         PG_UUID(as_uuid=True),
@@ -50,9 +58,32 @@ class EventLog(Base):
     )
     created_at = Column(
         DateTime(timezone=True),
+        primary_key=True,
         default=datetime.utcnow,
         nullable=False)
 
     # ─── Связи ────────────────────────────────────────────────────────────────
     user = relationship("User")
-    organization = relationship("Organization")
\ No newline at end of file
+    organization = relationship("Organization")
+
+
+class EventLogHourly(Base):
+    """
+    Почасовые агрегаты event_logs (час × event_type × success) для
+    мониторинга. Пересчитываются фоновым циклом за последние часы.
+    """
+    __tablename__ = "event_log_hourly"
+
+    hour = Column(
+        DateTime(timezone=True),
+        primary_key=True)
+    event_type = Column(
+        String(100),
+        primary_key=True)
+    success = Column(
+        Boolean,
+        primary_key=True)
+    event_count = Column(
+        BigInteger,
+        nullable=False,
+        default=0)
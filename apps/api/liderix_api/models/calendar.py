@@ -21,6 +21,8 @@ from sqlalchemy import (
     Float,
     UniqueConstraint,
     CheckConstraint,
+    literal_column,
+    text,
 )
 from sqlalchemy.dialects.postgresql import UUID as PG_UUID, JSONB
 from sqlalchemy.orm import relationship
@@ -39,6 +41,19 @@ class CalendarEvent(Base, OrgFKMixin, TimestampMixin, SoftDeleteMixin):
         Index("ix_event_dates", "start_date", "end_date"),
         Index("ix_event_org_type", "org_id", "event_type"),
         Index("ix_event_creator", "creator_id"),
+        Index("ix_event_calendar_start", "calendar_id", "start_date"),
+        # Recurring series (masters only): few rows, scanned for every range query
+        Index(
+            "ix_event_series",
+            "calendar_id", "start_date",
+            postgresql_where=text("recurrence_type <> 'NONE' AND parent_event_id IS NULL"),
+        ),
+        # Exceptions of a series, looked up by the occurrence they replace
+        Index(
+            "ix_event_exception",
+            "parent_event_id", "original_start_date",
+            postgresql_where=text("parent_event_id IS NOT NULL"),
+        ),
         CheckConstraint("end_date >= start_date", name="chk_event_dates"),
         {"extend_existing": True}
     )
@@ -119,6 +134,12 @@ class CalendarEvent(Base, OrgFKMixin, TimestampMixin, SoftDeleteMixin):
         nullable=True
     )
 
+    calendar_id = Column(
+        PG_UUID(as_uuid=True),
+        ForeignKey("calendars.id", ondelete="CASCADE"),
+        nullable=True
+    )
+
     # Relationships
     creator_id = Column(
         PG_UUID(as_uuid=True),
@@ -175,6 +196,12 @@ class CalendarEvent(Base, OrgFKMixin, TimestampMixin, SoftDeleteMixin):
         comment="For recurring event instances"
     )
 
+    original_start_date = Column(
+        DateTime(timezone=True),
+        nullable=True,
+        comment="Occurrence of the parent series this instance replaces (RECURRENCE-ID)"
+    )
+
     # Settings
     is_private = Column(
         Boolean,
@@ -286,6 +313,16 @@ class CalendarEvent(Base, OrgFKMixin, TimestampMixin, SoftDeleteMixin):
         return self.parent_event_id is not None
 
 
+# Interval index for range queries over single events (closed range, so
+# zero-length events such as deadlines still overlap a window)
+Index(
+    "ix_event_span",
+    func.tstzrange(CalendarEvent.start_date, CalendarEvent.end_date, literal_column("'[]'")),
+    postgresql_using="gist",
+    postgresql_where=text("recurrence_type = 'NONE' AND is_deleted = false"),
+)
+
+
 class EventAttendee(Base, TimestampMixin):
     """Event attendees and their RSVP status"""
     __tablename__ = "event_attendees"
@@ -4,7 +4,7 @@ from __future__ import annotations
 import uuid
 from datetime import datetime
 
-from sqlalchemy import Column, String, DateTime, ForeignKey
+from sqlalchemy import Column, String, DateTime, ForeignKey, Index, text
 from sqlalchemy.dialects.postgresql import UUID as PG_UUID, JSONB
 from sqlalchemy.orm import relationship
 
@@ -13,30 +13,46 @@ from liderix_api.db import Base
 class ChangeLog(Base):
     """
     Модель для хранения логов изменений сущностей.
+
+    Пишется пачками из services/change_log.py; changes — diff по полям:
+    {"status": {"old": "todo", "new": "done"}, ...}.
     """
     __tablename__ = "change_logs"
 
+    __table_args__ = (
+        # Лента сущности: keyset-пагинация, новые сверху
+        Index("ix_change_logs_entity_timeline", "entity_type", "entity_id",
+              text("created_at DESC"), text("id DESC")),
+        # Лента организации
+        Index("ix_change_logs_org_timeline", "org_id", text("created_at DESC"), text("id DESC")),
+    )
+
     id = Column(
         PG_UUID(as_uuid=True),
         primary_key=True,
         default=uuid.uuid4,
         nullable=False)
+    # NULL — изменение фоновой задачей или удалённым пользователем
     user_id = Column(
         PG_UUID(as_uuid=True),
-        ForeignKey("users.id", ondelete="CASCADE"),
-        nullable=False)
+        ForeignKey("users.id", ondelete="SET NULL"),
+        nullable=True)
     org_id = Column(
         PG_UUID(as_uuid=True),
         ForeignKey("organizations.id", ondelete="CASCADE"),
         nullable=True)
     entity_type = Column(
         String(50),
-        nullable=False,
-        index=True)
+        nullable=False)
     entity_id = Column(
         PG_UUID(as_uuid=True),
+        nullable=False)
+    # created / updated / deleted / restored
+    action = Column(
+        String(20),
         nullable=False,
-        index=True)
+        default="updated",
+        server_default="updated")
     changes = Column(
         JSONB,
         nullable=False,
@@ -48,4 +64,4 @@ class ChangeLog(Base):
 
     # Связи
     user = relationship("User")
-    organization = relationship("Organization")
\ No newline at end of file
+    organization = relationship("Organization")
@@ -17,6 +17,7 @@ from sqlalchemy import (
     ForeignKey,
     Index,
     Integer,
+    BigInteger,
     Boolean,
     Float,
     UniqueConstraint,
@@ -87,7 +88,7 @@ class File(Base, OrgFKMixin, TimestampMixin, SoftDeleteMixin):
     )
 
     file_size = Column(
-        Integer,
+        BigInteger,
         nullable=False,
         comment="File size in bytes"
     )
@@ -312,7 +313,7 @@ class FileAccessLog(Base, TimestampMixin):
     )
 
     bytes_served = Column(
-        Integer,
+        BigInteger,
         nullable=True,
         comment="Number of bytes served"
     )
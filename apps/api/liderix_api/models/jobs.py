@@ -0,0 +1,106 @@
+# apps/api/liderix_api/models/jobs.py
+from __future__ import annotations
+
+import uuid
+
+from sqlalchemy import Boolean, Column, DateTime, ForeignKey, Index, Integer, String, Text, func, text
+from sqlalchemy.dialects.postgresql import UUID as PG_UUID, JSONB
+
+from liderix_api.db import Base
+
+
+class Job(Base):
+    """
+    Фоновая задача (services/jobs.py).
+
+    Воркеры забирают задачи из очереди через SELECT ... FOR UPDATE SKIP LOCKED;
+    locked_until — аренда выполняющейся задачи, продлевается пульсом воркера.
+    Задача с истёкшей арендой (воркер упал) снова попадает в очередь.
+    """
+    __tablename__ = "jobs"
+
+    __table_args__ = (
+        # Очередь: готовые к запуску, по времени
+        Index("ix_jobs_queue", "run_after", postgresql_where=text("status = 'queued'")),
+        # Поиск задач с истёкшей арендой
+        Index("ix_jobs_running_lease", "locked_until", postgresql_where=text("status = 'running'")),
+        # Очистка завершённых по сроку хранения
+        Index("ix_jobs_finished_at", "finished_at", postgresql_where=text("finished_at IS NOT NULL")),
+    )
+
+    id = Column(
+        PG_UUID(as_uuid=True),
+        primary_key=True,
+        default=uuid.uuid4,
+        nullable=False)
+    # Имя обработчика, например "org.delete"
+    kind = Column(
+        String(100),
+        nullable=False)
+    # queued / running / succeeded / failed / cancelled (enums.JobStatus)
+    status = Column(
+        String(20),
+        nullable=False,
+        default="queued",
+        server_default="queued")
+    payload = Column(
+        JSONB,
+        nullable=False,
+        default=dict)
+    result = Column(
+        JSONB,
+        nullable=True)
+    error = Column(
+        Text,
+        nullable=True)
+    # 0..100 и короткое описание текущего шага
+    progress = Column(
+        Integer,
+        nullable=False,
+        default=0,
+        server_default="0")
+    progress_message = Column(
+        String(255),
+        nullable=True)
+    attempts = Column(
+        Integer,
+        nullable=False,
+        default=0,
+        server_default="0")
+    max_attempts = Column(
+        Integer,
+        nullable=False,
+        default=3,
+        server_default="3")
+    cancel_requested = Column(
+        Boolean,
+        nullable=False,
+        default=False,
+        server_default="false")
+    org_id = Column(
+        PG_UUID(as_uuid=True),
+        ForeignKey("organizations.id", ondelete="CASCADE"),
+        nullable=True,
+        index=True)
+    created_by_id = Column(
+        PG_UUID(as_uuid=True),
+        ForeignKey("users.id", ondelete="SET NULL"),
+        nullable=True)
+    # Не раньше этого момента (повтор с задержкой)
+    run_after = Column(
+        DateTime(timezone=True),
+        nullable=False,
+        server_default=func.now())
+    locked_until = Column(
+        DateTime(timezone=True),
+        nullable=True)
+    created_at = Column(
+        DateTime(timezone=True),
+        nullable=False,
+        server_default=func.now())
+    started_at = Column(
+        DateTime(timezone=True),
+        nullable=True)
+    finished_at = Column(
+        DateTime(timezone=True),
+        nullable=True)
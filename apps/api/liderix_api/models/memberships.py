@@ -10,7 +10,8 @@ from sqlalchemy import (
     DateTime,
     ForeignKey,
     Index,
-    UniqueConstraint)
+    UniqueConstraint,
+    text)
 from sqlalchemy.dialects.postgresql import UUID as PG_UUID, JSONB
 from sqlalchemy.orm import relationship, validates
 
@@ -26,7 +27,12 @@ class Membership(Base, OrgFKMixin, TimestampMixin, SoftDeleteMixin):
         UniqueConstraint("org_id", "user_id", name="uq_membership_org_user"),
         Index("ix_membership_role", "role"),
         Index("ix_membership_status", "status"),
-        Index("ix_membership_meta_data_gin", "meta_data", postgresql_using="gin"))
+        Index("ix_membership_meta_data_gin", "meta_data", postgresql_using="gin"),
+        # Hot paths: "my orgs" lookups and org member listings (live rows only)
+        Index("ix_membership_user_status_org", "user_id", "status", "org_id",
+              postgresql_where=text("deleted_at IS NULL")),
+        Index("ix_membership_org_created", "org_id", text("created_at DESC"),
+              postgresql_where=text("deleted_at IS NULL")))
 
     id = Column(
         PG_UUID(as_uuid=True),
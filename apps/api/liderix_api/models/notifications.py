@@ -21,6 +21,7 @@ from sqlalchemy import (
     Float,
     UniqueConstraint,
     CheckConstraint,
+    text,
 )
 from sqlalchemy.dialects.postgresql import UUID as PG_UUID, JSONB
 from sqlalchemy.orm import relationship
@@ -40,6 +41,15 @@ class Notification(Base, OrgFKMixin, TimestampMixin, SoftDeleteMixin):
         Index("ix_notification_type", "type"),
         Index("ix_notification_status", "status"),
         Index("ix_notification_created", "created_at"),
+        # Feed: keyset paging per user, newest first
+        Index("ix_notification_user_feed", "user_id", text("created_at DESC"), text("id DESC"),
+              postgresql_where=text("is_deleted = false")),
+        # Unread badge recount
+        Index("ix_notification_user_unread", "user_id",
+              postgresql_where=text("read_at IS NULL AND is_deleted = false")),
+        # Expiry purge
+        Index("ix_notification_expires", "expires_at",
+              postgresql_where=text("expires_at IS NOT NULL")),
         {"extend_existing": True}
     )
 
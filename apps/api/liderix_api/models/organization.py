@@ -52,7 +52,9 @@ class Organization(Base, TimestampMixin, SoftDeleteMixin):
     metric_definitions = relationship("MetricDefinition", lazy="selectin", overlaps="organization")
     compliances = relationship("OrgCompliance", lazy="selectin", overlaps="organization")
     event_logs = relationship("EventLog", cascade="all, delete-orphan", lazy="selectin", overlaps="organization")
-    change_logs = relationship("ChangeLog", cascade="all, delete-orphan", lazy="selectin", overlaps="organization")
+    change_logs = relationship(
+        "ChangeLog", cascade="all, delete-orphan", passive_deletes=True, lazy="noload", overlaps="organization"
+    )
     jwt_refresh_whitelists = relationship(
         "JWTRefreshWhitelist",
         cascade="all, delete-orphan",
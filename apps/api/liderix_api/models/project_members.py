@@ -3,7 +3,7 @@
 from __future__ import annotations
 import uuid
 
-from sqlalchemy import Column, String, ForeignKey, UniqueConstraint, Index
+from sqlalchemy import Column, String, ForeignKey, UniqueConstraint, Index, text
 from sqlalchemy.dialects.postgresql import UUID as PG_UUID
 from sqlalchemy.orm import relationship
 
@@ -17,6 +17,8 @@ class ProjectMember(Base, OrgFKMixin, TimestampMixin, SoftDeleteMixin):
     __table_args__ = (
         UniqueConstraint("project_id", "user_id", name="uq_project_member_project_user"),
         Index("ix_project_member_role", "role"),
+        Index("ix_project_member_user_project", "user_id", "project_id",
+              postgresql_where=text("deleted_at IS NULL")),
     )
 
     id = Column(
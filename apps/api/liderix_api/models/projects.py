@@ -1,9 +1,9 @@
 from __future__ import annotations
 import uuid
 from enum import Enum as PythonEnum
-from sqlalchemy import Column, String, Text, Enum as SQLEnum, DateTime, ForeignKey, Index, Integer, Boolean, UniqueConstraint
-from sqlalchemy.dialects.postgresql import UUID as PG_UUID, JSONB
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, String, Text, Enum as SQLEnum, DateTime, ForeignKey, Index, Integer, Boolean, UniqueConstraint, Computed, text
+from sqlalchemy.dialects.postgresql import UUID as PG_UUID, JSONB, TSVECTOR
+from sqlalchemy.orm import relationship, deferred
 from liderix_api.db import Base
 from liderix_api.enums import ProjectStatus, MembershipRole
 from .mixins import TimestampMixin, SoftDeleteMixin, OrgFKMixin
@@ -12,6 +12,10 @@ class Project(Base, OrgFKMixin, TimestampMixin, SoftDeleteMixin):
     __tablename__ = "projects"
     __table_args__ = (
         Index("ix_project_metadata_gin", "metadata", postgresql_using="gin"),
+        Index("ix_project_search_vector", "search_vector", postgresql_using="gin"),
+        Index("ix_project_name_trgm", text("lower(name) gin_trgm_ops"), postgresql_using="gin"),
+        Index("ix_project_org_updated", "org_id", text("updated_at DESC"),
+              postgresql_where=text("deleted_at IS NULL")),
         {"extend_existing": True})
     id = Column(PG_UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, nullable=False)
     name = Column(String(200), nullable=False, index=True)
@@ -21,6 +25,11 @@ class Project(Base, OrgFKMixin, TimestampMixin, SoftDeleteMixin):
     start_date = Column(DateTime(timezone=True), nullable=True)
     end_date = Column(DateTime(timezone=True), nullable=True)
     is_public = Column(Boolean, default=False, nullable=False, index=True)
+    # Full-text search (generated column; see services/search.py)
+    search_vector = deferred(Column(TSVECTOR, Computed(
+        "setweight(to_tsvector('simple'::regconfig, coalesce(name, '')), 'A') || "
+        "setweight(to_tsvector('simple'::regconfig, coalesce(description, '')), 'B')",
+        persisted=True), nullable=True))
     organization = relationship("Organization", lazy="selectin", overlaps="projects")
     members = relationship("ProjectMember", back_populates="project", cascade="all, delete-orphan", lazy="selectin", overlaps="project,members")
     tasks = relationship("Task", back_populates="project", cascade="all, delete-orphan", lazy="selectin", overlaps="project,tasks")
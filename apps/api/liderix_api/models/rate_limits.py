@@ -15,6 +15,8 @@ class RateLimit(Base, OrgFKMixin, TimestampMixin):
 
     __table_args__ = (
         Index("ix_rate_limit_key", "key"),
+        # Одна строка на ключ и окно (upsert счётчиков)
+        Index("uq_rate_limit_key_window", "key", "window_start", unique=True),
     )
 
     id = Column(
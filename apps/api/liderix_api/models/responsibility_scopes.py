@@ -2,7 +2,7 @@ from __future__ import annotations
 
 import uuid
 
-from sqlalchemy import Column, String, ForeignKey
+from sqlalchemy import Column, String, ForeignKey, Index, text
 from sqlalchemy.dialects.postgresql import UUID as PG_UUID, JSONB
 from sqlalchemy.orm import relationship
 
@@ -11,6 +11,11 @@ from .organization import OrgFKMixin, TimestampMixin, SoftDeleteMixin
 
 class ResponsibilityScope(Base, OrgFKMixin, TimestampMixin, SoftDeleteMixin):
     __tablename__ = "responsibility_scopes"
+    __table_args__ = (
+        # guards._has_scope_permission lookup
+        Index("ix_scope_org_user_type", "org_id", "user_id", "object_type",
+              postgresql_where=text("deleted_at IS NULL")),
+    )
 
     id = Column(
         PG_UUID(as_uuid=True),
@@ -12,11 +12,14 @@ from sqlalchemy import (
     ForeignKey,
     Index,
     Integer,
+    BigInteger,
     Boolean,
     Float,
-    UniqueConstraint)
-from sqlalchemy.dialects.postgresql import UUID as PG_UUID, JSONB
-from sqlalchemy.orm import relationship
+    Computed,
+    UniqueConstraint,
+    text)
+from sqlalchemy.dialects.postgresql import UUID as PG_UUID, JSONB, TSVECTOR
+from sqlalchemy.orm import relationship, deferred
 from sqlalchemy.sql import func
 
 from liderix_api.db import Base
@@ -35,6 +38,23 @@ class Task(Base, OrgFKMixin, TimestampMixin, SoftDeleteMixin):
         Index("ix_task_meta_data_gin", "meta_data", postgresql_using="gin"),
         Index("ix_task_assignee", "assignee_id"),
         Index("ix_task_due_date", "due_date"),
+        Index("ix_task_search_vector", "search_vector", postgresql_using="gin"),
+        Index("ix_task_title_trgm", text("lower(title) gin_trgm_ops"), postgresql_using="gin"),
+        # Hot paths: list filters on live tasks, newest first
+        Index("ix_task_assignee_status_updated", "assignee_id", "status", text("updated_at DESC"),
+              postgresql_where=text("deleted_at IS NULL")),
+        Index("ix_task_creator_updated", "creator_id", text("updated_at DESC"),
+              postgresql_where=text("deleted_at IS NULL")),
+        Index("ix_task_project_status_updated", "project_id", "status", text("updated_at DESC"),
+              postgresql_where=text("deleted_at IS NULL")),
+        Index("ix_task_org_updated", "org_id", text("updated_at DESC"),
+              postgresql_where=text("deleted_at IS NULL")),
+        # Recurring-task generator: due templates by next run
+        Index("ix_task_recurring_next_run", "next_run_at",
+              postgresql_where=text("is_recurring AND next_run_at IS NOT NULL AND deleted_at IS NULL")),
+        # One instance per template and occurrence
+        Index("uq_task_recurrence_occurrence", "recurrence_parent_id", "recurrence_date", unique=True,
+              postgresql_where=text("recurrence_parent_id IS NOT NULL")),
         {"extend_existing": True})
 
     id = Column(
@@ -135,6 +155,21 @@ class Task(Base, OrgFKMixin, TimestampMixin, SoftDeleteMixin):
         JSONB,
         nullable=True)
 
+    # Next occurrence to generate (NULL: not scheduled / series over)
+    next_run_at = Column(
+        DateTime(timezone=True),
+        nullable=True)
+
+    # Instances: the recurring template and the occurrence they were made for
+    recurrence_parent_id = Column(
+        PG_UUID(as_uuid=True),
+        ForeignKey("tasks.id", ondelete="SET NULL"),
+        nullable=True)
+
+    recurrence_date = Column(
+        DateTime(timezone=True),
+        nullable=True)
+
     tags = Column(
         JSONB,
         nullable=True,
@@ -145,6 +180,15 @@ class Task(Base, OrgFKMixin, TimestampMixin, SoftDeleteMixin):
         nullable=True,
         default=lambda: {})
 
+    # Full-text search (generated column; see services/search.py)
+    search_vector = deferred(Column(
+        TSVECTOR,
+        Computed(
+            "setweight(to_tsvector('simple'::regconfig, coalesce(title, '')), 'A') || "
+            "setweight(to_tsvector('simple'::regconfig, coalesce(description, '')), 'B')",
+            persisted=True),
+        nullable=True))
+
     meta_data = Column(
         JSONB,
         nullable=True,
@@ -182,12 +226,14 @@ class Task(Base, OrgFKMixin, TimestampMixin, SoftDeleteMixin):
     parent_task = relationship(
         "Task",
         remote_side=[id],
+        foreign_keys=[parent_task_id],
         lazy="selectin",
         back_populates="subtasks",
         overlaps="subtasks,parent_task")
 
     subtasks = relationship(
         "Task",
+        foreign_keys=[parent_task_id],
         lazy="selectin",
         back_populates="parent_task",
         cascade="all, delete-orphan",
@@ -227,6 +273,11 @@ class TaskComment(Base, TimestampMixin, SoftDeleteMixin):
     __table_args__ = (
         Index("ix_comment_task_created", "task_id", "created_at"),
         Index("ix_comment_parent", "parent_comment_id"),
+        # Keyset pages of threads and of replies (see routes/tasks.get_task_comments)
+        Index("ix_comment_task_threads", "task_id", "created_at", "id",
+              postgresql_where=text("deleted_at IS NULL AND parent_comment_id IS NULL")),
+        Index("ix_comment_task_replies", "task_id", "parent_comment_id", "created_at", "id",
+              postgresql_where=text("deleted_at IS NULL AND parent_comment_id IS NOT NULL")),
         {"extend_existing": True})
 
     id = Column(
@@ -349,7 +400,7 @@ class TaskAttachment(Base, TimestampMixin, SoftDeleteMixin):
         nullable=True)
 
     file_size = Column(
-        Integer,
+        BigInteger,
         nullable=True)
 
     description = Column(
@@ -3,8 +3,8 @@ from __future__ import annotations
 import uuid
 from datetime import datetime
 
-from sqlalchemy import Column, String, Integer, DateTime, ForeignKey, Index
-from sqlalchemy.dialects.postgresql import UUID as PG_UUID
+from sqlalchemy import Column, String, BigInteger, DateTime, ForeignKey, Index, text
+from sqlalchemy.dialects.postgresql import UUID as PG_UUID, JSONB
 from sqlalchemy.orm import relationship
 
 from liderix_api.db import Base
@@ -42,11 +42,22 @@ class Upload(Base, TimestampMixin, SoftDeleteMixin):
     filename = Column(String(255), nullable=False)
     url = Column(String(1024), nullable=False)
     content_type = Column(String(100), nullable=False)
-    size = Column(Integer, nullable=False)
+    size = Column(BigInteger, nullable=False)
 
-    # Ключ в объектном хранилище (уникален)
+    # Ключ в объектном хранилище (уникален); для докачиваемых загрузок - префикс частей
     storage_key = Column(String(255), nullable=False, unique=True, index=True)
 
+    # Докачиваемая загрузка: итоговый файл, принятые байты и части [{"key", "size"}]
+    file_id = Column(
+        PG_UUID(as_uuid=True),
+        ForeignKey("files.id", ondelete="SET NULL"),
+        nullable=True,
+        index=True,
+    )
+    received_bytes = Column(BigInteger, nullable=False, default=0, server_default="0")
+    parts = Column(JSONB, nullable=False, default=list, server_default="[]")
+    expires_at = Column(DateTime(timezone=True), nullable=True)
+
     # Связи
     user = relationship(
         "User",
@@ -57,6 +68,8 @@ class Upload(Base, TimestampMixin, SoftDeleteMixin):
     __table_args__ = (
         Index("ix_uploads_owner", "owner_type", "owner_id"),
         Index("ix_uploads_created_at", "created_at"),
+        # Очистка брошенных докачиваемых загрузок
+        Index("ix_uploads_expires_at", "expires_at", postgresql_where=text("expires_at IS NOT NULL")),
     )
 
     def __repr__(self) -> str:
@@ -3,9 +3,9 @@ from __future__ import annotations
 import uuid
 from datetime import datetime
 
-from sqlalchemy import Column, String, Boolean, Enum as SQLEnum, Text, DateTime, Index
-from sqlalchemy.dialects.postgresql import UUID as PG_UUID, JSONB
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, String, Boolean, Enum as SQLEnum, Text, DateTime, Index, Computed, text
+from sqlalchemy.dialects.postgresql import UUID as PG_UUID, JSONB, TSVECTOR
+from sqlalchemy.orm import relationship, deferred
 
 from liderix_api.db import Base
 from liderix_api.enums import UserRole
@@ -17,6 +17,11 @@ class User(Base, TimestampMixin, SoftDeleteMixin):
     """
     __tablename__ = "users"
 
+    __table_args__ = (
+        Index("ix_user_search_vector", "search_vector", postgresql_using="gin"),
+        Index("ix_user_username_trgm", text("lower(username) gin_trgm_ops"), postgresql_using="gin"),
+    )
+
     id = Column(
         PG_UUID(as_uuid=True),
         primary_key=True,
@@ -100,6 +105,15 @@ class User(Base, TimestampMixin, SoftDeleteMixin):
     password_reset_token_hash = Column(String(255), nullable=True, index=True)
     password_reset_expires_at = Column(DateTime(timezone=True), nullable=True)
 
+    # Mention/autocomplete search (generated column; see services/search.py)
+    search_vector = deferred(Column(
+        TSVECTOR,
+        Computed(
+            "to_tsvector('simple'::regconfig, coalesce(username, '') || ' ' || coalesce(full_name, '') || ' ' || "
+            "coalesce(first_name, '') || ' ' || coalesce(last_name, '') || ' ' || split_part(email, '@', 1))",
+            persisted=True),
+        nullable=True))
+
     # API ключи
     api_keys = relationship(
         "APIKey",
@@ -122,11 +136,12 @@ class User(Base, TimestampMixin, SoftDeleteMixin):
         lazy="selectin")
     
     # Логи изменений
+    # Не грузятся с пользователем: лента читается запросом (services/change_log.py)
     change_logs = relationship(
         "ChangeLog",
-        cascade="all, delete-orphan",
         back_populates="user",
-        lazy="selectin")
+        passive_deletes=True,
+        lazy="noload")
     
     # Организации (владелец)
     organizations = relationship(
@@ -20,10 +20,17 @@ __all__ = [
     "users",
     "projects",
     "tasks",
+    "uploads",
+    "files",
+    "calendar",
+    "notifications",
+    "board_events",
     "org_structure",
     "clients",
     "kpis",
     "okrs",
+    "activity",
+    "jobs",
     "analytics",
     "data_analytics",
 ]
\ No newline at end of file
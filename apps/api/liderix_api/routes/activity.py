@@ -0,0 +1,128 @@
+# apps/api/liderix_api/routes/activity.py
+"""
+Change history (activity timelines).
+
+    GET /activity/orgs/{org_id}                     everything in the organization (org admins)
+    GET /activity/{entity_type}/{entity_id}         one task / project / kpi / objective / key_result
+
+Newest first, keyset cursor. Entity timelines are readable by whoever can
+read the entity, including after a soft delete. See services/change_log.py
+for how entries are captured and written.
+"""
+from __future__ import annotations
+
+import logging
+from typing import Any, Optional
+from uuid import UUID
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import noload
+
+from liderix_api.db import get_async_session
+from liderix_api.models.kpi import KPI
+from liderix_api.models.okrs import KeyResult, Objective
+from liderix_api.models.projects import Project
+from liderix_api.models.tasks import Task
+from liderix_api.models.users import User
+from liderix_api.schemas.change_log import ChangeLogEntry, ChangeLogPage
+from liderix_api.services.auth import get_current_user
+from liderix_api.services.change_log import ENTITY_TYPES, InvalidCursor, entity_timeline, org_timeline
+from liderix_api.services.permissions import PermissionEvaluator
+
+router = APIRouter(prefix="/activity", tags=["Activity"])
+logger = logging.getLogger(__name__)
+
+TIMELINE_PAGE_MAX = 100
+
+
+def problem(status_code: int, type_: str, title: str, detail: str):
+    raise HTTPException(
+        status_code=status_code,
+        detail={"type": type_, "title": title, "detail": detail, "status": status_code},
+    )
+
+
+async def _access_object(session: AsyncSession, entity_type: str, entity_id: UUID) -> Optional[Any]:
+    """What PermissionEvaluator decides on: project, task row or org id"""
+    if entity_type == "task":
+        return (await session.execute(
+            select(
+                Task.id, Task.project_id, Task.org_id, Task.creator_id, Task.assignee_id,
+                Project.is_public.label("project_is_public"),
+            )
+            .outerjoin(Project, Project.id == Task.project_id)
+            .where(Task.id == entity_id)
+        )).first()
+    if entity_type == "project":
+        return await session.scalar(select(Project).options(noload("*")).where(Project.id == entity_id))
+    if entity_type == "kpi":
+        return await session.scalar(select(KPI.org_id).where(KPI.id == entity_id))
+    if entity_type == "objective":
+        return await session.scalar(select(Objective.org_id).where(Objective.id == entity_id))
+    if entity_type == "key_result":
+        return await session.scalar(
+            select(Objective.org_id)
+            .join(KeyResult, KeyResult.objective_id == Objective.id)
+            .where(KeyResult.id == entity_id)
+        )
+    return None
+
+
+def _timeline_page(rows, next_cursor: Optional[str]) -> ChangeLogPage:
+    return ChangeLogPage(
+        items=[ChangeLogEntry.model_validate(row) for row in rows],
+        next_cursor=next_cursor,
+        has_next=next_cursor is not None,
+    )
+
+
+@router.get("/orgs/{org_id}", response_model=ChangeLogPage)
+async def get_org_activity(
+    org_id: UUID,
+    entity_type: Optional[str] = Query(None, description=f"One of: {', '.join(ENTITY_TYPES)}"),
+    cursor: Optional[str] = Query(None, description="Cursor returned as next_cursor by the previous page"),
+    limit: int = Query(20, ge=1, le=TIMELINE_PAGE_MAX),
+    session: AsyncSession = Depends(get_async_session),
+    current_user: User = Depends(get_current_user),
+):
+    """Organization-wide history; it spans private projects, so admins only"""
+    if entity_type is not None and entity_type not in ENTITY_TYPES:
+        problem(400, "urn:problem:invalid-entity-type", "Invalid Entity Type",
+                f"entity_type must be one of: {', '.join(ENTITY_TYPES)}")
+    [allowed] = await PermissionEvaluator.for_session(session).can(current_user, "admin", [org_id])
+    if not allowed:
+        problem(403, "urn:problem:forbidden", "Forbidden", "Organization admin rights required")
+
+    try:
+        rows, next_cursor = await org_timeline(session, org_id, cursor, limit, entity_type)
+    except InvalidCursor as e:
+        problem(400, "urn:problem:invalid-cursor", "Invalid Cursor", str(e))
+    return _timeline_page(rows, next_cursor)
+
+
+@router.get("/{entity_type}/{entity_id}", response_model=ChangeLogPage)
+async def get_entity_activity(
+    entity_type: str,
+    entity_id: UUID,
+    cursor: Optional[str] = Query(None, description="Cursor returned as next_cursor by the previous page"),
+    limit: int = Query(20, ge=1, le=TIMELINE_PAGE_MAX),
+    session: AsyncSession = Depends(get_async_session),
+    current_user: User = Depends(get_current_user),
+):
+    """History of one entity, newest first (task pages: one index range scan per page)"""
+    if entity_type not in ENTITY_TYPES:
+        problem(404, "urn:problem:not-found", "Not Found", f"Unknown entity type '{entity_type}'")
+    target = await _access_object(session, entity_type, entity_id)
+    if target is None:
+        problem(404, "urn:problem:not-found", "Not Found", f"{entity_type} not found")
+    [allowed] = await PermissionEvaluator.for_session(session).can(current_user, "read", [target])
+    if not allowed:
+        problem(403, "urn:problem:forbidden", "Forbidden", f"No access to this {entity_type}")
+
+    try:
+        rows, next_cursor = await entity_timeline(session, entity_type, entity_id, cursor, limit)
+    except InvalidCursor as e:
+        problem(400, "urn:problem:invalid-cursor", "Invalid Cursor", str(e))
+    return _timeline_page(rows, next_cursor)
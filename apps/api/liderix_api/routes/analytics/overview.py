@@ -2,12 +2,17 @@
 Analytics Overview Routes - Main dashboard endpoints
 Based on real ITstep DWH data
 """
-from fastapi import APIRouter, Depends, HTTPException, Query
+import asyncio
+import json
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import text
 from datetime import datetime, date, timedelta
 from typing import Optional, List
 
+from liderix_api.config.settings import settings
 from liderix_api.db import get_itstep_session
 from liderix_api.schemas.analytics import (
     DashboardOverview,
@@ -17,6 +22,7 @@ from liderix_api.schemas.analytics import (
     MetricBase,
     PlatformType
 )
+from liderix_api.services.live_metrics import live_metrics
 
 router = APIRouter()
 
@@ -137,76 +143,51 @@ async def get_dashboard_overview(
 
 
 @router.get("/realtime", response_model=RealTimeMetrics)
-async def get_realtime_metrics(
-    session: AsyncSession = Depends(get_itstep_session)
-):
+async def get_realtime_metrics():
     """
     Get real-time metrics for dashboard
+
+    Served from the shared live-metrics snapshot (services/live_metrics.py);
+    the warehouse is queried at most once per interval. Prefer
+    /realtime/stream for screens that stay open.
     """
     try:
-        today = date.today()
-
-        # Get today's metrics
-        today_query = text("""
-            SELECT
-                SUM(revenue) as revenue_today,
-                SUM(contracts) as conversions_today
-            FROM dm.dm_campaign_results_daily_v3
-            WHERE date = :today
-        """)
-
-        today_result = await session.execute(today_query, {"today": today})
-        today_metrics = today_result.fetchone()
-
-        # Get new leads today from CRM
-        leads_query = text("""
-            SELECT COUNT(*) as new_leads_today
-            FROM dwh.fact_crm_requests
-            WHERE DATE(request_created_at) = :today
-        """)
+        return RealTimeMetrics(**await live_metrics.current())
 
-        leads_result = await session.execute(leads_query, {"today": today})
-        leads = leads_result.fetchone()
-        new_leads_today = int(leads.new_leads_today or 0)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Database error: {str(e)}")
 
-        # Get top performing creative
-        top_creative_query = text("""
-            SELECT creative_key
-            FROM dm.dm_ad_results_daily_v3
-            WHERE date >= :start_date
-            ORDER BY contracts DESC, revenue DESC
-            LIMIT 1
-        """)
 
-        week_start = today - timedelta(days=7)
-        top_result = await session.execute(
-            top_creative_query,
-            {"start_date": week_start}
-        )
-        top_creative = top_result.fetchone()
-
-        # Mock active sessions (would need real-time data)
-        active_sessions = 156  # Mock data
-
-        alerts = []
-
-        # Add alerts based on performance
-        revenue_today = float(today_metrics.revenue_today or 0)
-        if revenue_today < 10000:  # Below target
-            alerts.append("Daily revenue below target")
-
-        return RealTimeMetrics(
-            active_sessions=active_sessions,
-            new_leads_today=new_leads_today,
-            revenue_today=revenue_today,
-            conversions_today=int(today_metrics.conversions_today or 0),
-            top_performing_creative=top_creative.creative_key if top_creative else None,
-            alerts=alerts,
-            last_updated=datetime.now()
-        )
+@router.get("/realtime/stream")
+async def stream_realtime_metrics(request: Request):
+    """
+    Server-Sent Events with the real-time metrics.
 
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Database error: {str(e)}")
+    `event: snapshot` carries all fields (on connect and after falling
+    behind), `event: delta` only the fields that changed. All clients share
+    one warehouse poller, so open screens add no database load.
+    """
+    queue = await live_metrics.subscribe()
+
+    async def events():
+        try:
+            yield f"retry: {settings.LIVE_METRICS_INTERVAL_SEC * 1000}\n\n"
+            while not await request.is_disconnected():
+                try:
+                    kind, data = await asyncio.wait_for(queue.get(), timeout=settings.LIVE_METRICS_KEEPALIVE_SEC)
+                except asyncio.TimeoutError:
+                    # Keeps proxies from closing an idle stream
+                    yield ": keepalive\n\n"
+                    continue
+                yield f"event: {kind}\ndata: {json.dumps(data)}\n\n"
+        finally:
+            live_metrics.unsubscribe(queue)
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
 
 
 @router.get("/platforms", response_model=List[PlatformPerformance])
@@ -7,7 +7,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, func, and_, desc, cast, Integer
 from redis.asyncio import Redis
 from liderix_api.db import get_async_session
-from liderix_api.models.audit import EventLog
+from liderix_api.models.audit import EventLog, EventLogHourly
 from liderix_api.models.users import User
 from liderix_api.config.settings import settings  # Убедились, что именно core.config
 # Зависимость админа: должна валидировать, что запрос от админа/супера
@@ -24,6 +24,21 @@ redis = Redis.from_url(settings.REDIS_URL, decode_responses=True)
 def now_utc() -> datetime:
     return datetime.now(timezone.utc)
 
+def _window_start(hours: int) -> datetime:
+    """
+    Начало окна для почасовых агрегатов (event_log_hourly): текущий час
+    и hours-1 часов до него.
+    """
+    return now_utc().replace(minute=0, second=0, microsecond=0) - timedelta(hours=hours - 1)
+
+async def _event_count(session: AsyncSession, event_type: str, since: datetime) -> int:
+    count = await session.scalar(
+        select(func.sum(EventLogHourly.event_count)).where(
+            and_(EventLogHourly.event_type == event_type, EventLogHourly.hour >= since)
+        )
+    )
+    return int(count or 0)
+
 async def _count_redis_keys(pattern: str, scan_count: int = 1000) -> int:
     c = 0
     async for _ in redis.scan_iter(match=pattern, count=scan_count):
@@ -52,18 +67,15 @@ async def detailed_health_check(
     await redis.ping()
     redis_latency = (datetime.now() - red_t0).total_seconds() * 1000
 
-    # Ошибки за период
-    since = now_utc() - timedelta(hours=hours)
-    recent_errors = await session.scalar(
-        select(func.count(EventLog.id)).where(
-            and_(EventLog.success.is_(False), EventLog.created_at >= since)
-        )
-    )
-    recent_total = await session.scalar(
-        select(func.count(EventLog.id)).where(EventLog.created_at >= since)
-    )
-    recent_errors = recent_errors or 0
-    recent_total = recent_total or 0
+    # Ошибки за период (из почасовых агрегатов, а не сканом event_logs)
+    totals = (await session.execute(
+        select(
+            func.sum(EventLogHourly.event_count).label("total"),
+            func.sum(EventLogHourly.event_count).filter(EventLogHourly.success.is_(False)).label("errors"),
+        ).where(EventLogHourly.hour >= _window_start(hours))
+    )).one()
+    recent_errors = int(totals.errors or 0)
+    recent_total = int(totals.total or 0)
     error_rate = (recent_errors / recent_total * 100.0) if recent_total > 0 else 0.0
 
     # Активные refresh-сессии (по whitelist)
@@ -95,17 +107,18 @@ async def get_auth_metrics(
     """
     Агрегированные метрики по событиям аутентификации за период.
     """
-    since = now_utc() - timedelta(hours=hours)
+    since = _window_start(hours)
+    successful_count = func.sum(EventLogHourly.event_count).filter(EventLogHourly.success.is_(True))
 
     # По типам событий
     rows = await session.execute(
         select(
-            EventLog.event_type,
-            func.count(EventLog.id).label("total"),
-            func.sum(cast(EventLog.success, Integer)).label("successful"),
+            EventLogHourly.event_type,
+            func.sum(EventLogHourly.event_count).label("total"),
+            successful_count.label("successful"),
         )
-        .where(EventLog.created_at >= since)
-        .group_by(EventLog.event_type)
+        .where(EventLogHourly.hour >= since)
+        .group_by(EventLogHourly.event_type)
     )
     summary: Dict[str, Any] = {}
     for r in rows:
@@ -121,13 +134,13 @@ async def get_auth_metrics(
     # Почасовая динамика
     hourly_rows = await session.execute(
         select(
-            func.date_trunc("hour", EventLog.created_at).label("hour"),
-            func.count(EventLog.id).label("total"),
-            func.sum(cast(EventLog.success, Integer)).label("successful"),
+            EventLogHourly.hour,
+            func.sum(EventLogHourly.event_count).label("total"),
+            successful_count.label("successful"),
         )
-        .where(EventLog.created_at >= since)
-        .group_by(func.date_trunc("hour", EventLog.created_at))
-        .order_by(func.date_trunc("hour", EventLog.created_at))
+        .where(EventLogHourly.hour >= since)
+        .group_by(EventLogHourly.hour)
+        .order_by(EventLogHourly.hour)
     )
     hourly_breakdown: List[Dict[str, Any]] = []
     for r in hourly_rows:
@@ -193,12 +206,7 @@ async def get_registration_analytics(
         )
 
     # Кол-во «успешных регистраций» по ивенту
-    successful_reg_events = await session.scalar(
-        select(func.count(EventLog.id)).where(
-            and_(EventLog.event_type == "auth.register.success", EventLog.created_at >= since)
-        )
-    )
-    successful_reg_events = int(successful_reg_events or 0)
+    successful_reg_events = await _event_count(session, "auth.register.success", _window_start(days * 24))
 
     return {
         "period_days": days,
@@ -238,13 +246,7 @@ async def get_session_analytics(
     avg_sessions_per_user = (total_active_sessions / unique_active_users) if unique_active_users > 0 else 0.0
 
     # За последние 24 часа — успешные логины
-    since_24h = now_utc() - timedelta(hours=24)
-    recent_login_count = await session.scalar(
-        select(func.count(EventLog.id)).where(
-            and_(EventLog.event_type == "auth.login.success", EventLog.created_at >= since_24h)
-        )
-    )
-    recent_login_count = int(recent_login_count or 0)
+    recent_login_count = await _event_count(session, "auth.login.success", _window_start(24))
 
     # Распределение по количеству сессий на пользователя
     session_distribution: Dict[int, int] = {}
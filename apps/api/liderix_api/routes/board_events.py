@@ -0,0 +1,119 @@
+# apps/api/liderix_api/routes/board_events.py
+"""
+WebSocket for live task board / project updates.
+
+    WS /ws/board?token=<access token>
+
+Client -> server:
+    {"action": "subscribe", "channels": ["project:<id>", "task:<id>", "org:<id>"]}
+    {"action": "unsubscribe", "channels": [...]}
+    {"action": "ping"}
+
+Server -> client:
+    {"type": "subscribed", "channels": [...], "denied": [...]}
+    {"type": "unsubscribed", "channels": [...]}
+    {"type": "task.updated", ...}        change events, see services/board_events.py
+    {"type": "resync"}                    fell behind: reload once, keep the socket
+    {"type": "error", "detail": "..."}
+
+The socket is closed with 4401 when the access token expires; reconnect with
+a fresh token (subscriptions are authorized again).
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from typing import Any, Dict
+
+from fastapi import APIRouter, HTTPException, Query, WebSocket, WebSocketDisconnect
+
+from liderix_api.db import LiderixAsyncSessionLocal
+from liderix_api.services.auth import decode_token, get_current_user
+from liderix_api.services.board_events import (
+    MAX_CHANNELS_PER_CONNECTION,
+    BoardConnection,
+    authorize_channels,
+    board_hub,
+)
+
+router = APIRouter(tags=["Realtime"])
+logger = logging.getLogger(__name__)
+
+CLOSE_UNAUTHORIZED = 4401
+CLOSE_FORBIDDEN = 4403
+
+
+async def _send_loop(websocket: WebSocket, connection: BoardConnection) -> None:
+    while True:
+        await websocket.send_json(await connection.outbox.get())
+
+
+async def _handle(message: Any, connection: BoardConnection, user) -> None:
+    if not isinstance(message, dict):
+        connection.send({"type": "error", "detail": "Expected a JSON object"})
+        return
+    action = message.get("action")
+    channels = message.get("channels") or []
+    if action == "ping":
+        connection.send({"type": "pong"})
+        return
+    if action not in ("subscribe", "unsubscribe") or not isinstance(channels, list):
+        connection.send({"type": "error", "detail": "Unknown action"})
+        return
+    channels = [channel for channel in channels if isinstance(channel, str)]
+
+    if action == "unsubscribe":
+        connection.send({"type": "unsubscribed", "channels": board_hub.leave(connection, channels)})
+        return
+
+    new = [channel for channel in dict.fromkeys(channels) if channel not in connection.channels]
+    if len(connection.channels) + len(new) > MAX_CHANNELS_PER_CONNECTION:
+        connection.send({
+            "type": "error",
+            "detail": f"At most {MAX_CHANNELS_PER_CONNECTION} channels per connection",
+        })
+        return
+    allowed: Dict[str, Any] = {}
+    denied = []
+    if new:
+        async with LiderixAsyncSessionLocal() as session:
+            allowed, denied = await authorize_channels(session, user, new)
+        board_hub.join(connection, allowed)
+    connection.send({"type": "subscribed", "channels": list(allowed), "denied": denied})
+
+
+@router.websocket("/ws/board")
+async def board_socket(websocket: WebSocket, token: str = Query(...)):
+    """Subscribe to task/project channels and receive their change events"""
+    try:
+        claims = decode_token(token, verify_exp=True)
+        async with LiderixAsyncSessionLocal() as session:
+            user = await get_current_user(token=token, session=session)
+    except HTTPException as e:
+        await websocket.close(code=CLOSE_FORBIDDEN if e.status_code == 403 else CLOSE_UNAUTHORIZED)
+        return
+
+    await websocket.accept()
+    connection = BoardConnection(user.id)
+    sender = asyncio.create_task(_send_loop(websocket, connection))
+    expires_at = float(claims.get("exp") or time.time() + 3600)
+    try:
+        while True:
+            remaining = expires_at - time.time()
+            if remaining <= 0:
+                await websocket.close(code=CLOSE_UNAUTHORIZED, reason="Token expired")
+                break
+            try:
+                message = await asyncio.wait_for(websocket.receive_json(), timeout=remaining)
+            except asyncio.TimeoutError:
+                continue
+            except ValueError:
+                connection.send({"type": "error", "detail": "Invalid JSON"})
+                continue
+            await _handle(message, connection, user)
+    except WebSocketDisconnect:
+        pass
+    finally:
+        board_hub.detach(connection)
+        sender.cancel()
@@ -0,0 +1,236 @@
+# apps/api/liderix_api/routes/calendar.py
+"""
+Calendar range queries.
+
+    GET  /calendars/events?calendar_ids=..&calendar_ids=..&start=..&end=..
+    POST /calendars/free-busy     busy time of attendees + ranked meeting slots
+
+Recurring series are expanded inside the window (services/calendar_query.py);
+a month view over dozens of calendars is one query plus cached expansion.
+Free/busy exposes only intervals, never event details (services/scheduling.py).
+"""
+from __future__ import annotations
+
+import logging
+from datetime import datetime, timedelta
+from typing import Dict, List, Set
+from uuid import UUID
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from liderix_api.db import get_async_session
+from liderix_api.models.calendar import Calendar, CalendarPermission
+from liderix_api.models.memberships import Membership, MembershipStatus
+from liderix_api.models.users import User
+from liderix_api.schemas.calendar import (
+    AttendeeFreeBusy,
+    BusyInterval,
+    CalendarOccurrence,
+    CalendarRangeResponse,
+    FreeBusyRequest,
+    FreeBusyResponse,
+    SchedulingSlot,
+)
+from liderix_api.services.auth import get_current_user
+from liderix_api.services.calendar_query import WindowTooLarge, get_calendar_occurrences
+from liderix_api.services.permissions import check_organization_permission
+from liderix_api.services.scheduling import BUSY, TENTATIVE, find_slots, get_free_busy, load_working_hours
+
+router = APIRouter(prefix="/calendars", tags=["Calendar"])
+logger = logging.getLogger(__name__)
+
+MAX_CALENDARS_PER_QUERY = 100
+PRIVATE_TITLE = "Busy"
+MAX_FREE_BUSY_DAYS = 31
+
+
+# ----------------- helpers -----------------
+
+def problem(status_code: int, type_: str, title: str, detail: str):
+    raise HTTPException(
+        status_code=status_code,
+        detail={"type": type_, "title": title, "detail": detail, "status": status_code},
+    )
+
+
+async def _readable_calendars(
+    session: AsyncSession, calendar_ids: List[UUID], current_user: User
+) -> Dict[UUID, Calendar]:
+    """Calendars the user may read; 404/403 if any of the requested ones isn't"""
+    calendars = {
+        calendar.id: calendar
+        for calendar in await session.scalars(
+            select(Calendar).where(
+                Calendar.id.in_(calendar_ids),
+                Calendar.is_deleted.is_(False),
+                Calendar.is_active.is_(True),
+            )
+        )
+    }
+    missing = [str(calendar_id) for calendar_id in calendar_ids if calendar_id not in calendars]
+    if missing:
+        problem(404, "urn:problem:calendar-not-found", "Calendar Not Found",
+                f"Calendars not found: {', '.join(missing)}")
+    if current_user.is_admin:
+        return calendars
+
+    shared: Set[UUID] = set(await session.scalars(
+        select(CalendarPermission.calendar_id).where(
+            CalendarPermission.calendar_id.in_(calendar_ids),
+            CalendarPermission.user_id == current_user.id,
+        )
+    ))
+    public_orgs: Dict[UUID, bool] = {}
+    for calendar in calendars.values():
+        if calendar.owner_id == current_user.id or calendar.id in shared:
+            continue
+        if calendar.is_public:
+            if calendar.org_id not in public_orgs:
+                public_orgs[calendar.org_id] = await check_organization_permission(
+                    session, calendar.org_id, current_user, "read"
+                )
+            if public_orgs[calendar.org_id]:
+                continue
+        problem(403, "urn:problem:access-denied", "Access Denied",
+                f"You don't have access to calendar {calendar.id}")
+    return calendars
+
+
+async def _check_colleagues(session: AsyncSession, user_ids: List[UUID], current_user: User) -> None:
+    """Free/busy is visible only between members of a common organization"""
+    if current_user.is_admin:
+        return
+    my_orgs = select(Membership.org_id).where(
+        Membership.user_id == current_user.id,
+        Membership.status == MembershipStatus.ACTIVE,
+        Membership.is_deleted.is_(False),
+    )
+    visible = set(await session.scalars(
+        select(Membership.user_id).where(
+            Membership.user_id.in_(user_ids),
+            Membership.org_id.in_(my_orgs),
+            Membership.status == MembershipStatus.ACTIVE,
+            Membership.is_deleted.is_(False),
+        )
+    ))
+    visible.add(current_user.id)
+    hidden = [str(user_id) for user_id in user_ids if user_id not in visible]
+    if hidden:
+        problem(403, "urn:problem:access-denied", "Access Denied",
+                f"No shared organization with: {', '.join(hidden)}")
+
+
+def _redact(occurrence: CalendarOccurrence) -> CalendarOccurrence:
+    return occurrence.model_copy(update={
+        "title": PRIVATE_TITLE,
+        "description": None,
+        "location": None,
+        "meeting_url": None,
+    })
+
+
+# ----------------- endpoints -----------------
+
+@router.get("/events", response_model=CalendarRangeResponse)
+async def get_calendar_events(
+    calendar_ids: List[UUID] = Query(..., min_length=1, description="Calendars to show"),
+    start: datetime = Query(..., description="Window start (inclusive)"),
+    end: datetime = Query(..., description="Window end (exclusive)"),
+    session: AsyncSession = Depends(get_async_session),
+    current_user: User = Depends(get_current_user),
+):
+    """
+    Everything on the given calendars between start and end: single events
+    plus occurrences of recurring series (with their exceptions applied).
+    Private events of other people are returned as busy blocks.
+    """
+    calendar_ids = list(dict.fromkeys(calendar_ids))
+    if len(calendar_ids) > MAX_CALENDARS_PER_QUERY:
+        problem(400, "urn:problem:too-many-calendars", "Too Many Calendars",
+                f"At most {MAX_CALENDARS_PER_QUERY} calendars per query")
+    if end <= start:
+        problem(400, "urn:problem:invalid-window", "Invalid Window", "end must be after start")
+
+    calendars = await _readable_calendars(session, calendar_ids, current_user)
+    try:
+        occurrences = await get_calendar_occurrences(session, calendar_ids, start, end)
+    except WindowTooLarge as e:
+        problem(400, "urn:problem:invalid-window", "Invalid Window", str(e))
+
+    events = [
+        _redact(occurrence)
+        if occurrence.is_private
+        and occurrence.creator_id != current_user.id
+        and calendars[occurrence.calendar_id].owner_id != current_user.id
+        else occurrence
+        for occurrence in occurrences
+    ]
+    return CalendarRangeResponse(start=start, end=end, calendar_ids=calendar_ids, events=events)
+
+
+@router.post("/free-busy", response_model=FreeBusyResponse)
+async def get_free_busy_slots(
+    data: FreeBusyRequest,
+    session: AsyncSession = Depends(get_async_session),
+    current_user: User = Depends(get_current_user),
+):
+    """
+    Busy intervals of every attendee over the window and the best meeting
+    slots: all required attendees free and inside their working hours,
+    ranked by tentative conflicts, then by how many optional attendees are
+    free, then by time.
+    """
+    if data.end <= data.start:
+        problem(400, "urn:problem:invalid-window", "Invalid Window", "end must be after start")
+    if data.end - data.start > timedelta(days=MAX_FREE_BUSY_DAYS):
+        problem(400, "urn:problem:invalid-window", "Invalid Window",
+                f"Free/busy windows are limited to {MAX_FREE_BUSY_DAYS} days")
+
+    required = list(dict.fromkeys(data.attendee_ids))
+    optional = [user_id for user_id in dict.fromkeys(data.optional_attendee_ids) if user_id not in required]
+    everyone = required + optional
+    await _check_colleagues(session, everyone, current_user)
+
+    free_busy = await get_free_busy(session, everyone, data.start, data.end)
+    working_hours = await load_working_hours(session, everyone)
+    slots = find_slots(
+        free_busy,
+        required,
+        optional,
+        data.start,
+        data.end,
+        duration=timedelta(minutes=data.duration_minutes),
+        step=timedelta(minutes=data.slot_step_minutes),
+        working_hours=working_hours if data.respect_working_hours else None,
+        limit=data.max_results,
+    )
+
+    attendees = []
+    for user_id in everyone:
+        intervals = free_busy[user_id]
+        busy = [BusyInterval(start=s, end=e, status=BUSY) for s, e in intervals.busy]
+        busy += [BusyInterval(start=s, end=e, status=TENTATIVE) for s, e in intervals.tentative]
+        attendees.append(AttendeeFreeBusy(
+            user_id=user_id,
+            required=user_id in required,
+            timezone=working_hours[user_id].timezone if user_id in working_hours else None,
+            busy=sorted(busy, key=lambda interval: interval.start),
+        ))
+
+    return FreeBusyResponse(
+        start=data.start,
+        end=data.end,
+        attendees=attendees,
+        slots=[
+            SchedulingSlot(
+                start=slot.start,
+                end=slot.end,
+                available_optional=slot.available_optional,
+                unavailable_optional=slot.unavailable_optional,
+                tentative_conflicts=slot.tentative_conflicts,
+            )
+            for slot in slots
+        ],
+    )
@@ -0,0 +1,174 @@
+# apps/api/liderix_api/routes/files.py
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+from typing import Optional
+from uuid import UUID
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from fastapi.responses import RedirectResponse
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from liderix_api.config.settings import settings
+from liderix_api.db import get_async_session
+from liderix_api.enums import UploadStatus
+from liderix_api.models.files import File
+from liderix_api.models.users import User
+from liderix_api.services.auth import get_current_user
+from liderix_api.services.file_download import (
+    FileAccess,
+    LocalFileResponse,
+    RangeNotSatisfiable,
+    access_log,
+    content_disposition,
+    etag_matches,
+    make_etag,
+    parse_range,
+)
+from liderix_api.services.images import WEBP, file_variant
+from liderix_api.services.permissions import check_organization_permission
+from liderix_api.services.storage import LocalStorage, S3Storage, get_storage
+
+router = APIRouter(prefix="/files", tags=["Files"])
+logger = logging.getLogger(__name__)
+
+
+# ----------------- helpers -----------------
+
+def problem(status_code: int, type_: str, title: str, detail: str):
+    raise HTTPException(
+        status_code=status_code,
+        detail={"type": type_, "title": title, "detail": detail, "status": status_code},
+    )
+
+
+def _log_access(request: Request, file: File, user: User, access_type: str, code: int, sent: Optional[int]) -> None:
+    if request.method == "HEAD":
+        return
+    access_log.record(FileAccess(
+        file_id=file.id,
+        user_id=user.id,
+        access_type=access_type,
+        response_code=code,
+        bytes_served=sent,
+        ip_address=request.client.host if request.client else None,
+        user_agent=request.headers.get("user-agent"),
+        referer=request.headers.get("referer"),
+    ))
+
+
+# ----------------- endpoints -----------------
+
+@router.api_route("/{file_id}/download", methods=["GET", "HEAD"])
+async def download_file(
+    file_id: UUID,
+    request: Request,
+    inline: bool = Query(False, description="Content-Disposition: inline instead of attachment"),
+    variant: Optional[str] = Query(None, description="Image variant: thumb or preview"),
+    session: AsyncSession = Depends(get_async_session),
+    current_user: User = Depends(get_current_user),
+):
+    """
+    Download a file.
+
+    Supports Range (single range, 206) and If-None-Match (ETag is the
+    content SHA-256). Files in object storage are served by a redirect to a
+    short-lived pre-signed URL. `variant` serves a WebP thumbnail/preview of
+    an image file.
+    """
+    file = await session.scalar(
+        select(File).where(File.id == file_id, File.is_deleted.is_(False))
+    )
+    if not file or file.upload_status != UploadStatus.COMPLETED:
+        problem(404, "urn:problem:file-not-found", "File Not Found", "File does not exist")
+
+    if not file.is_public and not await check_organization_permission(session, file.org_id, current_user, "read"):
+        problem(403, "urn:problem:access-denied", "Access Denied",
+                "You don't have access to this file")
+
+    # Everything below runs without the database
+    await session.commit()
+
+    etag = make_etag(file.file_hash)
+    content_type = file.mime_type or "application/octet-stream"
+    filename = file.original_filename or file.filename
+    object_key = file.file_path
+    access_type = "view" if inline else "download"
+    if variant is not None:
+        rendered = file_variant(file, variant)
+        if rendered is None:
+            problem(404, "urn:problem:variant-not-found", "Variant Not Found",
+                    f"File has no {variant} variant")
+        object_key = rendered["key"]
+        etag = make_etag(f"{file.file_hash}.{variant}") if file.file_hash else None
+        content_type = WEBP
+        filename = f"{os.path.splitext(filename)[0]}.{variant}.webp"
+        access_type = "thumbnail"
+    disposition = content_disposition(filename, inline)
+
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        _log_access(request, file, current_user, access_type, 304, 0)
+        return Response(status_code=304, headers={"etag": etag, "cache-control": "private, no-cache"})
+
+    storage = get_storage()
+    if isinstance(storage, S3Storage):
+        url = storage.presigned_url(
+            object_key,
+            expires_in=settings.FILE_DOWNLOAD_URL_TTL_SEC,
+            params={"response-content-disposition": disposition, "response-content-type": content_type},
+        )
+        # Bytes are served by the object store; not known here
+        _log_access(request, file, current_user, "redirect", 302, None)
+        return RedirectResponse(url, status_code=302, headers={"cache-control": "no-store"})
+
+    if not isinstance(storage, LocalStorage):
+        problem(501, "urn:problem:storage-unsupported", "Download Unsupported",
+                f"Downloads from {storage.name} storage are not supported")
+
+    path = storage.path(object_key)
+    try:
+        size = (await asyncio.to_thread(os.stat, path)).st_size
+    except FileNotFoundError:
+        logger.error(f"File {file.id} is missing from storage: {object_key}")
+        problem(404, "urn:problem:file-missing", "File Missing", "File content is not available")
+
+    headers = {
+        "content-type": content_type,
+        "content-disposition": disposition,
+        "accept-ranges": "bytes",
+        "cache-control": "private, no-cache",
+    }
+    if etag:
+        headers["etag"] = etag
+
+    # If-Range: only honour Range while the client's copy is current
+    if_range = request.headers.get("if-range")
+    range_header = request.headers.get("range") if not if_range or if_range == etag else None
+    try:
+        byte_range = parse_range(range_header, size)
+    except RangeNotSatisfiable:
+        _log_access(request, file, current_user, access_type, 416, 0)
+        return Response(status_code=416, headers={"content-range": f"bytes */{size}"})
+
+    status_code, offset, count = 200, 0, size
+    if byte_range is not None:
+        start, end = byte_range
+        status_code, offset, count = 206, start, end - start + 1
+        headers["content-range"] = f"bytes {start}-{end}/{size}"
+
+    return LocalFileResponse(
+        path,
+        offset=offset,
+        count=count,
+        status_code=status_code,
+        headers=headers,
+        send_body=request.method != "HEAD",
+        accel_redirect=(
+            f"{settings.STORAGE_ACCEL_REDIRECT_PREFIX.rstrip('/')}/{object_key}"
+            if settings.STORAGE_ACCEL_REDIRECT_PREFIX else None
+        ),
+        on_complete=lambda code, sent: _log_access(request, file, current_user, access_type, code, sent),
+    )
@@ -0,0 +1,75 @@
+# apps/api/liderix_api/routes/jobs.py
+"""
+Status of background jobs started by 202 endpoints.
+
+    GET  /jobs/{job_id}            status, progress, result / error
+    POST /jobs/{job_id}/cancel     cancel (queued: at once, running: at its next checkpoint)
+
+Visible to the user who started the job and to admins of its organization.
+See services/jobs.py for the queue and the workers.
+"""
+from __future__ import annotations
+
+import logging
+from uuid import UUID
+
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from liderix_api.db import get_async_session
+from liderix_api.models.jobs import Job
+from liderix_api.models.users import User
+from liderix_api.schemas.jobs import JobRead
+from liderix_api.services.auth import get_current_user
+from liderix_api.services.jobs import request_cancel
+from liderix_api.services.permissions import PermissionEvaluator
+
+router = APIRouter(prefix="/jobs", tags=["Jobs"])
+logger = logging.getLogger(__name__)
+
+
+def problem(status_code: int, type_: str, title: str, detail: str):
+    raise HTTPException(
+        status_code=status_code,
+        detail={"type": type_, "title": title, "detail": detail, "status": status_code},
+    )
+
+
+async def _get_job(session: AsyncSession, job_id: UUID, user: User) -> Job:
+    job = await session.scalar(select(Job).where(Job.id == job_id))
+    if job is None:
+        problem(404, "urn:problem:job-not-found", "Job Not Found", "Job does not exist or has expired")
+    if job.created_by_id != user.id:
+        allowed = False
+        if job.org_id is not None:
+            [allowed] = await PermissionEvaluator.for_session(session).can(user, "admin", [job.org_id])
+        if not allowed:
+            # Same answer as a missing job: ids of other users' jobs are not confirmed
+            problem(404, "urn:problem:job-not-found", "Job Not Found", "Job does not exist or has expired")
+    return job
+
+
+@router.get("/{job_id}", response_model=JobRead)
+async def get_job(
+    job_id: UUID,
+    session: AsyncSession = Depends(get_async_session),
+    current_user: User = Depends(get_current_user),
+):
+    return JobRead.model_validate(await _get_job(session, job_id, current_user))
+
+
+@router.post("/{job_id}/cancel", response_model=JobRead)
+async def cancel_job(
+    job_id: UUID,
+    session: AsyncSession = Depends(get_async_session),
+    current_user: User = Depends(get_current_user),
+):
+    """Cancel a job; finished jobs are returned unchanged"""
+    await _get_job(session, job_id, current_user)
+    await request_cancel(session, job_id)
+    job = await session.scalar(
+        select(Job).where(Job.id == job_id).execution_options(populate_existing=True)
+    )
+    logger.info(f"Cancel requested for job {job_id} by user {current_user.id}")
+    return JobRead.model_validate(job)
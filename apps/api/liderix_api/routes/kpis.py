@@ -19,9 +19,37 @@ from liderix_api.db import get_async_session
 from liderix_api.services.auth import get_current_user
 from liderix_api.models.users import User
 from liderix_api.services.permissions import check_organization_permission
+from liderix_api.services.projections import kpi_list_projection
 
 router = APIRouter(prefix="", tags=["KPIs & Performance Metrics"])
 
+KPI_LIST = kpi_list_projection(KPIRead)
+LIST_MEASUREMENTS_PER_KPI = 10
+
+
+async def _attach_latest_measurements(session: AsyncSession, kpis: List[KPIRead]) -> None:
+    """Latest measurements for a page of KPIs in one windowed query"""
+    by_id = {kpi.id: kpi for kpi in kpis}
+    ranked = (
+        select(
+            KPIMeasurement,
+            func.row_number().over(
+                partition_by=KPIMeasurement.kpi_id,
+                order_by=desc(KPIMeasurement.measured_at),
+            ).label("position"),
+        )
+        .where(KPIMeasurement.kpi_id.in_(list(by_id)))
+        .subquery()
+    )
+    rows = await session.execute(
+        select(ranked)
+        .where(ranked.c.position <= LIST_MEASUREMENTS_PER_KPI)
+        .order_by(ranked.c.kpi_id, ranked.c.position)
+    )
+    for row in rows.all():
+        data = {field: row._mapping[field] for field in KPIMeasurementRead.model_fields if field in row._mapping}
+        by_id[row.kpi_id].measurements.append(KPIMeasurementRead.model_validate(data))
+
 # ==================== KPI CRUD OPERATIONS ====================
 
 @router.get("/kpis", response_model=KPIListResponse)
@@ -43,17 +71,14 @@ async def get_kpis(
     """Get KPIs with advanced filtering, pagination and search."""
     await check_organization_permission(session, current_user.org_id, current_user.id)
 
-    # Build base query
-    query = select(KPI).where(
+    # Build base query (column projection; measurements are batch-loaded below)
+    query = KPI_LIST.select().where(
         and_(
             KPI.org_id == current_user.org_id,
             KPI.deleted_at.is_(None)
         )
     )
 
-    if include_measurements:
-        query = query.options(selectinload(KPI.measurements))
-
     # Apply filters
     filters_applied = {}
     if status:
@@ -111,7 +136,10 @@ async def get_kpis(
     # Apply pagination and ordering
     query = query.order_by(desc(KPI.created_at)).offset((page - 1) * page_size).limit(page_size)
     result = await session.execute(query)
-    kpis = result.scalars().all()
+    kpis = KPI_LIST.build(result.all())
+
+    if include_measurements and kpis:
+        await _attach_latest_measurements(session, kpis)
 
     return KPIListResponse(
         items=kpis,
@@ -0,0 +1,98 @@
+# apps/api/liderix_api/routes/notifications.py
+"""
+In-app notification feed of the current user.
+
+    GET  /notifications                  newest first, keyset cursor
+    GET  /notifications/unread-count     header badge (cached counter)
+    POST /notifications/read             mark some read
+    POST /notifications/read-all         mark everything read (one UPDATE)
+
+See services/notification_feed.py for the counter and purge logic.
+"""
+from __future__ import annotations
+
+import logging
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from liderix_api.db import get_async_session
+from liderix_api.models.users import User
+from liderix_api.schemas.notifications import (
+    NotificationFeedPage,
+    NotificationMarkRead,
+    NotificationRead,
+    NotificationReadResult,
+    UnreadCount,
+)
+from liderix_api.services.auth import get_current_user
+from liderix_api.services.notification_feed import (
+    InvalidCursor,
+    get_feed,
+    mark_all_read,
+    mark_read,
+    unread_count,
+)
+
+router = APIRouter(prefix="/notifications", tags=["Notifications"])
+logger = logging.getLogger(__name__)
+
+FEED_PAGE_MAX = 100
+
+
+def problem(status_code: int, type_: str, title: str, detail: str):
+    raise HTTPException(
+        status_code=status_code,
+        detail={"type": type_, "title": title, "detail": detail, "status": status_code},
+    )
+
+
+@router.get("", response_model=NotificationFeedPage)
+async def get_notifications(
+    cursor: Optional[str] = Query(None, description="Cursor returned as next_cursor by the previous page"),
+    limit: int = Query(20, ge=1, le=FEED_PAGE_MAX),
+    unread_only: bool = Query(False),
+    session: AsyncSession = Depends(get_async_session),
+    current_user: User = Depends(get_current_user),
+):
+    """Notification feed, newest first; expired notifications are hidden"""
+    try:
+        rows, next_cursor = await get_feed(session, current_user.id, cursor, limit, unread_only)
+    except InvalidCursor as e:
+        problem(400, "urn:problem:invalid-cursor", "Invalid Cursor", str(e))
+
+    return NotificationFeedPage(
+        items=[NotificationRead.model_validate(row) for row in rows],
+        next_cursor=next_cursor,
+        has_next=next_cursor is not None,
+        unread_count=await unread_count(session, current_user.id),
+    )
+
+
+@router.get("/unread-count", response_model=UnreadCount)
+async def get_unread_count(
+    session: AsyncSession = Depends(get_async_session),
+    current_user: User = Depends(get_current_user),
+):
+    return UnreadCount(unread_count=await unread_count(session, current_user.id))
+
+
+@router.post("/read", response_model=NotificationReadResult)
+async def mark_notifications_read(
+    data: NotificationMarkRead,
+    session: AsyncSession = Depends(get_async_session),
+    current_user: User = Depends(get_current_user),
+):
+    """Mark notifications read; ids of other users or already read ones are ignored"""
+    updated = await mark_read(session, current_user.id, list(dict.fromkeys(data.ids)))
+    return NotificationReadResult(updated=updated, unread_count=await unread_count(session, current_user.id))
+
+
+@router.post("/read-all", response_model=NotificationReadResult)
+async def mark_all_notifications_read(
+    session: AsyncSession = Depends(get_async_session),
+    current_user: User = Depends(get_current_user),
+):
+    updated = await mark_all_read(session, current_user.id)
+    return NotificationReadResult(updated=updated, unread_count=await unread_count(session, current_user.id))
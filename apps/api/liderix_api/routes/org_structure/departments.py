@@ -22,6 +22,8 @@ from liderix_api.schemas.department import (
 )
 from liderix_api.services.guards import tenant_guard, TenantContext, require_perm
 from liderix_api.services.audit import AuditLogger
+from liderix_api.services.department_tree import build_department_tree, get_department_index
+from liderix_api.services.invalidation import CacheKind, invalidation_bus
 router = APIRouter(prefix="/orgs/{org_id}/departments", tags=["Departments"])
 logger = logging.getLogger(__name__)
 # ----------------- helpers -----------------
@@ -175,36 +177,8 @@ async def get_department_tree(
     """Get department hierarchy as a tree structure."""
     require_perm(ctx, "org:read")
     await _validate_org_exists(session, org_id)
-    async def build_tree(parent_id: Optional[UUID], current_depth: int = 0) -> List[DepartmentTreeResponse]:
-        if current_depth >= max_depth:
-            return []
-        rows = await session.execute(
-            select(Department).where(
-                and_(
-                    Department.org_id == org_id,
-                    Department.parent_id == parent_id,
-                    Department.deleted_at.is_(None),
-                )
-            ).order_by(Department.name.asc())
-        )
-        tree: List[DepartmentTreeResponse] = []
-        for dept in rows.scalars():
-            stats = await _get_department_stats(session, org_id, dept.id)
-            children = await build_tree(dept.id, current_depth + 1)
-            tree.append(
-                DepartmentTreeResponse(
-                    id=dept.id,
-                    name=dept.name,
-                    description=dept.description,
-                    manager_id=dept.manager_id,
-                    member_count=stats["member_count"],
-                    child_department_count=stats["child_department_count"],
-                    children=children,
-                    depth=current_depth,
-                )
-            )
-        return tree
-    tree = await build_tree(root_id)
+    index = await get_department_index(session, org_id)
+    tree = build_department_tree(index, root_id, max_depth)
     await AuditLogger.log_event(
         session,
         ctx.user_id,
@@ -264,6 +238,7 @@ async def create_department(
         logger.error(f"Failed to create department: {e}")
         problem(409, "urn:problem:integrity-error", "Data Integrity Error", "Failed to create department due to data constraint violation")
     await session.refresh(dept)
+    invalidation_bus.emit(CacheKind.DEPARTMENTS, [org_id])
     response.headers["Location"] = f"{settings.API_PREFIX.rstrip('/')}/orgs/{org_id}/departments/{dept.id}"
     await AuditLogger.log_event(
         session,
@@ -373,6 +348,7 @@ async def update_department(
         logger.error(f"Failed to update department {dept_id}: {e}")
         problem(409, "urn:problem:integrity-error", "Data Integrity Error", "Failed to update department due to data constraint violation")
     await session.refresh(dept)
+    invalidation_bus.emit(CacheKind.DEPARTMENTS, [org_id])
     await AuditLogger.log_event(
         session,
         ctx.user_id,
@@ -447,6 +423,7 @@ async def delete_department(
             .values(department_id=None)
         )
     await session.commit()
+    invalidation_bus.emit(CacheKind.DEPARTMENTS, [org_id])
     await AuditLogger.log_event(
         session,
         ctx.user_id,
@@ -11,6 +11,8 @@ from sqlalchemy.exc import IntegrityError
 from liderix_api.db import get_async_session
 from liderix_api.services.auth import get_current_user
 from liderix_api.services.guards import tenant_guard, TenantContext, require_perm
+from liderix_api.services.invalidation import CacheKind, invalidation_bus
+from liderix_api.services.permissions import invalidate_permission_cache
 from liderix_api.models.users import User
 from liderix_api.models.organization import Organization
 from liderix_api.models.memberships import Membership, MembershipRole, MembershipStatus
@@ -176,6 +178,8 @@ async def accept_invitation(
 
     inv.status = InvitationStatus.ACCEPTED
     await session.commit()
+    invalidate_permission_cache(current_user.id)
+    invalidation_bus.emit(CacheKind.DEPARTMENTS, [inv.org_id])
     await session.refresh(inv)
 
     return inv
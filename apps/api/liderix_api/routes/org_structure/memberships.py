@@ -1,21 +1,26 @@
 from __future__ import annotations
+import asyncio
 import logging
 from datetime import datetime, timezone, timedelta
 import secrets
 from typing import Optional, List, Dict, Any
-from uuid import UUID, uuid4
+from uuid import UUID, uuid4, uuid5
 from fastapi import APIRouter, Depends, Query, HTTPException, status, Response, Request, BackgroundTasks
 from sqlalchemy import select, func, update, and_, or_
 from sqlalchemy.orm import selectinload
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.exc import IntegrityError
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from liderix_api.config.settings import settings
-from liderix_api.db import get_async_session
+from liderix_api.db import LiderixAsyncSessionLocal, get_async_session
 from liderix_api.models import Membership, Department
 from liderix_api.models.memberships import MembershipRole, MembershipStatus
 from liderix_api.models import Organization
 from liderix_api.models.users import User
+from liderix_api.models.invitations import Invitation, InvitationStatus
+from liderix_api.schemas.jobs import JobAccepted
 from liderix_api.schemas.membership import (
+    MAX_BULK_MEMBERSHIPS,
     MembershipCreate,
     MembershipUpdate,
     MembershipRead,
@@ -26,10 +31,21 @@ from liderix_api.schemas.membership import (
 )
 from liderix_api.services.guards import tenant_guard, TenantContext, require_perm
 from liderix_api.services.audit import AuditLogger
+from liderix_api.services.projections import membership_list_projection
+from liderix_api.services.invalidation import CacheKind, invalidation_bus
+from liderix_api.services.jobs import JobContext, JobFailed, enqueue_job, job_accepted, job_handler
+from liderix_api.services.permissions import invalidate_permission_cache
 router = APIRouter(prefix="/orgs/{org_id}/memberships", tags=["Memberships"])
+MEMBERSHIP_LIST = membership_list_projection(MembershipRead)
 # ----------------- helpers -----------------
 logger = logging.getLogger(__name__)
 
+# Rows per INSERT statement in bulk endpoints (asyncpg allows 32767 bind parameters)
+BULK_INSERT_CHUNK = 1000
+BULK_INVITE_JOB = "membership.bulk_invite"
+# Invitation emails sent between two progress reports of the bulk invite job
+INVITE_EMAIL_CHUNK = 50
+
 # Role helpers (string values are stored in DB because native_enum=False)
 ROLE_HIERARCHY = {"viewer": 1, "member": 2, "admin": 3, "owner": 4}
 ROLE_TRANSITIONS = {
@@ -46,6 +62,23 @@ async def send_invitation_email(*, email: str, org_name: str, role: str, inviter
         "Sending membership invitation: email=%s org=%s role=%s inviter=%s",
         email, org_name, role, inviter_name
     )
+
+async def send_invitation_emails(
+    invitations: List[Dict[str, str]], *, org_name: str, inviter_name: str, concurrency: int = 10
+) -> None:
+    """Background sender for bulk invites: one task per request, bounded concurrency."""
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def _send(item: Dict[str, str]) -> None:
+        async with semaphore:
+            try:
+                await send_invitation_email(
+                    email=item["email"], org_name=org_name, role=item["role"], inviter_name=inviter_name
+                )
+            except Exception as e:
+                logger.error(f"Failed to send invitation to {item['email']}: {e}")
+
+    await asyncio.gather(*(_send(item) for item in invitations))
 # ----------------- helpers -----------------
 def now_utc() -> datetime:
     return datetime.now(timezone.utc)
@@ -86,6 +119,44 @@ async def _validate_department_exists(
         problem(400, "urn:problem:dept-not-found", "Department Not Found",
                 "Department does not exist in this organization")
     return dept
+async def _existing_department_ids(
+    session: AsyncSession, org_id: UUID, dept_ids: set[UUID]
+) -> set[UUID]:
+    """Which of `dept_ids` are live departments of the org (one IN query)."""
+    if not dept_ids:
+        return set()
+    rows = await session.scalars(
+        select(Department.id).where(
+            and_(
+                Department.id.in_(dept_ids),
+                Department.org_id == org_id,
+                Department.deleted_at.is_(None),
+            )
+        )
+    )
+    return set(rows)
+async def _insert_ignoring_conflicts(
+    session: AsyncSession, model: Any, rows: list[dict[str, Any]], constraint: Optional[str], *returning: Any
+) -> list[Any]:
+    """INSERT ... ON CONFLICT DO NOTHING RETURNING, chunked to stay under the bind-parameter limit (constraint None: any conflict)."""
+    inserted: list[Any] = []
+    for start in range(0, len(rows), BULK_INSERT_CHUNK):
+        stmt = (
+            pg_insert(model)
+            .values(rows[start:start + BULK_INSERT_CHUNK])
+            .on_conflict_do_nothing(constraint=constraint)
+            .returning(*returning)
+        )
+        inserted.extend((await session.execute(stmt)).all())
+    return inserted
+def _bulk_role_error(ctx: TenantContext, role: str) -> Optional[str]:
+    if role == "owner" and ctx.role != "owner":
+        return "Only owners can assign owner role"
+    return None
+async def _inviter_name(session: AsyncSession, user_id: UUID) -> str:
+    inviter = await session.get(User, user_id)
+    name = (f"{getattr(inviter, 'first_name', '') or ''} {getattr(inviter, 'last_name', '') or ''}").strip() if inviter else ""
+    return name or "System"
 async def _owner_count(session: AsyncSession, org_id: UUID) -> int:
     return await session.scalar(
         select(func.count(Membership.id)).where(
@@ -144,20 +215,17 @@ async def list_memberships(
     await _validate_org_exists(session, org_id)
     filters = [Membership.org_id == org_id, Membership.deleted_at.is_(None)]
 
-    base = select(Membership).options(
-        selectinload(Membership.user),
-        selectinload(Membership.department),
-    )
+    # Column projection; user/department summaries come from LEFT JOINs
+    base = MEMBERSHIP_LIST.select()
 
-    # join User only when searching on user fields
     if q and q.strip():
         term = f"%{q.strip()}%"
-        base = base.join(User, User.id == Membership.user_id)
+        member = MEMBERSHIP_LIST.alias("user")
         filters.append(
             or_(
-                User.username.ilike(term),
-                User.email.ilike(term),
-                func.concat(User.first_name, " ", User.last_name).ilike(term),
+                member.username.ilike(term),
+                member.email.ilike(term),
+                func.concat(member.first_name, " ", member.last_name).ilike(term),
             )
         )
 
@@ -166,10 +234,10 @@ async def list_memberships(
     if role:
         filters.append(Membership.role == role)
 
-    total = await session.scalar(select(func.count(Membership.id)).select_from(Membership).where(*filters)) or 0
+    total = await session.scalar(select(func.count()).select_from(base.where(*filters).subquery())) or 0
 
     stmt = base.where(*filters).order_by(Membership.created_at.desc()).offset((page - 1) * page_size).limit(page_size)
-    items = (await session.execute(stmt)).scalars().all()
+    items = MEMBERSHIP_LIST.build((await session.execute(stmt)).all())
     await AuditLogger.log_event(session, ctx.user_id, "membership.list", True, request.client.host, request.headers.get("user-agent"), {"org_id": str(org_id)})
     return MembershipListResponse(items=items, page=page, page_size=page_size, total=total)
 # ----------------- create -----------------
@@ -210,6 +278,8 @@ async def create_membership(
         existing.department_id = data.department_id
         existing.updated_at = now_utc()
         await session.commit()
+        invalidate_permission_cache(data.user_id)
+        invalidation_bus.emit(CacheKind.DEPARTMENTS, [org_id])
         await session.refresh(existing)
         await AuditLogger.log_event(
             session, ctx.user_id, "membership.reactivate", True,
@@ -237,12 +307,13 @@ async def create_membership(
         logger.error(f"Failed to create membership: {e}")
         problem(409, "urn:problem:integrity-error", "Data Integrity Error",
                 "Failed to create membership due to data constraint violation")
+    invalidate_permission_cache(data.user_id)
+    invalidation_bus.emit(CacheKind.DEPARTMENTS, [org_id])
     await session.refresh(membership)
     # имя пригласившего — по ctx.user_id
-    inviter = await session.get(User, ctx.user_id)
-    inviter_name = (f"{getattr(inviter, 'first_name', '')} {getattr(inviter, 'last_name', '')}").strip() if inviter else "System"
+    inviter_name = await _inviter_name(session, ctx.user_id)
     await _send_invitation_notification(
-        background, user.email, org.name, target_role, inviter_name or "System"
+        background, user.email, org.name, target_role, inviter_name
     )
     response.headers["Location"] = f"{settings.API_PREFIX.rstrip('/')}/orgs/{org_id}/memberships/{membership.id}"
     await AuditLogger.log_event(
@@ -263,170 +334,294 @@ async def bulk_create_memberships(
     ctx: TenantContext = Depends(tenant_guard),
     session: AsyncSession = Depends(get_async_session),
 ):
-    """Create multiple memberships in bulk."""
-    require_perm(ctx, "member:manage")
+    """
+    Create multiple memberships in bulk.
+
+    Set-based: one IN query per entity type (users, departments, existing
+    memberships), soft-deleted memberships are reactivated with a single
+    executemany UPDATE and new ones go in with INSERT ... ON CONFLICT DO
+    NOTHING RETURNING.
+    """
+    await require_perm(ctx, "member:manage", session)
     await _validate_org_exists(session, org_id)
-    if len(data.memberships) > 100:
+    if len(data.memberships) > MAX_BULK_MEMBERSHIPS:
         problem(400, "urn:problem:bulk-limit", "Bulk Limit Exceeded",
-                "Cannot create more than 100 memberships at once")
+                f"Cannot create more than {MAX_BULK_MEMBERSHIPS} memberships at once")
     results: dict[str, Any] = {"created": [], "updated": [], "errors": [], "total": len(data.memberships)}
+
+    candidates: dict[UUID, tuple[int, Any]] = {}
     for i, item in enumerate(data.memberships):
-        try:
-            await _validate_user_exists(session, item.user_id)
-            target_role = item.role or "member"
-            if target_role == "owner" and ctx.role != "owner":
-                results["errors"].append({"index": i, "user_id": str(item.user_id), "error": "Only owners can assign owner role"})
-                continue
-            existing = await session.scalar(
-                select(Membership).where(
-                    and_(Membership.org_id == org_id, Membership.user_id == item.user_id, Membership.deleted_at.is_(None))
-                )
-            )
-            if existing:
-                results["updated"].append({"membership_id": str(existing.id), "user_id": str(item.user_id), "action": "already_exists"})
-                continue
-            m = Membership(
-                id=uuid4(),
-                org_id=org_id,
-                user_id=item.user_id,
-                role=target_role,
-                department_id=item.department_id,
-                status="active",
-                created_at=now_utc(),
-                updated_at=now_utc(),
+        error = _bulk_role_error(ctx, item.role or "member")
+        if not error and item.user_id in candidates:
+            error = "Duplicate user_id in request"
+        if error:
+            results["errors"].append({"index": i, "user_id": str(item.user_id), "error": error})
+            continue
+        candidates[item.user_id] = (i, item)
+
+    users: dict[UUID, Any] = {}
+    existing: dict[UUID, Any] = {}
+    if candidates:
+        user_rows = await session.execute(
+            select(User.id, User.is_active, User.is_verified).where(User.id.in_(candidates))
+        )
+        users = {row.id: row for row in user_rows.all()}
+        # включая soft-deleted: uq_membership_org_user не даст вставить второй раз
+        membership_rows = await session.execute(
+            select(Membership.id, Membership.user_id, Membership.deleted_at).where(
+                and_(Membership.org_id == org_id, Membership.user_id.in_(candidates))
             )
-            session.add(m)
-            results["created"].append({"membership_id": str(m.id), "user_id": str(item.user_id), "role": target_role})
-        except HTTPException as he:
-            results["errors"].append({"index": i, "user_id": str(item.user_id), "error": he.detail})
-        except Exception as e:
-            results["errors"].append({"index": i, "user_id": str(item.user_id), "error": str(e)})
+        )
+        existing = {row.user_id: row for row in membership_rows.all()}
+    departments = await _existing_department_ids(
+        session, org_id, {item.department_id for _, item in candidates.values() if item.department_id}
+    )
+
+    now = now_utc()
+    to_insert: list[dict[str, Any]] = []
+    to_reactivate: list[dict[str, Any]] = []
+    for user_id, (i, item) in candidates.items():
+        role = item.role or "member"
+        user = users.get(user_id)
+        current = existing.get(user_id)
+        if user is None:
+            error = "User does not exist"
+        elif not user.is_active:
+            error = "User account is not active"
+        elif not user.is_verified:
+            error = "User email is not verified"
+        elif item.department_id and item.department_id not in departments:
+            error = "Department does not exist in this organization"
+        elif current is not None and current.deleted_at is None:
+            results["updated"].append({"membership_id": str(current.id), "user_id": str(user_id), "action": "already_exists"})
+            continue
+        elif current is not None:
+            to_reactivate.append({
+                "id": current.id,
+                "role": role,
+                "department_id": item.department_id,
+                "status": "active",
+                "is_deleted": False,
+                "deleted_at": None,
+                "updated_at": now,
+            })
+            results["updated"].append({"membership_id": str(current.id), "user_id": str(user_id), "action": "reactivated"})
+            continue
+        else:
+            to_insert.append({
+                "id": uuid4(),
+                "org_id": org_id,
+                "user_id": user_id,
+                "role": role,
+                "department_id": item.department_id,
+                "status": "active",
+                "is_deleted": False,
+                "meta_data": {},
+            })
+            continue
+        results["errors"].append({"index": i, "user_id": str(user_id), "error": error})
+
     try:
+        if to_reactivate:
+            await session.execute(update(Membership), to_reactivate)
+        inserted = await _insert_ignoring_conflicts(
+            session, Membership, to_insert, "uq_membership_org_user", Membership.id, Membership.user_id
+        )
         await session.commit()
     except IntegrityError as e:
         await session.rollback()
         logger.error(f"Bulk membership creation failed: {e}")
         problem(409, "urn:problem:bulk-integrity-error", "Bulk Operation Failed",
                 "Failed to create memberships due to data constraint violations")
+
+    invalidation_bus.emit(CacheKind.PERMISSIONS, candidates)
+    # Department member counts
+    invalidation_bus.emit(CacheKind.DEPARTMENTS, [org_id])
+
+    roles = {row["user_id"]: row["role"] for row in to_insert}
+    for membership_id, user_id in inserted:
+        results["created"].append({"membership_id": str(membership_id), "user_id": str(user_id), "role": roles[user_id]})
+    # Проигранная гонка с параллельным созданием: строка уже есть
+    created_ids = {user_id for _, user_id in inserted}
+    for row in to_insert:
+        if row["user_id"] not in created_ids:
+            results["updated"].append({"membership_id": None, "user_id": str(row["user_id"]), "action": "already_exists"})
+
     await AuditLogger.log_event(
         session, ctx.user_id, "membership.bulk_create", True,
         request.client.host if request.client else "unknown",
         request.headers.get("user-agent", "unknown"),
-        {"org_id": str(org_id), "results": results},
+        {"org_id": str(org_id), "total": results["total"], "created": len(results["created"]),
+         "updated": len(results["updated"]), "errors": len(results["errors"])},
     )
     return results
 # ----------------- bulk invite by email -----------------
-@router.post("/bulk-invite", response_model=dict[str, Any])
+@router.post("/bulk-invite", status_code=status.HTTP_202_ACCEPTED, response_model=JobAccepted)
 async def bulk_invite_by_email(
     org_id: UUID,
     data: MembershipBulkInviteRequest,
     request: Request,
-    background: BackgroundTasks,
+    response: Response,
     ctx: TenantContext = Depends(tenant_guard),
     session: AsyncSession = Depends(get_async_session),
 ):
-    """Bulk invite users by email - creates invitations, not direct memberships."""
-    require_perm(ctx, "member:manage")
-    org = await _validate_org_exists(session, org_id)
-    if len(data.memberships) > 100:
+    """
+    Bulk invite users by email - creates invitations, not direct memberships.
+
+    The request is checked here (permissions, limit, roles, duplicates) and
+    the invitations are created and emailed by a membership.bulk_invite job:
+    202 with the job id, per-email results in the job result.
+    """
+    await require_perm(ctx, "member:manage", session)
+    await _validate_org_exists(session, org_id)
+    if len(data.memberships) > MAX_BULK_MEMBERSHIPS:
         problem(400, "urn:problem:bulk-limit", "Bulk Limit Exceeded",
-                "Cannot create more than 100 invitations at once")
-    results: dict[str, Any] = {"created": [], "errors": [], "total": len(data.memberships)}
-    # Import here to avoid circular imports
-    try:
-        from liderix_api.models.invitations import Invitation
-        from liderix_api.models.users import User
-    except ImportError:
-        problem(500, "urn:problem:missing-model", "Missing Model", "Invitation model not available")
+                f"Cannot create more than {MAX_BULK_MEMBERSHIPS} invitations at once")
+
+    items: list[dict[str, Any]] = []
+    errors: list[dict[str, Any]] = []
+    seen: set[str] = set()
     for i, item in enumerate(data.memberships):
-        try:
-            # Check if user already exists
-            existing_user = await session.scalar(
-                select(User).where(User.email == item.email.lower())
-            )
-            if existing_user:
-                # Check if already a member
-                existing_membership = await session.scalar(
-                    select(Membership).where(
-                        and_(
-                            Membership.org_id == org_id,
-                            Membership.user_id == existing_user.id,
-                            Membership.deleted_at.is_(None)
-                        )
-                    )
-                )
-                if existing_membership:
-                    results["errors"].append({
-                        "index": i,
-                        "email": item.email,
-                        "error": "User is already a member"
-                    })
-                    continue
-            # Check for existing invitation
-            existing_invitation = await session.scalar(
-                select(Invitation).where(
+        email = item.email.strip().lower()
+        error = _bulk_role_error(ctx, item.role or "member")
+        if not error and email in seen:
+            error = "Duplicate email in request"
+        if error:
+            errors.append({"index": i, "email": item.email, "error": error})
+            continue
+        seen.add(email)
+        items.append({
+            "index": i,
+            "email": item.email,
+            "role": item.role or "member",
+            "department_id": item.department_id,
+        })
+
+    job = await enqueue_job(
+        session,
+        BULK_INVITE_JOB,
+        {"org_id": org_id, "inviter_id": ctx.user_id, "total": len(data.memberships), "items": items, "errors": errors},
+        org_id=org_id,
+        created_by_id=ctx.user_id,
+    )
+    await session.commit()
+
+    await AuditLogger.log_event(
+        session, ctx.user_id, "invitation.bulk_create", True,
+        request.client.host if request.client else "unknown",
+        request.headers.get("user-agent", "unknown"),
+        {"org_id": str(org_id), "total": len(data.memberships), "rejected": len(errors), "job_id": str(job.id)},
+    )
+    return job_accepted(job, response)
+
+
+@job_handler(BULK_INVITE_JOB)
+async def create_bulk_invitations(job: JobContext) -> dict[str, Any]:
+    """
+    Invitations of a bulk invite. One IN query finds emails that already belong
+    to members, emails with a pending invitation are skipped by INSERT ... ON
+    CONFLICT DO NOTHING (uq_invitation_org_email_status), then the emails go
+    out in chunks with progress reports.
+
+    Invitation ids are derived from the job id and the email, so a retry
+    recognizes the invitations an earlier attempt created and reports and
+    emails them again instead of calling them already pending (emails are
+    sent at least once).
+    """
+    payload = job.payload
+    org_id, inviter_id = UUID(payload["org_id"]), UUID(payload["inviter_id"])
+    results: dict[str, Any] = {"created": [], "errors": list(payload["errors"]), "total": payload["total"]}
+    candidates = {item["email"].strip().lower(): item for item in payload["items"]}
+
+    async with LiderixAsyncSessionLocal() as session:
+        org = await session.scalar(
+            select(Organization.name).where(Organization.id == org_id, Organization.deleted_at.is_(None))
+        )
+        if org is None:
+            raise JobFailed("Organization does not exist or has been deleted")
+
+        members: set[str] = set()
+        if candidates:
+            member_rows = await session.execute(
+                select(User.email)
+                .join(Membership, Membership.user_id == User.id)
+                .where(
                     and_(
-                        Invitation.org_id == org_id,
-                        Invitation.invited_email == item.email.lower(),
-                        Invitation.status == "pending"
+                        User.email.in_(candidates),
+                        Membership.org_id == org_id,
+                        Membership.deleted_at.is_(None),
                     )
                 )
             )
-            if existing_invitation:
-                results["errors"].append({
-                    "index": i,
-                    "email": item.email,
-                    "error": "Invitation already pending"
+            members = {email.lower() for email in member_rows.scalars()}
+        departments = await _existing_department_ids(
+            session, org_id, {UUID(item["department_id"]) for item in candidates.values() if item["department_id"]}
+        )
+
+        expires_at = now_utc() + timedelta(days=7)
+        to_insert: list[dict[str, Any]] = []
+        for email, item in candidates.items():
+            department_id = UUID(item["department_id"]) if item["department_id"] else None
+            if email in members:
+                error = "User is already a member"
+            elif department_id and department_id not in departments:
+                error = "Department does not exist in this organization"
+            else:
+                to_insert.append({
+                    "id": uuid5(job.id, email),
+                    "org_id": org_id,
+                    "invited_email": email,
+                    "role": item["role"],
+                    "department_id": department_id,
+                    "invited_by_id": inviter_id,
+                    "token": secrets.token_urlsafe(32),
+                    "expires_at": expires_at,
+                    "status": InvitationStatus.PENDING,
+                    "is_deleted": False,
                 })
                 continue
-            # Create invitation
-            invitation = Invitation(
-                id=uuid4(),
-                org_id=org_id,
-                invited_email=item.email.lower(),
-                role=item.role or "member",
-                department_id=item.department_id,
-                invited_by_id=ctx.user_id,
-                token=secrets.token_urlsafe(32),
-                expires_at=now_utc() + timedelta(days=7),
-                status="pending",
-                created_at=now_utc(),
-                updated_at=now_utc(),
-            )
-            session.add(invitation)
-            # Send invitation email in background
-            background.add_task(
-                send_invitation_email,
-                email=item.email,
-                org_name=org.name,
-                role=item.role or "member",
-                inviter_name="System (via bulk invite)"
-            )
-            results["created"].append({
-                "invitation_id": str(invitation.id),
-                "email": item.email,
-                "role": item.role or "member"
-            })
-        except Exception as e:
-            logger.error(f"Failed to create invitation for {item.email}: {e}")
-            results["errors"].append({
-                "index": i,
-                "email": item.email,
-                "error": str(e)
-            })
-    try:
-        await session.commit()
-    except IntegrityError as e:
-        await session.rollback()
-        logger.error(f"Bulk invitation creation failed: {e}")
-        problem(409, "urn:problem:bulk-integrity-error", "Bulk Operation Failed",
-                "Failed to create invitations due to data constraint violations")
-    await AuditLogger.log_event(
-        session, ctx.user_id, "invitation.bulk_create", True,
-        request.client.host if request.client else "unknown",
-        request.headers.get("user-agent", "unknown"),
-        {"org_id": str(org_id), "results": results},
-    )
+            results["errors"].append({"index": item["index"], "email": item["email"], "error": error})
+
+        try:
+            # No conflict target: a pending invitation for the email (uq_invitation_org_email_status)
+            # or this job's own row from an earlier attempt (primary key)
+            await _insert_ignoring_conflicts(session, Invitation, to_insert, None, Invitation.id)
+            await session.commit()
+        except IntegrityError as e:
+            await session.rollback()
+            logger.error(f"Bulk invitation creation failed: {e}")
+            raise JobFailed("Failed to create invitations due to data constraint violations")
+        # Created by this attempt or an earlier one of the same job
+        invited: dict[str, UUID] = {}
+        if to_insert:
+            invited = {
+                email: invitation_id
+                for invitation_id, email in await session.execute(
+                    select(Invitation.id, Invitation.invited_email)
+                    .where(Invitation.id.in_([row["id"] for row in to_insert]))
+                )
+            }
+        inviter_name = await _inviter_name(session, inviter_id)
+
+    outbox: list[dict[str, str]] = []
+    for row in to_insert:
+        item = candidates[row["invited_email"]]
+        if row["invited_email"] not in invited:
+            results["errors"].append({"index": item["index"], "email": item["email"], "error": "Invitation already pending"})
+            continue
+        results["created"].append({
+            "invitation_id": str(invited[row["invited_email"]]),
+            "email": item["email"],
+            "role": row["role"],
+        })
+        outbox.append({"email": item["email"], "role": row["role"]})
+
+    await job.progress(10, f"{len(outbox)} invitations created")
+    for start in range(0, len(outbox), INVITE_EMAIL_CHUNK):
+        await send_invitation_emails(outbox[start:start + INVITE_EMAIL_CHUNK], org_name=org, inviter_name=inviter_name)
+        sent = min(start + INVITE_EMAIL_CHUNK, len(outbox))
+        await job.progress(10 + 90 * sent // len(outbox), f"{sent}/{len(outbox)} emails sent")
+    results["errors"].sort(key=lambda error: error["index"])
     return results
 # ----------------- update -----------------
 @router.patch("/{membership_id}", response_model=MembershipRead)
@@ -485,6 +680,8 @@ async def update_membership(
         logger.error(f"Failed to update membership {membership_id}: {e}")
         problem(409, "urn:problem:integrity-error", "Data Integrity Error",
                 "Failed to update membership due to data constraint violation")
+    invalidate_permission_cache(membership.user_id)
+    invalidation_bus.emit(CacheKind.DEPARTMENTS, [org_id])
     await session.refresh(membership)
     await AuditLogger.log_event(
         session, ctx.user_id, "membership.update", True,
@@ -514,6 +711,8 @@ async def delete_membership(
                 "Cannot remove your own membership. Transfer ownership first if you are the owner.")
     membership.deleted_at = now_utc()
     await session.commit()
+    invalidate_permission_cache(membership.user_id)
+    invalidation_bus.emit(CacheKind.DEPARTMENTS, [org_id])
     await AuditLogger.log_event(
         session, ctx.user_id, "membership.delete", True,
         request.client.host if request.client else "unknown",
@@ -1,18 +1,22 @@
 from __future__ import annotations
 from typing import List
 from uuid import UUID, uuid4
-from fastapi import APIRouter, Depends, HTTPException, status, Request
+from fastapi import APIRouter, Depends, HTTPException, status, Request, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, update, func, and_
 from sqlalchemy.exc import IntegrityError
-from liderix_api.db import get_async_session
+from liderix_api.db import LiderixAsyncSessionLocal, get_async_session
 from liderix_api.models.organization import Organization
+from liderix_api.schemas.jobs import JobAccepted
 from liderix_api.schemas.organization import OrganizationCreate, OrganizationUpdate, OrganizationRead
 from liderix_api.services.guards import tenant_guard, TenantContext, require_perm
 from liderix_api.services.auth import get_current_user
 from liderix_api.models.users import User
 from liderix_api.models.memberships import Membership, MembershipRole, MembershipStatus
 from liderix_api.services.audit import AuditLogger
+from liderix_api.services.invalidation import CacheKind, invalidation_bus
+from liderix_api.services.jobs import JobContext, enqueue_job, job_accepted, job_handler
+from liderix_api.services.permissions import invalidate_permission_cache
 from liderix_api.services.tenants import bootstrap_org
 from datetime import datetime, timezone
 import logging
@@ -20,6 +24,10 @@ import logging
 router = APIRouter(prefix="/orgs", tags=["Organizations"])
 logger = logging.getLogger(__name__)
 
+ORG_DELETE_JOB = "org.delete"
+# Memberships deactivated per transaction by the org.delete job
+MEMBERSHIP_DEACTIVATION_BATCH = 1000
+
 
 def _convert_address_to_dict(address_obj) -> dict | None:
     """Конвертируем объект Address в dict для JSONB поля"""
@@ -127,6 +135,9 @@ async def create_organization(
             },
         )
 
+    # Владелец получил membership в новой организации
+    invalidate_permission_cache(current_user.id)
+
     logger.info(
         f"Created organization: id={org.id}, name={org.name}, slug={org.slug}, "
         f"owner_id={current_user.id}, membership_id={owner_m.id}, "
@@ -307,6 +318,9 @@ async def update_organization(
             }
         )
     
+    if changes:
+        invalidation_bus.emit(CacheKind.ORG, [org_id])
+
     logger.info(f"Updated organization {org_id}: {changes}")
     
     # Логируем событие для аудита
@@ -327,9 +341,10 @@ async def update_organization(
     return org
 
 
-@router.delete("/{org_id}", status_code=status.HTTP_204_NO_CONTENT)
+@router.delete("/{org_id}", status_code=status.HTTP_202_ACCEPTED, response_model=JobAccepted)
 async def delete_organization(
     org_id: UUID,
+    response: Response,
     ctx: TenantContext = Depends(tenant_guard),
     session: AsyncSession = Depends(get_async_session),
 ):
@@ -337,7 +352,8 @@ async def delete_organization(
     Мягко удалить организацию (soft delete).
     
     Требует права org:delete или роль owner.
-    Организация помечается как удаленная, но остается в базе.
+    Организация помечается как удаленная сразу (остается в базе), а участники
+    деактивируются фоновой задачей org.delete — ответ 202 с id задачи.
     """
     require_perm(ctx, "org:delete")
     
@@ -368,25 +384,15 @@ async def delete_organization(
         logger.warning(f"Attempting to delete last organization {org_id} for owner {org.owner_id}")
         # Можно разрешить или запретить - зависит от требований
     
-    # Мягкое удаление
+    # Мягкое удаление; участники деактивируются задачей (их может быть много)
     org.deleted_at = datetime.now(timezone.utc)
-    
-    # Опционально: деактивируем все membership
-    await session.execute(
-        update(Membership)
-        .where(
-            and_(
-                Membership.org_id == org_id,
-                Membership.deleted_at.is_(None)
-            )
-        )
-        .values(
-            status=MembershipStatus.INACTIVE,
-            deleted_at=datetime.now(timezone.utc)
-        )
+    job = await enqueue_job(
+        session, ORG_DELETE_JOB, {"org_id": org_id}, org_id=org_id, created_by_id=ctx.user_id
     )
     
     await session.commit()
+    # Снимки прав и кэши всех участников этой организации
+    invalidation_bus.emit(CacheKind.ORG, [org_id])
     
     logger.info(f"Soft deleted organization {org_id} by user {ctx.user_id}")
     
@@ -402,9 +408,40 @@ async def delete_organization(
             "org_id": str(org_id),
             "org_name": org.name,
             "org_slug": org.slug,
-            "owner_id": str(org.owner_id)
+            "owner_id": str(org.owner_id),
+            "job_id": str(job.id),
         }
     )
+    return job_accepted(job, response)
+
+
+@job_handler(ORG_DELETE_JOB)
+async def deactivate_org_memberships(job: JobContext) -> dict:
+    """Вторая часть delete_organization: деактивация участников пачками (повтор безопасен)"""
+    org_id = UUID(job.payload["org_id"])
+    active = and_(Membership.org_id == org_id, Membership.deleted_at.is_(None))
+    deactivated = 0
+    async with LiderixAsyncSessionLocal() as session:
+        total = await session.scalar(select(func.count(Membership.id)).where(active)) or 0
+        while True:
+            batch = select(Membership.id).where(active).limit(MEMBERSHIP_DEACTIVATION_BATCH)
+            result = await session.execute(
+                update(Membership)
+                .where(Membership.id.in_(batch.scalar_subquery()))
+                .values(status=MembershipStatus.INACTIVE, deleted_at=datetime.now(timezone.utc))
+                .execution_options(synchronize_session=False)
+            )
+            await session.commit()
+            if not result.rowcount:
+                break
+            deactivated += result.rowcount
+            await job.progress(
+                deactivated * 100 // max(total, deactivated), f"{deactivated} memberships deactivated"
+            )
+    # Снимки прав бывших участников
+    invalidation_bus.emit(CacheKind.ORG, [org_id])
+    logger.info(f"Deactivated {deactivated} memberships of deleted organization {org_id}")
+    return {"org_id": str(org_id), "memberships_deactivated": deactivated}
 
 
 # Дополнительные полезные эндпоинты
@@ -24,18 +24,24 @@ from liderix_api.models.users import User
 from liderix_api.models.memberships import Membership, MembershipStatus
 from liderix_api.config.settings import settings
 from liderix_api.schemas.projects import (
-    ProjectRead, ProjectCreate, ProjectUpdate, ProjectListResponse,
+    ProjectRead, ProjectCreate, ProjectUpdate, ProjectListResponse, ProjectListItem,
     ProjectDetailResponse, ProjectMemberAdd, ProjectStatsResponse,
-    ProjectStatusUpdate, ProjectMemberResponse
+    ProjectStatusUpdate, ProjectMemberResponse, ProjectSearchResponse
 )
 from liderix_api.services.auth import get_current_user
 from liderix_api.services.audit import AuditLogger
+from liderix_api.services.board_events import card, project_card, publish_project_event
 from liderix_api.services.notifications import send_project_notification
-from liderix_api.services.permissions import check_project_permission
+from liderix_api.services.invalidation import CacheKind, invalidation_bus
+from liderix_api.services.permissions import check_project_permission, invalidate_permission_cache
+from liderix_api.services.projections import project_list_projection
+from liderix_api.services.search import text_search, headline
 
 router = APIRouter(prefix="/projects", tags=["Projects"])
 logger = logging.getLogger(__name__)
 
+PROJECT_LIST = project_list_projection(ProjectListItem)
+
 class ProjectStatus(str, Enum):
     DRAFT = "draft"
     ACTIVE = "active"
@@ -195,10 +201,8 @@ async def list_projects(
 ):
     """List projects with advanced filtering"""
     
-    # Build base query
-    query = select(Project).options(
-        selectinload(Project.organization)
-    )
+    # Column projection with the organization summary joined in
+    query = PROJECT_LIST.select()
     
     filters = [Project.deleted_at.is_(None)]
     
@@ -259,13 +263,11 @@ async def list_projects(
         filters.append(Project.org_id == org_id)
     
     if search and search.strip():
-        search_term = f"%{search.strip()}%"
-        filters.append(
-            or_(
-                Project.name.ilike(search_term),
-                Project.description.ilike(search_term)
-            )
-        )
+        terms = text_search(Project.search_vector, Project.name, search)
+        if terms is None:
+            problem(400, "urn:problem:invalid-search", "Invalid Search",
+                    "Search query has no searchable characters")
+        filters.append(terms.criteria)
     
     # TODO: Add owner_id field to Project model
     # if owned_by_me:
@@ -287,13 +289,13 @@ async def list_projects(
         query = query.order_by(sort_field.asc())
     
     # Get paginated results
-    projects = await session.scalars(
+    rows = await session.execute(
         query.where(*filters)
         .offset((page - 1) * page_size)
         .limit(page_size)
     )
     
-    items = list(projects)
+    items = PROJECT_LIST.build(rows.all())
     
     await AuditLogger.log_event(
         session, current_user.id, "projects.list", True,
@@ -389,6 +391,7 @@ async def create_project(
             session.add(member)
         
         await session.commit()
+        invalidation_bus.emit(CacheKind.PERMISSIONS, [user.id for user in member_users])
         
         # Send notifications
         for user in member_users:
@@ -400,6 +403,8 @@ async def create_project(
                 current_user.username
             )
     
+    await publish_project_event("created", project, project_card(project), current_user.id)
+
     # Set location header
     response.headers["Location"] = f"{settings.API_PREFIX}/projects/{project.id}"
     
@@ -428,6 +433,81 @@ async def create_project(
     
     return project_with_details
 
+@router.get("/search", response_model=List[ProjectSearchResponse])
+async def search_projects(
+    q: str = Query(..., min_length=2, max_length=200, description="Search query"),
+    limit: int = Query(20, ge=1, le=50, description="Maximum results"),
+    session: AsyncSession = Depends(get_async_session),
+    current_user: User = Depends(get_current_user)
+):
+    """Ranked project search over the full-text and trigram indexes, with highlighted snippets"""
+    terms = text_search(Project.search_vector, Project.name, q)
+    if terms is None:
+        return []
+
+    member_projects = select(ProjectMember.project_id).where(
+        and_(
+            ProjectMember.user_id == current_user.id,
+            ProjectMember.deleted_at.is_(None)
+        )
+    )
+    user_orgs = select(Membership.org_id).where(
+        and_(
+            Membership.user_id == current_user.id,
+            Membership.deleted_at.is_(None),
+            Membership.status == MembershipStatus.ACTIVE
+        )
+    )
+    member_count = (
+        select(func.count(ProjectMember.id))
+        .where(and_(ProjectMember.project_id == Project.id, ProjectMember.deleted_at.is_(None)))
+        .scalar_subquery()
+    )
+    task_count = (
+        select(func.count(Task.id))
+        .where(and_(Task.project_id == Project.id, Task.deleted_at.is_(None)))
+        .scalar_subquery()
+    )
+
+    rows = await session.execute(
+        select(
+            Project.id,
+            Project.name,
+            Project.description,
+            Project.status,
+            member_count.label("member_count"),
+            task_count.label("task_count"),
+            terms.rank.label("rank"),
+            headline(Project.name, terms.tsquery).label("name_highlight"),
+            headline(Project.description, terms.tsquery).label("highlight"),
+        )
+        .where(
+            Project.deleted_at.is_(None),
+            terms.criteria,
+            or_(
+                Project.id.in_(member_projects),
+                and_(Project.org_id.in_(user_orgs), Project.is_public == True)
+            )
+        )
+        .order_by(terms.rank.desc(), Project.updated_at.desc())
+        .limit(limit)
+    )
+
+    return [
+        ProjectSearchResponse(
+            id=row.id,
+            name=row.name,
+            description=row.description,
+            status=row.status.value,
+            member_count=row.member_count or 0,
+            task_count=row.task_count or 0,
+            rank=row.rank or 0.0,
+            name_highlight=row.name_highlight,
+            highlight=row.highlight or None,
+        )
+        for row in rows.all()
+    ]
+
 @router.get("/{project_id}", response_model=ProjectDetailResponse)
 async def get_project(
     project_id: UUID,
@@ -484,6 +564,11 @@ async def update_project(
                 "Failed to update project due to data constraint violation")
     
     await session.refresh(project)
+    if changes:
+        invalidation_bus.emit(CacheKind.PROJECT, [project.id])
+        await publish_project_event(
+            "updated", project, card(project, [*changes, "updated_at"]), current_user.id
+        )
     
     await AuditLogger.log_event(
         session, current_user.id, "project.update", True,
@@ -522,6 +607,8 @@ async def delete_project(
         action = "project.soft_delete"
     
     await session.commit()
+    invalidation_bus.emit(CacheKind.PROJECT, [project_id])
+    await publish_project_event("deleted", project, actor_id=current_user.id)
     
     await AuditLogger.log_event(
         session, current_user.id, action, True,
@@ -629,6 +716,12 @@ async def add_project_members(
             })
     
     await session.commit()
+    invalidation_bus.emit(CacheKind.PERMISSIONS, [added["user_id"] for added in results["added"]])
+    if results["added"]:
+        await publish_project_event(
+            "member_added", project,
+            {"user_ids": [added["user_id"] for added in results["added"]]}, current_user.id,
+        )
     
     await AuditLogger.log_event(
         session, current_user.id, "project.members.add", True,
@@ -672,6 +765,9 @@ async def remove_project_member(
     
     member.deleted_at = now_utc()
     await session.commit()
+    invalidate_permission_cache(user_id)
+    # Also drops the user's live subscriptions granted by this project
+    await publish_project_event("member_removed", project, {"user_id": user_id}, current_user.id)
     
     await AuditLogger.log_event(
         session, current_user.id, "project.member.remove", True,
@@ -747,6 +843,10 @@ async def update_project_status(
     
     await session.commit()
     await session.refresh(project)
+    invalidation_bus.emit(CacheKind.PROJECT, [project.id])
+    await publish_project_event(
+        "updated", project, card(project, ["status", "updated_at"]), current_user.id,
+    )
     
     # Notify project members of status change
     members = await session.scalars(
@@ -4,37 +4,61 @@ from __future__ import annotations
 from datetime import datetime, timezone, timedelta
 from typing import Optional, List, Dict, Any
 from uuid import UUID, uuid4
+import base64
+import json
 import logging
 
 from fastapi import (
     APIRouter, Depends, HTTPException, status, Response, Request,
-    Query, BackgroundTasks
+    Query, BackgroundTasks, UploadFile, File
 )
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, update, func, and_, or_
-from sqlalchemy.orm import selectinload
+from sqlalchemy import select, update, func, and_, or_, any_, bindparam, tuple_, literal
+from sqlalchemy.dialects.postgresql import ARRAY, UUID as PG_UUID
+from sqlalchemy.orm import selectinload, aliased
 from sqlalchemy.exc import IntegrityError
 from enum import Enum
 
 from liderix_api.db import get_async_session
+from liderix_api.enums import (
+    TaskStatus as DbTaskStatus,
+    TaskPriority as DbTaskPriority,
+    TaskType as DbTaskType,
+)
 from liderix_api.models.tasks import Task, TaskComment
 from liderix_api.models.projects import Project
 from liderix_api.models.project_members import ProjectMember
 from liderix_api.models.memberships import Membership, MembershipStatus
 from liderix_api.models.users import User
+from liderix_api.enums import NotificationType
+from liderix_api.schemas.jobs import JobAccepted
 from liderix_api.schemas.tasks import (
-    TaskRead, TaskCreate, TaskUpdate, TaskListResponse,
+    TaskRead, TaskCreate, TaskUpdate, TaskListResponse, TaskListItem,
     TaskDetailResponse, TaskCommentCreate, TaskStatusUpdate,
-    TaskAssignmentUpdate, TaskStatsResponse, TaskCommentResponse
+    TaskAssignmentUpdate, TaskStatsResponse,
+    TaskCommentAuthor, TaskCommentNode, TaskCommentThreadPage,
+    TaskBulkFilter, TaskBulkPatch, TaskBulkMutation, TaskBulkMutationResponse,
+    TaskHierarchyResponse, TaskSearchResponse, RecurrencePattern,
 )
 from liderix_api.services.auth import get_current_user
 from liderix_api.services.audit import AuditLogger
+from liderix_api.services.board_events import card, publish_task_event, publish_tasks_updated, task_card
+from liderix_api.services.change_log import record_bulk_update
+from liderix_api.services.jobs import enqueue_job, job_accepted
+from liderix_api.services.notification_feed import notify_users
 from liderix_api.services.notifications import send_task_notification
-from liderix_api.services.permissions import check_task_permission
+from liderix_api.services.permissions import check_task_permission, load_tasks_with_permission
+from liderix_api.services.projections import task_list_projection
+from liderix_api.services.search import text_search, headline
+from liderix_api.services.recurring_tasks import first_run_at, template_anchor
+from liderix_api.services.task_hierarchy import get_ancestor_ids, get_task_hierarchy, invalidate_task_hierarchy
+from liderix_api.services.task_import import TASK_IMPORT_JOB, store_upload
 
 router = APIRouter(prefix="/tasks", tags=["Tasks"])
 logger = logging.getLogger(__name__)
 
+TASK_LIST = task_list_projection(TaskListItem)
+
 
 class TaskStatus(str, Enum):
     TODO = "todo"
@@ -125,6 +149,95 @@ async def _validate_task_assignee(session: AsyncSession, assignee_id: Optional[U
     return user
 
 
+async def _validate_parent_task(
+    session: AsyncSession,
+    parent_task_id: UUID,
+    current_user: User,
+    project_id: Optional[UUID],
+    org_id: Optional[UUID],
+    task_id: Optional[UUID] = None,
+) -> Task:
+    """Subtasks can only be attached to editable tasks of the same project, and never below themselves"""
+    parent = await _get_task_with_access(session, parent_task_id, current_user, "write")
+    if parent.project_id != project_id or (org_id and parent.org_id and parent.org_id != org_id):
+        problem(400, "urn:problem:invalid-parent", "Invalid Parent Task",
+                "Parent task must belong to the same project")
+    if task_id and task_id in await get_ancestor_ids(session, [parent_task_id]):
+        problem(400, "urn:problem:invalid-parent", "Invalid Parent Task",
+                "A task cannot be moved under itself or one of its subtasks")
+    return parent
+
+
+async def _task_access_filter(session: AsyncSession, current_user: User):
+    """Predicate selecting the tasks visible to the current user"""
+    # Access control - user can see:
+    # 1. Tasks they created
+    # 2. Tasks assigned to them
+    # 3. Tasks in projects they have access to
+
+    # Get user's accessible project IDs (membership)
+    user_project_ids = await session.scalars(
+        select(ProjectMember.project_id).where(
+            and_(
+                ProjectMember.user_id == current_user.id,
+                ProjectMember.deleted_at.is_(None),
+            )
+        )
+    )
+    accessible_project_ids = list(user_project_ids)
+
+    # Also allow tasks from public projects in orgs where the user is a member
+    user_orgs = await session.scalars(
+        select(Membership.org_id).where(
+            and_(
+                Membership.user_id == current_user.id,
+                Membership.deleted_at.is_(None),
+                Membership.status == MembershipStatus.ACTIVE,
+            )
+        )
+    )
+    user_org_ids = list(user_orgs)
+    public_proj_subq = None
+    if user_org_ids:
+        public_proj_subq = (
+            select(Project.id)
+            .where(
+                and_(
+                    Project.org_id.in_(user_org_ids),
+                    Project.is_public == True,
+                    Project.deleted_at.is_(None),
+                )
+            )
+        )
+
+    # Build access filter
+    access_filters = [
+        Task.creator_id == current_user.id,
+        Task.assignee_id == current_user.id,
+    ]
+    if accessible_project_ids:
+        access_filters.append(Task.project_id.in_(accessible_project_ids))
+    if public_proj_subq is not None:
+        access_filters.append(Task.project_id.in_(public_proj_subq))
+
+    return or_(*access_filters)
+
+
+def _assignment_notification(task: Task, user_id: UUID, actor: User, assigned: bool = True) -> Dict[str, Any]:
+    """In-app feed item for an (un)assignment; goes out with notify_users"""
+    verb = "assigned you to" if assigned else "unassigned you from"
+    return {
+        "org_id": task.org_id,
+        "user_id": user_id,
+        "type": NotificationType.TASK_ASSIGNED,
+        "title": task.title,
+        "message": f"{actor.username} {verb} \"{task.title}\"",
+        "related_entity_type": "task",
+        "related_entity_id": task.id,
+        "action_url": f"/tasks/{task.id}",
+    }
+
+
 async def _get_task_stats(session: AsyncSession, filters: Dict[str, Any]) -> Dict[str, Any]:
     """Get task statistics with filters"""
     base_query = select(Task).where(Task.deleted_at.is_(None))
@@ -208,66 +321,10 @@ async def list_tasks(
 ):
     """List tasks with advanced filtering"""
 
-    # Build base query with access control
-    query = select(Task).options(
-        selectinload(Task.creator),
-        selectinload(Task.assignee),
-        selectinload(Task.project),
-    )
-
-    filters = [Task.deleted_at.is_(None)]
-
-    # Access control - user can see:
-    # 1. Tasks they created
-    # 2. Tasks assigned to them
-    # 3. Tasks in projects they have access to
-
-    # Get user's accessible project IDs (membership)
-    user_project_ids = await session.scalars(
-        select(ProjectMember.project_id).where(
-            and_(
-                ProjectMember.user_id == current_user.id,
-                ProjectMember.deleted_at.is_(None),
-            )
-        )
-    )
-    accessible_project_ids = list(user_project_ids)
-
-    # Also allow tasks from public projects in orgs where the user is a member
-    user_orgs = await session.scalars(
-        select(Membership.org_id).where(
-            and_(
-                Membership.user_id == current_user.id,
-                Membership.deleted_at.is_(None),
-                Membership.status == MembershipStatus.ACTIVE,
-            )
-        )
-    )
-    user_org_ids = list(user_orgs)
-    public_proj_subq = None
-    if user_org_ids:
-        public_proj_subq = (
-            select(Project.id)
-            .where(
-                and_(
-                    Project.org_id.in_(user_org_ids),
-                    Project.is_public == True,
-                    Project.deleted_at.is_(None),
-                )
-            )
-        )
-
-    # Build access filter
-    access_filters = [
-        Task.creator_id == current_user.id,
-        Task.assignee_id == current_user.id,
-    ]
-    if accessible_project_ids:
-        access_filters.append(Task.project_id.in_(accessible_project_ids))
-    if public_proj_subq is not None:
-        access_filters.append(Task.project_id.in_(public_proj_subq))
+    # Column projection with assignee/creator/project summaries joined in
+    query = TASK_LIST.select()
 
-    filters.append(or_(*access_filters))
+    filters = [Task.deleted_at.is_(None), await _task_access_filter(session, current_user)]
 
     # Apply additional filters
     if status:
@@ -318,13 +375,11 @@ async def list_tasks(
         )
 
     if search and search.strip():
-        search_term = f"%{search.strip()}%"
-        filters.append(
-            or_(
-                Task.title.ilike(search_term),
-                Task.description.ilike(search_term),
-            )
-        )
+        terms = text_search(Task.search_vector, Task.title, search)
+        if terms is None:
+            problem(400, "urn:problem:invalid-search", "Invalid Search",
+                    "Search query has no searchable characters")
+        filters.append(terms.criteria)
 
     # Get total count
     total = await session.scalar(
@@ -339,13 +394,13 @@ async def list_tasks(
         query = query.order_by(sort_field.asc())
 
     # Get paginated results
-    tasks = await session.scalars(
+    rows = await session.execute(
         query.where(*filters)
         .offset((page - 1) * page_size)
         .limit(page_size)
     )
 
-    items = list(tasks)
+    items = TASK_LIST.build(rows.all())
 
     await AuditLogger.log_event(
         session, current_user.id, "tasks.list", True,
@@ -399,6 +454,9 @@ async def create_task(
     # Validate assignee
     assignee = await _validate_task_assignee(session, data.assignee_id, data.project_id)
 
+    if data.parent_task_id:
+        await _validate_parent_task(session, data.parent_task_id, current_user, data.project_id, None)
+
     # Create task
     task = Task(
         id=uuid4(),
@@ -407,6 +465,7 @@ async def create_task(
         creator_id=current_user.id,
         assignee_id=data.assignee_id,
         project_id=data.project_id,
+        parent_task_id=data.parent_task_id,
         status=data.status or TaskStatus.TODO,
         priority=data.priority or TaskPriority.MEDIUM,
         due_date=data.due_date,
@@ -415,6 +474,10 @@ async def create_task(
         created_at=now_utc(),
         updated_at=now_utc(),
     )
+    if data.recurrence_pattern is not None:
+        task.is_recurring = True
+        task.recurrence_pattern = data.recurrence_pattern.model_dump(mode="json", exclude_none=True)
+        task.next_run_at = first_run_at(task)
 
     session.add(task)
 
@@ -427,6 +490,9 @@ async def create_task(
                 "Failed to create task due to data constraint violation")
 
     await session.refresh(task)
+    if task.parent_task_id:
+        await invalidate_task_hierarchy(session, [task.parent_task_id])
+    await publish_task_event("created", task.id, [task.project_id], task_card(task), current_user.id)
 
     # Set location header
     response.headers["Location"] = f"/api/tasks/{task.id}"
@@ -440,6 +506,7 @@ async def create_task(
             task.title,
             current_user.username,
         )
+        background.add_task(notify_users, [_assignment_notification(task, assignee.id, current_user)])
 
     await AuditLogger.log_event(
     session, current_user.id, "task.create", True,
@@ -467,6 +534,64 @@ async def create_task(
     return task_with_details
 
 
+@router.get("/search", response_model=List[TaskSearchResponse])
+async def search_tasks(
+    request: Request,
+    q: str = Query(..., min_length=2, max_length=200, description="Search query"),
+    project_id: Optional[UUID] = Query(None, description="Restrict to a project"),
+    limit: int = Query(20, ge=1, le=50, description="Maximum results"),
+    session: AsyncSession = Depends(get_async_session),
+    current_user: User = Depends(get_current_user),
+):
+    """Ranked task search over the full-text and trigram indexes, with highlighted snippets"""
+    terms = text_search(Task.search_vector, Task.title, q)
+    if terms is None:
+        return []
+
+    filters = [Task.deleted_at.is_(None), terms.criteria, await _task_access_filter(session, current_user)]
+    if project_id:
+        filters.append(Task.project_id == project_id)
+
+    assignee = aliased(User)
+    rows = await session.execute(
+        select(
+            Task.id,
+            Task.title,
+            Task.description,
+            Task.status,
+            Task.priority,
+            Task.due_date,
+            func.coalesce(assignee.full_name, assignee.username).label("assignee_name"),
+            Project.name.label("project_name"),
+            terms.rank.label("rank"),
+            headline(Task.title, terms.tsquery).label("title_highlight"),
+            headline(Task.description, terms.tsquery).label("highlight"),
+        )
+        .outerjoin(assignee, assignee.id == Task.assignee_id)
+        .outerjoin(Project, Project.id == Task.project_id)
+        .where(*filters)
+        .order_by(terms.rank.desc(), Task.updated_at.desc())
+        .limit(limit)
+    )
+
+    return [
+        TaskSearchResponse(
+            id=row.id,
+            title=row.title,
+            description=row.description,
+            status=row.status.value,
+            priority=row.priority.value,
+            assignee_name=row.assignee_name,
+            project_name=row.project_name,
+            due_date=row.due_date,
+            rank=row.rank or 0.0,
+            title_highlight=row.title_highlight,
+            highlight=row.highlight or None,
+        )
+        for row in rows.all()
+    ]
+
+
 @router.get("/{task_id}", response_model=TaskDetailResponse)
 async def get_task(
     task_id: UUID,
@@ -498,9 +623,17 @@ async def update_task(
 ):
     """Update task"""
     task = await _get_task_with_access(session, task_id, current_user, "write")
+    old_project_id, old_parent_id = task.project_id, task.parent_task_id
 
     changes = {}
     payload = data.model_dump(exclude_unset=True)
+    if "recurrence_pattern" in payload:
+        pattern = data.recurrence_pattern
+        payload["recurrence_pattern"] = pattern.model_dump(mode="json", exclude_none=True) if pattern else None
+    if payload.get("parent_task_id") and payload["parent_task_id"] != old_parent_id:
+        await _validate_parent_task(
+            session, payload["parent_task_id"], current_user, task.project_id, task.org_id, task.id
+        )
 
     # Validate assignee if changed
     if "assignee_id" in payload:
@@ -523,6 +656,7 @@ async def update_task(
                     task.title,
                     current_user.username,
                 )
+                background.add_task(notify_users, [_assignment_notification(task, assignee.id, current_user)])
 
     # Track other changes
     for field, new_value in payload.items():
@@ -539,6 +673,16 @@ async def update_task(
 
     task.updated_at = now_utc()
 
+    # Reschedule the recurring template
+    if payload.keys() & {"recurrence_pattern", "due_date", "start_date"}:
+        task.is_recurring = task.recurrence_pattern is not None
+        if task.is_recurring and not RecurrencePattern.model_validate(task.recurrence_pattern).occurs_from(
+            template_anchor(task) or now_utc()
+        ):
+            problem(422, "urn:problem:invalid-recurrence", "Invalid Recurrence",
+                    "Recurrence pattern never produces an occurrence after the task's due date")
+        task.next_run_at = first_run_at(task)
+
     # Set completion date if task is marked as done
     if payload.get("status") == TaskStatus.DONE and task.status != TaskStatus.DONE:
         task.completed_at = now_utc()
@@ -554,6 +698,13 @@ async def update_task(
                 "Failed to update task due to data constraint violation")
 
     await session.refresh(task)
+    # A moved subtree leaves the old parent's chain and joins the new one
+    await invalidate_task_hierarchy(session, [task.id, old_parent_id])
+    if changes:
+        await publish_task_event(
+            "updated", task.id, [old_project_id, task.project_id],
+            card(task, [*changes, "completed_at", "updated_at"]), current_user.id,
+        )
 
     await AuditLogger.log_event(
         session, current_user.id, "task.update", True,
@@ -591,7 +742,10 @@ async def delete_task(
         task.status = TaskStatus.CANCELLED
         action = "task.soft_delete"
 
+    parent_task_id, project_id = task.parent_task_id, task.project_id
     await session.commit()
+    await invalidate_task_hierarchy(session, [task_id, parent_task_id])
+    await publish_task_event("deleted", task_id, [project_id], actor_id=current_user.id)
 
     await AuditLogger.log_event(
         session, current_user.id, action, True,
@@ -605,6 +759,326 @@ async def delete_task(
     )
 
 
+# ----------------- Bulk Operations -----------------
+
+BULK_MAX_TASKS = 5000
+
+_BULK_ENUM_FIELDS = {
+    "status": DbTaskStatus,
+    "priority": DbTaskPriority,
+    "task_type": DbTaskType,
+}
+
+
+def _uuid_array(name: str, ids: List[UUID]):
+    """Single array bind parameter for `= ANY(:ids)` (one param instead of N)."""
+    return any_(bindparam(name, ids, type_=ARRAY(PG_UUID(as_uuid=True))))
+
+
+def _to_db_enum(field: str, value: Any):
+    enum_cls = _BULK_ENUM_FIELDS[field]
+    raw = value.value if isinstance(value, Enum) else value
+    try:
+        return enum_cls(raw)
+    except ValueError:
+        problem(400, "urn:problem:invalid-value", "Invalid Value",
+                f"Unsupported {field}: {raw}")
+
+
+def _bulk_filter_criteria(flt: TaskBulkFilter):
+    conditions = []
+    if flt.project_id:
+        conditions.append(Task.project_id == flt.project_id)
+    if flt.assignee_id:
+        conditions.append(Task.assignee_id == flt.assignee_id)
+    if flt.unassigned:
+        conditions.append(Task.assignee_id.is_(None))
+    if flt.creator_id:
+        conditions.append(Task.creator_id == flt.creator_id)
+    if flt.status:
+        conditions.append(Task.status == _to_db_enum("status", flt.status))
+    if flt.priority:
+        conditions.append(Task.priority == _to_db_enum("priority", flt.priority))
+    if flt.due_before:
+        conditions.append(Task.due_date < flt.due_before)
+
+    if not conditions:
+        problem(400, "urn:problem:empty-bulk-filter", "Empty Filter",
+                "Bulk filter must contain at least one condition")
+    return and_(*conditions)
+
+
+def _bulk_patch_values(patch: TaskBulkPatch) -> Dict[str, Any]:
+    """Convert patch to column values, mapping API enums onto DB enums."""
+    values = patch.model_dump(exclude_unset=True)
+    for field in _BULK_ENUM_FIELDS:
+        if values.get(field) is not None:
+            values[field] = _to_db_enum(field, values[field])
+    return values
+
+
+@router.post("/bulk", response_model=TaskBulkMutationResponse)
+async def bulk_mutate_tasks(
+    data: TaskBulkMutation,
+    request: Request,
+    background: BackgroundTasks,
+    session: AsyncSession = Depends(get_async_session),
+    current_user: User = Depends(get_current_user),
+):
+    """
+    Apply one patch to many tasks selected by id list or filter.
+
+    Permissions are resolved in one batched query, the change is applied with a
+    single `UPDATE ... WHERE id = ANY(...)` and every affected user receives one
+    aggregated notification.
+    """
+    errors: List[Dict[str, Any]] = []
+
+    if data.task_ids is not None:
+        requested_ids = list(dict.fromkeys(data.task_ids))
+        criteria = Task.id == _uuid_array("task_ids", requested_ids)
+    else:
+        requested_ids = None
+        criteria = _bulk_filter_criteria(data.filter)
+
+    # Only tasks the user can see are matched: invisible ones are reported as
+    # not found, denied_ids lists visible tasks the user can't change
+    criteria = and_(criteria, await _task_access_filter(session, current_user))
+    allowed, denied_ids = await load_tasks_with_permission(
+        session, current_user, criteria, "write", limit=BULK_MAX_TASKS + 1
+    )
+    if len(allowed) + len(denied_ids) > BULK_MAX_TASKS:
+        problem(400, "urn:problem:bulk-too-large", "Too Many Tasks",
+                f"Bulk operations are limited to {BULK_MAX_TASKS} tasks; narrow the filter")
+
+    if requested_ids is not None:
+        found = {row.id for row in allowed} | set(denied_ids)
+        errors.extend(
+            {"task_id": str(task_id), "error": "Task not found"}
+            for task_id in requested_ids if task_id not in found
+        )
+
+    values = _bulk_patch_values(data.patch)
+    targets = allowed
+
+    # Validate assignee once, and project membership for all projects in one query
+    new_assignee: Optional[User] = None
+    if values.get("assignee_id"):
+        new_assignee = await session.get(User, values["assignee_id"])
+        if not new_assignee or new_assignee.deleted_at or not new_assignee.is_active:
+            problem(400, "urn:problem:invalid-assignee", "Invalid Assignee",
+                    "Assigned user does not exist or is not active")
+
+        project_ids = {row.project_id for row in targets if row.project_id}
+        member_project_ids = set()
+        if project_ids:
+            member_project_ids = set(await session.scalars(
+                select(ProjectMember.project_id).where(
+                    and_(
+                        ProjectMember.project_id.in_(project_ids),
+                        ProjectMember.user_id == new_assignee.id,
+                        ProjectMember.deleted_at.is_(None),
+                    )
+                )
+            ))
+        valid_targets = []
+        for row in targets:
+            if row.project_id and row.project_id not in member_project_ids:
+                errors.append({
+                    "task_id": str(row.id),
+                    "error": "Assigned user must be a member of the project",
+                })
+            else:
+                valid_targets.append(row)
+        targets = valid_targets
+
+    matched = len(allowed) + len(denied_ids)
+    if not targets:
+        return TaskBulkMutationResponse(
+            matched=matched, updated=0, updated_ids=[],
+            denied_ids=denied_ids, errors=errors,
+        )
+
+    now = now_utc()
+    values["updated_at"] = now
+    event_fields = dict(values)
+    if "status" in values:
+        if values["status"] == DbTaskStatus.DONE:
+            values["completed_at"] = func.coalesce(Task.completed_at, now)
+        else:
+            values["completed_at"] = None
+
+    target_ids = [row.id for row in targets]
+    stmt = (
+        update(Task)
+        .where(Task.id == _uuid_array("target_ids", target_ids), Task.deleted_at.is_(None))
+        .values(**values)
+        .returning(Task.id)
+        .execution_options(synchronize_session=False)
+    )
+
+    try:
+        updated_ids = list((await session.execute(stmt)).scalars())
+        await session.commit()
+    except IntegrityError as e:
+        await session.rollback()
+        logger.error(f"Bulk task update failed: {e}")
+        problem(409, "urn:problem:bulk-update-failed", "Bulk Update Failed",
+                "Failed to update tasks due to data constraint violation")
+
+    await invalidate_task_hierarchy(session, updated_ids)
+    updated_set = set(updated_ids)
+    updated_rows = [row for row in targets if row.id in updated_set]
+    # Core UPDATE: no flush events, so the history is recorded here
+    record_bulk_update(Task, updated_rows, event_fields, current_user.id)
+    await publish_tasks_updated(updated_rows, event_fields, current_user.id)
+
+    # One aggregated notification per affected user
+    if data.notify:
+        titles_by_user: Dict[UUID, List[str]] = {}
+        for row in targets:
+            if row.id not in updated_set:
+                continue
+            recipients = set()
+            if "assignee_id" in values:
+                if new_assignee:
+                    recipients.add(new_assignee.id)
+                if row.assignee_id and row.assignee_id != values["assignee_id"]:
+                    recipients.add(row.assignee_id)
+            elif row.assignee_id:
+                recipients.add(row.assignee_id)
+            recipients.discard(current_user.id)
+            for user_id in recipients:
+                titles_by_user.setdefault(user_id, []).append(row.title)
+
+        if titles_by_user:
+            recipients = await session.execute(
+                select(User.id, User.email).where(
+                    User.id.in_(list(titles_by_user)),
+                    User.deleted_at.is_(None),
+                )
+            )
+            for user_id, email in recipients:
+                titles = titles_by_user[user_id]
+                background.add_task(
+                    send_task_notification,
+                    email,
+                    "tasks_bulk_updated",
+                    f"{len(titles)} tasks",
+                    current_user.username,
+                    {
+                        "task_titles": titles[:20],
+                        "count": len(titles),
+                        "fields": sorted(data.patch.model_fields_set),
+                    },
+                )
+
+    await AuditLogger.log_event(
+        session, current_user.id, "tasks.bulk_update", True,
+        request.client.host if request.client else "unknown",
+        request.headers.get("user-agent", "unknown"),
+        {
+            "updated_count": len(updated_ids),
+            "denied_count": len(denied_ids),
+            "fields": sorted(data.patch.model_fields_set),
+            "by_filter": data.filter is not None,
+        },
+    )
+
+    return TaskBulkMutationResponse(
+        matched=matched,
+        updated=len(updated_ids),
+        updated_ids=updated_ids,
+        denied_ids=denied_ids,
+        errors=errors,
+    )
+
+
+# ----------------- Import -----------------
+
+@router.post("/import", response_model=JobAccepted, status_code=status.HTTP_202_ACCEPTED)
+async def import_tasks(
+    request: Request,
+    response: Response,
+    org_id: UUID = Query(..., description="Organization to import tasks into"),
+    file: UploadFile = File(..., description="CSV or XLSX file with a header row"),
+    session: AsyncSession = Depends(get_async_session),
+    current_user: User = Depends(get_current_user),
+):
+    """
+    Import tasks from a CSV/XLSX file as a tasks.import background job.
+
+    Rows are COPY'd into a staging table, validated and resolved with set-based
+    lookups and inserted with one statement per batch. Poll `GET /jobs/{job_id}`
+    for progress; the result has the counts and per-row errors.
+    """
+    if not current_user.is_admin:
+        membership = await session.scalar(
+            select(Membership.id).where(
+                and_(
+                    Membership.org_id == org_id,
+                    Membership.user_id == current_user.id,
+                    Membership.deleted_at.is_(None),
+                    Membership.status == MembershipStatus.ACTIVE,
+                )
+            )
+        )
+        if not membership:
+            problem(403, "urn:problem:access-denied", "Access Denied",
+                    "You are not an active member of this organization")
+
+    try:
+        key, fmt = await store_upload(file)
+    except ValueError as e:
+        problem(400, "urn:problem:invalid-import-file", "Invalid Import File", str(e))
+
+    job = await enqueue_job(
+        session,
+        TASK_IMPORT_JOB,
+        {
+            "key": key,
+            "format": fmt,
+            "filename": file.filename,
+            "org_id": org_id,
+            "user_id": current_user.id,
+            "is_admin": bool(current_user.is_admin),
+        },
+        org_id=org_id,
+        created_by_id=current_user.id,
+    )
+    await session.commit()
+
+    await AuditLogger.log_event(
+        session, current_user.id, "tasks.import", True,
+        request.client.host if request.client else "unknown",
+        request.headers.get("user-agent", "unknown"),
+        {"job_id": str(job.id), "org_id": str(org_id), "filename": file.filename},
+    )
+    return job_accepted(job, response)
+
+
+# ----------------- Task Hierarchy -----------------
+
+@router.get("/{task_id}/hierarchy", response_model=TaskHierarchyResponse)
+async def get_task_subtree(
+    task_id: UUID,
+    max_depth: int = Query(10, ge=0, le=20, description="Maximum subtask depth to load"),
+    session: AsyncSession = Depends(get_async_session),
+    current_user: User = Depends(get_current_user),
+):
+    """
+    Get the whole subtask tree under a task with rolled-up estimated/actual
+    hours, story points and progress, loaded with one recursive query.
+    """
+    await _get_task_with_access(session, task_id, current_user, "read")
+
+    hierarchy = await get_task_hierarchy(session, task_id, max_depth)
+    if hierarchy is None:
+        problem(404, "urn:problem:task-not-found", "Task Not Found",
+                "Task does not exist")
+    return hierarchy
+
+
 # ----------------- Task Status Management -----------------
 
 @router.patch("/{task_id}/status", response_model=TaskDetailResponse)
@@ -649,6 +1123,11 @@ async def update_task_status(
 
     await session.commit()
     await session.refresh(task)
+    await invalidate_task_hierarchy(session, [task.id])
+    await publish_task_event(
+        "updated", task.id, [task.project_id],
+        card(task, ["status", "completed_at", "updated_at"]), current_user.id,
+    )
 
     # Notify assignee if different from current user
     if task.assignee_id and task.assignee_id != current_user.id:
@@ -704,8 +1183,13 @@ async def update_task_assignment(
 
     await session.commit()
     await session.refresh(task)
+    await invalidate_task_hierarchy(session, [task.id])
+    await publish_task_event(
+        "updated", task.id, [task.project_id], card(task, ["assignee_id", "updated_at"]), current_user.id,
+    )
 
     # Send notifications
+    feed_items = []
     if new_assignee and new_assignee.id != current_user.id:
         background.add_task(
             send_task_notification,
@@ -714,6 +1198,7 @@ async def update_task_assignment(
             task.title,
             current_user.username,
         )
+        feed_items.append(_assignment_notification(task, new_assignee.id, current_user))
 
     # Notify old assignee if different
     if old_assignee_id and old_assignee_id != current_user.id and old_assignee_id != new_assignee_id:
@@ -726,6 +1211,9 @@ async def update_task_assignment(
                 task.title,
                 current_user.username,
             )
+            feed_items.append(_assignment_notification(task, old_assignee.id, current_user, assigned=False))
+    if feed_items:
+        background.add_task(notify_users, feed_items)
 
     await AuditLogger.log_event(
         session, current_user.id, "task.assignment.update", True,
@@ -743,32 +1231,205 @@ async def update_task_assignment(
 
 # ----------------- Task Comments -----------------
 
-@router.get("/{task_id}/comments", response_model=List[TaskCommentResponse])
+COMMENT_THREADS_MAX = 100
+COMMENT_REPLIES_MAX = 100
+
+
+def _encode_comment_cursor(created_at: datetime, comment_id: UUID) -> str:
+    raw = json.dumps({"c": created_at.isoformat(), "i": str(comment_id)})
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def _comment_keyset(cursor: str, descending: bool = False):
+    """Keyset predicate on (created_at, id) for an opaque page cursor"""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        data = json.loads(raw)
+        created_at, comment_id = datetime.fromisoformat(data["c"]), UUID(data["i"])
+    except Exception:
+        problem(400, "urn:problem:invalid-cursor", "Invalid Cursor",
+                "Pagination cursor is malformed")
+
+    key = tuple_(TaskComment.created_at, TaskComment.id)
+    bound = tuple_(literal(created_at), literal(comment_id, PG_UUID(as_uuid=True)))
+    return key < bound if descending else key > bound
+
+
+def _comment_columns():
+    """Comment fields plus the author fields the UI renders (plain columns, no lazy loads)"""
+    return (
+        TaskComment.id,
+        TaskComment.task_id,
+        TaskComment.parent_comment_id,
+        TaskComment.content,
+        TaskComment.content_type,
+        TaskComment.is_internal,
+        TaskComment.created_at,
+        TaskComment.updated_at,
+        User.id.label("author_id"),
+        User.username.label("author_username"),
+        User.full_name.label("author_full_name"),
+        User.avatar_url.label("author_avatar_url"),
+    )
+
+
+def _comment_node(row, reply_count: int = 0) -> TaskCommentNode:
+    author = None
+    if row.author_id:
+        author = TaskCommentAuthor(
+            id=row.author_id,
+            username=row.author_username,
+            full_name=row.author_full_name,
+            avatar_url=row.author_avatar_url,
+        )
+    return TaskCommentNode(
+        id=row.id,
+        task_id=row.task_id,
+        parent_comment_id=row.parent_comment_id,
+        content=row.content,
+        content_type=row.content_type,
+        is_internal=row.is_internal,
+        created_at=row.created_at,
+        updated_at=row.updated_at,
+        author=author,
+        reply_count=reply_count,
+    )
+
+
+async def _attach_replies(
+    session: AsyncSession, task_id: UUID, threads: List[TaskCommentNode], replies_limit: int
+) -> None:
+    """Load the first `replies_limit` replies (and reply counts) of all threads in one query"""
+    by_id = {thread.id: thread for thread in threads}
+
+    ranked = (
+        select(
+            *_comment_columns(),
+            func.row_number().over(
+                partition_by=TaskComment.parent_comment_id,
+                order_by=(TaskComment.created_at, TaskComment.id),
+            ).label("position"),
+            func.count().over(partition_by=TaskComment.parent_comment_id).label("reply_count"),
+        )
+        .outerjoin(User, User.id == TaskComment.user_id)
+        .where(
+            and_(
+                TaskComment.task_id == task_id,
+                TaskComment.parent_comment_id.in_(list(by_id)),
+                TaskComment.deleted_at.is_(None),
+            )
+        )
+        .subquery()
+    )
+
+    # Position 1 is always fetched so threads report reply_count even when replies_limit=0
+    rows = await session.execute(
+        select(ranked)
+        .where(ranked.c.position <= max(replies_limit, 1))
+        .order_by(ranked.c.parent_comment_id, ranked.c.position)
+    )
+
+    for row in rows.all():
+        thread = by_id[row.parent_comment_id]
+        thread.reply_count = row.reply_count
+        if row.position <= replies_limit:
+            thread.replies.append(_comment_node(row))
+
+
+@router.get("/{task_id}/comments", response_model=TaskCommentThreadPage)
 async def get_task_comments(
     task_id: UUID,
     request: Request,
+    cursor: Optional[str] = Query(None, description="Cursor returned as next_cursor by the previous page"),
+    limit: int = Query(20, ge=1, le=COMMENT_THREADS_MAX, description="Top-level comments per page"),
+    replies_limit: int = Query(5, ge=0, le=COMMENT_REPLIES_MAX, description="Replies returned per thread"),
+    order: str = Query("asc", pattern="^(asc|desc)$", description="Thread order by creation time"),
     session: AsyncSession = Depends(get_async_session),
     current_user: User = Depends(get_current_user),
 ):
-    """Get task comments"""
+    """
+    Get task comments as threads.
+
+    Top-level comments are paged with a keyset cursor on (created_at, id);
+    the first replies of every thread on the page come from one extra query.
+    Use /{task_id}/comments/{comment_id}/replies to page through the rest.
+    """
     await _get_task_with_access(session, task_id, current_user, "read")
 
-    comments = await session.scalars(
-        select(TaskComment)
-        .options(selectinload(TaskComment.author))
+    descending = order == "desc"
+    stmt = (
+        select(*_comment_columns())
+        .outerjoin(User, User.id == TaskComment.user_id)
         .where(
             and_(
                 TaskComment.task_id == task_id,
+                TaskComment.parent_comment_id.is_(None),
                 TaskComment.deleted_at.is_(None),
             )
         )
-        .order_by(TaskComment.created_at.asc())
     )
+    if cursor:
+        stmt = stmt.where(_comment_keyset(cursor, descending))
+    if descending:
+        stmt = stmt.order_by(TaskComment.created_at.desc(), TaskComment.id.desc())
+    else:
+        stmt = stmt.order_by(TaskComment.created_at.asc(), TaskComment.id.asc())
 
-    return list(comments)
+    rows = (await session.execute(stmt.limit(limit + 1))).all()
+    has_next = len(rows) > limit
+    rows = rows[:limit]
 
+    threads = [_comment_node(row) for row in rows]
+    if threads:
+        await _attach_replies(session, task_id, threads, replies_limit)
 
-@router.post("/{task_id}/comments", response_model=TaskCommentResponse)
+    return TaskCommentThreadPage(
+        items=threads,
+        next_cursor=_encode_comment_cursor(rows[-1].created_at, rows[-1].id) if has_next else None,
+        has_next=has_next,
+    )
+
+
+@router.get("/{task_id}/comments/{comment_id}/replies", response_model=TaskCommentThreadPage)
+async def get_comment_replies(
+    task_id: UUID,
+    comment_id: UUID,
+    request: Request,
+    cursor: Optional[str] = Query(None, description="Cursor returned as next_cursor by the previous page"),
+    limit: int = Query(50, ge=1, le=COMMENT_REPLIES_MAX),
+    session: AsyncSession = Depends(get_async_session),
+    current_user: User = Depends(get_current_user),
+):
+    """Page through the replies of a single comment thread (oldest first)"""
+    await _get_task_with_access(session, task_id, current_user, "read")
+
+    stmt = (
+        select(*_comment_columns())
+        .outerjoin(User, User.id == TaskComment.user_id)
+        .where(
+            and_(
+                TaskComment.task_id == task_id,
+                TaskComment.parent_comment_id == comment_id,
+                TaskComment.deleted_at.is_(None),
+            )
+        )
+        .order_by(TaskComment.created_at.asc(), TaskComment.id.asc())
+    )
+    if cursor:
+        stmt = stmt.where(_comment_keyset(cursor))
+
+    rows = (await session.execute(stmt.limit(limit + 1))).all()
+    has_next = len(rows) > limit
+    rows = rows[:limit]
+
+    return TaskCommentThreadPage(
+        items=[_comment_node(row) for row in rows],
+        next_cursor=_encode_comment_cursor(rows[-1].created_at, rows[-1].id) if has_next else None,
+        has_next=has_next,
+    )
+
+
+@router.post("/{task_id}/comments", response_model=TaskCommentNode)
 async def add_task_comment(
     task_id: UUID,
     data: TaskCommentCreate,
@@ -780,17 +1441,43 @@ async def add_task_comment(
     """Add comment to task"""
     task = await _get_task_with_access(session, task_id, current_user, "read")
 
+    parent_comment_id = None
+    if data.parent_comment_id:
+        parent = (await session.execute(
+            select(TaskComment.id, TaskComment.parent_comment_id).where(
+                and_(
+                    TaskComment.id == data.parent_comment_id,
+                    TaskComment.task_id == task_id,
+                    TaskComment.deleted_at.is_(None),
+                )
+            )
+        )).first()
+        if not parent:
+            problem(404, "urn:problem:comment-not-found", "Comment Not Found",
+                    "Parent comment does not exist on this task")
+        # Threads are one level deep: a reply to a reply joins the same thread
+        parent_comment_id = parent.parent_comment_id or parent.id
+
     comment = TaskComment(
         id=uuid4(),
         task_id=task_id,
-        author_id=current_user.id,
+        user_id=current_user.id,
+        parent_comment_id=parent_comment_id,
         content=data.content.strip(),
+        content_type=data.content_type,
+        is_internal=data.is_internal,
         created_at=now_utc(),
     )
 
     session.add(comment)
     await session.commit()
-    await session.refresh(comment)
+    if not comment.is_internal:
+        # Only a pointer; the task view loads the thread it shows
+        await publish_task_event(
+            "commented", task_id, [],
+            {"comment_id": comment.id, "parent_comment_id": comment.parent_comment_id},
+            current_user.id,
+        )
 
     # Notify task assignee and creator
     notify_users = set()
@@ -818,15 +1505,23 @@ async def add_task_comment(
         {"task_id": str(task_id), "comment_id": str(comment.id)},
     )
 
-    # Load with author for response
-    comment_with_author = await session.scalar(
-        select(TaskComment)
-        .options(selectinload(TaskComment.author))
-        .where(TaskComment.id == comment.id)
+    return TaskCommentNode(
+        id=comment.id,
+        task_id=comment.task_id,
+        parent_comment_id=comment.parent_comment_id,
+        content=comment.content,
+        content_type=comment.content_type,
+        is_internal=comment.is_internal,
+        created_at=comment.created_at,
+        updated_at=comment.updated_at,
+        author=TaskCommentAuthor(
+            id=current_user.id,
+            username=current_user.username,
+            full_name=current_user.full_name,
+            avatar_url=current_user.avatar_url,
+        ),
     )
 
-    return comment_with_author
-
 
 # ----------------- Task Statistics -----------------
 
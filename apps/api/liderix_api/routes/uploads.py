@@ -0,0 +1,295 @@
+# apps/api/liderix_api/routes/uploads.py
+"""
+Resumable uploads for large files (task attachments, org files).
+
+    POST   /uploads                 -> 201, Location: /uploads/{id}
+    HEAD   /uploads/{id}            -> Upload-Offset / Upload-Length
+    PATCH  /uploads/{id}            Upload-Offset: <n>, raw bytes in the body
+    POST   /uploads/{id}/complete   -> assembled file
+    DELETE /uploads/{id}            -> cancel
+
+The PATCH body is read as a stream (no multipart parsing, nothing spooled),
+so a dropped connection costs at most the chunk in flight: HEAD returns the
+offset to resume from.
+"""
+from __future__ import annotations
+
+import logging
+from datetime import datetime, timezone
+from typing import Optional, Tuple
+from uuid import UUID
+
+from fastapi import APIRouter, BackgroundTasks, Depends, Header, HTTPException, Request, Response, status
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from liderix_api.config.settings import settings
+from liderix_api.db import get_async_session
+from liderix_api.enums import UploadStatus
+from liderix_api.models.files import File
+from liderix_api.models.tasks import Task
+from liderix_api.models.uploads import Upload
+from liderix_api.models.users import User
+from liderix_api.schemas.uploads import ResumableUploadCreate, ResumableUploadRead
+from liderix_api.services.audit import AuditLogger
+from liderix_api.services.auth import get_current_user
+from liderix_api.services.file_upload import FileTooLarge
+from liderix_api.services.images import is_processable, process_file_image
+from liderix_api.services.permissions import check_organization_permission, check_task_permission
+from liderix_api.services.resumable_uploads import (
+    OWNER_TASK,
+    OffsetMismatch,
+    UploadBusy,
+    UploadCorrupt,
+    UploadIncomplete,
+    cancel_upload,
+    create_upload,
+    finalize_upload,
+    upload_status,
+    write_chunk,
+)
+from liderix_api.services.storage import StorageError
+
+router = APIRouter(prefix="/uploads", tags=["Uploads"])
+logger = logging.getLogger(__name__)
+
+FINISHED = (UploadStatus.COMPLETED, UploadStatus.CANCELLED, UploadStatus.FAILED)
+
+
+# ----------------- helpers -----------------
+
+def now_utc() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+def problem(status_code: int, type_: str, title: str, detail: str):
+    raise HTTPException(
+        status_code=status_code,
+        detail={"type": type_, "title": title, "detail": detail, "status": status_code},
+    )
+
+
+def _offset_conflict(expected: int):
+    raise HTTPException(
+        status_code=409,
+        detail={
+            "type": "urn:problem:upload-offset-mismatch",
+            "title": "Offset Mismatch",
+            "detail": f"Upload continues at offset {expected}",
+            "status": 409,
+        },
+        headers={"Upload-Offset": str(expected)},
+    )
+
+
+def _to_read(upload: Upload, file: Optional[File]) -> ResumableUploadRead:
+    return ResumableUploadRead(
+        id=upload.id,
+        filename=upload.filename,
+        content_type=upload.content_type,
+        size=upload.size,
+        offset=upload.received_bytes,
+        status=upload_status(upload, file),
+        owner_type=upload.owner_type,
+        owner_id=upload.owner_id,
+        file_id=upload.file_id,
+        file_hash=file.file_hash if file is not None else None,
+        expires_at=upload.expires_at,
+        completed_at=file.upload_completed_at if file is not None else None,
+    )
+
+
+async def _get_upload(session: AsyncSession, upload_id: UUID, current_user: User) -> Tuple[Upload, Optional[File]]:
+    """Only the uploader (or an admin) can see or continue an upload"""
+    upload = await session.scalar(
+        select(Upload).where(Upload.id == upload_id, Upload.is_deleted.is_(False))
+    )
+    if not upload or (upload.user_id != current_user.id and not current_user.is_admin):
+        problem(404, "urn:problem:upload-not-found", "Upload Not Found",
+                "Upload does not exist or has been cancelled")
+    file = await session.get(File, upload.file_id) if upload.file_id else None
+    return upload, file
+
+
+async def _owner_org_id(session: AsyncSession, data: ResumableUploadCreate, current_user: User) -> UUID:
+    if data.owner_type == OWNER_TASK:
+        task = await session.scalar(select(Task).where(Task.id == data.owner_id, Task.deleted_at.is_(None)))
+        if not task:
+            problem(404, "urn:problem:task-not-found", "Task Not Found", "Task does not exist")
+        if not await check_task_permission(session, task, current_user, "write"):
+            problem(403, "urn:problem:access-denied", "Access Denied",
+                    "You don't have write permission for this task")
+        return task.org_id
+
+    if not await check_organization_permission(session, data.owner_id, current_user, "write"):
+        problem(403, "urn:problem:access-denied", "Access Denied",
+                "You don't have write permission for this organization")
+    return data.owner_id
+
+
+# ----------------- endpoints -----------------
+
+@router.post("", response_model=ResumableUploadRead, status_code=status.HTTP_201_CREATED)
+async def create_resumable_upload(
+    data: ResumableUploadCreate,
+    request: Request,
+    response: Response,
+    session: AsyncSession = Depends(get_async_session),
+    current_user: User = Depends(get_current_user),
+):
+    """Start a resumable upload; send the bytes with PATCH, then complete it"""
+    if data.size > settings.RESUMABLE_UPLOAD_MAX_SIZE:
+        problem(413, "urn:problem:file-too-large", "File Too Large",
+                f"Uploads are limited to {settings.RESUMABLE_UPLOAD_MAX_SIZE} bytes")
+
+    org_id = await _owner_org_id(session, data, current_user)
+    upload = await create_upload(
+        session,
+        user=current_user,
+        org_id=org_id,
+        owner_type=data.owner_type,
+        owner_id=data.owner_id,
+        filename=data.filename,
+        content_type=data.content_type,
+        size=data.size,
+    )
+    await session.commit()
+
+    await AuditLogger.log_event(
+        session, current_user.id, "upload.create", True,
+        request.client.host if request.client else "unknown",
+        request.headers.get("user-agent", "unknown"),
+        {"upload_id": str(upload.id), "owner_type": data.owner_type,
+         "owner_id": str(data.owner_id), "size": data.size},
+    )
+
+    response.headers["Location"] = upload.url
+    response.headers["Upload-Offset"] = "0"
+    return _to_read(upload, None)
+
+
+@router.head("/{upload_id}")
+async def get_upload_offset(
+    upload_id: UUID,
+    session: AsyncSession = Depends(get_async_session),
+    current_user: User = Depends(get_current_user),
+):
+    """Offset to resume from"""
+    upload, _ = await _get_upload(session, upload_id, current_user)
+    return Response(
+        status_code=200,
+        headers={
+            "Upload-Offset": str(upload.received_bytes),
+            "Upload-Length": str(upload.size),
+            "Cache-Control": "no-store",
+        },
+    )
+
+
+@router.get("/{upload_id}", response_model=ResumableUploadRead)
+async def get_upload(
+    upload_id: UUID,
+    session: AsyncSession = Depends(get_async_session),
+    current_user: User = Depends(get_current_user),
+):
+    """Upload state"""
+    upload, file = await _get_upload(session, upload_id, current_user)
+    return _to_read(upload, file)
+
+
+@router.patch("/{upload_id}", status_code=204)
+async def upload_chunk(
+    upload_id: UUID,
+    request: Request,
+    upload_offset: int = Header(..., alias="Upload-Offset", ge=0),
+    session: AsyncSession = Depends(get_async_session),
+    current_user: User = Depends(get_current_user),
+):
+    """Append the request body at Upload-Offset"""
+    upload, file = await _get_upload(session, upload_id, current_user)
+    if file is None or file.upload_status in FINISHED:
+        problem(409, "urn:problem:upload-finished", "Upload Finished",
+                "Upload is already completed or cancelled")
+    if upload_offset != upload.received_bytes:
+        _offset_conflict(upload.received_bytes)
+
+    # Release the DB connection while the body streams in
+    await session.commit()
+    try:
+        offset = await write_chunk(session, upload, upload_offset, request.stream())
+    except OffsetMismatch as e:
+        _offset_conflict(e.expected)
+    except FileTooLarge:
+        problem(413, "urn:problem:file-too-large", "File Too Large",
+                f"Chunk goes past the declared size of {upload.size} bytes")
+    except StorageError as e:
+        logger.error(f"Chunk write failed for upload {upload_id}: {e}")
+        problem(502, "urn:problem:storage-unavailable", "Storage Unavailable",
+                "Failed to store the chunk, retry from the current offset")
+
+    return Response(status_code=204, headers={"Upload-Offset": str(offset)})
+
+
+@router.post("/{upload_id}/complete", response_model=ResumableUploadRead)
+async def complete_upload(
+    upload_id: UUID,
+    request: Request,
+    background: BackgroundTasks,
+    session: AsyncSession = Depends(get_async_session),
+    current_user: User = Depends(get_current_user),
+):
+    """Assemble the received chunks into the final file"""
+    upload, file = await _get_upload(session, upload_id, current_user)
+    if file is None or file.upload_status in (UploadStatus.CANCELLED, UploadStatus.FAILED):
+        problem(409, "urn:problem:upload-finished", "Upload Finished",
+                "Upload was cancelled or failed")
+
+    try:
+        file = await finalize_upload(session, upload_id)
+    except LookupError:
+        # Cancelled (or expired) while this request was waiting or assembling
+        problem(409, "urn:problem:upload-finished", "Upload Finished",
+                "Upload was cancelled or failed")
+    except UploadBusy:
+        problem(409, "urn:problem:upload-finalizing", "Upload Finalizing",
+                "Upload is already being completed")
+    except UploadIncomplete as e:
+        problem(409, "urn:problem:upload-incomplete", "Upload Incomplete", str(e))
+    except UploadCorrupt as e:
+        problem(422, "urn:problem:upload-corrupt", "Upload Corrupt", str(e))
+    except StorageError as e:
+        logger.error(f"Finalize failed for upload {upload_id}: {e}")
+        problem(502, "urn:problem:storage-unavailable", "Storage Unavailable",
+                "Failed to assemble the uploaded file, retry complete")
+
+    if is_processable(file):
+        # Thumbnails/WebP variants; decoding runs in the image process pool
+        background.add_task(process_file_image, file.id)
+
+    await AuditLogger.log_event(
+        session, current_user.id, "upload.complete", True,
+        request.client.host if request.client else "unknown",
+        request.headers.get("user-agent", "unknown"),
+        {"upload_id": str(upload_id), "file_id": str(file.id), "size": file.file_size},
+    )
+
+    upload, file = await _get_upload(session, upload_id, current_user)
+    return _to_read(upload, file)
+
+
+@router.delete("/{upload_id}", status_code=204)
+async def cancel_resumable_upload(
+    upload_id: UUID,
+    session: AsyncSession = Depends(get_async_session),
+    current_user: User = Depends(get_current_user),
+):
+    """Cancel an upload and drop the received chunks"""
+    upload, file = await _get_upload(session, upload_id, current_user)
+    if file is not None and file.upload_status == UploadStatus.COMPLETED:
+        problem(409, "urn:problem:upload-finished", "Upload Finished",
+                "Completed uploads cannot be cancelled")
+    if file is not None and file.upload_status == UploadStatus.FINALIZING:
+        problem(409, "urn:problem:upload-finalizing", "Upload Finalizing",
+                "Upload is being completed and cannot be cancelled")
+    await cancel_upload(session, upload)
+    return Response(status_code=204)
@@ -27,13 +27,19 @@ from liderix_api.schemas.user import (
 from liderix_api.services.auth import get_current_user, hash_password, verify_password
 from liderix_api.services.audit import AuditLogger
 from liderix_api.services.permissions import require_permission
-from liderix_api.services.file_upload import handle_avatar_upload
+from liderix_api.services.file_upload import FileTooLarge, delete_file, handle_avatar_upload
+from liderix_api.services.images import InvalidImage
+from liderix_api.services.invalidation import CacheKind, invalidation_bus
+from liderix_api.services.projections import user_list_projection
+from liderix_api.services.search import autocomplete_users
 from liderix_api.config.settings import settings
 
 router = APIRouter(prefix="/users", tags=["Users"])
 logger = logging.getLogger(__name__)
 redis = Redis.from_url(settings.REDIS_URL)
 
+USER_LIST = user_list_projection(UserRead)
+
 # Security constants
 MAX_AVATAR_SIZE = 5 * 1024 * 1024  # 5MB
 ALLOWED_AVATAR_TYPES = {"image/jpeg", "image/png", "image/webp"}
@@ -211,6 +217,7 @@ async def update_current_user_profile(
         logger.error(f"Failed to update user profile: {e}")
         problem(409, "urn:problem:update-failed", "Update Failed", 
                 "Failed to update profile due to data constraint violation")
+    invalidation_bus.emit(CacheKind.USER, [current_user.id])
     
     await session.refresh(current_user)
     
@@ -295,7 +302,7 @@ async def upload_user_avatar(
                 f"Avatar must be smaller than {MAX_AVATAR_SIZE // (1024*1024)}MB")
     
     try:
-        # Handle file upload (implement this service)
+        # Streams to storage; the size limit is enforced while reading
         avatar_url = await handle_avatar_upload(file, current_user.id)
         
         # Update user avatar
@@ -304,6 +311,11 @@ async def upload_user_avatar(
         current_user.updated_at = now_utc()
         
         await session.commit()
+        invalidation_bus.emit(CacheKind.USER, [current_user.id])
+
+        if old_avatar and old_avatar != avatar_url:
+            # No-op while another user still points at the same object
+            await delete_file(old_avatar)
         
         await AuditLogger.log_event(
             session, current_user.id, "user.avatar.upload", True,
@@ -318,6 +330,12 @@ async def upload_user_avatar(
         
         return {"message": "Avatar uploaded successfully", "avatar_url": avatar_url}
         
+    except FileTooLarge:
+        problem(413, "urn:problem:file-too-large", "File Too Large", 
+                f"Avatar must be smaller than {MAX_AVATAR_SIZE // (1024*1024)}MB")
+    except InvalidImage:
+        problem(400, "urn:problem:invalid-file-type", "Invalid File Type",
+                "Avatar could not be read as an image")
     except Exception as e:
         logger.error(f"Avatar upload failed for user {current_user.id}: {e}")
         problem(500, "urn:problem:upload-failed", "Upload Failed", 
@@ -370,8 +388,8 @@ async def list_users(
     # Check admin permission
     require_permission(current_user, "users:read")
     
-    # Build base query
-    query = select(User).where(User.deleted_at.is_(None))
+    # Build base query (column projection: no preferences blobs, no selectin relationships)
+    query = USER_LIST.select().where(User.deleted_at.is_(None))
     
     # Apply search filter
     if search and search.strip():
@@ -408,11 +426,11 @@ async def list_users(
         query = query.order_by(sort_field.asc())
     
     # Apply pagination
-    users = await session.scalars(
+    rows = await session.execute(
         query.offset((page - 1) * page_size).limit(page_size)
     )
     
-    items = list(users)
+    items = USER_LIST.build(rows.all())
     
     await AuditLogger.log_event(
         session, current_user.id, "users.list", True,
@@ -444,31 +462,21 @@ async def search_users(
     session: AsyncSession = Depends(get_async_session),
     current_user: User = Depends(get_current_user)
 ):
-    """Search users for mentions, assignments, etc."""
-    search_term = f"%{q.strip()}%"
-    
-    users = await session.scalars(
-        select(User)
-        .where(
-            and_(
-                User.deleted_at.is_(None),
-                User.is_active == True,
-                or_(
-                    User.username.ilike(search_term),
-                    User.email.ilike(search_term),
-                    func.concat(User.first_name, ' ', User.last_name).ilike(search_term)
-                )
-            )
-        )
-        .limit(limit)
-    )
-    
+    """
+    Search users for mentions, assignments, etc.
+
+    Prefix autocomplete over the users search index, limited to members of
+    the caller's organizations (system admins search everyone).
+    """
+    scope = None if getattr(current_user, "is_admin", False) else current_user.id
+    users = await autocomplete_users(session, q, scope, limit)
+
     results = [
         UserSearchResponse(
             id=user.id,
             username=user.username,
             email=user.email,
-            full_name=f"{user.first_name} {user.last_name}".strip() or user.username,
+            full_name=user.full_name or f"{user.first_name or ''} {user.last_name or ''}".strip() or user.username,
             avatar_url=user.avatar_url
         )
         for user in users
@@ -616,6 +624,7 @@ async def admin_update_user(
         logger.error(f"Admin update failed for user {user_id}: {e}")
         problem(409, "urn:problem:update-failed", "Update Failed", 
                 "Failed to update user due to data constraint violation")
+    invalidation_bus.emit(CacheKind.USER, [user_id])
     
     await session.refresh(user)
     
@@ -663,6 +672,7 @@ async def delete_user(
         action = "user.soft_delete"
     
     await session.commit()
+    invalidation_bus.emit(CacheKind.USER, [user_id])
     
     await AuditLogger.log_event(
         session, current_user.id, action, True,
@@ -728,6 +738,7 @@ async def bulk_user_actions(
             })
     
     await session.commit()
+    invalidation_bus.emit(CacheKind.USER, results["success"])
     
     await AuditLogger.log_event(
         session, current_user.id, f"users.bulk_{action}", True,
@@ -0,0 +1,86 @@
+# apps/api/liderix_api/schemas/calendar.py
+from __future__ import annotations
+
+from datetime import datetime
+from typing import List, Literal, Optional
+from uuid import UUID
+
+from pydantic import BaseModel, Field
+
+from liderix_api.enums import EventStatus, EventType, RecurrenceType
+
+
+class CalendarOccurrence(BaseModel):
+    """One event (or one occurrence of a recurring series) inside a window"""
+    event_id: UUID = Field(description="Row that describes this occurrence (series or exception)")
+    series_id: Optional[UUID] = Field(None, description="Recurring series this occurrence belongs to")
+    calendar_id: UUID
+    title: str
+    description: Optional[str] = None
+    event_type: EventType
+    status: EventStatus
+    start: datetime
+    end: datetime
+    occurrence_start: Optional[datetime] = Field(
+        None, description="Scheduled start within the series; identifies the occurrence for edits"
+    )
+    is_all_day: bool = False
+    timezone: Optional[str] = None
+    location: Optional[str] = None
+    meeting_url: Optional[str] = None
+    color: Optional[str] = None
+    creator_id: Optional[UUID] = None
+    recurrence_type: RecurrenceType = RecurrenceType.NONE
+    is_exception: bool = False
+    is_private: bool = False
+    is_important: bool = False
+
+
+class CalendarRangeResponse(BaseModel):
+    start: datetime
+    end: datetime
+    calendar_ids: List[UUID]
+    events: List[CalendarOccurrence]
+
+
+# ----------------- free/busy & scheduling -----------------
+
+class FreeBusyRequest(BaseModel):
+    attendee_ids: List[UUID] = Field(min_length=1, max_length=100, description="Required attendees")
+    optional_attendee_ids: List[UUID] = Field(default_factory=list, max_length=100)
+    start: datetime
+    end: datetime
+    duration_minutes: int = Field(30, ge=5, le=1440)
+    slot_step_minutes: int = Field(15, ge=5, le=240)
+    respect_working_hours: bool = True
+    max_results: int = Field(10, ge=1, le=100)
+
+
+class BusyInterval(BaseModel):
+    start: datetime
+    end: datetime
+    status: Literal["busy", "tentative"]
+
+
+class AttendeeFreeBusy(BaseModel):
+    user_id: UUID
+    required: bool
+    timezone: Optional[str] = None
+    busy: List[BusyInterval]
+
+
+class SchedulingSlot(BaseModel):
+    start: datetime
+    end: datetime
+    available_optional: List[UUID] = Field(default_factory=list)
+    unavailable_optional: List[UUID] = Field(default_factory=list)
+    tentative_conflicts: List[UUID] = Field(
+        default_factory=list, description="Required attendees with a tentative event in the slot"
+    )
+
+
+class FreeBusyResponse(BaseModel):
+    start: datetime
+    end: datetime
+    attendees: List[AttendeeFreeBusy]
+    slots: List[SchedulingSlot]
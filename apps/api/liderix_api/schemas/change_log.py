@@ -0,0 +1,28 @@
+# apps/api/liderix_api/schemas/change_log.py
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+from uuid import UUID
+
+from pydantic import BaseModel, ConfigDict
+
+
+class ChangeLogEntry(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    id: UUID
+    entity_type: str
+    entity_id: UUID
+    org_id: Optional[UUID] = None
+    user_id: Optional[UUID] = None
+    action: str
+    # field -> {"old": ..., "new": ...}
+    changes: Dict[str, Any]
+    created_at: datetime
+
+
+class ChangeLogPage(BaseModel):
+    items: List[ChangeLogEntry]
+    next_cursor: Optional[str] = None
+    has_next: bool = False
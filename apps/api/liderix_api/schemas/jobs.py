@@ -0,0 +1,37 @@
+# apps/api/liderix_api/schemas/jobs.py
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Any, Dict, Optional
+from uuid import UUID
+
+from pydantic import BaseModel, ConfigDict
+
+from liderix_api.enums import JobStatus
+
+
+class JobRead(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    id: UUID
+    kind: str
+    status: JobStatus
+    progress: int = 0
+    progress_message: Optional[str] = None
+    attempts: int = 0
+    max_attempts: int
+    cancel_requested: bool = False
+    result: Optional[Dict[str, Any]] = None
+    error: Optional[str] = None
+    org_id: Optional[UUID] = None
+    created_at: datetime
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+
+
+class JobAccepted(BaseModel):
+    """202 body of endpoints that hand their work to a background job"""
+    job_id: UUID
+    kind: str
+    status: JobStatus
+    status_url: str
@@ -13,6 +13,9 @@ from datetime import datetime
 Role = Literal["owner", "admin", "manager", "member", "guest"]
 Status = Literal["active", "invited", "suspended"]
 
+# Bulk endpoints are set-based (a few queries per request regardless of size)
+MAX_BULK_MEMBERSHIPS = 5000
+
 # Что можно отдавать через ?fields=...
 MEMBERSHIP_READ_FIELDS_WHITELIST = {
     "id", "org_id", "user_id", "role", "department_id", "title",
@@ -169,7 +172,7 @@ class MembershipBulkCreateItem(BaseModel):
 
 
 class MembershipBulkCreateRequest(BaseModel):
-    memberships: List[MembershipBulkCreateItem] = Field(..., min_items=1, max_items=100)
+    memberships: List[MembershipBulkCreateItem] = Field(..., min_items=1, max_items=MAX_BULK_MEMBERSHIPS)
 
     model_config = ConfigDict(extra="forbid")
 
@@ -194,7 +197,7 @@ class MembershipBulkInviteItem(BaseModel):
 
 
 class MembershipBulkInviteRequest(BaseModel):
-    memberships: List[MembershipBulkInviteItem] = Field(..., min_items=1, max_items=100)
+    memberships: List[MembershipBulkInviteItem] = Field(..., min_items=1, max_items=MAX_BULK_MEMBERSHIPS)
 
     model_config = ConfigDict(extra="forbid")
 
@@ -202,6 +205,7 @@ class MembershipBulkInviteRequest(BaseModel):
 __all__ = [
     "Role",
     "Status",
+    "MAX_BULK_MEMBERSHIPS",
     "UserMini",
     "DepartmentMini",
     "MembershipBase",
@@ -0,0 +1,49 @@
+# apps/api/liderix_api/schemas/notifications.py
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+from uuid import UUID
+
+from pydantic import BaseModel, ConfigDict, Field
+
+from liderix_api.enums import NotificationStatus, NotificationType
+
+
+class NotificationRead(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    id: UUID
+    type: NotificationType
+    status: NotificationStatus
+    title: str
+    message: str
+    related_entity_type: Optional[str] = None
+    related_entity_id: Optional[UUID] = None
+    action_url: Optional[str] = None
+    action_text: Optional[str] = None
+    priority: str = "normal"
+    created_at: datetime
+    read_at: Optional[datetime] = None
+    expires_at: Optional[datetime] = None
+    meta_data: Optional[Dict[str, Any]] = None
+
+
+class NotificationFeedPage(BaseModel):
+    items: List[NotificationRead]
+    next_cursor: Optional[str] = None
+    has_next: bool = False
+    unread_count: int = 0
+
+
+class NotificationMarkRead(BaseModel):
+    ids: List[UUID] = Field(min_length=1, max_length=500)
+
+
+class NotificationReadResult(BaseModel):
+    updated: int
+    unread_count: int
+
+
+class UnreadCount(BaseModel):
+    unread_count: int
@@ -168,7 +168,7 @@ class TaskRead(TaskBase):
 class ProjectRead(ProjectBase):
     id: UUID
     org_id: Optional[UUID] = None
-    owner_id: UUID
+    owner_id: Optional[UUID] = None
     status: ProjectStatus
     priority: Optional[ProjectPriority] = None
     budget: Optional[float] = None
@@ -192,8 +192,13 @@ class ProjectDetailResponse(ProjectRead):
     model_config = ConfigDict(from_attributes=True)
 
 
+class ProjectListItem(ProjectRead):
+    """Project row for list views with a small organization summary"""
+    organization: Optional[Dict[str, Any]] = None
+
+
 class ProjectListResponse(BaseModel):
-    items: List[ProjectRead]
+    items: List[ProjectListItem]
     total: int
     page: int
     page_size: int
@@ -244,5 +249,8 @@ class ProjectSearchResponse(BaseModel):
     status: ProjectStatus
     member_count: int
     task_count: int
+    rank: float = 0.0
+    name_highlight: Optional[str] = None
+    highlight: Optional[str] = None
 
     model_config = ConfigDict(from_attributes=True)
\ No newline at end of file
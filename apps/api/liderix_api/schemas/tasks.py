@@ -1,12 +1,15 @@
 # apps/api/liderix_api/schemas/tasks.py
 from __future__ import annotations
 
-from pydantic import BaseModel, Field, ConfigDict
+from pydantic import AliasPath, BaseModel, Field, ConfigDict, computed_field, model_validator
 from typing import Optional, List, Dict, Any
 from uuid import UUID
-from datetime import datetime
+from calendar import monthrange
+from datetime import MAXYEAR, datetime, timezone
 from enum import Enum as PythonEnum
 
+from liderix_api.utils.avatars import avatar_thumbnail_url
+
 
 class TaskStatus(PythonEnum):
     TODO = "todo"
@@ -31,6 +34,41 @@ class TaskType(PythonEnum):
     RESEARCH = "research"
 
 
+# Recurring task schemas
+class RecurrencePattern(BaseModel):
+    """Schema for task recurrence patterns"""
+    frequency: str = Field(pattern="^(daily|weekly|monthly|yearly)$")
+    interval: int = Field(1, ge=1, le=365)
+    days_of_week: Optional[List[int]] = Field(None, description="0=Monday, 6=Sunday")
+    day_of_month: Optional[int] = Field(None, ge=1, le=31)
+    end_date: Optional[datetime] = None
+    max_occurrences: Optional[int] = Field(None, ge=1)
+    timezone: Optional[str] = Field(None, max_length=50, description="Timezone of the occurrence times")
+
+    @model_validator(mode="after")
+    def _check_days(self) -> "RecurrencePattern":
+        if self.days_of_week and any(not 0 <= day <= 6 for day in self.days_of_week):
+            raise ValueError("days_of_week must be between 0 (Monday) and 6 (Sunday)")
+        return self
+
+    def occurs_from(self, anchor: datetime) -> bool:
+        """
+        False when a monthly day_of_month is missing from every month the series
+        visits from `anchor` (e.g. the 30th every 12 months from February)
+        """
+        day = self.day_of_month
+        if self.frequency != "monthly" or day is None or day <= 28:
+            return True
+        # The visited months repeat within 12 periods, February's length within 4 years
+        for k in range(48):
+            year, month = divmod(anchor.year * 12 + anchor.month - 1 + k * self.interval, 12)
+            if year > MAXYEAR:
+                break
+            if day <= monthrange(year, month + 1)[1]:
+                return True
+        return False
+
+
 # Base schemas
 class TaskBase(BaseModel):
     title: str = Field(min_length=1, max_length=500)
@@ -50,11 +88,22 @@ class TaskCreate(TaskBase):
     project_id: Optional[UUID] = None
     parent_task_id: Optional[UUID] = None
     status: TaskStatus = TaskStatus.TODO
+    recurrence_pattern: Optional[RecurrencePattern] = Field(
+        None, description="Makes the task a recurring template"
+    )
+
+    @model_validator(mode="after")
+    def _check_recurrence(self) -> "TaskCreate":
+        anchor = self.due_date or self.start_date or datetime.now(timezone.utc)
+        if self.recurrence_pattern is not None and not self.recurrence_pattern.occurs_from(anchor):
+            raise ValueError("recurrence_pattern never produces an occurrence")
+        return self
 
 
 class TaskUpdate(BaseModel):
     title: Optional[str] = Field(None, min_length=1, max_length=500)
     description: Optional[str] = None
+    parent_task_id: Optional[UUID] = Field(None, description="null makes the task top-level")
     status: Optional[TaskStatus] = None
     priority: Optional[TaskPriority] = None
     task_type: Optional[TaskType] = None
@@ -68,6 +117,9 @@ class TaskUpdate(BaseModel):
     progress_percentage: Optional[int] = Field(None, ge=0, le=100)
     tags: Optional[List[str]] = None
     custom_fields: Optional[Dict[str, Any]] = None
+    recurrence_pattern: Optional[RecurrencePattern] = Field(
+        None, description="null stops the recurrence"
+    )
 
 
 class TaskStatusUpdate(BaseModel):
@@ -134,6 +186,10 @@ class TaskAttachmentRead(TaskAttachmentBase):
     file_size: Optional[int] = None
     created_at: datetime
     uploaded_by: Optional[Dict[str, Any]] = None
+    # Filled by the image pipeline for image attachments
+    thumbnail_url: Optional[str] = Field(None, validation_alias=AliasPath("meta_data", "thumbnail_url"))
+    image_width: Optional[int] = Field(None, validation_alias=AliasPath("meta_data", "image_width"))
+    image_height: Optional[int] = Field(None, validation_alias=AliasPath("meta_data", "image_height"))
 
     model_config = ConfigDict(from_attributes=True)
 
@@ -208,8 +264,15 @@ class TaskDetailResponse(TaskRead):
     model_config = ConfigDict(from_attributes=True)
 
 
+class TaskListItem(TaskRead):
+    """Task row for list views with small assignee/creator/project summaries"""
+    assignee: Optional[Dict[str, Any]] = None
+    creator: Optional[Dict[str, Any]] = None
+    project: Optional[Dict[str, Any]] = None
+
+
 class TaskListResponse(BaseModel):
-    items: List[TaskRead]
+    items: List[TaskListItem]
     total: int
     page: int
     page_size: int
@@ -238,11 +301,14 @@ class TaskSearchResponse(BaseModel):
     id: UUID
     title: str
     description: Optional[str] = None
-    status: TaskStatus
-    priority: TaskPriority
+    status: str
+    priority: str
     assignee_name: Optional[str] = None
     project_name: Optional[str] = None
     due_date: Optional[datetime] = None
+    rank: float = 0.0
+    title_highlight: Optional[str] = None
+    highlight: Optional[str] = None
 
     model_config = ConfigDict(from_attributes=True)
 
@@ -267,6 +333,68 @@ class TaskBulkStatusUpdate(BaseModel):
     comment: Optional[str] = None
 
 
+class TaskBulkFilter(BaseModel):
+    """Set-based selector for bulk mutations (all conditions are ANDed)"""
+    project_id: Optional[UUID] = None
+    assignee_id: Optional[UUID] = None
+    creator_id: Optional[UUID] = None
+    status: Optional[TaskStatus] = None
+    priority: Optional[TaskPriority] = None
+    unassigned: bool = False
+    due_before: Optional[datetime] = None
+
+
+# Bulk patch fields an explicit null clears; the other columns are NOT NULL
+BULK_CLEARABLE_FIELDS = frozenset({"assignee_id", "due_date", "start_date"})
+
+
+class TaskBulkPatch(BaseModel):
+    """Fields that can be changed for many tasks at once"""
+    status: Optional[TaskStatus] = None
+    priority: Optional[TaskPriority] = None
+    task_type: Optional[TaskType] = None
+    assignee_id: Optional[UUID] = None
+    due_date: Optional[datetime] = None
+    start_date: Optional[datetime] = None
+    progress_percentage: Optional[int] = Field(None, ge=0, le=100)
+    tags: Optional[List[str]] = None
+
+    @model_validator(mode="after")
+    def _check_nulls(self) -> "TaskBulkPatch":
+        nulls = sorted(
+            name for name in self.model_fields_set - BULK_CLEARABLE_FIELDS
+            if getattr(self, name) is None
+        )
+        if nulls:
+            raise ValueError(f"Fields cannot be null: {', '.join(nulls)}")
+        return self
+
+
+class TaskBulkMutation(BaseModel):
+    """Schema for POST /tasks/bulk: either explicit ids or a filter, plus a patch"""
+    task_ids: Optional[List[UUID]] = Field(None, min_length=1, max_length=1000)
+    filter: Optional[TaskBulkFilter] = None
+    patch: TaskBulkPatch
+    notify: bool = True
+
+    @model_validator(mode="after")
+    def _check_selector(self) -> "TaskBulkMutation":
+        if (self.task_ids is None) == (self.filter is None):
+            raise ValueError("Provide exactly one of task_ids or filter")
+        if not self.patch.model_fields_set:
+            raise ValueError("Patch must contain at least one field")
+        return self
+
+
+class TaskBulkMutationResponse(BaseModel):
+    """Result of a bulk mutation"""
+    matched: int
+    updated: int
+    updated_ids: List[UUID]
+    denied_ids: List[UUID] = []
+    errors: List[Dict[str, Any]] = []
+
+
 # Label schemas
 class TaskLabelBase(BaseModel):
     name: str = Field(min_length=1, max_length=100)
@@ -311,17 +439,6 @@ class TaskDependencyRead(BaseModel):
     model_config = ConfigDict(from_attributes=True)
 
 
-# Recurring task schemas
-class RecurrencePattern(BaseModel):
-    """Schema for task recurrence patterns"""
-    frequency: str = Field(pattern="^(daily|weekly|monthly|yearly)$")
-    interval: int = Field(ge=1, le=365)
-    days_of_week: Optional[List[int]] = Field(None, description="0=Monday, 6=Sunday")
-    day_of_month: Optional[int] = Field(None, ge=1, le=31)
-    end_date: Optional[datetime] = None
-    max_occurrences: Optional[int] = Field(None, ge=1)
-
-
 class TaskRecurringCreate(TaskCreate):
     """Schema for creating recurring tasks"""
     is_recurring: bool = True
@@ -357,6 +474,39 @@ class TaskCommentListResponse(BaseModel):
     model_config = ConfigDict(from_attributes=True)
 
 
+# Threaded comment page (keyset-paginated top-level threads)
+class TaskCommentAuthor(BaseModel):
+    id: UUID
+    username: Optional[str] = None
+    full_name: Optional[str] = None
+    avatar_url: Optional[str] = None
+
+    @computed_field
+    @property
+    def avatar_thumbnail_url(self) -> Optional[str]:
+        return avatar_thumbnail_url(self.avatar_url)
+
+
+class TaskCommentNode(BaseModel):
+    id: UUID
+    task_id: UUID
+    parent_comment_id: Optional[UUID] = None
+    content: str
+    content_type: str = "text"
+    is_internal: bool = False
+    created_at: datetime
+    updated_at: Optional[datetime] = None
+    author: Optional[TaskCommentAuthor] = None
+    reply_count: int = 0
+    replies: List["TaskCommentNode"] = []
+
+
+class TaskCommentThreadPage(BaseModel):
+    items: List[TaskCommentNode]
+    next_cursor: Optional[str] = None
+    has_next: bool = False
+
+
 # Time log list response
 class TaskTimeLogListResponse(BaseModel):
     items: List[TaskTimeLogRead]
@@ -368,6 +518,41 @@ class TaskTimeLogListResponse(BaseModel):
     model_config = ConfigDict(from_attributes=True)
 
 
+# Hierarchy schemas
+class TaskRollup(BaseModel):
+    """Totals over a task and all of its loaded descendants"""
+    estimated_hours: float = 0
+    actual_hours: float = 0
+    story_points: int = 0
+    progress_percentage: float = 0
+    descendants_count: int = 0
+    completed_descendants: int = 0
+
+
+class TaskHierarchyNode(BaseModel):
+    id: UUID
+    parent_task_id: Optional[UUID] = None
+    title: str
+    status: str
+    priority: str
+    assignee_id: Optional[UUID] = None
+    depth: int
+    estimated_hours: Optional[float] = None
+    actual_hours: Optional[float] = None
+    story_points: Optional[int] = None
+    progress_percentage: int = 0
+    has_more_children: bool = False
+    rollup: TaskRollup = Field(default_factory=TaskRollup)
+    children: List["TaskHierarchyNode"] = []
+
+
+class TaskHierarchyResponse(BaseModel):
+    root: TaskHierarchyNode
+    total_nodes: int
+    max_depth: int
+    truncated: bool = False
+
+
 # =============================================================================
 # ALIASES FOR COMPATIBILITY WITH ROUTES
 # =============================================================================
@@ -376,4 +561,7 @@ class TaskTimeLogListResponse(BaseModel):
 TaskCommentResponse = TaskCommentRead
 
 # Enable forward references for self-referencing models
-TaskCommentRead.model_rebuild()
\ No newline at end of file
+TaskCommentRead.model_rebuild()
+TaskHierarchyNode.model_rebuild()
+TaskCommentNode.model_rebuild()
+
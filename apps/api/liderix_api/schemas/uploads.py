@@ -0,0 +1,34 @@
+# apps/api/liderix_api/schemas/uploads.py
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Literal, Optional
+from uuid import UUID
+
+from pydantic import BaseModel, Field
+
+from liderix_api.enums import UploadStatus
+
+
+class ResumableUploadCreate(BaseModel):
+    """Start a resumable upload; the body is sent later with PATCH"""
+    filename: str = Field(min_length=1, max_length=255)
+    content_type: Optional[str] = Field(None, max_length=100)
+    size: int = Field(gt=0, description="Total size in bytes")
+    owner_type: Literal["task", "organization"]
+    owner_id: UUID
+
+
+class ResumableUploadRead(BaseModel):
+    id: UUID
+    filename: str
+    content_type: str
+    size: int
+    offset: int = Field(description="Bytes received so far; the next PATCH starts here")
+    status: UploadStatus
+    owner_type: str
+    owner_id: UUID
+    file_id: Optional[UUID] = None
+    file_hash: Optional[str] = None
+    expires_at: Optional[datetime] = None
+    completed_at: Optional[datetime] = None
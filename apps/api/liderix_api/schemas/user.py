@@ -1,12 +1,14 @@
 # apps/api/liderix_api/schemas/user.py
 from __future__ import annotations
 
-from pydantic import BaseModel, EmailStr, Field, ConfigDict, field_validator, model_validator
+from pydantic import BaseModel, EmailStr, Field, ConfigDict, computed_field, field_validator, model_validator
 from typing import Optional, List, Dict, Any
 from uuid import UUID
 from datetime import datetime
 from enum import Enum as PythonEnum
 
+from liderix_api.utils.avatars import avatar_thumbnail_url
+
 
 class UserRole(str, PythonEnum):
     ADMIN = "admin"
@@ -99,6 +101,12 @@ class UserSearchResponse(BaseModel):
 
     model_config = ConfigDict(from_attributes=True)
 
+    @computed_field
+    @property
+    def avatar_thumbnail_url(self) -> Optional[str]:
+        """Small avatar for lists"""
+        return avatar_thumbnail_url(self.avatar_url)
+
 
 class UserStatsResponse(BaseModel):
     """Schema for user statistics"""
@@ -131,6 +139,12 @@ class UserRead(UserBase):
 
     model_config = ConfigDict(from_attributes=True)
 
+    @computed_field
+    @property
+    def avatar_thumbnail_url(self) -> Optional[str]:
+        """Small avatar for lists"""
+        return avatar_thumbnail_url(self.avatar_url)
+
 
 class UserListResponse(BaseModel):
     items: List[UserRead]
@@ -0,0 +1,435 @@
+# apps/api/liderix_api/services/api_keys.py
+"""
+API-key authentication for machine clients (BI jobs and the like).
+
+Keys look like `lrx_<random>` and are stored only as SHA-256 hex digests in
+api_keys.key_hash. Keys are 256-bit random, so a fast unsalted digest is
+safe, and it can be looked up directly. The hot path is:
+
+    sha256(key) -> in-process cache -> Redis cache -> (miss) database
+
+plus one Redis round trip for the per-key token bucket. Unknown digests
+are cached negatively as well, so bad keys do not reach the database
+either. Revocation propagates within the cache TTLs, or immediately with
+invalidate_api_key().
+
+Per-key usage is counted in memory and flushed every few seconds into
+rate_limits (key "api_key:<id>", one row per hour) by a background task.
+"""
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import logging
+import math
+import secrets
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional, Tuple
+from uuid import UUID, uuid4
+
+from fastapi import HTTPException, Request, Response, Security, status
+from fastapi.security import APIKeyHeader
+from redis.asyncio import Redis
+from sqlalchemy import select, and_, func
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+
+from liderix_api.config.settings import settings
+from liderix_api.db import LiderixAsyncSessionLocal
+from liderix_api.models.api_keys import APIKey
+from liderix_api.models.memberships import Membership, MembershipStatus
+from liderix_api.models.rate_limits import RateLimit
+from liderix_api.models.users import User
+from liderix_api.services.invalidation import CacheKind, invalidation_bus
+
+logger = logging.getLogger(__name__)
+
+redis = Redis.from_url(settings.REDIS_URL)
+
+API_KEY_HEADER = "X-API-Key"
+KEY_PREFIX = "lrx_"
+ANALYTICS_READ_SCOPE = "analytics:read"
+
+MEMORY_TTL_SEC = 60
+REDIS_TTL_SEC = 300
+NEGATIVE_TTL_SEC = 30
+# Bounds the in-process cache (random keys are cached negatively)
+MAX_MEMORY_ENTRIES = 10_000
+USAGE_FLUSH_INTERVAL_SEC = 15
+USAGE_FLUSH_MAX_ATTEMPTS = 5
+
+api_key_header = APIKeyHeader(name=API_KEY_HEADER, auto_error=False)
+
+
+@dataclass(frozen=True)
+class ApiKeyPrincipal:
+    key_id: UUID
+    name: str
+    owner_id: UUID
+    # Org the usage is accounted to (owner's oldest active membership)
+    org_id: Optional[UUID]
+    scopes: frozenset
+    expires_at: Optional[float]
+
+    def has_scope(self, scope: str) -> bool:
+        resource = scope.split(":", 1)[0]
+        return "*" in self.scopes or scope in self.scopes or f"{resource}:*" in self.scopes
+
+    def to_json(self) -> str:
+        return json.dumps({
+            "key_id": str(self.key_id),
+            "name": self.name,
+            "owner_id": str(self.owner_id),
+            "org_id": str(self.org_id) if self.org_id else None,
+            "scopes": sorted(self.scopes),
+            "expires_at": self.expires_at,
+        })
+
+    @classmethod
+    def from_json(cls, raw: str) -> "ApiKeyPrincipal":
+        data = json.loads(raw)
+        return cls(
+            key_id=UUID(data["key_id"]),
+            name=data["name"],
+            owner_id=UUID(data["owner_id"]),
+            org_id=UUID(data["org_id"]) if data.get("org_id") else None,
+            scopes=frozenset(data.get("scopes") or []),
+            expires_at=data.get("expires_at"),
+        )
+
+
+def hash_api_key(raw_key: str) -> str:
+    return hashlib.sha256(raw_key.encode()).hexdigest()
+
+
+def generate_api_key() -> Tuple[str, str]:
+    """New key: (raw key shown to the user once, digest to store in key_hash)"""
+    raw_key = KEY_PREFIX + secrets.token_urlsafe(32)
+    return raw_key, hash_api_key(raw_key)
+
+
+def _problem(status_code: int, type_: str, title: str, detail: str, headers: Optional[Dict[str, str]] = None):
+    raise HTTPException(
+        status_code=status_code,
+        detail={"type": type_, "title": title, "detail": detail, "status": status_code},
+        headers=headers,
+    )
+
+
+# ----------------- key cache -----------------
+
+# digest -> (valid until (monotonic), principal or None for unknown keys)
+_memory: Dict[str, Tuple[float, Optional[ApiKeyPrincipal]]] = {}
+
+
+def _redis_key(key_hash: str) -> str:
+    return f"api_key:{key_hash}"
+
+
+async def _load_from_db(key_hash: str) -> Optional[ApiKeyPrincipal]:
+    usage_org = (
+        select(Membership.org_id)
+        .where(
+            and_(
+                Membership.user_id == APIKey.owner_id,
+                Membership.status == MembershipStatus.ACTIVE,
+                Membership.deleted_at.is_(None),
+            )
+        )
+        .order_by(Membership.created_at)
+        .limit(1)
+        .scalar_subquery()
+    )
+    async with LiderixAsyncSessionLocal() as session:
+        row = (await session.execute(
+            select(APIKey.id, APIKey.name, APIKey.owner_id, APIKey.scopes, APIKey.expires_at, usage_org.label("org_id"))
+            .join(User, User.id == APIKey.owner_id)
+            .where(
+                and_(
+                    APIKey.key_hash == key_hash,
+                    APIKey.is_active == True,
+                    APIKey.deleted_at.is_(None),
+                    User.is_active == True,
+                    User.deleted_at.is_(None),
+                )
+            )
+        )).first()
+    if row is None:
+        return None
+    expires_at = None
+    if row.expires_at is not None:
+        # Column is naive; values are UTC
+        expires_at = row.expires_at.replace(tzinfo=timezone.utc).timestamp()
+    return ApiKeyPrincipal(
+        key_id=row.id,
+        name=row.name,
+        owner_id=row.owner_id,
+        org_id=row.org_id,
+        scopes=frozenset(row.scopes or []),
+        expires_at=expires_at,
+    )
+
+
+async def lookup_api_key(key_hash: str) -> Optional[ApiKeyPrincipal]:
+    now = time.monotonic()
+    cached = _memory.get(key_hash)
+    if cached is not None and cached[0] > now:
+        return cached[1]
+
+    principal: Optional[ApiKeyPrincipal] = None
+    found = False
+    try:
+        raw = await redis.get(_redis_key(key_hash))
+        if raw is not None:
+            raw = raw.decode() if isinstance(raw, bytes) else raw
+            principal = ApiKeyPrincipal.from_json(raw) if raw else None
+            found = True
+    except Exception as e:
+        logger.warning("API key cache unavailable: %s", e)
+
+    if not found:
+        principal = await _load_from_db(key_hash)
+        try:
+            if principal is not None:
+                await redis.set(_redis_key(key_hash), principal.to_json(), ex=REDIS_TTL_SEC)
+            else:
+                await redis.set(_redis_key(key_hash), "", ex=NEGATIVE_TTL_SEC)
+        except Exception as e:
+            logger.warning("API key cache write failed: %s", e)
+
+    ttl = MEMORY_TTL_SEC if principal is not None else NEGATIVE_TTL_SEC
+    if len(_memory) >= MAX_MEMORY_ENTRIES:
+        _memory.clear()
+    _memory[key_hash] = (now + ttl, principal)
+    return principal
+
+
+async def invalidate_api_key(key_hash: str) -> None:
+    """Call after revoking/editing a key; other workers are told over the invalidation bus"""
+    invalidation_bus.emit(CacheKind.API_KEY, [key_hash])
+    try:
+        await redis.delete(_redis_key(key_hash))
+    except Exception as e:
+        logger.warning("API key cache invalidation failed: %s", e)
+
+
+def _evict_keys(key_hashes: Optional[frozenset]) -> None:
+    if key_hashes is None:
+        _memory.clear()
+        return
+    for key_hash in key_hashes:
+        _memory.pop(key_hash, None)
+
+
+def _evict_principals(attribute: str):
+    """Keys whose owner (USER, PERMISSIONS) or accounting org (ORG) changed"""
+    def evict(ids: Optional[frozenset]) -> None:
+        if ids is None:
+            _memory.clear()
+            return
+        for key_hash, (_, principal) in list(_memory.items()):
+            if principal is not None and str(getattr(principal, attribute)) in ids:
+                _memory.pop(key_hash, None)
+    return evict
+
+
+invalidation_bus.register(CacheKind.API_KEY, _evict_keys)
+invalidation_bus.register(CacheKind.USER, _evict_principals("owner_id"))
+# Memberships decide the org usage is accounted to
+invalidation_bus.register(CacheKind.PERMISSIONS, _evict_principals("owner_id"))
+invalidation_bus.register(CacheKind.ORG, _evict_principals("org_id"))
+
+
+# ----------------- token bucket -----------------
+
+_TOKEN_BUCKET_LUA = """
+local capacity = tonumber(ARGV[1])
+local rate = tonumber(ARGV[2])
+local now = tonumber(ARGV[3])
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(state[1]) or capacity
+local ts = tonumber(state[2]) or now
+tokens = math.min(capacity, tokens + math.max(0, now - ts) * rate)
+local allowed = 0
+if tokens >= 1 then
+    tokens = tokens - 1
+    allowed = 1
+end
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'ts', tostring(now))
+redis.call('EXPIRE', KEYS[1], math.ceil(capacity / rate) + 60)
+return {allowed, tostring(tokens)}
+"""
+_token_bucket = redis.register_script(_TOKEN_BUCKET_LUA)
+
+# Used only while Redis is unreachable (per-process, so limits are looser)
+_local_buckets: Dict[UUID, Tuple[float, float]] = {}
+
+
+def _bucket_params() -> Tuple[float, float]:
+    capacity = float(settings.API_KEY_RATE_LIMIT_BURST)
+    rate = settings.API_KEY_RATE_LIMIT_PER_HOUR / 3600.0
+    return capacity, rate
+
+
+def _take_local(key_id: UUID, capacity: float, rate: float, now: float) -> Tuple[bool, float]:
+    tokens, ts = _local_buckets.get(key_id, (capacity, now))
+    tokens = min(capacity, tokens + max(0.0, now - ts) * rate)
+    allowed = tokens >= 1
+    if allowed:
+        tokens -= 1
+    _local_buckets[key_id] = (tokens, now)
+    return allowed, tokens
+
+
+async def take_token(key_id: UUID) -> Tuple[bool, float, float]:
+    """(allowed, tokens left, seconds until the next token)"""
+    capacity, rate = _bucket_params()
+    now = time.time()
+    try:
+        allowed, tokens = await _token_bucket(keys=[f"api_key_bucket:{key_id}"], args=[capacity, rate, now])
+        allowed, tokens = bool(int(allowed)), float(tokens)
+    except Exception as e:
+        logger.warning("API key rate limiter unavailable, using local bucket: %s", e)
+        allowed, tokens = _take_local(key_id, capacity, rate, now)
+    retry_after = 0.0 if tokens >= 1 else (1 - tokens) / rate
+    return allowed, tokens, retry_after
+
+
+# ----------------- usage persistence -----------------
+
+# (key id, hour) -> [org id, hits] not yet written to rate_limits. One bucket
+# per upsert conflict target (key, window_start); the latest org wins if the
+# key's accounting org changes within the hour.
+_usage: Dict[Tuple[UUID, datetime], List[Any]] = {}
+# Failed flushes of the counts in _usage; they are dropped after USAGE_FLUSH_MAX_ATTEMPTS
+_flush_attempts = 0
+_flusher: Optional[asyncio.Task] = None
+
+
+def _record_usage(principal: ApiKeyPrincipal) -> None:
+    hour = datetime.now(timezone.utc).replace(minute=0, second=0, microsecond=0)
+    bucket = _usage.setdefault((principal.key_id, hour), [principal.org_id, 0])
+    bucket[0] = principal.org_id
+    bucket[1] += 1
+
+
+async def flush_usage() -> None:
+    global _usage, _flush_attempts
+    if not _usage:
+        return
+    pending, _usage = _usage, {}
+    rows = [
+        {
+            "id": uuid4(),
+            "key": f"api_key:{key_id}",
+            "org_id": org_id,
+            "hits": hits,
+            "window_start": hour,
+            "window_end": hour + timedelta(hours=1),
+        }
+        for (key_id, hour), (org_id, hits) in pending.items()
+    ]
+    stmt = pg_insert(RateLimit).values(rows)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[RateLimit.key, RateLimit.window_start],
+        set_={"hits": RateLimit.hits + stmt.excluded.hits, "updated_at": func.now()},
+    )
+    try:
+        async with LiderixAsyncSessionLocal() as session:
+            await session.execute(stmt)
+            await session.commit()
+    except Exception as e:
+        _flush_attempts += 1
+        if _flush_attempts >= USAGE_FLUSH_MAX_ATTEMPTS:
+            logger.error(
+                "Dropping API key usage of %d buckets after %d failed attempts: %s",
+                len(pending), _flush_attempts, e,
+            )
+            _flush_attempts = 0
+            return
+        logger.warning("Failed to persist API key usage: %s", e)
+        # Keep the counts for the next attempt; usage recorded meanwhile keeps its (newer) org
+        for bucket, (org_id, hits) in pending.items():
+            _usage.setdefault(bucket, [org_id, 0])[1] += hits
+        return
+    _flush_attempts = 0
+
+
+async def _flush_loop() -> None:
+    while True:
+        await asyncio.sleep(USAGE_FLUSH_INTERVAL_SEC)
+        await flush_usage()
+
+
+def start_usage_flusher() -> None:
+    global _flusher
+    if _flusher is None:
+        _flusher = asyncio.create_task(_flush_loop())
+
+
+async def stop_usage_flusher() -> None:
+    global _flusher
+    if _flusher is not None:
+        _flusher.cancel()
+        try:
+            await _flusher
+        except asyncio.CancelledError:
+            pass
+        _flusher = None
+    await flush_usage()
+
+
+# ----------------- authentication -----------------
+
+async def authenticate_api_key(raw_key: str, scope: str, response: Optional[Response] = None) -> ApiKeyPrincipal:
+    """Validate key, scope and quota; raises 401/403/429."""
+    if not raw_key.startswith(KEY_PREFIX):
+        _problem(401, "urn:problem:invalid-api-key", "Invalid API Key", "API key is not valid")
+
+    principal = await lookup_api_key(hash_api_key(raw_key))
+    if principal is None:
+        _problem(401, "urn:problem:invalid-api-key", "Invalid API Key", "API key is not valid")
+    if principal.expires_at is not None and principal.expires_at <= time.time():
+        _problem(401, "urn:problem:api-key-expired", "API Key Expired", "API key has expired")
+    if not principal.has_scope(scope):
+        _problem(403, "urn:problem:insufficient-scope", "Insufficient Scope", f"API key lacks scope: {scope}")
+    if principal.org_id is None:
+        # Usage rows belong to an organization; a key without one could not be metered
+        _problem(403, "urn:problem:api-key-no-organization", "API Key Has No Organization",
+                 "API key owner is not an active member of any organization")
+
+    allowed, tokens, retry_after = await take_token(principal.key_id)
+    _record_usage(principal)
+    headers = {
+        "X-RateLimit-Limit": str(settings.API_KEY_RATE_LIMIT_BURST),
+        "X-RateLimit-Remaining": str(max(0, int(tokens))),
+    }
+    if not allowed:
+        headers["Retry-After"] = str(max(1, math.ceil(retry_after)))
+        _problem(status.HTTP_429_TOO_MANY_REQUESTS, "urn:problem:rate-limited", "Too Many Requests",
+                 "API key quota exceeded", headers=headers)
+    if response is not None:
+        response.headers.update(headers)
+    return principal
+
+
+def optional_api_key(scope: str):
+    """
+    Dependency: validates and meters `X-API-Key` with `scope` when the header
+    is sent. Requests without it pass through unchanged (the data-analytics
+    endpoints stay open to the web app). Returns ApiKeyPrincipal or None.
+    """
+    async def dependency(
+        request: Request,
+        response: Response,
+        raw_key: Optional[str] = Security(api_key_header),
+    ) -> Optional[ApiKeyPrincipal]:
+        if not raw_key:
+            return None
+        principal = await authenticate_api_key(raw_key, scope, response)
+        request.state.api_key = principal
+        return principal
+
+    return dependency
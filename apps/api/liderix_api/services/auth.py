@@ -19,6 +19,7 @@ from sqlalchemy.exc import NoResultFound
 from liderix_api.db import get_async_session
 from liderix_api.models.users import User
 from liderix_api.config.settings import settings
+from liderix_api.services.change_log import set_change_actor
 
 logger = logging.getLogger(__name__)
 
@@ -174,6 +175,8 @@ async def get_current_user(
             status_code=status.HTTP_403_FORBIDDEN,
             detail={"type": "urn:problem:unverified", "title": "Email not verified", "status": 403},
         )
+    # Авторство изменений в change_logs для этого запроса
+    set_change_actor(user.id)
     return user
 
 
@@ -0,0 +1,338 @@
+# apps/api/liderix_api/services/board_events.py
+"""
+Live change events for task boards and project views.
+
+Mutations in routes/tasks.py and routes/projects.py publish one compact event
+per change (after commit) to the Redis channel board_events. Every API
+worker holds one subscription to it and relays each event to its WebSocket
+clients subscribed to any of the event's channels:
+
+    task:<id>       changes of one task
+    project:<id>    task changes inside the project + changes of the project
+    org:<id>        project changes inside the organization (ids only for
+                    non-public projects)
+
+Clients apply the deltas to what they loaded once instead of re-polling
+list_tasks. Channel access is checked with PermissionEvaluator ("read") when
+a client subscribes. When a project member is removed, that user's
+connections drop the project's channels and get "unsubscribed"; a client
+that still has access can subscribe again.
+
+Event: {"type": "task.updated", "id": "...", "project_id": "...",
+        "fields": {...changed fields...}, "actor_id": "...", "at": "..."}
+"""
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+from datetime import date, datetime, timezone
+from decimal import Decimal
+from enum import Enum
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Set, Tuple
+from uuid import UUID
+
+from redis.asyncio import Redis
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import noload
+
+from liderix_api.config.settings import settings
+from liderix_api.models.projects import Project
+from liderix_api.models.tasks import Task
+from liderix_api.models.users import User
+from liderix_api.services.permissions import PermissionEvaluator
+
+logger = logging.getLogger(__name__)
+
+redis = Redis.from_url(settings.REDIS_URL)
+
+CHANNEL = "board_events"
+CHANNEL_KINDS = ("task", "project", "org")
+MAX_CHANNELS_PER_CONNECTION = 200
+# Events buffered per connection; a client that falls behind is told to reload
+OUTBOX_SIZE = 256
+
+# What a board needs to place and render a task card
+TASK_CARD_FIELDS = (
+    "title", "status", "priority", "task_type", "assignee_id", "project_id", "parent_task_id",
+    "due_date", "start_date", "progress_percentage", "story_points", "completed_at", "updated_at",
+)
+PROJECT_CARD_FIELDS = (
+    "name", "status", "is_public", "start_date", "end_date", "updated_at",
+)
+
+
+def _jsonable(value: Any) -> Any:
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, UUID):
+        return str(value)
+    if isinstance(value, Decimal):
+        return float(value)
+    if isinstance(value, dict):
+        return {key: _jsonable(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple, set)):
+        return [_jsonable(item) for item in value]
+    return value
+
+
+def card(obj: Any, fields: Sequence[str]) -> Dict[str, Any]:
+    return {name: _jsonable(getattr(obj, name, None)) for name in fields}
+
+
+def task_card(task: Any) -> Dict[str, Any]:
+    return card(task, TASK_CARD_FIELDS)
+
+
+def project_card(project: Any) -> Dict[str, Any]:
+    return card(project, PROJECT_CARD_FIELDS)
+
+
+# ----------------- publishing -----------------
+
+async def publish(channels: Iterable[str], event: Dict[str, Any]) -> None:
+    """One PUBLISH per change, however many channels/clients it reaches"""
+    channels = list(dict.fromkeys(channel for channel in channels if channel))
+    if not channels:
+        return
+    event.setdefault("at", datetime.now(timezone.utc).isoformat())
+    try:
+        await redis.publish(CHANNEL, json.dumps({"channels": channels, "event": _jsonable(event)}))
+    except Exception as e:
+        logger.warning(f"Board event publish failed: {e}")
+
+
+async def publish_task_event(
+    action: str,
+    task_id: UUID,
+    project_ids: Iterable[Optional[UUID]],
+    fields: Optional[Dict[str, Any]] = None,
+    actor_id: Optional[UUID] = None,
+) -> None:
+    """task.created/updated/deleted; pass old and new project when a task moves"""
+    project_ids = [project_id for project_id in project_ids if project_id]
+    await publish(
+        [f"task:{task_id}"] + [f"project:{project_id}" for project_id in project_ids],
+        {
+            "type": f"task.{action}",
+            "id": task_id,
+            "project_id": project_ids[-1] if project_ids else None,
+            "fields": fields or {},
+            "actor_id": actor_id,
+        },
+    )
+
+
+async def publish_tasks_updated(
+    tasks: Sequence[Any], fields: Dict[str, Any], actor_id: Optional[UUID] = None
+) -> None:
+    """One event for a bulk patch: the same fields applied to many tasks"""
+    if not tasks:
+        return
+    await publish(
+        [f"task:{task.id}" for task in tasks]
+        + [f"project:{task.project_id}" for task in tasks if task.project_id],
+        {
+            "type": "task.bulk_updated",
+            "ids": [task.id for task in tasks],
+            "fields": fields,
+            "actor_id": actor_id,
+        },
+    )
+
+
+async def publish_project_event(
+    action: str,
+    project: Any,
+    fields: Optional[Dict[str, Any]] = None,
+    actor_id: Optional[UUID] = None,
+) -> None:
+    """
+    project.created/updated/deleted/member_added/member_removed. Org channels
+    reach every org member: for a non-public project they only get the id
+    and the event type, the details stay on the project channel.
+    """
+    event = {
+        "type": f"project.{action}",
+        "id": project.id,
+        "org_id": project.org_id,
+        "fields": fields or {},
+        "actor_id": actor_id,
+    }
+    org_channel = f"org:{project.org_id}" if project.org_id else None
+    if project.is_public:
+        await publish([f"project:{project.id}", org_channel], event)
+        return
+    await publish([f"project:{project.id}"], event)
+    await publish([org_channel], {"type": event["type"], "id": project.id, "org_id": project.org_id})
+
+
+# ----------------- channel authorization -----------------
+
+def parse_channel(channel: str) -> Optional[Tuple[str, UUID]]:
+    kind, _, raw_id = channel.partition(":")
+    if kind not in CHANNEL_KINDS:
+        return None
+    try:
+        return kind, UUID(raw_id)
+    except ValueError:
+        return None
+
+
+async def authorize_channels(
+    session: AsyncSession, user: User, channels: Sequence[str]
+) -> Tuple[Dict[str, Optional[UUID]], List[str]]:
+    """
+    Channels the user may read, each with the project that grants it (for
+    revocation), and the denied ones. Batched: at most one query per kind
+    plus the evaluator's snapshot.
+    """
+    parsed = {channel: parse_channel(channel) for channel in dict.fromkeys(channels)}
+    ids = {kind: {p[1] for p in parsed.values() if p and p[0] == kind} for kind in CHANNEL_KINDS}
+
+    objects: Dict[Tuple[str, UUID], Any] = {}
+    if ids["project"]:
+        for project in await session.scalars(
+            select(Project).options(noload("*")).where(
+                Project.id.in_(ids["project"]), Project.deleted_at.is_(None)
+            )
+        ):
+            objects[("project", project.id)] = project
+    if ids["task"]:
+        for row in (await session.execute(
+            select(
+                Task.id, Task.project_id, Task.org_id, Task.creator_id, Task.assignee_id,
+                Project.is_public.label("project_is_public"),
+            )
+            .outerjoin(Project, Project.id == Task.project_id)
+            .where(Task.id.in_(ids["task"]), Task.deleted_at.is_(None))
+        )).all():
+            objects[("task", row.id)] = row
+    for org_id in ids["org"]:
+        objects[("org", org_id)] = org_id
+
+    keys = list(objects)
+    decisions = await PermissionEvaluator.for_session(session).can(user, "read", [objects[key] for key in keys])
+    readable = {key for key, ok in zip(keys, decisions) if ok}
+
+    allowed: Dict[str, Optional[UUID]] = {}
+    denied: List[str] = []
+    for channel, key in parsed.items():
+        if key is None or key not in readable:
+            denied.append(channel)
+            continue
+        kind, object_id = key
+        allowed[channel] = (
+            object_id if kind == "project"
+            else objects[key].project_id if kind == "task"
+            else None
+        )
+    return allowed, denied
+
+
+# ----------------- per-process hub -----------------
+
+class BoardConnection:
+    """One WebSocket client: its channels and outgoing queue"""
+
+    def __init__(self, user_id: UUID):
+        self.user_id = user_id
+        # channel -> project whose membership granted it (None: not membership based)
+        self.channels: Dict[str, Optional[UUID]] = {}
+        self.outbox: asyncio.Queue = asyncio.Queue(maxsize=OUTBOX_SIZE)
+
+    def send(self, message: Dict[str, Any]) -> None:
+        try:
+            self.outbox.put_nowait(message)
+        except asyncio.QueueFull:
+            # Too slow to keep up: drop the backlog, the client reloads once
+            while not self.outbox.empty():
+                self.outbox.get_nowait()
+            self.outbox.put_nowait({"type": "resync"})
+
+
+class BoardHub:
+    def __init__(self):
+        self._channels: Dict[str, Set[BoardConnection]] = {}
+        self._listener: Optional[asyncio.Task] = None
+
+    def start(self) -> None:
+        if self._listener is None:
+            self._listener = asyncio.create_task(self._listen())
+
+    async def stop(self) -> None:
+        if self._listener is not None:
+            self._listener.cancel()
+            try:
+                await self._listener
+            except asyncio.CancelledError:
+                pass
+            self._listener = None
+
+    def join(self, connection: BoardConnection, channels: Dict[str, Optional[UUID]]) -> None:
+        for channel, project_id in channels.items():
+            connection.channels[channel] = project_id
+            self._channels.setdefault(channel, set()).add(connection)
+
+    def leave(self, connection: BoardConnection, channels: Iterable[str]) -> List[str]:
+        left = []
+        for channel in list(channels):
+            if connection.channels.pop(channel, ...) is ...:
+                continue
+            left.append(channel)
+            members = self._channels.get(channel)
+            if members is not None:
+                members.discard(connection)
+                if not members:
+                    del self._channels[channel]
+        return left
+
+    def detach(self, connection: BoardConnection) -> None:
+        self.leave(connection, list(connection.channels))
+
+    def dispatch(self, channels: Sequence[str], event: Dict[str, Any]) -> None:
+        targets: Set[BoardConnection] = set()
+        for channel in channels:
+            targets.update(self._channels.get(channel, ()))
+        for connection in targets:
+            connection.send(event)
+        if event.get("type") == "project.member_removed":
+            self._revoke(event)
+
+    def _revoke(self, event: Dict[str, Any]) -> None:
+        project_id, user_id = event.get("id"), (event.get("fields") or {}).get("user_id")
+        if not project_id or not user_id:
+            return
+        project_id, user_id = UUID(project_id), UUID(user_id)
+        for connection in {c for members in self._channels.values() for c in members if c.user_id == user_id}:
+            granted = [channel for channel, project in connection.channels.items() if project == project_id]
+            left = self.leave(connection, granted)
+            if left:
+                connection.send({"type": "unsubscribed", "channels": left, "reason": "access_revoked"})
+
+    async def _listen(self) -> None:
+        while True:
+            pubsub = redis.pubsub(ignore_subscribe_messages=True)
+            try:
+                await pubsub.subscribe(CHANNEL)
+                async for message in pubsub.listen():
+                    if message.get("type") != "message":
+                        continue
+                    payload = json.loads(message["data"])
+                    self.dispatch(payload["channels"], payload["event"])
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Board event subscription error: {e}; retrying")
+                await asyncio.sleep(5)
+            finally:
+                try:
+                    await pubsub.aclose()
+                except Exception:
+                    pass
+
+
+board_hub = BoardHub()
@@ -0,0 +1,505 @@
+# apps/api/liderix_api/services/calendar_query.py
+"""
+"What is on these calendars between A and B".
+
+Recurring events are stored once (the series) and expanded on the fly, only
+inside the requested window; nothing is materialized. One statement fetches
+everything a window needs for any number of calendars:
+
+- single events overlapping the window (GiST interval index ix_event_span)
+- recurring series that started before the window end and are still open
+  (partial index ix_event_series; series are few)
+- exceptions of those series whose original occurrence falls in the window
+  (ix_event_exception), so moved/cancelled occurrences are suppressed even
+  when the replacement lies elsewhere
+
+An exception is a row with parent_event_id and original_start_date: it
+replaces the series occurrence scheduled at original_start_date (status
+cancelled removes it). Expanded windows are cached per calendar in Redis;
+windows are widened to whole UTC days so month views of different users hit
+the same entries. Writers call invalidate_calendar_windows().
+
+recurrence_pattern (same keys as task recurrence patterns):
+    {"interval": 2, "days_of_week": [0, 2], "day_of_month": 15,
+     "max_occurrences": 10, "end_date": "...", "exdates": ["..."],
+     "frequency": "weekly"}    # frequency only for recurrence_type custom
+Occurrences keep the series' wall-clock time in its timezone across DST.
+"""
+from __future__ import annotations
+
+import calendar as _calendar
+import logging
+from dataclasses import dataclass
+from datetime import MAXYEAR, datetime, time, timedelta, timezone
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+from uuid import UUID
+from zoneinfo import ZoneInfo
+
+from pydantic import TypeAdapter
+from redis.asyncio import Redis
+from sqlalchemy import func, literal_column, or_, select, union_all
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from liderix_api.config.settings import settings
+from liderix_api.enums import EventStatus, RecurrenceType
+from liderix_api.models.calendar import CalendarEvent
+from liderix_api.schemas.calendar import CalendarOccurrence
+
+logger = logging.getLogger(__name__)
+
+redis = Redis.from_url(settings.REDIS_URL)
+
+WINDOW_CACHE_TTL_SEC = 300
+MAX_WINDOW_DAYS = 370
+# Guard against a minutely-dense series blowing up one response
+MAX_OCCURRENCES_PER_SERIES = 2000
+# Consecutive periods without a start after which a series is treated as over
+MAX_EMPTY_PERIODS = 48
+
+FREQUENCIES = ("daily", "weekly", "monthly", "yearly")
+
+_occurrences_adapter = TypeAdapter(List[CalendarOccurrence])
+
+_COLUMNS = (
+    "id", "calendar_id", "parent_event_id", "original_start_date", "title", "description",
+    "event_type", "status", "start_date", "end_date", "is_all_day", "timezone", "location",
+    "meeting_url", "color", "creator_id", "recurrence_type", "recurrence_pattern",
+    "recurrence_end_date", "is_private", "is_important",
+)
+
+
+class WindowTooLarge(Exception):
+    pass
+
+
+def _cache_key(calendar_id: UUID) -> str:
+    return f"calendar_window:{calendar_id}"
+
+
+def as_utc(value: datetime) -> datetime:
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc)
+
+
+def _parse_datetime(value: Any) -> Optional[datetime]:
+    if isinstance(value, datetime):
+        return as_utc(value)
+    if isinstance(value, str) and value:
+        try:
+            return as_utc(datetime.fromisoformat(value.replace("Z", "+00:00")))
+        except ValueError:
+            return None
+    return None
+
+
+def get_zone(name: Optional[str]) -> ZoneInfo:
+    try:
+        return ZoneInfo(name or "UTC")
+    except Exception:
+        return ZoneInfo("UTC")
+
+
+def align_window(start: datetime, end: datetime) -> Tuple[datetime, datetime]:
+    """Widen [start, end) to whole UTC days (the unit of caching)"""
+    start, end = as_utc(start), as_utc(end)
+    a = datetime.combine(start.date(), time.min, tzinfo=timezone.utc)
+    b = datetime.combine(end.date(), time.min, tzinfo=timezone.utc)
+    if b < end:
+        b += timedelta(days=1)
+    return a, b
+
+
+# ----------------- recurrence rules -----------------
+
+@dataclass(frozen=True)
+class RecurrenceRule:
+    frequency: str
+    interval: int = 1
+    days_of_week: Tuple[int, ...] = ()
+    day_of_month: Optional[int] = None
+    count: Optional[int] = None
+    until: Optional[datetime] = None
+    exdates: frozenset = frozenset()
+
+
+def parse_rule(
+    recurrence_type: Any,
+    pattern: Optional[Dict[str, Any]],
+    recurrence_end_date: Optional[datetime] = None,
+) -> Optional[RecurrenceRule]:
+    """Rule of a series; None for single events and patterns we can't expand"""
+    kind = getattr(recurrence_type, "value", recurrence_type)
+    pattern = pattern or {}
+    if kind == RecurrenceType.CUSTOM.value:
+        kind = str(pattern.get("frequency") or "").lower()
+    if kind not in FREQUENCIES:
+        return None
+
+    try:
+        interval = max(1, int(pattern.get("interval") or 1))
+        days = tuple(sorted({int(d) % 7 for d in pattern.get("days_of_week") or ()}))
+        day_of_month = int(pattern["day_of_month"]) if pattern.get("day_of_month") else None
+        count = int(pattern["max_occurrences"]) if pattern.get("max_occurrences") else None
+    except (TypeError, ValueError):
+        return None
+
+    until = _parse_datetime(pattern.get("end_date"))
+    if recurrence_end_date is not None:
+        until = min(until, as_utc(recurrence_end_date)) if until else as_utc(recurrence_end_date)
+    exdates = frozenset(filter(None, (_parse_datetime(d) for d in pattern.get("exdates") or ())))
+
+    return RecurrenceRule(
+        frequency=kind,
+        interval=interval,
+        days_of_week=days,
+        day_of_month=day_of_month if day_of_month and 1 <= day_of_month <= 31 else None,
+        count=count,
+        until=until,
+        exdates=exdates,
+    )
+
+
+def _add_months(year: int, month: int, months: int) -> Tuple[int, int]:
+    index = year * 12 + (month - 1) + months
+    return index // 12, index % 12 + 1
+
+
+def _local_starts(rule: RecurrenceRule, first: datetime, skip_periods: int) -> Iterator[datetime]:
+    """
+    Naive local start times of the series in order, beginning `skip_periods`
+    periods after the first one (only used when the count doesn't matter).
+    Ends at the last representable year, and after MAX_EMPTY_PERIODS periods
+    in a row without a start (e.g. the 30th every 12 months from February).
+    """
+    step = rule.interval
+    try:
+        if rule.frequency == "daily":
+            k = skip_periods
+            while True:
+                yield first + timedelta(days=k * step)
+                k += 1
+
+        elif rule.frequency == "weekly":
+            days = rule.days_of_week or (first.weekday(),)
+            monday = first - timedelta(days=first.weekday())
+            k = skip_periods
+            while True:
+                week = monday + timedelta(weeks=k * step)
+                for day in days:
+                    candidate = week + timedelta(days=day)
+                    if candidate >= first:
+                        yield candidate
+                k += 1
+
+        elif rule.frequency == "monthly":
+            day = rule.day_of_month or first.day
+            k = skip_periods
+            empty = 0
+            while empty < MAX_EMPTY_PERIODS:
+                year, month = _add_months(first.year, first.month, k * step)
+                k += 1
+                if year > MAXYEAR:
+                    return
+                # Months without that day are skipped (RFC 5545)
+                if day > _calendar.monthrange(year, month)[1]:
+                    empty += 1
+                    continue
+                empty = 0
+                candidate = first.replace(year=year, month=month, day=day)
+                if candidate >= first:
+                    yield candidate
+
+        else:  # yearly
+            k = skip_periods
+            empty = 0
+            while empty < MAX_EMPTY_PERIODS:
+                year = first.year + k * step
+                k += 1
+                if year > MAXYEAR:
+                    return
+                if first.month == 2 and first.day == 29 and not _calendar.isleap(year):
+                    empty += 1
+                    continue
+                empty = 0
+                yield first.replace(year=year)
+    except OverflowError:
+        # Past datetime.max
+        return
+
+
+def _period(rule: RecurrenceRule) -> timedelta:
+    days = {"daily": 1, "weekly": 7, "monthly": 28, "yearly": 365}[rule.frequency]
+    return timedelta(days=days * rule.interval)
+
+
+def expand(
+    start: datetime,
+    end: datetime,
+    tz_name: Optional[str],
+    rule: RecurrenceRule,
+    window_start: datetime,
+    window_end: datetime,
+    limit: int = MAX_OCCURRENCES_PER_SERIES,
+) -> List[datetime]:
+    """UTC start times of the occurrences overlapping [window_start, window_end)"""
+    start, end = as_utc(start), as_utc(end)
+    duration = end - start
+    zone = get_zone(tz_name)
+    first = start.astimezone(zone).replace(tzinfo=None)
+
+    # Without a count the occurrence number doesn't matter: jump close to the
+    # window instead of walking the series from its beginning. The period is
+    # underestimated (28-day months) and one extra period is kept for DST.
+    skip = 0
+    earliest = window_start - duration
+    if rule.count is None and earliest > start:
+        skip = max(0, (earliest - start) // _period(rule) - 1)
+
+    result: List[datetime] = []
+    for number, local in enumerate(_local_starts(rule, first, skip)):
+        if rule.count is not None and number >= rule.count:
+            break
+        try:
+            occurrence = local.replace(tzinfo=zone).astimezone(timezone.utc)
+        except OverflowError:
+            break
+        if occurrence >= window_end or (rule.until is not None and occurrence > rule.until):
+            break
+        if occurrence in rule.exdates:
+            continue
+        if occurrence + duration > window_start or (not duration and occurrence >= window_start):
+            result.append(occurrence)
+            if len(result) >= limit:
+                break
+    return result
+
+
+def next_occurrence(
+    start: datetime, tz_name: Optional[str], rule: RecurrenceRule, after: datetime
+) -> Optional[datetime]:
+    """First occurrence starting at or after `after`; None once the series is over"""
+    # Long enough for the sparsest rule (Feb 29 every `interval` years)
+    after = as_utc(after)
+    horizon = after + min(timedelta(days=1500 * rule.interval), datetime.max.replace(tzinfo=timezone.utc) - after)
+    found = expand(start, start, tz_name, rule, after, horizon, limit=1)
+    return found[0] if found else None
+
+
+# ----------------- fetching -----------------
+
+def _select(table, *where):
+    return select(*[table.c[name] for name in _COLUMNS]).where(*where)
+
+
+def window_statement(scope: Callable[[Any], Any], window_start: datetime, window_end: datetime):
+    """
+    Single events, open series and their exceptions for a window, in one
+    statement. `scope(table)` selects the events of interest (calendars,
+    attendees); exceptions are found through their series.
+    """
+    events = CalendarEvent.__table__
+    series_rows = events.alias("series_rows")
+    exceptions = events.alias("exceptions")
+
+    single = _select(
+        events,
+        scope(events),
+        events.c.is_deleted.is_(False),
+        events.c.recurrence_type == RecurrenceType.NONE,
+        # Same expression as ix_event_span
+        func.tstzrange(events.c.start_date, events.c.end_date, literal_column("'[]'")).op("&&")(
+            func.tstzrange(window_start, window_end, literal_column("'[)'"))
+        ),
+    )
+
+    series = _select(
+        series_rows,
+        scope(series_rows),
+        series_rows.c.is_deleted.is_(False),
+        series_rows.c.recurrence_type != RecurrenceType.NONE,
+        series_rows.c.parent_event_id.is_(None),
+        series_rows.c.start_date < window_end,
+        or_(
+            series_rows.c.recurrence_end_date.is_(None),
+            series_rows.c.recurrence_end_date + (series_rows.c.end_date - series_rows.c.start_date) > window_start,
+        ),
+    ).cte("series")
+
+    # Exceptions replacing an occurrence of one of those series in the window
+    replaced = _select(
+        exceptions,
+        exceptions.c.is_deleted.is_(False),
+        exceptions.c.original_start_date < window_end,
+        exceptions.c.original_start_date + (series.c.end_date - series.c.start_date) > window_start,
+    ).join_from(exceptions, series, exceptions.c.parent_event_id == series.c.id)
+
+    return union_all(single, select(series), replaced)
+
+
+def _occurrence(row: Any, start: datetime, end: datetime, **extra: Any) -> CalendarOccurrence:
+    return CalendarOccurrence(
+        event_id=row.id,
+        calendar_id=row.calendar_id,
+        title=row.title,
+        description=row.description,
+        event_type=row.event_type,
+        status=row.status,
+        start=start,
+        end=end,
+        is_all_day=row.is_all_day,
+        timezone=row.timezone,
+        location=row.location,
+        meeting_url=row.meeting_url,
+        color=row.color,
+        creator_id=row.creator_id,
+        recurrence_type=row.recurrence_type,
+        is_private=row.is_private,
+        is_important=row.is_important,
+        **extra,
+    )
+
+
+def _overlaps(start: datetime, end: datetime, window_start: datetime, window_end: datetime) -> bool:
+    return start < window_end and (end > window_start or (start == end and start >= window_start))
+
+
+def expand_rows(
+    rows: Iterable[Any], window_start: datetime, window_end: datetime
+) -> Iterator[Tuple[Any, datetime, datetime, Dict[str, Any]]]:
+    """
+    (row, start, end, extra) for every occurrence in the window: single
+    events as they are, series expanded, exceptions in place of the
+    occurrences they replace (cancelled ones dropped).
+    """
+    by_id: Dict[UUID, Any] = {}
+    for row in rows:
+        by_id.setdefault(row.id, row)
+
+    # (series_id, original start) -> exception row
+    replaced = {
+        (row.parent_event_id, as_utc(row.original_start_date)): row
+        for row in by_id.values()
+        if row.parent_event_id is not None and row.original_start_date is not None
+    }
+
+    for row in by_id.values():
+        start, end = as_utc(row.start_date), as_utc(row.end_date)
+        rule = parse_rule(row.recurrence_type, row.recurrence_pattern, row.recurrence_end_date) \
+            if row.parent_event_id is None else None
+
+        if rule is None:
+            if row.parent_event_id is not None and row.status == EventStatus.CANCELLED:
+                continue
+            if not _overlaps(start, end, window_start, window_end):
+                continue
+            extra = {}
+            if row.parent_event_id is not None:
+                extra = {
+                    "series_id": row.parent_event_id,
+                    "occurrence_start": as_utc(row.original_start_date or row.start_date),
+                    "is_exception": True,
+                }
+            yield row, start, end, extra
+            continue
+
+        duration = end - start
+        for occurrence in expand(start, end, row.timezone, rule, window_start, window_end):
+            if (row.id, occurrence) in replaced:
+                continue
+            yield row, occurrence, occurrence + duration, {"series_id": row.id, "occurrence_start": occurrence}
+
+
+def build_occurrences(
+    rows: Iterable[Any], window_start: datetime, window_end: datetime
+) -> Dict[UUID, List[CalendarOccurrence]]:
+    """Expand series, apply exceptions and group the result by calendar"""
+    result: Dict[UUID, List[CalendarOccurrence]] = {}
+    for row, start, end, extra in expand_rows(rows, window_start, window_end):
+        result.setdefault(row.calendar_id, []).append(_occurrence(row, start, end, **extra))
+    return result
+
+
+# ----------------- cache -----------------
+
+def _window_field(window_start: datetime, window_end: datetime) -> str:
+    return f"{window_start:%Y%m%d}-{window_end:%Y%m%d}"
+
+
+async def _read_cached(calendar_ids: Sequence[UUID], field: str) -> Dict[UUID, List[CalendarOccurrence]]:
+    try:
+        async with redis.pipeline(transaction=False) as pipe:
+            for calendar_id in calendar_ids:
+                pipe.hget(_cache_key(calendar_id), field)
+            values = await pipe.execute()
+    except Exception as e:
+        logger.warning(f"Calendar window cache read failed: {e}")
+        return {}
+    return {
+        calendar_id: _occurrences_adapter.validate_json(value)
+        for calendar_id, value in zip(calendar_ids, values)
+        if value is not None
+    }
+
+
+async def _write_cached(windows: Dict[UUID, List[CalendarOccurrence]], field: str) -> None:
+    try:
+        async with redis.pipeline(transaction=False) as pipe:
+            for calendar_id, occurrences in windows.items():
+                key = _cache_key(calendar_id)
+                pipe.hset(key, field, _occurrences_adapter.dump_json(occurrences))
+                pipe.expire(key, WINDOW_CACHE_TTL_SEC)
+            await pipe.execute()
+    except Exception as e:
+        logger.warning(f"Calendar window cache write failed: {e}")
+
+
+async def invalidate_calendar_windows(calendar_ids: Iterable[Optional[UUID]]) -> None:
+    """Drop cached windows after events of these calendars changed"""
+    keys = [_cache_key(calendar_id) for calendar_id in set(calendar_ids) if calendar_id]
+    if not keys:
+        return
+    try:
+        await redis.delete(*keys)
+    except Exception as e:
+        logger.warning(f"Calendar window cache invalidation failed: {e}")
+
+
+# ----------------- public API -----------------
+
+async def get_calendar_occurrences(
+    session: AsyncSession,
+    calendar_ids: Sequence[UUID],
+    start: datetime,
+    end: datetime,
+) -> List[CalendarOccurrence]:
+    """Events and expanded occurrences overlapping [start, end), sorted by start"""
+    start, end = as_utc(start), as_utc(end)
+    if end <= start:
+        return []
+    if end - start > timedelta(days=MAX_WINDOW_DAYS):
+        raise WindowTooLarge(f"Windows are limited to {MAX_WINDOW_DAYS} days")
+
+    calendar_ids = list(dict.fromkeys(calendar_ids))
+    window_start, window_end = align_window(start, end)
+    field = _window_field(window_start, window_end)
+
+    windows = await _read_cached(calendar_ids, field)
+    missing = [calendar_id for calendar_id in calendar_ids if calendar_id not in windows]
+    if missing:
+        statement = window_statement(lambda events: events.c.calendar_id.in_(missing), window_start, window_end)
+        rows = (await session.execute(statement)).all()
+        fetched = build_occurrences(rows, window_start, window_end)
+        fresh = {calendar_id: fetched.get(calendar_id, []) for calendar_id in missing}
+        await _write_cached(fresh, field)
+        windows.update(fresh)
+
+    return sorted(
+        (
+            occurrence
+            for calendar_id in calendar_ids
+            for occurrence in windows.get(calendar_id, ())
+            if _overlaps(occurrence.start, occurrence.end, start, end)
+        ),
+        key=lambda occurrence: (occurrence.start, occurrence.end),
+    )
@@ -0,0 +1,456 @@
+# apps/api/liderix_api/services/change_log.py
+"""
+Field-level change history (change_logs) of tasks, projects, KPIs and OKRs.
+
+Capture: an after_flush listener on every Session diffs the tracked columns of
+the new, changed and deleted objects from their attribute history (no extra
+queries) and keeps the entries in session.info, grouped by the innermost
+SAVEPOINT (begin_nested) open at the time. Releasing a SAVEPOINT hands its
+entries to the enclosing one; rolling it back drops them. They are queued
+when the outermost transaction commits and dropped when it ends any other
+way, so a rolled back change leaves no history. Core UPDATEs bypass the
+ORM; their callers report the change with record_bulk_update().
+
+Write: committed entries wait in worker memory and are INSERTed in batches
+(multi-row VALUES) every CHANGE_LOG_FLUSH_INTERVAL_SEC, or as soon as
+CHANGE_LOG_FLUSH_SIZE are queued; a request never waits for its history.
+Timelines therefore lag writes by up to one interval. The actor is the user
+authenticated for the request (get_current_user); changes made by
+background loops have no user.
+
+Entry: {"entity_type": "task", "entity_id": ..., "org_id": ..., "user_id": ...,
+        "action": "updated", "changes": {"status": {"old": "todo", "new": "done"}}}
+action is created / updated / deleted / restored (soft delete via deleted_at
+or is_deleted). "old" is left out when the previous value was never loaded.
+
+Read: keyset pages on (created_at, id), newest first:
+- one entity: ix_change_logs_entity_timeline (entity_type, entity_id,
+  created_at DESC, id DESC), so a task's activity feed is a single index
+  range scan
+- one organization: ix_change_logs_org_timeline (org_id, created_at DESC, id DESC)
+"""
+from __future__ import annotations
+
+import asyncio
+import base64
+import json
+import logging
+from contextvars import ContextVar
+from dataclasses import dataclass
+from datetime import date, datetime, timezone
+from decimal import Decimal
+from enum import Enum
+from functools import lru_cache
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Tuple, Type
+from uuid import UUID, uuid4
+
+from sqlalchemy import event, inspect, insert, literal, select, tuple_
+from sqlalchemy.dialects.postgresql import UUID as PG_UUID
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from liderix_api.config.settings import settings
+from liderix_api.db import LiderixAsyncSessionLocal
+from liderix_api.models.change_logs import ChangeLog
+from liderix_api.models.kpi import KPI
+from liderix_api.models.okrs import KeyResult, Objective
+from liderix_api.models.projects import Project
+from liderix_api.models.tasks import Task
+
+logger = logging.getLogger(__name__)
+
+# Rows per INSERT statement, under the 32767 bind parameter limit
+INSERT_CHUNK_ROWS = 1000
+# Entries kept while the database is unreachable; the oldest are dropped beyond it
+MAX_BUFFERED_ENTRIES = 50_000
+# Long texts are cut in the history
+MAX_VALUE_CHARS = 500
+
+# session.info key: {innermost SAVEPOINT (None: outermost transaction): entries}
+_PENDING_KEY = "change_log_pending"
+
+
+@dataclass(frozen=True)
+class TrackedEntity:
+    entity_type: str
+    fields: Tuple[str, ...]
+
+
+TRACKED: Dict[type, TrackedEntity] = {
+    Task: TrackedEntity("task", (
+        "title", "description", "status", "priority", "task_type", "assignee_id", "reporter_id",
+        "project_id", "parent_task_id", "due_date", "start_date", "completed_at", "estimated_hours",
+        "actual_hours", "story_points", "progress_percentage", "tags", "custom_fields",
+    )),
+    Project: TrackedEntity("project", (
+        "name", "description", "status", "start_date", "end_date", "is_public",
+    )),
+    KPI: TrackedEntity("kpi", (
+        "name", "description", "target_value", "current_value", "unit", "is_active", "on_track",
+    )),
+    Objective: TrackedEntity("objective", (
+        "title", "description", "status", "start_date", "due_date",
+    )),
+    KeyResult: TrackedEntity("key_result", (
+        "objective_id", "description", "start_value", "target_value", "current_value", "unit",
+    )),
+}
+ENTITY_TYPES = tuple(entity.entity_type for entity in TRACKED.values())
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+# ----------------- actor -----------------
+
+_actor: ContextVar[Optional[UUID]] = ContextVar("change_log_actor", default=None)
+
+
+def set_change_actor(user_id: Optional[UUID]) -> None:
+    """User the changes of the current request are attributed to"""
+    _actor.set(user_id)
+
+
+# ----------------- capture -----------------
+
+@lru_cache(maxsize=None)
+def _tracked(cls: type) -> Optional[TrackedEntity]:
+    # Subclasses (OKR) share their base's history
+    for base in cls.__mro__:
+        if base in TRACKED:
+            return TRACKED[base]
+    return None
+
+
+def _value(value: Any) -> Any:
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, UUID):
+        return str(value)
+    if isinstance(value, Decimal):
+        return float(value)
+    if isinstance(value, str) and len(value) > MAX_VALUE_CHARS:
+        return value[:MAX_VALUE_CHARS] + "…"
+    if isinstance(value, dict):
+        return {str(key): _value(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple, set)):
+        return [_value(item) for item in value]
+    return value
+
+
+def _org_id(session: Session, obj: Any) -> Optional[UUID]:
+    state = inspect(obj)
+    org_id = state.dict.get("org_id")
+    if org_id is None and isinstance(obj, KeyResult):
+        # Only what is already in memory: no lazy loads inside a flush
+        objective = state.dict.get("objective")
+        if objective is None and state.dict.get("objective_id") is not None:
+            objective = session.identity_map.get(session.identity_key(Objective, state.dict["objective_id"]))
+        if objective is not None:
+            org_id = inspect(objective).dict.get("org_id")
+    return org_id
+
+
+def _entry(
+    entity_type: str,
+    entity_id: UUID,
+    org_id: Optional[UUID],
+    action: str,
+    changes: Dict[str, Any],
+    user_id: Optional[UUID],
+    created_at: datetime,
+) -> Dict[str, Any]:
+    # Same keys in every entry: they are inserted with one multi-row VALUES
+    return {
+        "id": uuid4(),
+        "entity_type": entity_type,
+        "entity_id": entity_id,
+        "org_id": org_id,
+        "user_id": user_id,
+        "action": action,
+        "changes": changes,
+        "created_at": created_at,
+    }
+
+
+def _field_changes(state: Any, fields: Sequence[str]) -> Dict[str, Any]:
+    changes = {}
+    for name in fields:
+        history = state.attrs[name].history
+        if not history.added:
+            continue
+        new = _value(history.added[0])
+        if not history.deleted:
+            changes[name] = {"new": new}
+            continue
+        old = _value(history.deleted[0])
+        if old != new:
+            changes[name] = {"old": old, "new": new}
+    return changes
+
+
+def _soft_delete_action(state: Any) -> Optional[str]:
+    for name in ("deleted_at", "is_deleted"):
+        if name in state.mapper.column_attrs:
+            added = state.attrs[name].history.added
+            if added:
+                return "deleted" if added[0] else "restored"
+    return None
+
+
+@event.listens_for(Session, "after_flush")
+def _capture_changes(session: Session, _flush_context: Any) -> None:
+    if not settings.CHANGE_LOG_ENABLED:
+        return
+    now = datetime.now(timezone.utc)
+    actor = _actor.get()
+    entries = []
+
+    for obj in session.new:
+        entity = _tracked(type(obj))
+        if entity is None:
+            continue
+        state = inspect(obj)
+        changes = {
+            name: {"new": _value(state.dict[name])}
+            for name in entity.fields if state.dict.get(name) is not None
+        }
+        entries.append(_entry(entity.entity_type, obj.id, _org_id(session, obj), "created", changes, actor, now))
+
+    for obj in session.dirty:
+        entity = _tracked(type(obj))
+        if entity is None:
+            continue
+        state = inspect(obj)
+        changes = _field_changes(state, entity.fields)
+        action = _soft_delete_action(state) or "updated"
+        if not changes and action == "updated":
+            # Only untracked columns (updated_at, search_vector, ...)
+            continue
+        entries.append(_entry(entity.entity_type, obj.id, _org_id(session, obj), action, changes, actor, now))
+
+    for obj in session.deleted:
+        entity = _tracked(type(obj))
+        if entity is None:
+            continue
+        entries.append(_entry(entity.entity_type, obj.id, _org_id(session, obj), "deleted", {}, actor, now))
+
+    if entries:
+        pending = session.info.setdefault(_PENDING_KEY, {})
+        pending.setdefault(session.get_nested_transaction(), []).extend(entries)
+
+
+@event.listens_for(Session, "after_commit")
+def _queue_committed(session: Session) -> None:
+    if session.in_nested_transaction():
+        # SAVEPOINT released: its entries move up in _close_transaction
+        return
+    pending = session.info.pop(_PENDING_KEY, None)
+    if pending:
+        _enqueue([entry for entries in pending.values() for entry in entries])
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_rolled_back(session: Session) -> None:
+    # Fires for the SAVEPOINT being rolled back, or the outermost transaction
+    savepoint = session.get_nested_transaction()
+    if savepoint is None:
+        session.info.pop(_PENDING_KEY, None)
+    elif _PENDING_KEY in session.info:
+        session.info[_PENDING_KEY].pop(savepoint, None)
+
+
+@event.listens_for(Session, "after_transaction_end")
+def _close_transaction(session: Session, transaction: Any) -> None:
+    if transaction.parent is None:
+        # Runs after after_commit, so whatever is left was abandoned
+        session.info.pop(_PENDING_KEY, None)
+        return
+    pending = session.info.get(_PENDING_KEY)
+    if not transaction.nested or not pending:
+        return
+    # Released, or closed with its parent: the enclosing SAVEPOINT (or the
+    # outermost transaction) now owns the entries and decides their fate
+    entries = pending.pop(transaction, None)
+    if entries:
+        pending.setdefault(session.get_nested_transaction(), []).extend(entries)
+
+
+def record_bulk_update(
+    model: Type[Any],
+    rows: Sequence[Any],
+    values: Mapping[str, Any],
+    user_id: Optional[UUID] = None,
+) -> None:
+    """
+    History of a Core UPDATE that set `values` on `rows` (call after commit).
+    Rows need `id` and `org_id`; tracked fields they also carry give "old".
+    """
+    entity = _tracked(model)
+    if entity is None or not rows or not settings.CHANGE_LOG_ENABLED:
+        return
+    fields = [name for name in entity.fields if name in values]
+    action = None
+    if "deleted_at" in values or "is_deleted" in values:
+        action = "deleted" if values.get("deleted_at", values.get("is_deleted")) else "restored"
+    now = datetime.now(timezone.utc)
+    entries = []
+    for row in rows:
+        changes = {}
+        for name in fields:
+            new = _value(values[name])
+            if not hasattr(row, name):
+                changes[name] = {"new": new}
+                continue
+            old = _value(getattr(row, name))
+            if old != new:
+                changes[name] = {"old": old, "new": new}
+        if changes or action:
+            entries.append(_entry(
+                entity.entity_type, row.id, getattr(row, "org_id", None),
+                action or "updated", changes, user_id, now,
+            ))
+    _enqueue(entries)
+
+
+# ----------------- batched writer -----------------
+
+_buffer: List[Dict[str, Any]] = []
+_buffer_full = asyncio.Event()
+_writer: Optional[asyncio.Task] = None
+
+
+def _enqueue(entries: List[Dict[str, Any]]) -> None:
+    global _buffer
+    if _writer is None or not entries:
+        # Not started (scripts, CLI): nothing is recorded
+        return
+    _buffer.extend(entries)
+    if len(_buffer) > MAX_BUFFERED_ENTRIES:
+        logger.warning(f"Change log buffer full; dropping {len(_buffer) - MAX_BUFFERED_ENTRIES} oldest entries")
+        _buffer = _buffer[-MAX_BUFFERED_ENTRIES:]
+    if len(_buffer) >= settings.CHANGE_LOG_FLUSH_SIZE:
+        _buffer_full.set()
+
+
+async def flush_change_logs() -> int:
+    """Write everything queued. Returns entries written."""
+    global _buffer
+    if not _buffer:
+        return 0
+    pending, _buffer = _buffer, []
+    try:
+        async with LiderixAsyncSessionLocal() as session:
+            for offset in range(0, len(pending), INSERT_CHUNK_ROWS):
+                await session.execute(insert(ChangeLog).values(pending[offset:offset + INSERT_CHUNK_ROWS]))
+            await session.commit()
+    except Exception as e:
+        logger.warning(f"Change log flush failed: {e}")
+        # Retried with the next batch
+        _buffer = (pending + _buffer)[-MAX_BUFFERED_ENTRIES:]
+        return 0
+    return len(pending)
+
+
+async def _write_loop() -> None:
+    while True:
+        try:
+            await asyncio.wait_for(_buffer_full.wait(), settings.CHANGE_LOG_FLUSH_INTERVAL_SEC)
+        except asyncio.TimeoutError:
+            pass
+        _buffer_full.clear()
+        await flush_change_logs()
+
+
+def start_change_log_writer() -> None:
+    global _writer
+    if _writer is None and settings.CHANGE_LOG_ENABLED:
+        _writer = asyncio.create_task(_write_loop())
+
+
+async def stop_change_log_writer() -> None:
+    global _writer
+    if _writer is not None:
+        _writer.cancel()
+        try:
+            await _writer
+        except asyncio.CancelledError:
+            pass
+        _writer = None
+    await flush_change_logs()
+
+
+# ----------------- timelines -----------------
+
+_TIMELINE_COLUMNS = (
+    ChangeLog.id,
+    ChangeLog.entity_type,
+    ChangeLog.entity_id,
+    ChangeLog.org_id,
+    ChangeLog.user_id,
+    ChangeLog.action,
+    ChangeLog.changes,
+    ChangeLog.created_at,
+)
+
+
+def encode_cursor(created_at: datetime, entry_id: UUID) -> str:
+    raw = json.dumps({"c": created_at.isoformat(), "i": str(entry_id)})
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def _keyset(cursor: str):
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        data = json.loads(raw)
+        created_at, entry_id = datetime.fromisoformat(data["c"]), UUID(data["i"])
+    except Exception:
+        raise InvalidCursor("Pagination cursor is malformed")
+    return tuple_(ChangeLog.created_at, ChangeLog.id) < tuple_(
+        literal(created_at), literal(entry_id, PG_UUID(as_uuid=True))
+    )
+
+
+async def _page(
+    session: AsyncSession, criteria: List[Any], cursor: Optional[str], limit: int
+) -> Tuple[List[Any], Optional[str]]:
+    stmt = select(*_TIMELINE_COLUMNS).where(*criteria)
+    if cursor:
+        stmt = stmt.where(_keyset(cursor))
+    stmt = stmt.order_by(ChangeLog.created_at.desc(), ChangeLog.id.desc()).limit(limit + 1)
+
+    rows = (await session.execute(stmt)).all()
+    if len(rows) <= limit:
+        return rows, None
+    rows = rows[:limit]
+    return rows, encode_cursor(rows[-1].created_at, rows[-1].id)
+
+
+async def entity_timeline(
+    session: AsyncSession,
+    entity_type: str,
+    entity_id: UUID,
+    cursor: Optional[str] = None,
+    limit: int = 20,
+) -> Tuple[List[Any], Optional[str]]:
+    """A page of one entity's history, newest first, and the cursor of the next page"""
+    return await _page(
+        session, [ChangeLog.entity_type == entity_type, ChangeLog.entity_id == entity_id], cursor, limit
+    )
+
+
+async def org_timeline(
+    session: AsyncSession,
+    org_id: UUID,
+    cursor: Optional[str] = None,
+    limit: int = 20,
+    entity_type: Optional[str] = None,
+) -> Tuple[List[Any], Optional[str]]:
+    """A page of the organization's history, newest first, optionally one entity type"""
+    criteria = [ChangeLog.org_id == org_id]
+    if entity_type:
+        criteria.append(ChangeLog.entity_type == entity_type)
+    return await _page(session, criteria, cursor, limit)
@@ -0,0 +1,140 @@
+# apps/api/liderix_api/services/department_tree.py
+"""
+Department hierarchy of an organization, cached in worker memory.
+
+The tree view used to run three queries per department (its children and
+two counts), each loading full entities with their selectin relationships.
+Now one query reads every department of the org with its active member
+count, the result is kept per org for DEPARTMENT_TREE_CACHE_TTL_SEC, and
+any subtree is built from it without I/O.
+
+Department and membership writes emit CacheKind.DEPARTMENTS for the org
+(CacheKind.ORG when the organization itself changes), which evicts it on
+every worker through the invalidation bus.
+"""
+from __future__ import annotations
+
+import time
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+from uuid import UUID
+
+from sqlalchemy import and_, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from liderix_api.config.settings import settings
+from liderix_api.models import Department, Membership
+from liderix_api.models.memberships import MembershipStatus
+from liderix_api.schemas.department import DepartmentTreeResponse
+from liderix_api.services.invalidation import CacheKind, invalidation_bus
+
+
+@dataclass(frozen=True)
+class DepartmentNode:
+    id: UUID
+    name: str
+    description: Optional[str]
+    manager_id: Optional[UUID]
+    member_count: int
+
+
+@dataclass(frozen=True)
+class DepartmentIndex:
+    nodes: Dict[UUID, DepartmentNode]
+    # parent id (None: top level) -> children ordered by name
+    children: Dict[Optional[UUID], List[UUID]]
+
+
+# org_id -> (valid until (monotonic), index)
+_cache: Dict[UUID, Tuple[float, DepartmentIndex]] = {}
+
+
+def _evict(org_ids: Optional[frozenset]) -> None:
+    if org_ids is None:
+        _cache.clear()
+        return
+    for org_id in org_ids:
+        _cache.pop(UUID(org_id), None)
+
+
+invalidation_bus.register(CacheKind.DEPARTMENTS, _evict)
+invalidation_bus.register(CacheKind.ORG, _evict)
+
+
+async def _load(session: AsyncSession, org_id: UUID) -> DepartmentIndex:
+    member_counts = (
+        select(Membership.department_id, func.count(Membership.id).label("member_count"))
+        .where(
+            and_(
+                Membership.org_id == org_id,
+                Membership.department_id.is_not(None),
+                Membership.deleted_at.is_(None),
+                Membership.status == MembershipStatus.ACTIVE,
+            )
+        )
+        .group_by(Membership.department_id)
+        .subquery()
+    )
+    rows = (await session.execute(
+        select(
+            Department.id,
+            Department.parent_id,
+            Department.name,
+            Department.description,
+            Department.manager_id,
+            func.coalesce(member_counts.c.member_count, 0).label("member_count"),
+        )
+        .outerjoin(member_counts, member_counts.c.department_id == Department.id)
+        .where(Department.org_id == org_id, Department.deleted_at.is_(None))
+        .order_by(Department.name.asc())
+    )).all()
+
+    nodes: Dict[UUID, DepartmentNode] = {}
+    children: Dict[Optional[UUID], List[UUID]] = {}
+    for row in rows:
+        nodes[row.id] = DepartmentNode(
+            id=row.id,
+            name=row.name,
+            description=row.description,
+            manager_id=row.manager_id,
+            member_count=row.member_count,
+        )
+        children.setdefault(row.parent_id, []).append(row.id)
+    return DepartmentIndex(nodes=nodes, children=children)
+
+
+async def get_department_index(session: AsyncSession, org_id: UUID) -> DepartmentIndex:
+    ttl = settings.DEPARTMENT_TREE_CACHE_TTL_SEC
+    cached = _cache.get(org_id) if ttl > 0 else None
+    if cached is not None and cached[0] > time.monotonic():
+        return cached[1]
+    index = await _load(session, org_id)
+    if ttl > 0:
+        _cache[org_id] = (time.monotonic() + ttl, index)
+    return index
+
+
+def build_department_tree(
+    index: DepartmentIndex, root_id: Optional[UUID], max_depth: int
+) -> List[DepartmentTreeResponse]:
+    """Children of root_id (top level when None), max_depth levels deep"""
+    def build(parent_id: Optional[UUID], depth: int) -> List[DepartmentTreeResponse]:
+        if depth >= max_depth:
+            return []
+        tree = []
+        for dept_id in index.children.get(parent_id, ()):
+            node = index.nodes[dept_id]
+            tree.append(
+                DepartmentTreeResponse(
+                    id=node.id,
+                    name=node.name,
+                    description=node.description,
+                    manager_id=node.manager_id,
+                    member_count=node.member_count,
+                    child_department_count=len(index.children.get(dept_id, ())),
+                    children=build(dept_id, depth + 1),
+                    depth=depth,
+                )
+            )
+        return tree
+    return build(root_id, 0)
@@ -0,0 +1,191 @@
+# apps/api/liderix_api/services/event_logs.py
+"""
+Partitions and hourly rollups of the audit log (event_logs).
+
+event_logs is range-partitioned by month on created_at. A background loop in
+every API worker:
+
+- every EVENT_LOG_ROLLUP_INTERVAL_SEC refreshes event_log_hourly (count per
+  hour x event_type x success) by re-aggregating only the hours that can
+  still change: the current and the previous one (rows committed late), or
+  everything since the newest rolled-up hour after downtime. That is an
+  index range scan over the newest partition, so it costs the same however
+  large the log grows;
+- once an hour creates the monthly partitions EVENT_LOG_PARTITIONS_AHEAD
+  months ahead (SQL function event_logs_ensure_partitions) and, in a
+  separate transaction, drops whole partitions that ended more than
+  EVENT_LOG_RETENTION_MONTHS ago - no row DELETEs, no bloat, nothing for
+  vacuum. A failing retention run never undoes the new partitions.
+
+Rows no monthly partition covers land in the DEFAULT partition
+event_logs_p_default instead of failing the INSERT; the next
+event_logs_ensure_partitions() moves the current and coming months out of
+it, and a warning is logged while it holds rows.
+
+Each run holds a transaction-level advisory lock, so one worker does the
+work and the others skip that round.
+
+The monitoring endpoints (routes/auth/monitoring.py) read event_log_hourly:
+a few hundred rows per day whatever the log volume, at most one rollup
+interval behind.
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from datetime import datetime, timedelta, timezone
+from typing import List, Optional, Tuple
+
+from sqlalchemy import func, literal_column, select, text
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from liderix_api.config.settings import settings
+from liderix_api.db import LiderixAsyncSessionLocal
+from liderix_api.models.audit import EventLog, EventLogHourly
+
+logger = logging.getLogger(__name__)
+
+# pg_try_advisory_xact_lock keys, one per job
+ROLLUP_LOCK_KEY = 7_310_595_146
+PARTITIONS_LOCK_KEY = 7_310_595_147
+PARTITION_MAINTENANCE_INTERVAL_SEC = 3600
+
+DEFAULT_PARTITION = "event_logs_p_default"
+
+# Monthly partitions whose upper bound is at or before :cutoff. The bound is
+# cut from pg_get_expr(relpartbound), e.g. FOR VALUES FROM (...) TO ('2026-11-01
+# 00:00:00+00'), and compared as timestamptz by Postgres; DEFAULT and MAXVALUE
+# bounds give NULL and are never selected.
+_EXPIRED_PARTITIONS = text("""
+    SELECT c.relname
+    FROM pg_inherits i
+    JOIN pg_class c ON c.oid = i.inhrelid
+    WHERE i.inhparent = 'event_logs'::regclass
+      AND substring(pg_get_expr(c.relpartbound, c.oid) FROM 'TO \\(''([^'']+)''\\)')::timestamptz <= :cutoff
+""")
+
+
+def _month_start(moment: datetime, months_back: int = 0) -> datetime:
+    index = moment.year * 12 + moment.month - 1 - months_back
+    return datetime(index // 12, index % 12 + 1, 1, tzinfo=timezone.utc)
+
+
+async def _try_lock(session: AsyncSession, key: int) -> bool:
+    return bool(await session.scalar(select(func.pg_try_advisory_xact_lock(key))))
+
+
+# ----------------- rollups -----------------
+
+async def refresh_rollups(now: Optional[datetime] = None) -> int:
+    """Re-aggregate the hours that may still change. Returns rollup rows written."""
+    now = now or datetime.now(timezone.utc)
+    since = now.replace(minute=0, second=0, microsecond=0) - timedelta(hours=1)
+    async with LiderixAsyncSessionLocal() as session:
+        if not await _try_lock(session, ROLLUP_LOCK_KEY):
+            return 0
+        latest = await session.scalar(select(func.max(EventLogHourly.hour)))
+        if latest is not None and latest < since:
+            # Catch up after downtime
+            since = latest
+
+        # Literal unit: a bind parameter would make the SELECT and GROUP BY expressions differ
+        hour = func.date_trunc(literal_column("'hour'"), EventLog.created_at)
+        stmt = pg_insert(EventLogHourly).from_select(
+            ["hour", "event_type", "success", "event_count"],
+            select(hour, EventLog.event_type, EventLog.success, func.count())
+            .where(EventLog.created_at >= since)
+            .group_by(hour, EventLog.event_type, EventLog.success),
+        )
+        result = await session.execute(
+            stmt.on_conflict_do_update(
+                index_elements=[EventLogHourly.hour, EventLogHourly.event_type, EventLogHourly.success],
+                set_={"event_count": stmt.excluded.event_count},
+            )
+        )
+        await session.commit()
+    return result.rowcount or 0
+
+
+# ----------------- partitions -----------------
+
+async def ensure_partitions() -> int:
+    """Create the upcoming monthly partitions. Returns partitions created."""
+    async with LiderixAsyncSessionLocal() as session:
+        if not await _try_lock(session, PARTITIONS_LOCK_KEY):
+            return 0
+        created = await session.scalar(
+            select(func.event_logs_ensure_partitions(settings.EVENT_LOG_PARTITIONS_AHEAD))
+        ) or 0
+        stray = await session.scalar(text(f'SELECT count(*) FROM "{DEFAULT_PARTITION}"'))
+        await session.commit()
+    if stray:
+        logger.warning(
+            "%d event log rows are in %s: no monthly partition covered them", stray, DEFAULT_PARTITION
+        )
+    return created
+
+
+async def drop_expired_partitions(now: Optional[datetime] = None) -> List[str]:
+    """Drop partitions past EVENT_LOG_RETENTION_MONTHS. Returns their names."""
+    if settings.EVENT_LOG_RETENTION_MONTHS <= 0:
+        return []
+    now = now or datetime.now(timezone.utc)
+    cutoff = _month_start(now, settings.EVENT_LOG_RETENTION_MONTHS)
+    async with LiderixAsyncSessionLocal() as session:
+        if not await _try_lock(session, PARTITIONS_LOCK_KEY):
+            return []
+        dropped = list((await session.scalars(_EXPIRED_PARTITIONS, {"cutoff": cutoff})).all())
+        for name in dropped:
+            # Every row is past retention: drop the partition instead of deleting rows
+            await session.execute(text(f'DROP TABLE "{name}"'))
+        await session.commit()
+    return dropped
+
+
+# ----------------- background loop -----------------
+
+_maintainer: Optional[asyncio.Task] = None
+
+
+async def _maintenance_loop() -> None:
+    partitions_due = 0.0
+    while True:
+        if time.monotonic() >= partitions_due:
+            try:
+                created = await ensure_partitions()
+                if created:
+                    logger.info("Event log partitions: %d created", created)
+                partitions_due = time.monotonic() + PARTITION_MAINTENANCE_INTERVAL_SEC
+            except Exception as e:
+                logger.warning(f"Event log partition creation failed: {e}")
+            else:
+                try:
+                    dropped = await drop_expired_partitions()
+                    if dropped:
+                        logger.info("Event log partitions dropped: %s", dropped)
+                except Exception as e:
+                    logger.warning(f"Event log partition retention failed: {e}")
+        try:
+            await refresh_rollups()
+        except Exception as e:
+            logger.warning(f"Event log rollup failed: {e}")
+        await asyncio.sleep(settings.EVENT_LOG_ROLLUP_INTERVAL_SEC)
+
+
+def start_event_log_maintenance() -> None:
+    global _maintainer
+    if _maintainer is None and settings.EVENT_LOG_MAINTENANCE_ENABLED:
+        _maintainer = asyncio.create_task(_maintenance_loop())
+
+
+async def stop_event_log_maintenance() -> None:
+    global _maintainer
+    if _maintainer is not None:
+        _maintainer.cancel()
+        try:
+            await _maintainer
+        except asyncio.CancelledError:
+            pass
+        _maintainer = None
@@ -0,0 +1,249 @@
+# apps/api/liderix_api/services/feature_flags.py
+"""
+Feature flags evaluated in memory.
+
+All rows of `feature_flags` are loaded at startup and every flag is compiled
+into a single predicate over FlagContext, so `is_enabled()` is a dict lookup
+plus a few set/hash operations - no I/O. A trigger on the table sends
+NOTIFY feature_flags_changed on any write; each process LISTENs and reloads.
+A periodic reload covers missed notifications and lost connections.
+
+`rules` is a list; a flag is on when enabled_globally is true or ANY rule
+matches:
+
+    {"type": "users", "ids": ["<uuid>", ...]}
+    {"type": "orgs", "ids": ["<uuid>", ...]}
+    {"type": "percentage", "percentage": 25, "by": "user" | "org"}
+    {"type": "environments", "values": ["staging", ...]}
+
+A rule may set "enabled": false to switch it off without deleting it.
+Percentage rollout is sticky: a subject lands in the same bucket (per
+flag) on every process.
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+import zlib
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Any, Callable, Dict, Iterable, List, Mapping, Optional
+from uuid import UUID
+
+from fastapi import Depends, Request
+from sqlalchemy import select
+
+from liderix_api.config.settings import settings
+from liderix_api.db import LiderixAsyncSessionLocal, liderix_engine
+from liderix_api.models.feature_flags import FeatureFlag
+from liderix_api.services.auth import get_current_user
+
+logger = logging.getLogger(__name__)
+
+NOTIFY_CHANNEL = "feature_flags_changed"
+# Safety net for missed NOTIFYs
+REFRESH_INTERVAL_SEC = 60
+
+
+@dataclass(frozen=True)
+class FlagContext:
+    user_id: Optional[UUID] = None
+    org_id: Optional[UUID] = None
+
+
+Predicate = Callable[[FlagContext], bool]
+
+
+def _always(_: FlagContext) -> bool:
+    return True
+
+
+def _never(_: FlagContext) -> bool:
+    return False
+
+
+def _bucket(flag_key: str, subject: Any) -> int:
+    """Stable 0..99 bucket of a subject for a flag"""
+    return zlib.crc32(f"{flag_key}:{subject}".encode()) % 100
+
+
+def _id_set(values: Iterable[Any]) -> frozenset:
+    return frozenset(str(value).lower() for value in values or [])
+
+
+def _compile_rule(flag_key: str, rule: Dict[str, Any]) -> Optional[Predicate]:
+    """Predicate for one rule; None when the rule can never match"""
+    if not isinstance(rule, dict) or rule.get("enabled", True) is False:
+        return None
+    kind = rule.get("type")
+
+    if kind == "users":
+        ids = _id_set(rule.get("ids"))
+        return (lambda ctx: ctx.user_id is not None and str(ctx.user_id) in ids) if ids else None
+
+    if kind == "orgs":
+        ids = _id_set(rule.get("ids"))
+        return (lambda ctx: ctx.org_id is not None and str(ctx.org_id) in ids) if ids else None
+
+    if kind == "percentage":
+        percentage = max(0, min(100, int(rule.get("percentage", 0))))
+        if percentage == 0:
+            return None
+        if percentage == 100:
+            return _always
+        attr = "org_id" if rule.get("by") == "org" else "user_id"
+
+        def in_rollout(ctx: FlagContext) -> bool:
+            subject = getattr(ctx, attr)
+            return subject is not None and _bucket(flag_key, subject) < percentage
+        return in_rollout
+
+    if kind == "environments":
+        # Known at compile time
+        return _always if settings.ENVIRONMENT in set(rule.get("values") or []) else None
+
+    logger.warning("Feature flag %s: unknown rule type %r ignored", flag_key, kind)
+    return None
+
+
+def compile_flag(key: str, enabled_globally: bool, rules: Optional[List[Dict[str, Any]]]) -> Predicate:
+    if enabled_globally:
+        return _always
+
+    predicates: List[Predicate] = []
+    for rule in rules or []:
+        try:
+            predicate = _compile_rule(key, rule)
+        except (TypeError, ValueError) as e:
+            logger.warning("Feature flag %s: invalid rule %r: %s", key, rule, e)
+            continue
+        if predicate is _always:
+            return _always
+        if predicate is not None:
+            predicates.append(predicate)
+
+    if not predicates:
+        return _never
+    if len(predicates) == 1:
+        return predicates[0]
+    return lambda ctx: any(predicate(ctx) for predicate in predicates)
+
+
+class FlagSnapshot:
+    """Flags as they were when the request started, bound to its context."""
+
+    __slots__ = ("_flags", "ctx")
+
+    def __init__(self, flags: Mapping[str, Predicate], ctx: FlagContext):
+        self._flags = flags
+        self.ctx = ctx
+
+    def is_enabled(self, key: str, ctx: Optional[FlagContext] = None) -> bool:
+        predicate = self._flags.get(key)
+        return predicate is not None and predicate(ctx or self.ctx)
+
+    def enabled_keys(self) -> List[str]:
+        return sorted(key for key, predicate in self._flags.items() if predicate(self.ctx))
+
+
+class FeatureFlagService:
+    """
+    Holds the compiled flags of this process.
+
+    The compiled mapping is immutable and replaced as a whole on reload, so
+    readers never see a half-updated set and need no locking.
+    """
+
+    def __init__(self):
+        self._flags: Mapping[str, Predicate] = MappingProxyType({})
+        self.loaded_at: Optional[float] = None
+        self._listener: Optional[asyncio.Task] = None
+        self._reload_requested = asyncio.Event()
+
+    def is_enabled(self, key: str, ctx: Optional[FlagContext] = None) -> bool:
+        predicate = self._flags.get(key)
+        return predicate is not None and predicate(ctx or FlagContext())
+
+    def snapshot(self, ctx: FlagContext) -> FlagSnapshot:
+        return FlagSnapshot(self._flags, ctx)
+
+    async def reload(self) -> None:
+        async with LiderixAsyncSessionLocal() as session:
+            rows = (await session.execute(
+                select(FeatureFlag.key, FeatureFlag.enabled_globally, FeatureFlag.rules)
+            )).all()
+        self._flags = MappingProxyType({
+            key: compile_flag(key, enabled_globally, rules) for key, enabled_globally, rules in rows
+        })
+        self.loaded_at = time.time()
+        logger.info("Feature flags loaded: %d", len(rows))
+
+    async def start(self) -> None:
+        try:
+            await self.reload()
+        except Exception as e:
+            # Flags stay off until the next successful reload
+            logger.warning("Feature flags initial load failed: %s", e)
+        if self._listener is None:
+            self._listener = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._listener is not None:
+            self._listener.cancel()
+            try:
+                await self._listener
+            except asyncio.CancelledError:
+                pass
+            self._listener = None
+
+    def _on_notify(self, *_args: Any) -> None:
+        self._reload_requested.set()
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                async with liderix_engine.connect() as conn:
+                    raw = await conn.get_raw_connection()
+                    driver = raw.driver_connection
+                    await driver.add_listener(NOTIFY_CHANNEL, self._on_notify)
+                    try:
+                        # Changes made while we were not listening
+                        await self.reload()
+                        await self._wait_and_reload()
+                    finally:
+                        await driver.remove_listener(NOTIFY_CHANNEL, self._on_notify)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning("Feature flag listener error: %s; retrying", e)
+                await asyncio.sleep(5)
+
+    async def _wait_and_reload(self) -> None:
+        while True:
+            try:
+                await asyncio.wait_for(self._reload_requested.wait(), timeout=REFRESH_INTERVAL_SEC)
+            except asyncio.TimeoutError:
+                pass
+            self._reload_requested.clear()
+            await self.reload()
+
+
+feature_flags = FeatureFlagService()
+
+
+def is_enabled(key: str, ctx: Optional[FlagContext] = None) -> bool:
+    return feature_flags.is_enabled(key, ctx)
+
+
+async def get_feature_flags(request: Request, current_user=Depends(get_current_user)) -> FlagSnapshot:
+    """
+    Dependency: flags snapshotted once for the request, bound to the current
+    user and the org from the path (if the route has one).
+    """
+    org_id = request.path_params.get("org_id")
+    try:
+        org_id = UUID(str(org_id)) if org_id else None
+    except ValueError:
+        org_id = None
+    return feature_flags.snapshot(FlagContext(user_id=current_user.id, org_id=org_id))
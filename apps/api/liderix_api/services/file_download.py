@@ -0,0 +1,276 @@
+# apps/api/liderix_api/services/file_download.py
+"""
+Serving stored files.
+
+- ETag is the content SHA-256 (File.file_hash), so it is stable across
+  processes and re-uploads of the same bytes; If-None-Match -> 304
+- single byte ranges (Range: bytes=a-b / a- / -n) -> 206; unsatisfiable -> 416;
+  multi-range requests get the whole file (allowed by RFC 9110)
+- local files are handed to the reverse proxy with X-Accel-Redirect when
+  STORAGE_ACCEL_REDIRECT_PREFIX is set (zero-copy sendfile there), and
+  otherwise streamed in bounded chunks read with os.pread in a thread - the
+  file is never loaded into memory
+- S3 objects are not proxied: the client is redirected to a pre-signed URL
+  and the object store handles Range/ETag itself
+
+Access logging goes through a batched writer: responses only append to an
+in-memory buffer, which is flushed with one multi-row INSERT.
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+import re
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Mapping, Optional, Tuple
+from urllib.parse import quote
+from uuid import UUID
+
+from sqlalchemy import insert
+from starlette.responses import Response
+from starlette.types import Receive, Scope, Send
+
+from liderix_api.db import LiderixAsyncSessionLocal
+from liderix_api.models.files import FileAccessLog
+
+logger = logging.getLogger(__name__)
+
+STREAM_CHUNK_SIZE = 256 * 1024
+
+_RANGE_RE = re.compile(r"^\s*bytes\s*=\s*(\d*)\s*-\s*(\d*)\s*$", re.IGNORECASE)
+
+
+# ----------------- conditional / range helpers -----------------
+
+def make_etag(file_hash: Optional[str]) -> Optional[str]:
+    return f'"{file_hash}"' if file_hash else None
+
+
+def etag_matches(if_none_match: Optional[str], etag: Optional[str]) -> bool:
+    """Weak comparison, as required for If-None-Match"""
+    if not if_none_match or not etag:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    wanted = etag.removeprefix("W/")
+    return any(tag.strip().removeprefix("W/") == wanted for tag in if_none_match.split(","))
+
+
+class RangeNotSatisfiable(Exception):
+    pass
+
+
+def parse_range(header: Optional[str], size: int) -> Optional[Tuple[int, int]]:
+    """
+    (start, end) inclusive for a single-range header, None to send the whole
+    file (no header, multiple ranges or a syntax we don't understand).
+    """
+    if not header or "," in header:
+        return None
+    match = _RANGE_RE.match(header)
+    if not match:
+        return None
+    first, last = match.groups()
+    if not first and not last:
+        return None
+    if not first:
+        # Suffix range: last N bytes
+        length = int(last)
+        if length == 0 or size == 0:
+            raise RangeNotSatisfiable()
+        return max(size - length, 0), size - 1
+    start = int(first)
+    end = min(int(last), size - 1) if last else size - 1
+    if start >= size or (last and int(last) < start):
+        raise RangeNotSatisfiable()
+    return start, end
+
+
+def content_disposition(filename: str, inline: bool = False) -> str:
+    kind = "inline" if inline else "attachment"
+    fallback = filename.encode("ascii", "ignore").decode().replace('"', "") or "download"
+    return f"{kind}; filename=\"{fallback}\"; filename*=UTF-8''{quote(filename)}"
+
+
+# ----------------- response -----------------
+
+class LocalFileResponse(Response):
+    """
+    Response for a byte range of a local file.
+
+    With `accel_redirect` set the body is left to the reverse proxy
+    (X-Accel-Redirect; nginx/Caddy serve it with sendfile). Otherwise it is
+    streamed in STREAM_CHUNK_SIZE pieces read with os.pread.
+
+    `on_complete(status, bytes_sent)` is called once the body is out (or the
+    client went away), so the access log records what was actually served.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        *,
+        offset: int,
+        count: int,
+        status_code: int = 200,
+        headers: Optional[Mapping[str, str]] = None,
+        send_body: bool = True,
+        accel_redirect: Optional[str] = None,
+        on_complete: Optional[Callable[[int, int], None]] = None,
+    ):
+        self.path = path
+        self.offset = offset
+        self.count = count
+        self.status_code = status_code
+        self.send_body = send_body
+        self.accel_redirect = accel_redirect
+        self.on_complete = on_complete
+        self.background = None
+        self.body = b""
+        headers = dict(headers or {})
+        if accel_redirect:
+            # The proxy sets length/range itself from the original request
+            headers = {k: v for k, v in headers.items() if k.lower() not in ("content-range", "content-length")}
+            headers["x-accel-redirect"] = accel_redirect
+            self.status_code = 200
+        else:
+            # HEAD gets the length the GET would send
+            headers["content-length"] = str(count)
+        self.init_headers(headers)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        sent = 0
+        try:
+            await send({"type": "http.response.start", "status": self.status_code, "headers": self.raw_headers})
+            if self.accel_redirect or not self.send_body or self.count == 0:
+                await send({"type": "http.response.body", "body": b""})
+                sent = self.count if self.accel_redirect and self.send_body else 0
+                return
+
+            fd = await asyncio.to_thread(os.open, self.path, os.O_RDONLY)
+            try:
+                position, end = self.offset, self.offset + self.count
+                while position < end:
+                    size = min(STREAM_CHUNK_SIZE, end - position)
+                    chunk = await asyncio.to_thread(os.pread, fd, size, position)
+                    if not chunk:
+                        break
+                    position += len(chunk)
+                    await send({"type": "http.response.body", "body": chunk, "more_body": position < end})
+                    sent += len(chunk)
+                if position < end:
+                    # File shrank under us; close the body anyway
+                    await send({"type": "http.response.body", "body": b""})
+            finally:
+                os.close(fd)
+        finally:
+            if self.on_complete is not None:
+                self.on_complete(self.status_code, sent)
+        if self.background is not None:
+            await self.background()
+
+
+# ----------------- batched access log -----------------
+
+ACCESS_LOG_FLUSH_INTERVAL_SEC = 5
+ACCESS_LOG_BATCH_SIZE = 500
+# Memory guard if the database is down for long
+ACCESS_LOG_MAX_PENDING = 50_000
+# A batch that keeps failing (bad row, constraint error) is dropped after this many tries
+ACCESS_LOG_MAX_ATTEMPTS = 5
+
+
+@dataclass
+class FileAccess:
+    file_id: UUID
+    user_id: Optional[UUID]
+    access_type: str
+    response_code: int
+    bytes_served: Optional[int]
+    ip_address: Optional[str] = None
+    user_agent: Optional[str] = None
+    referer: Optional[str] = None
+    accessed_at: Optional[datetime] = None
+
+    def row(self) -> Dict[str, Any]:
+        return {
+            "file_id": self.file_id,
+            "user_id": self.user_id,
+            "access_type": self.access_type,
+            "response_code": self.response_code,
+            "bytes_served": self.bytes_served,
+            "ip_address": (self.ip_address or "")[:45] or None,
+            "user_agent": (self.user_agent or "")[:500] or None,
+            "referer": (self.referer or "")[:1000] or None,
+            "accessed_at": self.accessed_at,
+        }
+
+
+class AccessLogWriter:
+    def __init__(self):
+        self._pending: List[FileAccess] = []
+        self._wakeup = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+        # Failed attempts of the batch at the head of _pending
+        self._attempts = 0
+
+    def record(self, access: FileAccess) -> None:
+        access.accessed_at = access.accessed_at or datetime.now(timezone.utc)
+        if len(self._pending) >= ACCESS_LOG_MAX_PENDING:
+            del self._pending[: len(self._pending) - ACCESS_LOG_MAX_PENDING + 1]
+            self._attempts = 0
+            logger.warning("File access log backlog full; dropping oldest entries")
+        self._pending.append(access)
+        if len(self._pending) >= ACCESS_LOG_BATCH_SIZE:
+            self._wakeup.set()
+
+    async def flush(self) -> None:
+        while self._pending:
+            batch = self._pending[:ACCESS_LOG_BATCH_SIZE]
+            del self._pending[:ACCESS_LOG_BATCH_SIZE]
+            try:
+                async with LiderixAsyncSessionLocal() as session:
+                    await session.execute(insert(FileAccessLog), [access.row() for access in batch])
+                    await session.commit()
+            except Exception as e:
+                self._attempts += 1
+                if self._attempts >= ACCESS_LOG_MAX_ATTEMPTS:
+                    logger.error(
+                        "Dropping %d file access log entries after %d failed attempts: %s",
+                        len(batch), self._attempts, e,
+                    )
+                    self._attempts = 0
+                    continue
+                logger.warning("Failed to write %d file access log entries: %s", len(batch), e)
+                # Retry on the next tick
+                self._pending[:0] = batch
+                return
+            self._attempts = 0
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=ACCESS_LOG_FLUSH_INTERVAL_SEC)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            await self.flush()
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self.flush()
+
+
+access_log = AccessLogWriter()
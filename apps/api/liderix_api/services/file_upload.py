@@ -1,78 +1,317 @@
 # apps/api/liderix_api/services/file_upload.py
 """
-File upload service for handling user avatars and other files.
-This is a stub implementation - replace with actual file upload implementation.
+File upload service: avatars and org files.
+
+Uploads are streamed to the configured storage backend chunk by chunk; the
+SHA-256 and size are computed on the way, and the size limit is enforced
+mid-stream, so the whole file is never held in memory. Objects are
+content-addressed ({folder}/ab/cd/<sha256>): an identical upload reuses the
+stored object instead of writing a second copy.
 """
 from __future__ import annotations
 
+import hashlib
+import logging
+import mimetypes
 import os
 import uuid
-from typing import Optional
-from fastapi import UploadFile
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import AsyncIterator, Optional
 from uuid import UUID
 
+from fastapi import UploadFile
+from sqlalchemy import exists, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from liderix_api.config.settings import settings
+from liderix_api.db import LiderixAsyncSessionLocal
+from liderix_api.enums import FileType, UploadStatus
+from liderix_api.models.files import File
+from liderix_api.models.users import User
+from liderix_api.services import images
+from liderix_api.services.storage import PUBLIC_PREFIX, StorageBackend, get_storage
+
+logger = logging.getLogger(__name__)
+
+UPLOAD_CHUNK_SIZE = 1024 * 1024
+MAX_AVATAR_SIZE = 5 * 1024 * 1024
+TMP_PREFIX = "tmp/"
+
+
+class FileTooLarge(Exception):
+    def __init__(self, limit: int):
+        super().__init__(f"File exceeds {limit} bytes")
+        self.limit = limit
+
+
+@dataclass(frozen=True)
+class StoredFile:
+    key: str
+    size: int
+    sha256: str
+    content_type: Optional[str]
+    provider: str
+    bucket: Optional[str]
+    region: Optional[str]
+    url: Optional[str] = None
+    deduplicated: bool = False
+
+
+async def iter_upload(file: UploadFile, chunk_size: int = UPLOAD_CHUNK_SIZE) -> AsyncIterator[bytes]:
+    """Read an UploadFile in chunks (Starlette spools large bodies to disk)"""
+    while True:
+        chunk = await file.read(chunk_size)
+        if not chunk:
+            break
+        yield chunk
+
+
+def content_key(folder: str, sha256: str, *, public: bool = False, content_type: Optional[str] = None) -> str:
+    folder = folder.strip("/")
+    # Extension lets static servers pick the right Content-Type
+    suffix = (mimetypes.guess_extension(content_type) or "") if content_type else ""
+    key = f"{folder}/{sha256[:2]}/{sha256[2:4]}/{sha256}{suffix}"
+    return f"{PUBLIC_PREFIX}{key}" if public else key
+
+
+async def store_stream(
+    chunks: AsyncIterator[bytes],
+    folder: str,
+    *,
+    public: bool = False,
+    max_size: Optional[int] = None,
+    content_type: Optional[str] = None,
+    session: Optional[AsyncSession] = None,
+    storage: Optional[StorageBackend] = None,
+) -> StoredFile:
+    """
+    Stream chunks into storage under their content hash.
+
+    The data goes to a temporary key first (the hash is only known at the
+    end), then is moved into place - or dropped when that content is
+    already stored. Raises FileTooLarge as soon as max_size is exceeded.
+    """
+    storage = storage or get_storage()
+    limit = max_size if max_size is not None else settings.MAX_UPLOAD_SIZE
+    digest = hashlib.sha256()
+    size = 0
+
+    async def measured() -> AsyncIterator[bytes]:
+        nonlocal size
+        async for chunk in chunks:
+            size += len(chunk)
+            if size > limit:
+                raise FileTooLarge(limit)
+            digest.update(chunk)
+            yield chunk
+
+    temp_key = f"{TMP_PREFIX}{uuid.uuid4().hex}"
+    await storage.write_stream(temp_key, measured(), content_type)
+
+    sha256 = digest.hexdigest()
+    key = content_key(folder, sha256, public=public, content_type=content_type)
+    try:
+        duplicate = await _is_stored(storage, key, sha256, session)
+        if duplicate:
+            await storage.delete(temp_key)
+        else:
+            await storage.move(temp_key, key)
+    except BaseException:
+        await storage.delete(temp_key)
+        raise
+
+    return StoredFile(
+        key=key,
+        size=size,
+        sha256=sha256,
+        content_type=content_type,
+        provider=storage.name,
+        bucket=storage.bucket,
+        region=storage.region,
+        url=storage.public_url(key) if public else None,
+        deduplicated=duplicate,
+    )
+
+
+async def _is_stored(
+    storage: StorageBackend, key: str, sha256: str, session: Optional[AsyncSession]
+) -> bool:
+    # A live File row with the same hash and path means the object is there
+    # (cheaper than a storage round trip on S3)
+    if session is not None:
+        known = await session.scalar(
+            select(exists().where(
+                File.file_hash == sha256,
+                File.file_path == key,
+                File.storage_provider == storage.name,
+                File.is_deleted.is_(False),
+            ))
+        )
+        if known:
+            return True
+    return await storage.exists(key)
+
+
+def detect_file_type(mime_type: Optional[str]) -> FileType:
+    mime = (mime_type or "").lower()
+    if mime.startswith("image/"):
+        return FileType.IMAGE
+    if mime.startswith("video/"):
+        return FileType.VIDEO
+    if mime.startswith("audio/"):
+        return FileType.AUDIO
+    if any(token in mime for token in ("zip", "tar", "gzip", "rar", "7z")):
+        return FileType.ARCHIVE
+    if any(token in mime for token in ("spreadsheet", "excel", "csv")):
+        return FileType.SPREADSHEET
+    if any(token in mime for token in ("presentation", "powerpoint")):
+        return FileType.PRESENTATION
+    if mime.startswith("text/") or any(token in mime for token in ("pdf", "msword", "document", "rtf")):
+        return FileType.DOCUMENT
+    return FileType.OTHER
+
+
+def _content_type(file: UploadFile) -> Optional[str]:
+    if file.content_type and file.content_type != "application/octet-stream":
+        return file.content_type
+    return mimetypes.guess_type(file.filename or "")[0] or file.content_type
+
+
+async def create_file(
+    session: AsyncSession,
+    file: UploadFile,
+    *,
+    org_id: UUID,
+    uploaded_by_id: Optional[UUID],
+    folder: str = "files",
+    is_public: bool = False,
+    max_size: Optional[int] = None,
+) -> File:
+    """Store an upload and add its File row to the session (caller commits)"""
+    content_type = _content_type(file)
+    stored = await store_stream(
+        iter_upload(file), f"{folder}/{org_id}",
+        public=is_public, max_size=max_size, content_type=content_type, session=session,
+    )
+    original_filename = os.path.basename(file.filename or "") or stored.sha256
+    record = File(
+        org_id=org_id,
+        filename=original_filename[:255],
+        original_filename=original_filename[:255],
+        file_path=stored.key,
+        file_url=stored.url,
+        file_type=detect_file_type(content_type),
+        mime_type=content_type,
+        file_size=stored.size,
+        file_hash=stored.sha256,
+        upload_status=UploadStatus.COMPLETED,
+        uploaded_by_id=uploaded_by_id,
+        upload_completed_at=datetime.now(timezone.utc),
+        is_public=is_public,
+        storage_provider=stored.provider,
+        storage_bucket=stored.bucket,
+        storage_region=stored.region,
+    )
+    session.add(record)
+    return record
+
 
 async def handle_avatar_upload(file: UploadFile, user_id: UUID) -> str:
     """
     Handle avatar file upload.
-    
+
     Args:
         file: Uploaded file
         user_id: ID of user uploading the avatar
-        
+
     Returns:
         URL of uploaded avatar
+
+    Raises:
+        FileTooLarge: avatar is bigger than MAX_AVATAR_SIZE
+        InvalidImage: the file could not be decoded as an image
     """
-    # This is a stub implementation
-    # In production, you would:
-    # 1. Validate file type and size
-    # 2. Generate unique filename
-    # 3. Upload to cloud storage (S3, GCS, etc.) or local storage
-    # 4. Possibly resize/optimize image
-    # 5. Return public URL
-    
-    # Generate a mock URL
-    file_extension = os.path.splitext(file.filename or "")[1] or ".jpg"
-    filename = f"avatar_{user_id}_{uuid.uuid4()}{file_extension}"
-    
-    # Mock URL - in production this would be your actual storage URL
-    avatar_url = f"https://example.com/avatars/{filename}"
-    
-    return avatar_url
+    if not images.available():
+        stored = await store_stream(
+            iter_upload(file), "avatars",
+            public=True, max_size=MAX_AVATAR_SIZE, content_type=_content_type(file),
+        )
+        return stored.url
+
+    # Original stays private; only metadata-free variants are public
+    stored = await store_stream(
+        iter_upload(file), "avatars",
+        max_size=MAX_AVATAR_SIZE, content_type=_content_type(file),
+    )
+    try:
+        return await images.process_avatar(stored.key)
+    except images.InvalidImage:
+        if not stored.deduplicated:
+            await get_storage().delete(stored.key)
+        raise
+
+
+def _key_from_url(storage: StorageBackend, file_url: str) -> Optional[str]:
+    """Storage key of one of our public URLs (None for foreign URLs)"""
+    probe = storage.public_url(f"{PUBLIC_PREFIX}_")[:-1]
+    if not file_url.startswith(probe):
+        return None
+    return PUBLIC_PREFIX + file_url[len(probe):]
 
 
 async def delete_file(file_url: str) -> bool:
     """
     Delete file from storage.
-    
+
+    Content-addressed objects can be shared, so the object is only removed
+    when no user avatar or live File row references it any more.
+
     Args:
         file_url: URL of file to delete
-        
+
     Returns:
         True if successful, False otherwise
     """
-    # Stub implementation
-    return True
+    storage = get_storage()
+    key = _key_from_url(storage, file_url)
+    if key is None:
+        return False
+    try:
+        async with LiderixAsyncSessionLocal() as session:
+            referenced = await session.scalar(
+                select(or_(
+                    exists().where(User.avatar_url == file_url),
+                    exists().where(File.file_path == key, File.is_deleted.is_(False)),
+                ))
+            )
+        if not referenced:
+            # Avatar variants go together with their original
+            for object_key in images.avatar_keys(key):
+                await storage.delete(object_key)
+        return True
+    except Exception as e:
+        logger.warning("Failed to delete %s: %s", file_url, e)
+        return False
 
 
 async def upload_file(
-    file: UploadFile, 
-    folder: str, 
+    file: UploadFile,
+    folder: str,
     user_id: Optional[UUID] = None
 ) -> str:
     """
-    Upload file to storage.
-    
+    Upload a publicly readable file to storage.
+
     Args:
         file: Uploaded file
         folder: Folder to upload to
         user_id: Optional user ID for organizing files
-        
+
     Returns:
         URL of uploaded file
     """
-    # Stub implementation
-    file_extension = os.path.splitext(file.filename or "")[1]
-    filename = f"{folder}_{uuid.uuid4()}{file_extension}"
-    
-    return f"https://example.com/files/{folder}/{filename}"
\ No newline at end of file
+    if user_id is not None:
+        folder = f"{folder}/{user_id}"
+    stored = await store_stream(iter_upload(file), folder, public=True, content_type=_content_type(file))
+    return stored.url
@@ -4,11 +4,12 @@ from typing import Optional, Literal, Tuple
 from uuid import UUID
 from fastapi import Depends, HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, or_
+from sqlalchemy import select
 from liderix_api.db import get_async_session
 from liderix_api.models.organization import Organization
 from liderix_api.models import Membership, ResponsibilityScope  # Изменено: Импорт из models
 from liderix_api.services.auth import get_current_user # должен вернуть User (с .id)
+from liderix_api.services.permissions import PermissionEvaluator
 # -----------------------------
 # Роли и права
 # -----------------------------
@@ -109,22 +110,9 @@ async def _has_scope_permission(
     """
     if not object_type:
         return False
-    stmt = (
-        select(ResponsibilityScope)
-        .where(
-            ResponsibilityScope.org_id == ctx.org.id,
-            ResponsibilityScope.user_id == ctx.user_id,
-            ResponsibilityScope.object_type == object_type,
-            or_(ResponsibilityScope.object_id.is_(None), ResponsibilityScope.object_id == object_id),
-            ResponsibilityScope.deleted_at.is_(None),
-        )
-    )
-    scopes = (await session.execute(stmt)).scalars().all()
-    for scope in scopes:
-        perms = scope.permissions or {}
-        if perms.get(action) is True:
-            return True
-    return False
+    # Скоупы пользователя грузятся один раз на запрос (см. PermissionEvaluator)
+    evaluator = PermissionEvaluator.for_session(session)
+    return await evaluator.has_scope(ctx.user_id, ctx.org.id, object_type, object_id, action)
 async def check_perm(
     ctx: TenantContext,
     perm: str,
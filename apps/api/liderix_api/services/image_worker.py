@@ -0,0 +1,52 @@
+# apps/api/liderix_api/services/image_worker.py
+"""
+CPU side of the image pipeline; runs inside the image process pool.
+
+Kept free of app imports (settings, DB, models) so pool processes start
+fast and stay small. Everything here is synchronous and picklable.
+"""
+from __future__ import annotations
+
+import os
+from typing import Any, Dict, Sequence, Tuple
+
+# (name, size, square): square variants are center-cropped to size x size,
+# the others are scaled to fit in a size x size box (never upscaled)
+VariantSpec = Tuple[str, int, bool]
+
+MAX_IMAGE_PIXELS = 50_000_000
+WEBP_QUALITY = 82
+
+
+def render_variants(src_path: str, out_dir: str, specs: Sequence[VariantSpec]) -> Dict[str, Any]:
+    """
+    Decode src_path, apply EXIF orientation and write one WebP per spec into
+    out_dir. Variants are saved without EXIF/XMP/ICC, so metadata (GPS,
+    camera, ...) is stripped. Returns the original dimensions and, per
+    variant, its path and dimensions.
+    """
+    from PIL import Image, ImageOps
+
+    # Decompression bomb guard
+    Image.MAX_IMAGE_PIXELS = MAX_IMAGE_PIXELS
+
+    with Image.open(src_path) as source:
+        source.seek(0)
+        image = ImageOps.exif_transpose(source)
+        width, height = image.size
+        if image.mode not in ("RGB", "RGBA"):
+            has_alpha = "A" in image.getbands() or "transparency" in image.info
+            image = image.convert("RGBA" if has_alpha else "RGB")
+
+        variants: Dict[str, Any] = {}
+        for name, size, square in specs:
+            if square:
+                variant = ImageOps.fit(image, (size, size), Image.Resampling.LANCZOS)
+            else:
+                variant = image.copy()
+                variant.thumbnail((size, size), Image.Resampling.LANCZOS)
+            path = os.path.join(out_dir, f"{name}.webp")
+            variant.save(path, "WEBP", quality=WEBP_QUALITY, method=4)
+            variants[name] = {"path": path, "width": variant.width, "height": variant.height}
+
+    return {"width": width, "height": height, "variants": variants}
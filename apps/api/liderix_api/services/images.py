@@ -0,0 +1,255 @@
+# apps/api/liderix_api/services/images.py
+"""
+Image pipeline: dimensions, metadata stripping, thumbnails, WebP variants.
+
+Decoding and encoding are CPU-bound and hold the GIL, so they run in a
+process pool (services/image_worker.py); the event loop only moves bytes
+between storage and temp files. Variants are stored next to the original
+({key}.{variant}.webp).
+
+- avatars: the original is kept private, square WebP variants go to the
+  public area ({original}.{size}.webp under public/); avatar_url points at the largest one and smaller sizes are
+  derived from it (utils/avatars.py avatar_thumbnail_url), so lists can show
+  64px avatars without a lookup
+- image files/attachments: processed in the background after upload;
+  dimensions land in File.image_width/height, variants in
+  File.meta_data["image"], and the thumbnail URL in the attachment
+
+Pillow is a declared dependency; available() still guards installs without
+it: avatars are then stored as uploaded and files get no variants.
+"""
+from __future__ import annotations
+
+import asyncio
+import importlib.util
+import logging
+import multiprocessing
+import os
+import shutil
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, AsyncIterator, Dict, List, Optional, Sequence
+from uuid import UUID
+
+from sqlalchemy import func, select, type_coerce, update
+from sqlalchemy.dialects.postgresql import JSONB
+
+from liderix_api.config.settings import settings
+from liderix_api.db import LiderixAsyncSessionLocal
+from liderix_api.enums import FileType, UploadStatus
+from liderix_api.models.files import File
+from liderix_api.models.tasks import TaskAttachment
+from liderix_api.services import image_worker
+from liderix_api.services.storage import PUBLIC_PREFIX, StorageBackend, get_storage
+from liderix_api.utils.avatars import AVATAR_SIZES, AVATAR_VARIANT_RE
+
+logger = logging.getLogger(__name__)
+
+IMAGE_MIME_TYPES = {"image/jpeg", "image/png", "image/webp", "image/gif", "image/bmp", "image/tiff"}
+WEBP = "image/webp"
+
+AVATAR_SPECS = tuple((str(size), size, True) for size in AVATAR_SIZES)
+FILE_SPECS = (("thumb", 256, False), ("preview", 1280, False))
+THUMBNAIL_VARIANT = "thumb"
+
+_FILE_CHUNK_SIZE = 1024 * 1024
+
+
+class InvalidImage(Exception):
+    pass
+
+
+def available() -> bool:
+    return importlib.util.find_spec("PIL") is not None
+
+
+# ----------------- process pool -----------------
+
+_pool: Optional[ProcessPoolExecutor] = None
+
+
+def _get_pool() -> ProcessPoolExecutor:
+    global _pool
+    if _pool is None:
+        # spawn: don't fork a process that runs an event loop and DB pools
+        _pool = ProcessPoolExecutor(
+            max_workers=settings.IMAGE_WORKERS,
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+    return _pool
+
+
+def shutdown_image_pool() -> None:
+    global _pool
+    if _pool is not None:
+        _pool.shutdown(wait=False, cancel_futures=True)
+        _pool = None
+
+
+async def _render(src_path: str, out_dir: str, specs: Sequence[image_worker.VariantSpec]) -> Dict[str, Any]:
+    global _pool
+    loop = asyncio.get_running_loop()
+    try:
+        return await loop.run_in_executor(_get_pool(), image_worker.render_variants, src_path, out_dir, specs)
+    except BrokenProcessPool:
+        # A worker died (OOM on a huge image); next call gets a fresh pool
+        _pool = None
+        raise InvalidImage("Image could not be processed")
+    except Exception as e:
+        raise InvalidImage(str(e)) from e
+
+
+# ----------------- storage <-> temp files -----------------
+
+async def _spool(storage: StorageBackend, key: str, directory: str) -> str:
+    path = os.path.join(directory, "source")
+    handle = await asyncio.to_thread(open, path, "wb")
+    try:
+        async for chunk in storage.read_stream(key):
+            await asyncio.to_thread(handle.write, chunk)
+    finally:
+        await asyncio.to_thread(handle.close)
+    return path
+
+
+async def _file_chunks(path: str) -> AsyncIterator[bytes]:
+    handle = await asyncio.to_thread(open, path, "rb")
+    try:
+        while chunk := await asyncio.to_thread(handle.read, _FILE_CHUNK_SIZE):
+            yield chunk
+    finally:
+        await asyncio.to_thread(handle.close)
+
+
+async def _store_variants(storage: StorageBackend, rendered: Dict[str, Any], key_for) -> Dict[str, Any]:
+    stored = {}
+    for name, variant in rendered["variants"].items():
+        key = key_for(name)
+        await storage.write_stream(key, _file_chunks(variant["path"]), WEBP)
+        stored[name] = {
+            "key": key,
+            "width": variant["width"],
+            "height": variant["height"],
+            "size": os.path.getsize(variant["path"]),
+        }
+    return stored
+
+
+async def _process(storage: StorageBackend, key: str, specs, key_for) -> Dict[str, Any]:
+    directory = await asyncio.to_thread(tempfile.mkdtemp, prefix="img-")
+    try:
+        source = await _spool(storage, key, directory)
+        rendered = await _render(source, directory, specs)
+        variants = await _store_variants(storage, rendered, key_for)
+        return {"width": rendered["width"], "height": rendered["height"], "variants": variants}
+    finally:
+        await asyncio.to_thread(shutil.rmtree, directory, True)
+
+
+# ----------------- avatars -----------------
+
+def avatar_variant_key(original_key: str, size: int) -> str:
+    return f"{PUBLIC_PREFIX}{original_key}.{size}.webp"
+
+
+async def process_avatar(original_key: str) -> str:
+    """Render avatar variants of a stored original; returns the avatar URL"""
+    storage = get_storage()
+    largest = avatar_variant_key(original_key, max(AVATAR_SIZES))
+    # Same picture uploaded before (keys are content-addressed)
+    if not await storage.exists(largest):
+        await _process(
+            storage, original_key, AVATAR_SPECS,
+            lambda name: avatar_variant_key(original_key, int(name)),
+        )
+    return storage.public_url(largest)
+
+
+def avatar_keys(variant_key: str) -> List[str]:
+    """All objects of an avatar, given the key of one of its variants"""
+    if not variant_key.startswith(PUBLIC_PREFIX) or not AVATAR_VARIANT_RE.search(variant_key):
+        return [variant_key]
+    original_key = AVATAR_VARIANT_RE.sub("", variant_key)[len(PUBLIC_PREFIX):]
+    return [avatar_variant_key(original_key, size) for size in AVATAR_SIZES] + [original_key]
+
+
+# ----------------- files / attachments -----------------
+
+def file_variant_key(file_path: str, variant: str) -> str:
+    return f"{file_path}.{variant}.webp"
+
+
+def file_thumbnail_url(file_id: UUID) -> str:
+    return f"{settings.API_PREFIX.rstrip('/')}/files/{file_id}/download?variant={THUMBNAIL_VARIANT}&inline=true"
+
+
+def _jsonb_merge(column, value: Dict[str, Any]):
+    return func.coalesce(column, type_coerce({}, JSONB)).op("||")(type_coerce(value, JSONB))
+
+
+def is_processable(file: File) -> bool:
+    return (
+        file.file_type == FileType.IMAGE
+        and (file.mime_type or "").lower() in IMAGE_MIME_TYPES
+        and file.upload_status == UploadStatus.COMPLETED
+    )
+
+
+async def process_file_image(file_id: UUID) -> None:
+    """
+    Background job: variants and dimensions of an image File, plus the
+    thumbnail URL on attachments that point at it.
+    """
+    if not available():
+        return
+    async with LiderixAsyncSessionLocal() as session:
+        file = await session.get(File, file_id)
+        if file is None or not is_processable(file):
+            return
+        storage = get_storage()
+
+        # Identical content already processed: reuse its variants
+        done = await session.scalar(
+            select(File.meta_data["image"]).where(
+                File.file_path == file.file_path,
+                File.storage_provider == file.storage_provider,
+                File.meta_data.has_key("image"),
+            ).limit(1)
+        )
+        if done is None:
+            # Release the connection while rendering
+            await session.commit()
+            try:
+                done = await _process(
+                    storage, file.file_path, FILE_SPECS,
+                    lambda name: file_variant_key(file.file_path, name),
+                )
+            except InvalidImage as e:
+                logger.warning("Image processing failed for file %s: %s", file_id, e)
+                return
+
+        thumbnail_url = file_thumbnail_url(file.id)
+        await session.execute(
+            update(File)
+            .where(File.id == file.id)
+            .values(
+                image_width=done["width"],
+                image_height=done["height"],
+                meta_data=_jsonb_merge(File.meta_data, {"image": done}),
+            )
+        )
+        await session.execute(
+            update(TaskAttachment)
+            .where(TaskAttachment.meta_data["file_id"].astext == str(file.id))
+            .values(meta_data=_jsonb_merge(TaskAttachment.meta_data, {
+                "thumbnail_url": thumbnail_url,
+                "image_width": done["width"],
+                "image_height": done["height"],
+            }))
+        )
+        await session.commit()
+
+
+def file_variant(file: File, variant: str) -> Optional[Dict[str, Any]]:
+    return ((file.meta_data or {}).get("image") or {}).get("variants", {}).get(variant)
@@ -0,0 +1,251 @@
+# apps/api/liderix_api/services/invalidation.py
+"""
+Cross-worker invalidation of process-local caches.
+
+Caches kept in a worker's memory (permission snapshots, API key principals,
+department trees, ...) register an eviction handler per kind of change:
+
+    invalidation_bus.register(CacheKind.PERMISSIONS, _evict_snapshots)
+
+Writers call `invalidation_bus.emit(kind, ids)` after their commit. The
+caches of the emitting worker are evicted at once, so a worker always reads
+its own writes. The other workers are told with NOTIFY cache_invalidation;
+emits are coalesced per kind until the sender runs, so a bulk update sends
+one message rather than one per row. If the NOTIFY fails the batch is
+PUBLISHed on the Redis channel of the same name instead. Every worker
+listens on both.
+
+Message: {"o": "<sending worker>", "k": "permissions", "ids": ["<id>", ...]}
+"ids": null means everything of that kind.
+
+Delivery is best-effort. A listener that loses its connection clears every
+registered cache once it is back, since messages may have been missed in
+between, and the caches' own TTLs bound anything else.
+"""
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+from enum import Enum
+from typing import Any, Callable, Dict, FrozenSet, Iterable, List, Optional, Set
+from uuid import uuid4
+
+from redis.asyncio import Redis
+from sqlalchemy import text
+
+from liderix_api.config.settings import settings
+from liderix_api.db import liderix_engine
+
+logger = logging.getLogger(__name__)
+
+redis = Redis.from_url(settings.REDIS_URL)
+
+CHANNEL = "cache_invalidation"
+# NOTIFY payloads must stay under 8000 bytes; ids are split across messages
+MAX_PAYLOAD_BYTES = 7000
+# Round trip on the LISTEN connection, so a dead connection is noticed
+LISTENER_KEEPALIVE_SEC = 30
+
+
+class CacheKind(str, Enum):
+    """What changed; ids are of that entity"""
+    USER = "user"                  # profile, activation, deletion
+    PERMISSIONS = "permissions"    # user ids whose memberships/roles changed
+    ORG = "org"                    # organization settings, deactivation, deletion
+    DEPARTMENTS = "departments"    # org ids whose departments or member placement changed
+    PROJECT = "project"            # project settings, deletion
+    API_KEY = "api_key"            # key hashes
+
+
+Keys = Optional[FrozenSet[str]]
+Handler = Callable[[Keys], None]
+
+
+class InvalidationBus:
+    def __init__(self):
+        self._handlers: Dict[CacheKind, List[Handler]] = {}
+        # kind -> ids waiting to be broadcast (None: everything)
+        self._outbox: Dict[CacheKind, Optional[Set[str]]] = {}
+        self._pending = asyncio.Event()
+        self._origin = uuid4().hex
+        self._tasks: List[asyncio.Task] = []
+
+    # ---- lifecycle ----
+
+    def start(self) -> None:
+        if not self._tasks:
+            self._tasks = [
+                asyncio.create_task(self._send()),
+                asyncio.create_task(self._listen_postgres()),
+                asyncio.create_task(self._listen_redis()),
+            ]
+
+    async def stop(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        for task in self._tasks:
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+        self._tasks = []
+        # Whatever is still queued
+        payloads = self._drain()
+        if payloads:
+            await self._broadcast(payloads)
+
+    # ---- caches ----
+
+    def register(self, kind: CacheKind, handler: Handler) -> None:
+        """handler(ids) evicts those ids (strings) or everything when ids is None"""
+        self._handlers.setdefault(kind, []).append(handler)
+
+    def emit(self, kind: CacheKind, ids: Optional[Iterable[Any]] = None) -> None:
+        """Evict here now and on the other workers shortly; call after commit"""
+        keys = None if ids is None else frozenset(str(i) for i in ids if i is not None)
+        if keys is not None and not keys:
+            return
+        self._evict(kind, keys)
+        if not self._tasks:
+            # Not started (scripts, CLI): nobody else to tell
+            return
+        if keys is None or (kind in self._outbox and self._outbox[kind] is None):
+            self._outbox[kind] = None
+        else:
+            self._outbox.setdefault(kind, set()).update(keys)
+        self._pending.set()
+
+    def _evict(self, kind: CacheKind, keys: Keys) -> None:
+        for handler in self._handlers.get(kind, ()):
+            try:
+                handler(keys)
+            except Exception as e:
+                logger.warning(f"Cache invalidation handler failed for {kind.value}: {e}")
+
+    def _evict_all(self) -> None:
+        for kind in list(self._handlers):
+            self._evict(kind, None)
+
+    # ---- sending ----
+
+    def _drain(self) -> List[str]:
+        outbox, self._outbox = self._outbox, {}
+        payloads = []
+        for kind, keys in outbox.items():
+            chunks: List[Optional[List[str]]] = [None]
+            if keys is not None:
+                chunks, size = [[]], 0
+                for key in sorted(keys):
+                    if chunks[-1] and size + len(key) > MAX_PAYLOAD_BYTES:
+                        chunks.append([])
+                        size = 0
+                    chunks[-1].append(key)
+                    size += len(key) + 4
+            payloads.extend(
+                json.dumps({"o": self._origin, "k": kind.value, "ids": chunk}) for chunk in chunks
+            )
+        return payloads
+
+    async def _broadcast(self, payloads: List[str]) -> None:
+        try:
+            async with liderix_engine.connect() as conn:
+                for payload in payloads:
+                    await conn.execute(
+                        text("SELECT pg_notify(:channel, :payload)"),
+                        {"channel": CHANNEL, "payload": payload},
+                    )
+                # NOTIFY is delivered on commit
+                await conn.commit()
+            return
+        except Exception as e:
+            logger.warning(f"Cache invalidation NOTIFY failed: {e}; falling back to Redis")
+        try:
+            async with redis.pipeline(transaction=False) as pipe:
+                for payload in payloads:
+                    pipe.publish(CHANNEL, payload)
+                await pipe.execute()
+        except Exception as e:
+            logger.warning(f"Cache invalidation publish failed: {e}")
+
+    async def _send(self) -> None:
+        while True:
+            await self._pending.wait()
+            self._pending.clear()
+            payloads = self._drain()
+            if not payloads:
+                continue
+            try:
+                await self._broadcast(payloads)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Cache invalidation send failed: {e}")
+
+    # ---- receiving ----
+
+    def _receive(self, payload: Any) -> None:
+        try:
+            message = json.loads(payload)
+            if message.get("o") == self._origin:
+                # Evicted when emitted
+                return
+            kind = CacheKind(message["k"])
+            ids = message.get("ids")
+        except (ValueError, KeyError, TypeError, AttributeError) as e:
+            logger.warning(f"Malformed cache invalidation message: {e}")
+            return
+        self._evict(kind, None if ids is None else frozenset(ids))
+
+    def _on_notify(self, _connection: Any, _pid: int, _channel: str, payload: str) -> None:
+        self._receive(payload)
+
+    async def _listen_postgres(self) -> None:
+        connected = False
+        while True:
+            try:
+                async with liderix_engine.connect() as conn:
+                    raw = await conn.get_raw_connection()
+                    driver = raw.driver_connection
+                    await driver.add_listener(CHANNEL, self._on_notify)
+                    try:
+                        if connected:
+                            # Messages sent while we were away are lost
+                            self._evict_all()
+                        connected = True
+                        while True:
+                            await asyncio.sleep(LISTENER_KEEPALIVE_SEC)
+                            await driver.execute("SELECT 1")
+                    finally:
+                        await driver.remove_listener(CHANNEL, self._on_notify)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Cache invalidation listener error: {e}; retrying")
+                await asyncio.sleep(5)
+
+    async def _listen_redis(self) -> None:
+        connected = False
+        while True:
+            pubsub = redis.pubsub(ignore_subscribe_messages=True)
+            try:
+                await pubsub.subscribe(CHANNEL)
+                if connected:
+                    self._evict_all()
+                connected = True
+                async for message in pubsub.listen():
+                    if message.get("type") == "message":
+                        self._receive(message["data"])
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Cache invalidation subscription error: {e}; retrying")
+                await asyncio.sleep(5)
+            finally:
+                try:
+                    await pubsub.aclose()
+                except Exception:
+                    pass
+
+
+invalidation_bus = InvalidationBus()
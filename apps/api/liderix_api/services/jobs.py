@@ -0,0 +1,461 @@
+# apps/api/liderix_api/services/jobs.py
+"""
+Background jobs for work too large for a request (the `jobs` table).
+
+An endpoint validates the request, adds a job to its own transaction and
+answers 202 with the job id; GET /jobs/{id} reports status, progress and
+the result. The job only exists if the endpoint's transaction commits.
+
+    job = await enqueue_job(session, "org.delete", {"org_id": str(org_id)}, org_id=org_id)
+    await session.commit()
+    return job_accepted(job, response)
+
+Handlers are registered per kind and receive a JobContext:
+
+    @job_handler("org.delete")
+    async def deactivate_org_memberships(job: JobContext) -> dict: ...
+
+Workers are asyncio tasks, JOB_WORKERS of them in every API process
+(JOBS_ENABLED) and/or in a separate process (scripts/job_worker.py). Each
+claims one job at a time:
+
+    UPDATE jobs SET status = 'running', attempts = attempts + 1, locked_until = now() + lease
+    WHERE id = (SELECT id FROM jobs WHERE status = 'queued' AND run_after <= now()
+                ORDER BY run_after LIMIT 1 FOR UPDATE SKIP LOCKED)
+
+(partial index ix_jobs_queue), so workers never wait on each other. Idle
+workers poll every JOB_POLL_INTERVAL_SEC; a commit that enqueued a job wakes
+the workers of its own process at once.
+
+- lease: while a handler runs, a heartbeat extends locked_until every third
+  of JOB_LEASE_SEC. A job whose lease expired (worker killed) goes back to
+  the queue, or fails once it has used its attempts
+- retries: an exception requeues the job with exponential backoff until
+  max_attempts; JobFailed fails it right away
+- progress: handlers call `await job.progress(percent, message)`
+- cancel: a queued job is cancelled at once; a running one is stopped at its
+  next heartbeat or progress report (the handler task is cancelled, so an
+  open transaction rolls back)
+- shutdown: running jobs are cancelled and requeued without using an attempt
+
+Handlers must be safe to run again: a retry or an expired lease repeats the
+whole handler. Finished jobs are deleted after JOB_RETENTION_DAYS.
+"""
+from __future__ import annotations
+
+import asyncio
+import importlib
+import json
+import logging
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+from uuid import UUID, uuid4
+
+from fastapi import Response
+from sqlalchemy import case, delete, event, func, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from liderix_api.config.settings import settings
+from liderix_api.db import LiderixAsyncSessionLocal
+from liderix_api.enums import JobStatus
+from liderix_api.models.jobs import Job
+from liderix_api.schemas.jobs import JobAccepted
+
+logger = logging.getLogger(__name__)
+
+# Modules whose import registers handlers (the API imports them anyway; a
+# standalone worker calls load_handlers())
+HANDLER_MODULES = (
+    "liderix_api.routes.org_structure.org",
+    "liderix_api.routes.org_structure.memberships",
+    "liderix_api.services.task_import",
+)
+
+RETRY_BACKOFF_SEC = 30
+RETRY_BACKOFF_MAX_SEC = 3600
+MAINTENANCE_INTERVAL_SEC = 60
+
+_WAKE_KEY = "jobs_enqueued"
+
+QUEUED = JobStatus.QUEUED.value
+RUNNING = JobStatus.RUNNING.value
+SUCCEEDED = JobStatus.SUCCEEDED.value
+FAILED = JobStatus.FAILED.value
+CANCELLED = JobStatus.CANCELLED.value
+
+
+class JobFailed(Exception):
+    """Raised by a handler for a failure a retry can't fix"""
+
+
+class JobCancelled(Exception):
+    """Raised from JobContext.progress once cancellation was requested"""
+
+
+@dataclass
+class JobContext:
+    id: UUID
+    kind: str
+    payload: Dict[str, Any]
+    attempt: int
+    org_id: Optional[UUID] = None
+    created_by_id: Optional[UUID] = None
+    max_attempts: int = 1
+    # Set by the heartbeat: the handler task was cancelled on request / the lease was lost
+    cancel_requested: bool = field(default=False, init=False)
+    lease_lost: bool = field(default=False, init=False)
+
+    @property
+    def last_attempt(self) -> bool:
+        """An exception now fails the job instead of requeueing it"""
+        return self.attempt >= self.max_attempts
+
+    async def progress(self, percent: int, message: Optional[str] = None) -> None:
+        """Report progress (0..100); raises JobCancelled once cancellation was requested"""
+        async with LiderixAsyncSessionLocal() as session:
+            cancel = await session.scalar(
+                update(Job)
+                .where(Job.id == self.id, Job.status == RUNNING)
+                .values(
+                    progress=max(0, min(int(percent), 100)),
+                    progress_message=message[:255] if message else None,
+                    locked_until=_lease_end(),
+                )
+                .returning(Job.cancel_requested)
+            )
+            await session.commit()
+        if cancel:
+            self.cancel_requested = True
+            raise JobCancelled()
+
+
+Handler = Callable[[JobContext], Awaitable[Optional[Dict[str, Any]]]]
+_handlers: Dict[str, Handler] = {}
+
+
+def job_handler(kind: str) -> Callable[[Handler], Handler]:
+    """Register the coroutine that runs jobs of `kind`; it returns the job result (JSON)"""
+    def register(handler: Handler) -> Handler:
+        _handlers[kind] = handler
+        return handler
+    return register
+
+
+def load_handlers() -> None:
+    for module in HANDLER_MODULES:
+        importlib.import_module(module)
+
+
+def _lease_end():
+    return func.now() + timedelta(seconds=settings.JOB_LEASE_SEC)
+
+
+def _retry_delay(attempt: int) -> timedelta:
+    return timedelta(seconds=min(RETRY_BACKOFF_SEC * 2 ** max(attempt - 1, 0), RETRY_BACKOFF_MAX_SEC))
+
+
+# ----------------- enqueue / status -----------------
+
+async def enqueue_job(
+    session: AsyncSession,
+    kind: str,
+    payload: Dict[str, Any],
+    *,
+    org_id: Optional[UUID] = None,
+    created_by_id: Optional[UUID] = None,
+    max_attempts: Optional[int] = None,
+) -> Job:
+    """Add a job to the caller's transaction; it runs once that commits"""
+    if kind not in _handlers:
+        raise ValueError(f"No handler registered for job kind '{kind}'")
+    now = datetime.now(timezone.utc)
+    job = Job(
+        id=uuid4(),
+        kind=kind,
+        status=QUEUED,
+        # UUIDs, datetimes, ... as strings
+        payload=json.loads(json.dumps(payload, default=str)),
+        progress=0,
+        attempts=0,
+        max_attempts=max_attempts or settings.JOB_MAX_ATTEMPTS,
+        cancel_requested=False,
+        org_id=org_id,
+        created_by_id=created_by_id,
+        run_after=now,
+        created_at=now,
+    )
+    session.add(job)
+    session.info[_WAKE_KEY] = True
+    return job
+
+
+def status_url(job_id: UUID) -> str:
+    return f"{(settings.API_PREFIX or '/api').rstrip('/')}/jobs/{job_id}"
+
+
+def job_accepted(job: Job, response: Optional[Response] = None) -> JobAccepted:
+    """Body of a 202 answer; sets Location to the status endpoint"""
+    url = status_url(job.id)
+    if response is not None:
+        response.headers["Location"] = url
+    return JobAccepted(job_id=job.id, kind=job.kind, status=JobStatus(job.status), status_url=url)
+
+
+async def request_cancel(session: AsyncSession, job_id: UUID) -> None:
+    """Cancel a queued job now; flag a running one for its worker. Finished jobs are left alone"""
+    cancelled = await session.scalar(
+        update(Job)
+        .where(Job.id == job_id, Job.status == QUEUED)
+        .values(status=CANCELLED, cancel_requested=True, finished_at=func.now())
+        .returning(Job.id)
+    )
+    if cancelled is None:
+        await session.execute(
+            update(Job).where(Job.id == job_id, Job.status == RUNNING).values(cancel_requested=True)
+        )
+    await session.commit()
+
+
+@event.listens_for(Session, "after_commit")
+def _wake_after_enqueue(session: Session) -> None:
+    if session.info.pop(_WAKE_KEY, False):
+        job_runner.wake()
+
+
+@event.listens_for(Session, "after_transaction_end")
+def _forget_enqueue(session: Session, transaction: Any) -> None:
+    if transaction.parent is None:
+        session.info.pop(_WAKE_KEY, None)
+
+
+# ----------------- worker side -----------------
+
+async def claim_job() -> Optional[JobContext]:
+    """Lock the next due job for this worker, or None when the queue is empty"""
+    next_job = (
+        select(Job.id)
+        .where(Job.status == QUEUED, Job.run_after <= func.now())
+        .order_by(Job.run_after)
+        .limit(1)
+        .with_for_update(skip_locked=True)
+        .scalar_subquery()
+    )
+    async with LiderixAsyncSessionLocal() as session:
+        row = (await session.execute(
+            update(Job)
+            .where(Job.id == next_job)
+            .values(
+                status=RUNNING,
+                attempts=Job.attempts + 1,
+                started_at=func.coalesce(Job.started_at, func.now()),
+                locked_until=_lease_end(),
+                error=None,
+            )
+            .returning(
+                Job.id, Job.kind, Job.payload, Job.attempts, Job.max_attempts, Job.org_id, Job.created_by_id
+            )
+            .execution_options(synchronize_session=False)
+        )).first()
+        await session.commit()
+    if row is None:
+        return None
+    return JobContext(
+        id=row.id, kind=row.kind, payload=row.payload or {}, attempt=row.attempts,
+        org_id=row.org_id, created_by_id=row.created_by_id, max_attempts=row.max_attempts,
+    )
+
+
+async def _finish(
+    job_id: UUID, status: str, result: Optional[Dict[str, Any]] = None, error: Optional[str] = None
+) -> None:
+    values: Dict[str, Any] = {
+        "status": status, "result": result, "error": error,
+        "finished_at": func.now(), "locked_until": None,
+    }
+    if status == SUCCEEDED:
+        values["progress"] = 100
+    async with LiderixAsyncSessionLocal() as session:
+        await session.execute(update(Job).where(Job.id == job_id, Job.status == RUNNING).values(**values))
+        await session.commit()
+
+
+async def _retry_or_fail(job: JobContext, error: str) -> None:
+    async with LiderixAsyncSessionLocal() as session:
+        await session.execute(
+            update(Job)
+            .where(Job.id == job.id, Job.status == RUNNING)
+            .values(
+                status=case((Job.attempts < Job.max_attempts, QUEUED), else_=FAILED),
+                run_after=func.now() + _retry_delay(job.attempt),
+                finished_at=case((Job.attempts < Job.max_attempts, None), else_=func.now()),
+                locked_until=None,
+                error=error,
+            )
+        )
+        await session.commit()
+
+
+async def _requeue(job_id: UUID) -> None:
+    """Back to the queue without using an attempt (worker shutting down)"""
+    async with LiderixAsyncSessionLocal() as session:
+        await session.execute(
+            update(Job)
+            .where(Job.id == job_id, Job.status == RUNNING)
+            .values(status=QUEUED, attempts=Job.attempts - 1, locked_until=None, run_after=func.now())
+        )
+        await session.commit()
+
+
+async def recover_expired_leases() -> int:
+    """Jobs of workers that died: queued again, or failed after their last attempt"""
+    async with LiderixAsyncSessionLocal() as session:
+        result = await session.execute(
+            update(Job)
+            .where(Job.status == RUNNING, Job.locked_until < func.now())
+            .values(
+                status=case((Job.attempts < Job.max_attempts, QUEUED), else_=FAILED),
+                finished_at=case((Job.attempts < Job.max_attempts, None), else_=func.now()),
+                run_after=func.now(),
+                locked_until=None,
+                error="Worker stopped responding (lease expired)",
+            )
+        )
+        await session.commit()
+    return result.rowcount or 0
+
+
+async def purge_finished_jobs(now: Optional[datetime] = None) -> int:
+    now = now or datetime.now(timezone.utc)
+    async with LiderixAsyncSessionLocal() as session:
+        result = await session.execute(
+            delete(Job).where(Job.finished_at < now - timedelta(days=settings.JOB_RETENTION_DAYS))
+        )
+        await session.commit()
+    return result.rowcount or 0
+
+
+class JobRunner:
+    def __init__(self):
+        self._tasks: List[asyncio.Task] = []
+        self._wakeup = asyncio.Event()
+
+    def start(self, workers: int) -> None:
+        if not self._tasks:
+            self._tasks = [asyncio.create_task(self._work()) for _ in range(max(workers, 1))]
+            self._tasks.append(asyncio.create_task(self._maintain()))
+
+    async def stop(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        for task in self._tasks:
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+        self._tasks = []
+
+    def wake(self) -> None:
+        if self._tasks:
+            self._wakeup.set()
+
+    async def _work(self) -> None:
+        while True:
+            try:
+                job = await claim_job()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Job claim failed: {e}")
+                job = None
+            if job is not None:
+                await self._run(job)
+                continue
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), settings.JOB_POLL_INTERVAL_SEC)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+
+    async def _run(self, job: JobContext) -> None:
+        handler = _handlers.get(job.kind)
+        if handler is None:
+            await _finish(job.id, FAILED, error=f"No handler registered for job kind '{job.kind}'")
+            return
+        task = asyncio.create_task(handler(job))
+        heartbeat = asyncio.create_task(self._heartbeat(job, task))
+        try:
+            result = await task
+        except asyncio.CancelledError:
+            if job.lease_lost:
+                # Requeued by lease recovery; whoever claims it next owns it
+                return
+            if job.cancel_requested:
+                await _finish(job.id, CANCELLED, error="Cancelled")
+                return
+            # The worker itself is stopping
+            task.cancel()
+            await _requeue(job.id)
+            raise
+        except JobCancelled:
+            await _finish(job.id, CANCELLED, error="Cancelled")
+        except JobFailed as e:
+            logger.warning(f"Job {job.kind} {job.id} failed: {e}")
+            await _finish(job.id, FAILED, error=str(e) or type(e).__name__)
+        except Exception as e:
+            logger.warning(f"Job {job.kind} {job.id} attempt {job.attempt} failed: {e}")
+            await _retry_or_fail(job, f"{type(e).__name__}: {e}")
+        else:
+            await _finish(job.id, SUCCEEDED, result=json.loads(json.dumps(result, default=str)) if result else None)
+        finally:
+            heartbeat.cancel()
+
+    async def _heartbeat(self, job: JobContext, task: asyncio.Task) -> None:
+        interval = max(settings.JOB_LEASE_SEC / 3, 1)
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                async with LiderixAsyncSessionLocal() as session:
+                    row = (await session.execute(
+                        update(Job)
+                        .where(Job.id == job.id, Job.status == RUNNING)
+                        .values(locked_until=_lease_end())
+                        .returning(Job.cancel_requested)
+                    )).first()
+                    await session.commit()
+            except Exception as e:
+                logger.warning(f"Job heartbeat failed for {job.id}: {e}")
+                continue
+            if row is None:
+                job.lease_lost = True
+                task.cancel()
+                return
+            if row.cancel_requested:
+                job.cancel_requested = True
+                task.cancel()
+                return
+
+    async def _maintain(self) -> None:
+        while True:
+            try:
+                recovered = await recover_expired_leases()
+                if recovered:
+                    logger.warning(f"Requeued {recovered} job(s) with expired leases")
+                await purge_finished_jobs()
+            except Exception as e:
+                logger.warning(f"Job maintenance failed: {e}")
+            await asyncio.sleep(MAINTENANCE_INTERVAL_SEC)
+
+
+job_runner = JobRunner()
+
+
+def start_job_runner() -> None:
+    """Workers inside the API process"""
+    if settings.JOBS_ENABLED:
+        job_runner.start(settings.JOB_WORKERS)
+
+
+async def stop_job_runner() -> None:
+    await job_runner.stop()
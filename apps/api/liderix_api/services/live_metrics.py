@@ -0,0 +1,304 @@
+# apps/api/liderix_api/services/live_metrics.py
+"""
+Live dashboard metrics from the ITSTEP warehouse, shared by all clients.
+
+Instead of every open dashboard polling /analytics/overview/realtime (three
+warehouse queries per poll), one poller queries the warehouse once per
+LIVE_METRICS_INTERVAL_SEC for the whole cluster:
+
+- every API worker runs the poll loop, but only a worker with connected
+  SSE clients competes for the Redis lock live_metrics:poller; the holder
+  queries, stores the result in live_metrics:snapshot and PUBLISHes it
+- every worker has one Redis subscription and fans each update out to its
+  local SSE clients as the delta against the previous snapshot
+- REST polls read live_metrics:snapshot and only query the warehouse when
+  it is missing (single-flight per process)
+
+Warehouse load is therefore constant however many screens are open.
+"""
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, List, Optional, Set, Tuple
+from uuid import uuid4
+
+from redis.asyncio import Redis
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from liderix_api.config.settings import settings
+from liderix_api.db import ItstepAsyncSessionLocal
+
+logger = logging.getLogger(__name__)
+
+redis = Redis.from_url(settings.REDIS_URL)
+
+CHANNEL = "live_metrics"
+SNAPSHOT_KEY = "live_metrics:snapshot"
+POLLER_LOCK_KEY = "live_metrics:poller"
+# Events buffered per SSE client; a client that falls behind gets a fresh snapshot
+SUBSCRIBER_QUEUE_SIZE = 32
+REVENUE_ALERT_THRESHOLD = 10000
+
+Event = Tuple[str, Dict[str, Any]]
+
+# Keep the lock while we hold it (compare-and-extend / compare-and-delete)
+_RENEW_LOCK_LUA = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    return redis.call('PEXPIRE', KEYS[1], ARGV[2])
+end
+return 0
+"""
+_RELEASE_LOCK_LUA = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    return redis.call('DEL', KEYS[1])
+end
+return 0
+"""
+_renew_lock = redis.register_script(_RENEW_LOCK_LUA)
+_release_lock = redis.register_script(_RELEASE_LOCK_LUA)
+
+
+# ----------------- warehouse query -----------------
+
+async def fetch_realtime_metrics(session: AsyncSession) -> Dict[str, Any]:
+    """Today's revenue/conversions/leads and the week's top creative"""
+    today = date.today()
+
+    today_metrics = (await session.execute(text("""
+        SELECT
+            SUM(revenue) as revenue_today,
+            SUM(contracts) as conversions_today
+        FROM dm.dm_campaign_results_daily_v3
+        WHERE date = :today
+    """), {"today": today})).fetchone()
+
+    # Range instead of DATE(request_created_at) = :today, so an index on
+    # request_created_at can be used
+    leads = (await session.execute(text("""
+        SELECT COUNT(*) as new_leads_today
+        FROM dwh.fact_crm_requests
+        WHERE request_created_at >= :today
+          AND request_created_at < :tomorrow
+    """), {"today": today, "tomorrow": today + timedelta(days=1)})).fetchone()
+
+    top_creative = (await session.execute(text("""
+        SELECT creative_key
+        FROM dm.dm_ad_results_daily_v3
+        WHERE date >= :start_date
+        ORDER BY contracts DESC, revenue DESC
+        LIMIT 1
+    """), {"start_date": today - timedelta(days=7)})).fetchone()
+
+    revenue_today = float(today_metrics.revenue_today or 0)
+    alerts = []
+    if revenue_today < REVENUE_ALERT_THRESHOLD:  # Below target
+        alerts.append("Daily revenue below target")
+
+    return {
+        # Mock active sessions (would need real-time data)
+        "active_sessions": 156,
+        "new_leads_today": int(leads.new_leads_today or 0),
+        "revenue_today": revenue_today,
+        "conversions_today": int(today_metrics.conversions_today or 0),
+        "top_performing_creative": top_creative.creative_key if top_creative else None,
+        "alerts": alerts,
+        "last_updated": datetime.now().isoformat(),
+    }
+
+
+def metrics_delta(old: Optional[Dict[str, Any]], new: Dict[str, Any]) -> Dict[str, Any]:
+    """Fields of `new` that differ from `old` (everything if there is no old)"""
+    if old is None:
+        return dict(new)
+    return {key: value for key, value in new.items() if old.get(key) != value}
+
+
+# ----------------- hub -----------------
+
+class LiveMetricsHub:
+    """
+    Per-process fan-out of live metrics to SSE clients.
+
+    Clients get ("snapshot", metrics) first and ("delta", changed fields)
+    afterwards. Queues are filled synchronously, so a subscriber always
+    receives the deltas that follow the snapshot it started from.
+    """
+
+    def __init__(self):
+        self._subscribers: Set[asyncio.Queue] = set()
+        self._snapshot: Optional[Dict[str, Any]] = None
+        self._token = uuid4().hex
+        self._is_poller = False
+        self._wakeup = asyncio.Event()
+        self._refresh_lock = asyncio.Lock()
+        self._tasks: List[asyncio.Task] = []
+
+    @property
+    def interval(self) -> int:
+        return max(settings.LIVE_METRICS_INTERVAL_SEC, 1)
+
+    # ---- lifecycle ----
+
+    def start(self) -> None:
+        if not self._tasks:
+            self._tasks = [asyncio.create_task(self._listen()), asyncio.create_task(self._poll())]
+
+    async def stop(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        for task in self._tasks:
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+        self._tasks = []
+        await self._release()
+
+    # ---- subscribers ----
+
+    async def subscribe(self) -> asyncio.Queue:
+        if self._snapshot is None:
+            # Another worker may be polling already: start from its snapshot
+            cached = await self._cached()
+            if cached is not None and self._snapshot is None:
+                self._apply(cached)
+        queue: asyncio.Queue = asyncio.Queue(maxsize=SUBSCRIBER_QUEUE_SIZE)
+        if self._snapshot is not None:
+            queue.put_nowait(("snapshot", self._snapshot))
+        else:
+            # Nothing to show yet: poll now instead of at the next tick
+            self._wakeup.set()
+        self._subscribers.add(queue)
+        return queue
+
+    def unsubscribe(self, queue: asyncio.Queue) -> None:
+        self._subscribers.discard(queue)
+
+    def _offer(self, queue: asyncio.Queue, event: Event) -> None:
+        try:
+            queue.put_nowait(event)
+        except asyncio.QueueFull:
+            # Too slow for deltas: drop the backlog, resync with a snapshot
+            while not queue.empty():
+                queue.get_nowait()
+            queue.put_nowait(("snapshot", self._snapshot))
+
+    def _apply(self, metrics: Dict[str, Any]) -> None:
+        delta = metrics_delta(self._snapshot, metrics)
+        kind = "snapshot" if self._snapshot is None else "delta"
+        self._snapshot = metrics
+        if not delta:
+            return
+        for queue in list(self._subscribers):
+            self._offer(queue, (kind, delta))
+
+    # ---- REST ----
+
+    async def current(self) -> Dict[str, Any]:
+        """Latest metrics for polling clients; queries only if nobody has lately"""
+        metrics = await self._cached()
+        if metrics is not None:
+            return metrics
+        async with self._refresh_lock:
+            metrics = await self._cached()
+            if metrics is None:
+                metrics = await self._query()
+                await self._store(metrics)
+            return metrics
+
+    # ---- redis ----
+
+    async def _cached(self) -> Optional[Dict[str, Any]]:
+        try:
+            raw = await redis.get(SNAPSHOT_KEY)
+        except Exception as e:
+            logger.warning(f"Live metrics snapshot read failed: {e}")
+            return None
+        return json.loads(raw) if raw else None
+
+    async def _store(self, metrics: Dict[str, Any], publish: bool = False) -> None:
+        payload = json.dumps(metrics)
+        try:
+            async with redis.pipeline(transaction=False) as pipe:
+                pipe.set(SNAPSHOT_KEY, payload, ex=self.interval * 2)
+                if publish:
+                    pipe.publish(CHANNEL, payload)
+                await pipe.execute()
+        except Exception as e:
+            logger.warning(f"Live metrics publish failed: {e}")
+            if publish:
+                # Local clients still get the update
+                self._apply(metrics)
+
+    async def _acquire(self) -> bool:
+        ttl_ms = self.interval * 3 * 1000
+        try:
+            if self._is_poller:
+                self._is_poller = bool(await _renew_lock(keys=[POLLER_LOCK_KEY], args=[self._token, ttl_ms]))
+            if not self._is_poller:
+                self._is_poller = bool(await redis.set(POLLER_LOCK_KEY, self._token, nx=True, px=ttl_ms))
+        except Exception as e:
+            # Without Redis every worker polls for its own clients
+            logger.warning(f"Live metrics lock failed: {e}")
+            return True
+        return self._is_poller
+
+    async def _release(self) -> None:
+        if not self._is_poller:
+            return
+        self._is_poller = False
+        try:
+            await _release_lock(keys=[POLLER_LOCK_KEY], args=[self._token])
+        except Exception as e:
+            logger.warning(f"Live metrics lock release failed: {e}")
+
+    async def _query(self) -> Dict[str, Any]:
+        async with ItstepAsyncSessionLocal() as session:
+            return await fetch_realtime_metrics(session)
+
+    # ---- loops ----
+
+    async def _poll(self) -> None:
+        while True:
+            try:
+                if self._subscribers:
+                    if await self._acquire():
+                        await self._store(await self._query(), publish=True)
+                else:
+                    # Let a worker that still has clients take over at once
+                    await self._release()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Live metrics poll failed: {e}")
+            self._wakeup.clear()
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.interval)
+            except asyncio.TimeoutError:
+                pass
+
+    async def _listen(self) -> None:
+        while True:
+            pubsub = redis.pubsub(ignore_subscribe_messages=True)
+            try:
+                await pubsub.subscribe(CHANNEL)
+                async for message in pubsub.listen():
+                    if message.get("type") == "message":
+                        self._apply(json.loads(message["data"]))
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Live metrics subscription error: {e}; retrying")
+                await asyncio.sleep(5)
+            finally:
+                try:
+                    await pubsub.aclose()
+                except Exception:
+                    pass
+
+
+live_metrics = LiveMetricsHub()
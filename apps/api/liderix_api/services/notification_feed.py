@@ -0,0 +1,348 @@
+# apps/api/liderix_api/services/notification_feed.py
+"""
+In-app notification feed (the `notifications` table).
+
+The header badge reads an unread counter per user cached in Redis
+(notifications:unread:{user_id}) instead of running COUNT(*) on every page
+view. The counter is filled lazily from the partial ix_notification_user_unread
+index and then adjusted in place:
+
+- notify_users: +n after the INSERT commits
+- mark_read:    -n for the rows the UPDATE actually flipped
+- mark_all_read / purge: the key is dropped and recounted on the next read
+  (a concurrent insert can't be lost between the UPDATE and a SET 0)
+
+Adjustments only touch an existing key (Lua), so a cold counter is never
+initialised from a delta. The TTL bounds any drift from races with a recount.
+
+The feed is keyset-paginated on (created_at, id) within a user
+(ix_notification_user_feed). Expired notifications are hidden right away and
+deleted by a background loop in batches.
+"""
+from __future__ import annotations
+
+import asyncio
+import base64
+import json
+import logging
+from collections import Counter
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Sequence, Set, Tuple
+from uuid import UUID, uuid4
+
+from redis.asyncio import Redis
+from sqlalchemy import and_, delete, func, insert, literal, or_, select, tuple_, update
+from sqlalchemy.dialects.postgresql import UUID as PG_UUID
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from liderix_api.config.settings import settings
+from liderix_api.db import LiderixAsyncSessionLocal
+from liderix_api.enums import NotificationChannel, NotificationStatus
+from liderix_api.models.notifications import Notification, NotificationPreference
+
+logger = logging.getLogger(__name__)
+
+redis = Redis.from_url(settings.REDIS_URL)
+
+UNREAD_CACHE_TTL_SEC = 600
+# Rows per INSERT statement, under the 32767 bind parameter limit
+INSERT_CHUNK_ROWS = 1000
+
+# Apply a delta to a cached counter; a missing key stays missing, a negative
+# result (drift) drops the key so the next read recounts
+_ADJUST_UNREAD_LUA = """
+if redis.call('EXISTS', KEYS[1]) == 0 then
+    return -1
+end
+local value = redis.call('INCRBY', KEYS[1], ARGV[1])
+if value < 0 then
+    redis.call('DEL', KEYS[1])
+end
+return value
+"""
+_adjust_unread = redis.register_script(_ADJUST_UNREAD_LUA)
+
+# Columns the feed renders (no entity loads: the relationships are selectin)
+_FEED_COLUMNS = (
+    Notification.id,
+    Notification.type,
+    Notification.status,
+    Notification.title,
+    Notification.message,
+    Notification.related_entity_type,
+    Notification.related_entity_id,
+    Notification.action_url,
+    Notification.action_text,
+    Notification.priority,
+    Notification.created_at,
+    Notification.read_at,
+    Notification.expires_at,
+    Notification.meta_data,
+)
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+def _unread_key(user_id: UUID) -> str:
+    return f"notifications:unread:{user_id}"
+
+
+def _visible(now: datetime):
+    return and_(
+        Notification.is_deleted.is_(False),
+        or_(Notification.expires_at.is_(None), Notification.expires_at > now),
+    )
+
+
+# ----------------- unread counter -----------------
+
+async def unread_count(session: AsyncSession, user_id: UUID) -> int:
+    key = _unread_key(user_id)
+    try:
+        cached = await redis.get(key)
+        if cached is not None:
+            return max(int(cached), 0)
+    except Exception as e:
+        logger.warning(f"Unread counter read failed: {e}")
+
+    count = await session.scalar(
+        select(func.count()).select_from(Notification).where(
+            Notification.user_id == user_id,
+            Notification.read_at.is_(None),
+            _visible(datetime.now(timezone.utc)),
+        )
+    ) or 0
+    try:
+        # NX: an adjusted value written meanwhile is at least as fresh
+        await redis.set(key, count, ex=UNREAD_CACHE_TTL_SEC, nx=True)
+    except Exception as e:
+        logger.warning(f"Unread counter write failed: {e}")
+    return count
+
+
+async def _adjust_unread_counts(deltas: Dict[UUID, int]) -> None:
+    deltas = {user_id: delta for user_id, delta in deltas.items() if delta}
+    if not deltas:
+        return
+    try:
+        async with redis.pipeline(transaction=False) as pipe:
+            for user_id, delta in deltas.items():
+                await _adjust_unread(keys=[_unread_key(user_id)], args=[delta], client=pipe)
+            await pipe.execute()
+    except Exception as e:
+        logger.warning(f"Unread counter update failed: {e}")
+        await _forget_unread_counts(deltas.keys())
+
+
+async def _forget_unread_counts(user_ids) -> None:
+    keys = [_unread_key(user_id) for user_id in set(user_ids)]
+    if not keys:
+        return
+    try:
+        await redis.delete(*keys)
+    except Exception as e:
+        logger.warning(f"Unread counter invalidation failed: {e}")
+
+
+# ----------------- writes -----------------
+
+async def notify_users(notifications: Sequence[Dict[str, Any]]) -> int:
+    """
+    Create in-app notifications with one INSERT in their own transaction
+    (safe to run as a background task). Each item needs org_id, user_id,
+    type, title and message; any other Notification column may be given.
+    Users who switched the in-app channel off for a type are skipped.
+    Returns the number of notifications created.
+    """
+    if not notifications:
+        return 0
+    now = datetime.now(timezone.utc)
+
+    async with LiderixAsyncSessionLocal() as session:
+        muted: Set[Tuple[UUID, Any]] = set((await session.execute(
+            select(NotificationPreference.user_id, NotificationPreference.type).where(
+                NotificationPreference.user_id.in_({item["user_id"] for item in notifications}),
+                NotificationPreference.in_app_enabled.is_(False),
+            )
+        )).all())
+        rows = [
+            {
+                "status": NotificationStatus.UNREAD,
+                "priority": "normal",
+                "channels": [NotificationChannel.IN_APP.value],
+                "meta_data": {},
+                # Multi-row VALUES need the same keys in every row
+                "related_entity_type": None,
+                "related_entity_id": None,
+                "action_url": None,
+                "action_text": None,
+                "expires_at": None,
+                **item,
+                "id": uuid4(),
+                "read_at": None,
+                "sent_at": now,
+                "is_deleted": False,
+                "created_at": now,
+                "updated_at": now,
+            }
+            for item in notifications
+            if (item["user_id"], item["type"]) not in muted
+        ]
+        for offset in range(0, len(rows), INSERT_CHUNK_ROWS):
+            await session.execute(insert(Notification).values(rows[offset:offset + INSERT_CHUNK_ROWS]))
+        await session.commit()
+
+    await _adjust_unread_counts(Counter(
+        row["user_id"] for row in rows
+        if row["expires_at"] is None or row["expires_at"] > now
+    ))
+    return len(rows)
+
+
+async def mark_read(session: AsyncSession, user_id: UUID, notification_ids: Sequence[UUID]) -> int:
+    """Mark the user's notifications read; commits. Returns rows changed."""
+    now = datetime.now(timezone.utc)
+    changed = (await session.execute(
+        update(Notification)
+        .where(
+            Notification.user_id == user_id,
+            Notification.id.in_(notification_ids),
+            Notification.read_at.is_(None),
+            Notification.is_deleted.is_(False),
+        )
+        .values(read_at=now, status=NotificationStatus.READ, updated_at=now)
+        .returning(Notification.expires_at)
+    )).scalars().all()
+    await session.commit()
+
+    # Expired rows were never part of the count
+    counted = sum(1 for expires_at in changed if expires_at is None or expires_at > now)
+    await _adjust_unread_counts({user_id: -counted})
+    return len(changed)
+
+
+async def mark_all_read(session: AsyncSession, user_id: UUID) -> int:
+    """One UPDATE over all unread notifications of the user; commits."""
+    now = datetime.now(timezone.utc)
+    result = await session.execute(
+        update(Notification)
+        .where(
+            Notification.user_id == user_id,
+            Notification.read_at.is_(None),
+            Notification.is_deleted.is_(False),
+        )
+        .values(read_at=now, status=NotificationStatus.READ, updated_at=now)
+        .execution_options(synchronize_session=False)
+    )
+    await session.commit()
+    await _forget_unread_counts([user_id])
+    return result.rowcount or 0
+
+
+# ----------------- feed -----------------
+
+def encode_cursor(created_at: datetime, notification_id: UUID) -> str:
+    raw = json.dumps({"c": created_at.isoformat(), "i": str(notification_id)})
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def _keyset(cursor: str):
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        data = json.loads(raw)
+        created_at, notification_id = datetime.fromisoformat(data["c"]), UUID(data["i"])
+    except Exception:
+        raise InvalidCursor("Pagination cursor is malformed")
+    return tuple_(Notification.created_at, Notification.id) < tuple_(
+        literal(created_at), literal(notification_id, PG_UUID(as_uuid=True))
+    )
+
+
+async def get_feed(
+    session: AsyncSession,
+    user_id: UUID,
+    cursor: Optional[str] = None,
+    limit: int = 20,
+    unread_only: bool = False,
+) -> Tuple[List[Any], Optional[str]]:
+    """A page of the user's feed, newest first, and the cursor of the next page"""
+    stmt = select(*_FEED_COLUMNS).where(
+        Notification.user_id == user_id,
+        _visible(datetime.now(timezone.utc)),
+    )
+    if unread_only:
+        stmt = stmt.where(Notification.read_at.is_(None))
+    if cursor:
+        stmt = stmt.where(_keyset(cursor))
+    stmt = stmt.order_by(Notification.created_at.desc(), Notification.id.desc()).limit(limit + 1)
+
+    rows = (await session.execute(stmt)).all()
+    if len(rows) <= limit:
+        return rows, None
+    rows = rows[:limit]
+    return rows, encode_cursor(rows[-1].created_at, rows[-1].id)
+
+
+# ----------------- expiry purge -----------------
+
+async def purge_expired(batch_size: Optional[int] = None) -> int:
+    """
+    Delete expired notifications in batches (one short transaction each, so
+    the table is never locked for long). Returns rows deleted.
+    """
+    batch_size = batch_size or settings.NOTIFICATIONS_PURGE_BATCH_SIZE
+    total = 0
+    while True:
+        async with LiderixAsyncSessionLocal() as session:
+            batch = (
+                select(Notification.id)
+                .where(Notification.expires_at <= func.now())
+                .limit(batch_size)
+                .with_for_update(skip_locked=True)
+                .scalar_subquery()
+            )
+            users = (await session.execute(
+                delete(Notification)
+                .where(Notification.id.in_(batch))
+                .returning(Notification.user_id)
+                .execution_options(synchronize_session=False)
+            )).scalars().all()
+            await session.commit()
+        await _forget_unread_counts(users)
+        total += len(users)
+        if len(users) < batch_size:
+            break
+    if total:
+        logger.info("Purged %d expired notifications", total)
+    return total
+
+
+_purger: Optional[asyncio.Task] = None
+
+
+async def _purge_loop() -> None:
+    while True:
+        try:
+            await purge_expired()
+        except Exception as e:
+            logger.warning(f"Notification purge failed: {e}")
+        await asyncio.sleep(settings.NOTIFICATIONS_PURGE_INTERVAL_SEC)
+
+
+def start_notification_purger() -> None:
+    global _purger
+    if _purger is None and settings.NOTIFICATIONS_PURGE_ENABLED:
+        _purger = asyncio.create_task(_purge_loop())
+
+
+async def stop_notification_purger() -> None:
+    global _purger
+    if _purger is not None:
+        _purger.cancel()
+        try:
+            await _purger
+        except asyncio.CancelledError:
+            pass
+        _purger = None
@@ -155,6 +155,7 @@ class NotificationService:
                 "task_deadline": "task_deadline_reminder",
                 "task_completed": "task_completed",
                 "task_overdue": "task_overdue",
+                "tasks_bulk_updated": "tasks_bulk_updated",
             }
             template_name = template_mapping.get(notification_type, "generic_task")
 
@@ -191,6 +192,7 @@ class NotificationService:
             "task_deadline": f"Task Deadline Reminder: {task_title}",
             "task_completed": f"Task Completed: {task_title}",
             "task_overdue": f"Task Overdue: {task_title}",
+            "tasks_bulk_updated": f"Tasks Updated: {task_title}",
         }
         subject = subjects.get(notification_type, f"Task Notification: {task_title}")
 
@@ -203,6 +205,7 @@ class NotificationService:
             "task_deadline": f'Reminder: Task "{task_title}" has an upcoming deadline.',
             "task_completed": f'Task "{task_title}" has been marked as completed by {sender_username}.',
             "task_overdue": f'Task "{task_title}" is now overdue.',
+            "tasks_bulk_updated": f'{sender_username} updated {task_title}.',
         }
         content = content_templates.get(
             notification_type, f'Task "{task_title}" notification from {sender_username}.'
@@ -213,6 +216,8 @@ class NotificationService:
                 content += f' Status changed from {extra_data["old_status"]} to {extra_data["new_status"]}.'
             if "comment" in extra_data:
                 content += f' Comment: {extra_data["comment"][:100]}...'
+            if extra_data.get("task_titles"):
+                content += "\n" + "\n".join(f"- {t}" for t in extra_data["task_titles"])
 
         content += (
             f'\n\nNotification sent at {datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M:%S UTC")}'
@@ -5,16 +5,24 @@ Supports organization-level and project-level permissions.
 from __future__ import annotations
 
 import logging
-from typing import List, Dict, Any, Optional
+import time
+from dataclasses import dataclass, field
+from typing import List, Dict, Any, Optional, Sequence, Tuple
+from uuid import UUID
 from enum import Enum
 from fastapi import HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, and_, or_
+from sqlalchemy import select, and_, or_, event
+from sqlalchemy.orm import Session
 
 from liderix_api.models.users import User, UserRole
 from liderix_api.models.memberships import Membership, MembershipRole
 from liderix_api.models.projects import Project
 from liderix_api.models.project_members import ProjectMember
+from liderix_api.models.tasks import Task
+from liderix_api.models.responsibility_scopes import ResponsibilityScope
+from liderix_api.config.settings import settings
+from liderix_api.services.invalidation import CacheKind, invalidation_bus
 
 logger = logging.getLogger(__name__)
 
@@ -46,6 +54,274 @@ class Permission(str, Enum):
     SYSTEM_ADMIN = "system:admin"
 
 
+_ROLE_PERMISSIONS: Dict[str, List[str]] = {
+    "owner": ["read", "write", "delete", "admin"],
+    "admin": ["read", "write", "admin"],
+    "member": ["read", "write"],
+    "viewer": ["read"]
+}
+
+# Org roles that reach tasks outside a (live) project; plain members and
+# viewers only see those they created or are assigned to
+_TASK_ORG_FALLBACK_ROLES = frozenset({"owner", "admin"})
+
+# Evaluator is stored in session.info, so a request's checks share one snapshot
+_EVALUATOR_KEY = "permission_evaluator"
+
+# Cross-request snapshot cache (process-local), enabled by PERMISSION_CACHE_TTL_SEC;
+# kept in sync across workers by the invalidation bus
+_snapshot_cache: Dict[UUID, Tuple[float, "PermissionSnapshot"]] = {}
+
+
+def _role_name(role: Any) -> str:
+    return role.value if isinstance(role, Enum) else str(role)
+
+
+@dataclass
+class PermissionSnapshot:
+    """Everything permission checks need to know about one user."""
+    user_id: UUID
+    org_roles: Dict[UUID, str] = field(default_factory=dict)
+    project_roles: Dict[UUID, str] = field(default_factory=dict)
+    # (org_id, object_type) -> [(object_id or None for wildcard, permissions)]
+    scopes: Dict[Tuple[UUID, str], List[Tuple[Optional[UUID], Dict[str, Any]]]] = field(default_factory=dict)
+
+    def has_scope(self, org_id: UUID, object_type: str, object_id: Optional[UUID], action: str) -> bool:
+        for scope_object_id, permissions in self.scopes.get((org_id, object_type), []):
+            if scope_object_id is None or scope_object_id == object_id:
+                if (permissions or {}).get(action) is True:
+                    return True
+        return False
+
+
+async def _load_snapshot(session: AsyncSession, user_id: UUID) -> PermissionSnapshot:
+    snapshot = PermissionSnapshot(user_id=user_id)
+
+    memberships = await session.execute(
+        select(Membership.org_id, Membership.role).where(
+            and_(Membership.user_id == user_id, Membership.deleted_at.is_(None))
+        )
+    )
+    snapshot.org_roles = {org_id: _role_name(role) for org_id, role in memberships.all()}
+
+    project_members = await session.execute(
+        select(ProjectMember.project_id, ProjectMember.role).where(
+            and_(ProjectMember.user_id == user_id, ProjectMember.deleted_at.is_(None))
+        )
+    )
+    snapshot.project_roles = {
+        project_id: _role_name(role or "member") for project_id, role in project_members.all()
+    }
+
+    scopes = await session.execute(
+        select(
+            ResponsibilityScope.org_id,
+            ResponsibilityScope.object_type,
+            ResponsibilityScope.object_id,
+            ResponsibilityScope.permissions,
+        ).where(
+            and_(ResponsibilityScope.user_id == user_id, ResponsibilityScope.deleted_at.is_(None))
+        )
+    )
+    for org_id, object_type, object_id, permissions in scopes.all():
+        snapshot.scopes.setdefault((org_id, object_type), []).append((object_id, permissions))
+
+    return snapshot
+
+
+@event.listens_for(Session, "after_commit")
+def _reset_session_evaluator(session: Session) -> None:
+    # Writes in this transaction may have changed memberships/roles
+    session.info.pop(_EVALUATOR_KEY, None)
+
+
+def invalidate_permission_cache(user_id: Optional[UUID] = None) -> None:
+    """Drop cached snapshots (all of them when user_id is None) on every worker."""
+    invalidation_bus.emit(CacheKind.PERMISSIONS, None if user_id is None else [user_id])
+
+
+def _evict_snapshots(user_ids: Optional[frozenset]) -> None:
+    if user_ids is None:
+        _snapshot_cache.clear()
+        return
+    for user_id in user_ids:
+        _snapshot_cache.pop(UUID(user_id), None)
+
+
+def _evict_snapshots_referencing(attribute: str):
+    """Snapshots holding a role in one of the changed organizations"""
+    def evict(ids: Optional[frozenset]) -> None:
+        if ids is None:
+            _snapshot_cache.clear()
+            return
+        for user_id, (_, snapshot) in list(_snapshot_cache.items()):
+            if any(str(object_id) in ids for object_id in getattr(snapshot, attribute)):
+                _snapshot_cache.pop(user_id, None)
+    return evict
+
+
+invalidation_bus.register(CacheKind.PERMISSIONS, _evict_snapshots)
+invalidation_bus.register(CacheKind.USER, _evict_snapshots)
+invalidation_bus.register(CacheKind.ORG, _evict_snapshots_referencing("org_roles"))
+
+
+class PermissionEvaluator:
+    """
+    Batched permission checks.
+
+    Memberships, project roles and responsibility scopes of a user are loaded
+    once (three queries) and kept for the lifetime of the session, i.e. the
+    request; with PERMISSION_CACHE_TTL_SEC > 0 snapshots are also reused across
+    requests for that many seconds. `can()` then decides for any number of
+    tasks, projects or organizations in memory. The only extra query is one
+    IN lookup of is_public for projects the objects reference but the user
+    is not a member of.
+
+    Use PermissionEvaluator.for_session(session) to share the instance
+    between all checks made with the same session.
+    """
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+        self._snapshots: Dict[UUID, PermissionSnapshot] = {}
+        self._public_projects: Dict[UUID, bool] = {}
+
+    @classmethod
+    def for_session(cls, session: AsyncSession) -> "PermissionEvaluator":
+        evaluator = session.info.get(_EVALUATOR_KEY)
+        if evaluator is None:
+            evaluator = cls(session)
+            session.info[_EVALUATOR_KEY] = evaluator
+        return evaluator
+
+    async def snapshot(self, user_id: UUID) -> PermissionSnapshot:
+        snapshot = self._snapshots.get(user_id)
+        if snapshot is not None:
+            return snapshot
+
+        ttl = settings.PERMISSION_CACHE_TTL_SEC
+        cached = _snapshot_cache.get(user_id) if ttl > 0 else None
+        if cached is not None and cached[0] > time.monotonic():
+            snapshot = cached[1]
+        else:
+            snapshot = await _load_snapshot(self.session, user_id)
+            if ttl > 0:
+                _snapshot_cache[user_id] = (time.monotonic() + ttl, snapshot)
+
+        self._snapshots[user_id] = snapshot
+        return snapshot
+
+    async def can(self, user: User, permission: str, objects: Sequence[Any]) -> List[bool]:
+        """
+        Decide `permission` (read/write/delete/admin) for each object.
+
+        Objects are Task or Project instances (or rows with the same
+        attribute names), Organization instances or organization ids.
+        """
+        if not user or not getattr(user, 'is_active', False):
+            return [False] * len(objects)
+        if getattr(user, 'is_admin', False):
+            return [True] * len(objects)
+
+        snapshot = await self.snapshot(user.id)
+        await self._load_public_flags(snapshot, objects)
+        return [self._decide(snapshot, user, permission, obj) for obj in objects]
+
+    async def filter(self, user: User, permission: str, objects: Sequence[Any]) -> List[Any]:
+        """Objects from `objects` the user has `permission` on."""
+        decisions = await self.can(user, permission, objects)
+        return [obj for obj, ok in zip(objects, decisions) if ok]
+
+    async def has_scope(
+        self,
+        user_id: UUID,
+        org_id: UUID,
+        object_type: str,
+        object_id: Optional[UUID],
+        action: str,
+    ) -> bool:
+        snapshot = await self.snapshot(user_id)
+        return snapshot.has_scope(org_id, object_type, object_id, action)
+
+    # ----- internals -----
+
+    async def _load_public_flags(self, snapshot: PermissionSnapshot, objects: Sequence[Any]) -> None:
+        missing = set()
+        for obj in objects:
+            if isinstance(obj, Project) or _is_task(obj):
+                project_id = obj.id if isinstance(obj, Project) else obj.project_id
+                if project_id is None or project_id in snapshot.project_roles:
+                    continue
+                if self._known_public_flag(obj) is None and project_id not in self._public_projects:
+                    missing.add(project_id)
+        if not missing:
+            return
+        rows = await self.session.execute(
+            select(Project.id, Project.is_public).where(
+                and_(Project.id.in_(missing), Project.deleted_at.is_(None))
+            )
+        )
+        self._public_projects.update({project_id: bool(is_public) for project_id, is_public in rows.all()})
+
+    @staticmethod
+    def _known_public_flag(obj: Any) -> Optional[bool]:
+        if isinstance(obj, Project):
+            return bool(obj.is_public)
+        if hasattr(obj, 'project_is_public'):
+            return obj.project_is_public
+        # Task instance with the project relationship already loaded
+        project = obj.__dict__.get('project') if hasattr(obj, '__dict__') else None
+        if project is None or getattr(project, 'deleted_at', None) is not None:
+            return None
+        return bool(project.is_public)
+
+    def _has_live_project(self, snapshot: PermissionSnapshot, obj: Any) -> bool:
+        """The task's project exists and is not soft-deleted (or the user holds a role in it)"""
+        if obj.project_id in snapshot.project_roles:
+            return True
+        return self._known_public_flag(obj) is not None or obj.project_id in self._public_projects
+
+    def _decide(self, snapshot: PermissionSnapshot, user: User, permission: str, obj: Any) -> bool:
+        if isinstance(obj, Project):
+            return self._project_decision(snapshot, user, permission, obj.id, obj)
+        if _is_task(obj):
+            if obj.creator_id == user.id:
+                return True
+            if obj.assignee_id == user.id:
+                return permission in ["read", "write"]
+            if obj.project_id and self._has_live_project(snapshot, obj):
+                return self._project_decision(snapshot, user, permission, obj.project_id, obj)
+            # No project, or a deleted/dangling one: organization owners and admins only
+            if obj.org_id and snapshot.org_roles.get(obj.org_id) in _TASK_ORG_FALLBACK_ROLES:
+                return self._org_decision(snapshot, permission, obj.org_id)
+            return False
+        # Organization instance or id
+        return self._org_decision(snapshot, permission, getattr(obj, 'id', obj))
+
+    def _project_decision(
+        self, snapshot: PermissionSnapshot, user: User, permission: str, project_id: UUID, obj: Any
+    ) -> bool:
+        # Project owner always has full access
+        if isinstance(obj, Project) and getattr(obj, 'owner_id', None) == user.id:
+            return True
+        role = snapshot.project_roles.get(project_id)
+        if role is not None:
+            return permission in _ROLE_PERMISSIONS.get(role, [])
+        is_public = self._known_public_flag(obj)
+        if is_public is None:
+            is_public = self._public_projects.get(project_id, False)
+        return bool(is_public) and permission == "read"
+
+    @staticmethod
+    def _org_decision(snapshot: PermissionSnapshot, permission: str, org_id: UUID) -> bool:
+        role = snapshot.org_roles.get(org_id)
+        return role is not None and permission in _ROLE_PERMISSIONS.get(role, [])
+
+
+def _is_task(obj: Any) -> bool:
+    return isinstance(obj, Task) or (hasattr(obj, 'creator_id') and hasattr(obj, 'assignee_id'))
+
+
 async def check_task_permission(
     session: AsyncSession,
     task,  # Task model instance
@@ -65,45 +341,69 @@ async def check_task_permission(
         bool: True if user has permission
     """
     try:
-        if not task or not user or not user.is_active:
+        if not task:
             return False
-        
-        # System admins have all permissions
-        if getattr(user, 'is_admin', False):
-            return True
-        
-        # Task creator has all permissions
-        if hasattr(task, 'creator_id') and task.creator_id == user.id:
-            return True
-        
-        # Task assignee has read/write permissions (but not delete)
-        if hasattr(task, 'assignee_id') and task.assignee_id == user.id:
-            return permission in ["read", "write"]
-        
-        # If task belongs to a project, check project permissions
-        if hasattr(task, 'project_id') and task.project_id:
-            # Get the project
-            if hasattr(task, 'project') and task.project:
-                project = task.project
-            else:
-                # Load project if not already loaded
-                project = await session.get(Project, task.project_id)
-            
-            if project:
-                return await check_project_permission(session, project, user, permission)
-        
-        # If task belongs to an organization (but no project), check org permissions
-        if hasattr(task, 'org_id') and task.org_id:
-            return await check_organization_permission(session, task.org_id, user, permission)
-        
-        # For tasks without project/org, only creator and assignee have access
-        return False
-        
+        (allowed,) = await PermissionEvaluator.for_session(session).can(user, permission, [task])
+        return allowed
     except Exception as e:
         logger.error(f"Error checking task permission: {e}")
         return False
 
 
+async def load_tasks_with_permission(
+    session: AsyncSession,
+    user: User,
+    criteria,
+    permission: str,
+    limit: Optional[int] = None,
+) -> Tuple[List[Any], List[Any]]:
+    """
+    Batched variant of check_task_permission for bulk operations.
+
+    Selects every non-deleted task matching `criteria` (with its project's
+    is_public flag) in a single query and evaluates the permission with
+    PermissionEvaluator.
+
+    Returns:
+        (allowed_rows, denied_ids) - rows expose id, title, status,
+        assignee_id, creator_id, project_id and org_id.
+    """
+    if not user or not user.is_active:
+        return [], []
+
+    stmt = (
+        select(
+            Task.id,
+            Task.title,
+            Task.status,
+            Task.assignee_id,
+            Task.creator_id,
+            Task.project_id,
+            Task.org_id,
+            Project.is_public.label("project_is_public"),
+        )
+        .outerjoin(
+            Project,
+            and_(Project.id == Task.project_id, Project.deleted_at.is_(None)),
+        )
+        .where(Task.deleted_at.is_(None), criteria)
+        .order_by(Task.id)
+    )
+    if limit is not None:
+        stmt = stmt.limit(limit)
+
+    rows = (await session.execute(stmt)).all()
+    decisions = await PermissionEvaluator.for_session(session).can(user, permission, rows)
+
+    allowed, denied = [], []
+    for row, ok in zip(rows, decisions):
+        if ok:
+            allowed.append(row)
+        else:
+            denied.append(row.id)
+    return allowed, denied
+
+
 async def check_project_permission(
     session: AsyncSession,
     project: Project,
@@ -112,46 +412,8 @@ async def check_project_permission(
 ) -> bool:
     """Check if user has permission for specific project"""
     try:
-        if not user.is_active:
-            return False
-        
-        # System admins have all permissions
-        if getattr(user, 'is_admin', False):
-            return True
-        
-        # Project owner always has full access
-        if hasattr(project, 'owner_id') and project.owner_id == user.id:
-            return True
-        
-        # Check project-specific membership
-        project_member = await session.scalar(
-            select(ProjectMember).where(
-                and_(
-                    ProjectMember.project_id == project.id,
-                    ProjectMember.user_id == user.id,
-                    ProjectMember.deleted_at.is_(None)
-                )
-            )
-        )
-        
-        if not project_member:
-            # Check if project is public and permission is read
-            if hasattr(project, 'is_public') and project.is_public and permission == "read":
-                return True
-            return False
-        
-        # Role-based permission check
-        role_permissions = {
-            "owner": ["read", "write", "delete", "admin"],
-            "admin": ["read", "write", "admin"],
-            "member": ["read", "write"],
-            "viewer": ["read"]
-        }
-        
-        user_role = getattr(project_member, 'role', 'member')
-        allowed_permissions = role_permissions.get(user_role, [])
-        return permission in allowed_permissions
-        
+        (allowed,) = await PermissionEvaluator.for_session(session).can(user, permission, [project])
+        return allowed
     except Exception as e:
         logger.error(f"Error checking project permission: {e}")
         return False
@@ -176,49 +438,8 @@ async def check_organization_permission(
         bool: True if user has permission
     """
     try:
-        if not user or not user.is_active:
-            return False
-        
-        # System admins have all permissions
-        if getattr(user, 'is_admin', False):
-            return True
-        
-        # Extract organization ID if we got an instance
-        if hasattr(organization_id, 'id'):
-            org_id = organization_id.id
-        else:
-            org_id = organization_id
-        
-        # Check organization membership
-        try:
-            membership = await session.scalar(
-                select(Membership).where(
-                    and_(
-                        Membership.organization_id == org_id,
-                        Membership.user_id == user.id,
-                        Membership.deleted_at.is_(None)
-                    )
-                )
-            )
-            
-            if membership:
-                # Role-based permissions
-                role_permissions = {
-                    "owner": ["read", "write", "delete", "admin"],
-                    "admin": ["read", "write", "admin"],
-                    "member": ["read", "write"],
-                    "viewer": ["read"]
-                }
-                
-                user_role = getattr(membership, 'role', 'member')
-                allowed_permissions = role_permissions.get(user_role, [])
-                return permission in allowed_permissions
-            
-        except Exception as e:
-            logger.debug(f"Error checking organization membership: {e}")
-        
-        return False
-        
+        (allowed,) = await PermissionEvaluator.for_session(session).can(user, permission, [organization_id])
+        return allowed
     except Exception as e:
         logger.error(f"Error checking organization permission: {e}")
         return False
@@ -0,0 +1,162 @@
+# apps/api/liderix_api/services/projections.py
+"""
+Column projections for list endpoints.
+
+List views serialize a handful of columns, but selecting full entities
+hydrates wide rows (preferences, JSON blobs) and fires every
+lazy="selectin" relationship on the model. A ListProjection selects only
+the columns its schema declares, LEFT JOINs small summaries of related rows
+and builds the response models straight from result rows, without going
+through the ORM identity map.
+"""
+from __future__ import annotations
+
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Tuple, Type
+
+from pydantic import BaseModel
+from sqlalchemy import select, Select
+from sqlalchemy.orm import aliased
+
+from liderix_api.models.users import User
+from liderix_api.models.projects import Project
+from liderix_api.models.project_members import ProjectMember
+from liderix_api.models.tasks import Task
+from liderix_api.models.kpi import KPI
+from liderix_api.models.memberships import Membership
+from liderix_api.models.organization import Organization, Department
+from liderix_api.utils.avatars import avatar_thumbnail_url
+
+# Fields the UI renders for related rows
+USER_SUMMARY_FIELDS = ("id", "username", "full_name", "avatar_url")
+PROJECT_SUMMARY_FIELDS = ("id", "name", "status")
+ORG_SUMMARY_FIELDS = ("id", "name", "slug")
+
+
+class RelatedSummary(NamedTuple):
+    """Related row joined by `target.id == foreign_key` and returned as a small dict"""
+    model: Any
+    foreign_key: Any
+    fields: Tuple[str, ...]
+
+
+class ListProjection:
+    """
+    Column-level select for a list schema.
+
+    Schema fields backed by a mapped column are selected directly, `related`
+    summaries become LEFT JOINs returned as dicts (None when the FK is empty)
+    and `computed` maps schema fields to arbitrary SQL expressions. Fields
+    not covered by any of these fall back to their schema defaults.
+    """
+
+    def __init__(
+        self,
+        model: Any,
+        schema: Type[BaseModel],
+        related: Optional[Dict[str, RelatedSummary]] = None,
+        computed: Optional[Dict[str, Any]] = None,
+    ):
+        self.model = model
+        self.schema = schema
+        self.related = related or {}
+        self.computed = computed or {}
+
+        mapped = model.__mapper__.column_attrs.keys()
+        self.fields = [
+            name for name in schema.model_fields
+            if name in mapped and name not in self.related and name not in self.computed
+        ]
+
+        self._aliases: Dict[str, Any] = {}
+        self._columns = [getattr(model, name).label(name) for name in self.fields]
+        for name, expr in self.computed.items():
+            self._columns.append(expr.label(name))
+        for name, summary in self.related.items():
+            target = aliased(summary.model, name=f"{name}_summary")
+            self._aliases[name] = target
+            self._columns.extend(
+                getattr(target, field).label(f"{name}__{field}") for field in summary.fields
+            )
+
+    def alias(self, name: str) -> Any:
+        """Aliased entity of a related summary (for filtering on joined columns)"""
+        return self._aliases[name]
+
+    def select(self) -> Select:
+        stmt = select(*self._columns).select_from(self.model)
+        for name, summary in self.related.items():
+            target = self._aliases[name]
+            stmt = stmt.outerjoin(target, target.id == summary.foreign_key)
+        return stmt
+
+    def to_dict(self, row: Any) -> Dict[str, Any]:
+        mapping = row._mapping
+        data = {name: mapping[name] for name in self.fields}
+        for name in self.computed:
+            data[name] = mapping[name]
+        for name, summary in self.related.items():
+            if mapping[f"{name}__id"] is None:
+                data[name] = None
+            else:
+                data[name] = {field: mapping[f"{name}__{field}"] for field in summary.fields}
+                if "avatar_url" in data[name]:
+                    data[name]["avatar_thumbnail_url"] = avatar_thumbnail_url(data[name]["avatar_url"])
+        return data
+
+    def build(self, rows: Iterable[Any]) -> List[BaseModel]:
+        return [self.schema.model_validate(self.to_dict(row)) for row in rows]
+
+
+# ----------------- Projections used by list endpoints -----------------
+
+def task_list_projection(schema: Type[BaseModel]) -> ListProjection:
+    return ListProjection(
+        Task,
+        schema,
+        related={
+            "assignee": RelatedSummary(User, Task.assignee_id, USER_SUMMARY_FIELDS),
+            "creator": RelatedSummary(User, Task.creator_id, USER_SUMMARY_FIELDS),
+            "project": RelatedSummary(Project, Task.project_id, PROJECT_SUMMARY_FIELDS),
+        },
+    )
+
+
+def project_list_projection(schema: Type[BaseModel]) -> ListProjection:
+    # Projects have no owner column; the owner is the project member with role "owner"
+    owner_id = (
+        select(ProjectMember.user_id)
+        .where(
+            ProjectMember.project_id == Project.id,
+            ProjectMember.role == "owner",
+            ProjectMember.deleted_at.is_(None),
+        )
+        .limit(1)
+        .scalar_subquery()
+    )
+    return ListProjection(
+        Project,
+        schema,
+        related={
+            "organization": RelatedSummary(Organization, Project.org_id, ORG_SUMMARY_FIELDS),
+        },
+        computed={"owner_id": owner_id},
+    )
+
+
+def membership_list_projection(schema: Type[BaseModel]) -> ListProjection:
+    return ListProjection(
+        Membership,
+        schema,
+        related={
+            "user": RelatedSummary(User, Membership.user_id, ("id", "username", "email")),
+            "department": RelatedSummary(Department, Membership.department_id, ("id", "name")),
+        },
+    )
+
+
+def user_list_projection(schema: Type[BaseModel]) -> ListProjection:
+    return ListProjection(User, schema)
+
+
+def kpi_list_projection(schema: Type[BaseModel]) -> ListProjection:
+    return ListProjection(KPI, schema)
@@ -0,0 +1,227 @@
+# apps/api/liderix_api/services/recurring_tasks.py
+"""
+Recurring tasks: a template (is_recurring, recurrence_pattern) produces one
+task instance per occurrence.
+
+Templates carry next_run_at, the next occurrence still to generate. A
+background loop in every API worker picks due templates in batches:
+
+    SELECT ... WHERE is_recurring AND next_run_at <= now + lookahead
+    ORDER BY next_run_at LIMIT n FOR UPDATE SKIP LOCKED
+
+(partial index ix_task_recurring_next_run), builds the instances for all of
+them, writes them with one multi-row INSERT and moves next_run_at forward in
+the same transaction. Concurrent workers skip each other's locked rows, and
+the unique (recurrence_parent_id, recurrence_date) index makes a replayed
+batch a no-op (ON CONFLICT DO NOTHING).
+
+Occurrences are expanded with the calendar recurrence engine
+(services/calendar_query.py), anchored at the template's due date (or start
+date) - the template itself is the first occurrence. recurrence_pattern is
+schemas.tasks.RecurrencePattern, optionally with a "timezone" for the
+wall-clock time of the occurrences.
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional, Set, Tuple
+from uuid import UUID, uuid4
+
+from sqlalchemy import select, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from liderix_api.config.settings import settings
+from liderix_api.db import LiderixAsyncSessionLocal
+from liderix_api.enums import RecurrenceType, TaskStatus
+from liderix_api.models.tasks import Task
+from liderix_api.services.calendar_query import RecurrenceRule, as_utc, expand, next_occurrence, parse_rule
+from liderix_api.services.task_hierarchy import invalidate_task_hierarchy
+
+logger = logging.getLogger(__name__)
+
+# Catch-up cap per template and batch (after downtime); the rest follows in the next batch
+MAX_INSTANCES_PER_TEMPLATE = 100
+# Rows per INSERT statement, under the 32767 bind parameter limit
+INSERT_CHUNK_ROWS = 1000
+
+_TICK = timedelta(microseconds=1)
+
+# Fields an instance copies from its template
+_COPIED = (
+    "org_id", "project_id", "parent_task_id", "title", "description", "priority", "task_type",
+    "assignee_id", "creator_id", "reporter_id", "estimated_hours", "story_points", "tags",
+    "custom_fields",
+)
+
+
+# ----------------- schedule -----------------
+
+def template_rule(pattern: Optional[Dict[str, Any]]) -> Optional[RecurrenceRule]:
+    # Task patterns carry their frequency, like custom calendar rules
+    return parse_rule(RecurrenceType.CUSTOM, pattern)
+
+
+def template_anchor(task: Any) -> Optional[datetime]:
+    anchor = task.due_date or task.start_date or task.created_at
+    return as_utc(anchor) if anchor else None
+
+
+def first_run_at(task: Any, now: Optional[datetime] = None) -> Optional[datetime]:
+    """
+    next_run_at for a new or edited template: the first occurrence after the
+    template itself that is not in the past.
+    """
+    rule = template_rule(task.recurrence_pattern) if task.is_recurring else None
+    if rule is None:
+        return None
+    now = as_utc(now or datetime.now(timezone.utc))
+    anchor = template_anchor(task) or now
+    return next_occurrence(anchor, (task.recurrence_pattern or {}).get("timezone"), rule, max(anchor + _TICK, now))
+
+
+# ----------------- generation -----------------
+
+def _instance(template: Any, occurrence: datetime, now: datetime) -> Dict[str, Any]:
+    row = {name: getattr(template, name) for name in _COPIED}
+    due, start = template.due_date, template.start_date
+    if due is not None:
+        row["due_date"] = occurrence
+        row["start_date"] = occurrence - (due - start) if start is not None else None
+    else:
+        row["due_date"] = None
+        row["start_date"] = occurrence
+    row.update(
+        id=uuid4(),
+        status=TaskStatus.TODO,
+        progress_percentage=0,
+        is_recurring=False,
+        recurrence_pattern=None,
+        recurrence_parent_id=template.id,
+        recurrence_date=occurrence,
+        tags=row["tags"] or [],
+        custom_fields=row["custom_fields"] or {},
+        meta_data={},
+        is_deleted=False,
+        created_at=now,
+        updated_at=now,
+    )
+    return row
+
+
+def plan_template(template: Any, horizon: datetime, now: datetime) -> Tuple[List[Dict[str, Any]], Optional[datetime]]:
+    """Instances due up to `horizon` and the template's new next_run_at"""
+    rule = template_rule(template.recurrence_pattern)
+    anchor = template_anchor(template)
+    if rule is None or anchor is None:
+        return [], None
+
+    tz_name = (template.recurrence_pattern or {}).get("timezone")
+    lower = max(as_utc(template.next_run_at), anchor + _TICK)
+    occurrences = expand(anchor, anchor, tz_name, rule, lower, horizon + _TICK, limit=MAX_INSTANCES_PER_TEMPLATE)
+    after = occurrences[-1] + _TICK if len(occurrences) >= MAX_INSTANCES_PER_TEMPLATE else horizon + _TICK
+    return (
+        [_instance(template, occurrence, now) for occurrence in occurrences],
+        next_occurrence(anchor, tz_name, rule, after),
+    )
+
+
+async def generate_batch(session: AsyncSession, horizon: datetime, now: datetime, limit: int) -> Tuple[int, int, Set[UUID]]:
+    """
+    One batch in the caller's transaction: lock due templates, insert their
+    instances, advance next_run_at. Returns (templates, instances, parents of
+    new subtasks).
+    """
+    templates = (await session.execute(
+        select(
+            Task.id, Task.next_run_at, Task.recurrence_pattern, Task.due_date, Task.start_date,
+            Task.created_at, *[getattr(Task, name) for name in _COPIED],
+        )
+        .where(
+            Task.is_recurring.is_(True),
+            Task.next_run_at <= horizon,
+            Task.deleted_at.is_(None),
+        )
+        .order_by(Task.next_run_at)
+        .limit(limit)
+        .with_for_update(skip_locked=True)
+    )).all()
+    if not templates:
+        return 0, 0, set()
+
+    instances: List[Dict[str, Any]] = []
+    schedule: List[Dict[str, Any]] = []
+    parents: Set[UUID] = set()
+    for template in templates:
+        rows, next_run_at = plan_template(template, horizon, now)
+        instances.extend(rows)
+        schedule.append({"id": template.id, "next_run_at": next_run_at})
+        if rows and template.parent_task_id:
+            parents.add(template.parent_task_id)
+
+    # A regular batch is one INSERT; catch-up after downtime is chunked
+    for offset in range(0, len(instances), INSERT_CHUNK_ROWS):
+        await session.execute(
+            pg_insert(Task)
+            .values(instances[offset:offset + INSERT_CHUNK_ROWS])
+            .on_conflict_do_nothing(
+                index_elements=[Task.recurrence_parent_id, Task.recurrence_date],
+                index_where=Task.recurrence_parent_id.isnot(None),
+            )
+        )
+    # Bulk UPDATE by primary key (executemany)
+    await session.execute(update(Task), schedule)
+    return len(templates), len(instances), parents
+
+
+async def run_recurring_tasks(now: Optional[datetime] = None) -> int:
+    """Generate everything due; safe to run concurrently. Returns instances created."""
+    now = now or datetime.now(timezone.utc)
+    horizon = now + timedelta(hours=settings.RECURRING_TASKS_LOOKAHEAD_HOURS)
+    batch_size = settings.RECURRING_TASKS_BATCH_SIZE
+    total = 0
+    while True:
+        async with LiderixAsyncSessionLocal() as session:
+            processed, created, parents = await generate_batch(session, horizon, now, batch_size)
+            await session.commit()
+            if parents:
+                await invalidate_task_hierarchy(session, parents)
+        total += created
+        if processed < batch_size:
+            break
+    if total:
+        logger.info("Generated %d recurring task instances", total)
+    return total
+
+
+# ----------------- background loop -----------------
+
+_scheduler: Optional[asyncio.Task] = None
+
+
+async def _scheduler_loop() -> None:
+    while True:
+        try:
+            await run_recurring_tasks()
+        except Exception as e:
+            logger.warning(f"Recurring task generation failed: {e}")
+        await asyncio.sleep(settings.RECURRING_TASKS_INTERVAL_SEC)
+
+
+def start_recurring_task_scheduler() -> None:
+    global _scheduler
+    if _scheduler is None and settings.RECURRING_TASKS_ENABLED:
+        _scheduler = asyncio.create_task(_scheduler_loop())
+
+
+async def stop_recurring_task_scheduler() -> None:
+    global _scheduler
+    if _scheduler is not None:
+        _scheduler.cancel()
+        try:
+            await _scheduler
+        except asyncio.CancelledError:
+            pass
+        _scheduler = None
@@ -0,0 +1,391 @@
+# apps/api/liderix_api/services/resumable_uploads.py
+"""
+Resumable uploads: create -> PATCH chunks at an offset -> complete.
+
+Every PATCH body is streamed straight into the storage backend as its own
+part object ({storage_key}/{offset}-{rand}); the Upload row only records the
+accepted parts and the byte count. A chunk is accepted with a conditional
+UPDATE (received_bytes must still equal its offset), so no row lock is held
+while bytes are in flight and a dropped connection simply leaves the offset
+where it was - the client asks for it (HEAD) and resends from there.
+
+On complete the File is marked FINALIZING, the parts are streamed, in order,
+through the regular upload path (SHA-256, dedup, content-addressed key)
+outside of any transaction, and the File row created with the upload is
+marked COMPLETED. For owner_type "task" a TaskAttachment is
+created as well. A storage error puts the upload back to UPLOADING (every
+byte is still in its parts) so complete can be retried; only content that
+does not match the announced size fails it.
+
+A background loop (start_upload_purger) cancels uploads past their
+expires_at, including finalizes interrupted by a dying worker.
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Any, AsyncIterator, Dict, List, Optional
+from uuid import UUID
+
+from sqlalchemy import func, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from liderix_api.config.settings import settings
+from liderix_api.db import LiderixAsyncSessionLocal
+from liderix_api.enums import UploadStatus
+from liderix_api.models.files import File
+from liderix_api.models.tasks import TaskAttachment
+from liderix_api.models.uploads import Upload
+from liderix_api.models.users import User
+from liderix_api.services.file_upload import FileTooLarge, detect_file_type, store_stream
+from liderix_api.services.storage import get_storage
+
+logger = logging.getLogger(__name__)
+
+OWNER_TASK = "task"
+OWNER_ORGANIZATION = "organization"
+UPLOAD_KEY_PREFIX = "uploads/"
+
+
+class OffsetMismatch(Exception):
+    """PATCH offset differs from what the server has; client must resync."""
+
+    def __init__(self, expected: int):
+        super().__init__(f"Expected offset {expected}")
+        self.expected = expected
+
+
+class UploadIncomplete(Exception):
+    pass
+
+
+class UploadBusy(Exception):
+    """Another request is assembling the upload"""
+
+
+class UploadCorrupt(Exception):
+    """Assembled parts do not add up to the announced size; the upload is FAILED"""
+
+
+def _now() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+def upload_status(upload: Upload, file: Optional[File] = None) -> UploadStatus:
+    if file is not None:
+        return file.upload_status
+    return UploadStatus.UPLOADING if upload.received_bytes else UploadStatus.PENDING
+
+
+async def create_upload(
+    session: AsyncSession,
+    *,
+    user: User,
+    org_id: UUID,
+    owner_type: str,
+    owner_id: UUID,
+    filename: str,
+    content_type: Optional[str],
+    size: int,
+) -> Upload:
+    """Create the Upload and its pending File (caller commits)"""
+    upload_id = uuid.uuid4()
+    original_filename = os.path.basename(filename)[:255] or str(upload_id)
+    content_type = content_type or "application/octet-stream"
+    storage_key = f"{UPLOAD_KEY_PREFIX}{upload_id}"
+    storage = get_storage()
+
+    file = File(
+        id=uuid.uuid4(),
+        org_id=org_id,
+        filename=original_filename,
+        original_filename=original_filename,
+        file_path=storage_key,
+        file_type=detect_file_type(content_type),
+        mime_type=content_type,
+        file_size=size,
+        upload_status=UploadStatus.PENDING,
+        uploaded_by_id=user.id,
+        is_temporary=True,
+        expires_at=_now() + timedelta(hours=settings.RESUMABLE_UPLOAD_TTL_HOURS),
+        storage_provider=storage.name,
+        storage_bucket=storage.bucket,
+        storage_region=storage.region,
+    )
+    upload = Upload(
+        id=upload_id,
+        user_id=user.id,
+        owner_type=owner_type,
+        owner_id=owner_id,
+        filename=original_filename,
+        url=f"{settings.API_PREFIX.rstrip('/')}/uploads/{upload_id}",
+        content_type=content_type,
+        size=size,
+        storage_key=storage_key,
+        file_id=file.id,
+        received_bytes=0,
+        parts=[],
+        expires_at=file.expires_at,
+    )
+    session.add(file)
+    session.add(upload)
+    return upload
+
+
+async def write_chunk(
+    session: AsyncSession, upload: Upload, offset: int, chunks: AsyncIterator[bytes]
+) -> int:
+    """
+    Store one PATCH body at `offset`; returns the new offset.
+
+    The session must not hold a connection while this runs (callers release
+    it after loading the Upload), since a chunk can take minutes.
+    """
+    if offset != upload.received_bytes:
+        raise OffsetMismatch(upload.received_bytes)
+
+    remaining = upload.size - offset
+    written = 0
+
+    async def bounded() -> AsyncIterator[bytes]:
+        nonlocal written
+        async for chunk in chunks:
+            written += len(chunk)
+            if written > remaining:
+                raise FileTooLarge(upload.size)
+            yield chunk
+
+    storage = get_storage()
+    part_key = f"{upload.storage_key}/{offset:016d}-{uuid.uuid4().hex[:8]}"
+    await storage.write_stream(part_key, bounded())
+    if not written:
+        await storage.delete(part_key)
+        return offset
+
+    part = func.jsonb_build_array(func.jsonb_build_object("key", part_key, "size", written))
+    accepted = await session.scalar(
+        update(Upload)
+        .where(Upload.id == upload.id, Upload.received_bytes == offset, Upload.is_deleted.is_(False))
+        .values(
+            received_bytes=Upload.received_bytes + written,
+            parts=Upload.parts.op("||")(part),
+            updated_at=func.now(),
+        )
+        .returning(Upload.received_bytes)
+    )
+    if accepted is None:
+        # Another request got there first
+        await session.rollback()
+        await storage.delete(part_key)
+        current = await session.scalar(select(Upload.received_bytes).where(Upload.id == upload.id))
+        raise OffsetMismatch(current or 0)
+
+    if offset == 0:
+        await session.execute(
+            update(File)
+            .where(File.id == upload.file_id, File.upload_status == UploadStatus.PENDING)
+            .values(upload_status=UploadStatus.UPLOADING)
+        )
+    await session.commit()
+    return accepted
+
+
+async def _joined_parts(parts: List[Dict[str, Any]]) -> AsyncIterator[bytes]:
+    storage = get_storage()
+    for part in parts:
+        async for chunk in storage.read_stream(part["key"]):
+            yield chunk
+
+
+async def _delete_parts(parts: List[Dict[str, Any]]) -> None:
+    storage = get_storage()
+    for part in parts:
+        try:
+            await storage.delete(part["key"])
+        except Exception as e:
+            logger.warning("Failed to delete upload part %s: %s", part["key"], e)
+
+
+async def _lock_upload(session: AsyncSession, upload_id: UUID):
+    # Row lock serializes completes and cancels of the same upload
+    upload = await session.scalar(
+        select(Upload).where(Upload.id == upload_id)
+        .with_for_update().execution_options(populate_existing=True)
+    )
+    file = await session.get(File, upload.file_id, populate_existing=True) if upload and upload.file_id else None
+    if upload is None or file is None:
+        raise LookupError(upload_id)
+    return upload, file
+
+
+async def _end_finalize(session: AsyncSession, file_id: UUID, upload_status: UploadStatus) -> None:
+    # Conditional: a cancel or purge that got in meanwhile wins
+    await session.execute(
+        update(File)
+        .where(File.id == file_id, File.upload_status == UploadStatus.FINALIZING)
+        .values(upload_status=upload_status)
+    )
+    await session.commit()
+
+
+async def finalize_upload(session: AsyncSession, upload_id: UUID) -> File:
+    """
+    Assemble the parts into the final object and complete the File.
+    Idempotent: completing a completed upload returns its File.
+
+    Three steps, so no row lock is held while the parts are copied (which can
+    take minutes for large files): mark the File FINALIZING and commit,
+    assemble without a transaction, record the result in a short second
+    transaction. Raises LookupError when the upload is gone or was cancelled
+    meanwhile, UploadBusy when another complete is running, UploadCorrupt
+    when the parts do not match the announced size. Storage errors propagate
+    with the upload back in UPLOADING.
+    """
+    upload, file = await _lock_upload(session, upload_id)
+    if file.upload_status == UploadStatus.COMPLETED:
+        return file
+    if upload.is_deleted or file.upload_status in (UploadStatus.CANCELLED, UploadStatus.FAILED):
+        raise LookupError(upload_id)
+    if file.upload_status == UploadStatus.FINALIZING:
+        raise UploadBusy(upload_id)
+    if upload.received_bytes != upload.size:
+        raise UploadIncomplete(f"Received {upload.received_bytes} of {upload.size} bytes")
+
+    parts = list(upload.parts or [])
+    org_id, size, content_type = file.org_id, upload.size, upload.content_type
+    file.upload_status = UploadStatus.FINALIZING
+    # An interrupted finalize is cancelled by purge_expired_uploads
+    upload.expires_at = file.expires_at = _now() + timedelta(hours=settings.RESUMABLE_UPLOAD_TTL_HOURS)
+    await session.commit()
+
+    try:
+        stored = await store_stream(
+            _joined_parts(parts), f"files/{org_id}", max_size=size, content_type=content_type,
+        )
+    except FileTooLarge:
+        await _end_finalize(session, file.id, UploadStatus.FAILED)
+        raise UploadCorrupt(f"Parts exceed the announced {size} bytes")
+    except Exception:
+        # Storage hiccup: the parts are intact, so complete can be retried
+        await _end_finalize(session, file.id, UploadStatus.UPLOADING)
+        raise
+    if stored.size != size:
+        await _end_finalize(session, file.id, UploadStatus.FAILED)
+        raise UploadCorrupt(f"Parts add up to {stored.size} of the announced {size} bytes")
+
+    upload, file = await _lock_upload(session, upload_id)
+    if upload.is_deleted or file.upload_status != UploadStatus.FINALIZING:
+        # Cancelled (or purged) while assembling; the parts are gone with it
+        await session.rollback()
+        raise LookupError(upload_id)
+
+    completed_at = _now()
+    file.file_path = stored.key
+    file.file_size = stored.size
+    file.file_hash = stored.sha256
+    file.upload_status = UploadStatus.COMPLETED
+    file.upload_completed_at = completed_at
+    file.is_temporary = False
+    file.expires_at = None
+    upload.parts = []
+    upload.expires_at = None
+
+    if upload.owner_type == OWNER_TASK:
+        session.add(TaskAttachment(
+            task_id=upload.owner_id,
+            uploaded_by_id=upload.user_id,
+            filename=file.filename,
+            original_filename=file.original_filename,
+            file_path=stored.key,
+            content_type=upload.content_type,
+            file_size=stored.size,
+            meta_data={"file_id": str(file.id), "sha256": stored.sha256},
+        ))
+
+    await session.commit()
+    await _delete_parts(parts)
+    return file
+
+
+def _mark_cancelled(upload: Upload) -> List[Dict[str, Any]]:
+    parts = list(upload.parts or [])
+    upload.parts = []
+    upload.expires_at = None
+    upload.is_deleted = True
+    upload.deleted_at = _now()
+    return parts
+
+
+def _cancel_file(upload_ids: List[UUID]):
+    return (
+        update(File)
+        .where(
+            File.id.in_(select(Upload.file_id).where(Upload.id.in_(upload_ids))),
+            File.upload_status != UploadStatus.COMPLETED,
+        )
+        .values(upload_status=UploadStatus.CANCELLED)
+    )
+
+
+async def cancel_upload(session: AsyncSession, upload: Upload) -> None:
+    """Drop the parts and mark the File CANCELLED"""
+    parts = _mark_cancelled(upload)
+    await session.execute(_cancel_file([upload.id]))
+    await session.commit()
+    await _delete_parts(parts)
+
+
+async def purge_expired_uploads(batch_size: int = 100) -> int:
+    """Cancel abandoned and stuck-finalizing uploads; returns how many"""
+    purged = 0
+    async with LiderixAsyncSessionLocal() as session:
+        while True:
+            uploads = (await session.scalars(
+                select(Upload)
+                .where(Upload.expires_at < func.now(), Upload.is_deleted.is_(False))
+                .limit(batch_size)
+                .with_for_update(skip_locked=True)
+            )).all()
+            if not uploads:
+                return purged
+            parts = [part for upload in uploads for part in _mark_cancelled(upload)]
+            await session.execute(_cancel_file([upload.id for upload in uploads]))
+            await session.commit()
+            await _delete_parts(parts)
+            purged += len(uploads)
+
+
+# ----------------- background purge -----------------
+
+_purger: Optional[asyncio.Task] = None
+
+
+async def _purge_loop() -> None:
+    while True:
+        try:
+            purged = await purge_expired_uploads()
+            if purged:
+                logger.info("Cancelled %d expired resumable uploads", purged)
+        except Exception as e:
+            logger.warning(f"Resumable upload purge failed: {e}")
+        await asyncio.sleep(settings.RESUMABLE_UPLOAD_PURGE_INTERVAL_SEC)
+
+
+def start_upload_purger() -> None:
+    global _purger
+    if _purger is None and settings.RESUMABLE_UPLOAD_PURGE_ENABLED:
+        _purger = asyncio.create_task(_purge_loop())
+
+
+async def stop_upload_purger() -> None:
+    global _purger
+    if _purger is not None:
+        _purger.cancel()
+        try:
+            await _purger
+        except asyncio.CancelledError:
+            pass
+        _purger = None
@@ -0,0 +1,315 @@
+# apps/api/liderix_api/services/scheduling.py
+"""
+Free/busy and meeting slot search.
+
+Busy time of every attendee comes from one window query over the events
+they attend (EventAttendee, not declined) or created, expanded with the same
+recurrence engine as calendar views (services/calendar_query.py). Per
+attendee the intervals are merged with a sort + sweep; slots are what is
+left of the required attendees' common working hours after removing their
+merged busy time.
+
+- busy: accepted invitations, organizer, own events
+- tentative: tentative/unanswered invitations and tentative events; they
+  don't block a slot but rank it lower
+- optional attendees never block a slot; slots where more of them are free
+  rank higher
+
+Working hours come from users.preferences["working_hours"]
+({"start": "09:00", "end": "18:00", "days": [0, 1, 2, 3, 4]}, 0=Monday),
+in users.timezone (or the default calendar's timezone).
+"""
+from __future__ import annotations
+
+import bisect
+from dataclasses import dataclass, field
+from datetime import datetime, time, timedelta, timezone
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+from uuid import UUID
+
+from sqlalchemy import or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from liderix_api.enums import EventStatus
+from liderix_api.models.calendar import Calendar, EventAttendee
+from liderix_api.models.users import User
+from liderix_api.services.calendar_query import as_utc, expand_rows, get_zone, window_statement
+
+Interval = Tuple[datetime, datetime]
+
+BUSY = "busy"
+TENTATIVE = "tentative"
+
+DEFAULT_WORKING_START = time(9, 0)
+DEFAULT_WORKING_END = time(18, 0)
+DEFAULT_WORKING_DAYS = (0, 1, 2, 3, 4)
+
+MAX_SLOT_CANDIDATES = 5000
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+
+# ----------------- interval helpers -----------------
+
+def merge_intervals(intervals: Iterable[Interval]) -> List[Interval]:
+    """Sort + sweep: overlapping or touching intervals become one"""
+    merged: List[Interval] = []
+    for start, end in sorted(intervals):
+        if merged and start <= merged[-1][1]:
+            if end > merged[-1][1]:
+                merged[-1] = (merged[-1][0], end)
+        else:
+            merged.append((start, end))
+    return merged
+
+
+def subtract_intervals(base: Sequence[Interval], removed: Sequence[Interval]) -> List[Interval]:
+    """base minus removed; both sorted and merged"""
+    result: List[Interval] = []
+    j = 0
+    for start, end in base:
+        cursor = start
+        while j < len(removed) and removed[j][1] <= cursor:
+            j += 1
+        k = j
+        while k < len(removed) and removed[k][0] < end:
+            if removed[k][0] > cursor:
+                result.append((cursor, removed[k][0]))
+            cursor = max(cursor, removed[k][1])
+            k += 1
+        if cursor < end:
+            result.append((cursor, end))
+    return result
+
+
+def intersect_intervals(a: Sequence[Interval], b: Sequence[Interval]) -> List[Interval]:
+    """Intersection of two sorted, merged interval lists"""
+    result: List[Interval] = []
+    i = j = 0
+    while i < len(a) and j < len(b):
+        start, end = max(a[i][0], b[j][0]), min(a[i][1], b[j][1])
+        if start < end:
+            result.append((start, end))
+        if a[i][1] < b[j][1]:
+            i += 1
+        else:
+            j += 1
+    return result
+
+
+def _overlaps_any(intervals: Sequence[Interval], starts: Sequence[datetime], start: datetime, end: datetime) -> bool:
+    index = bisect.bisect_left(starts, end)
+    # Intervals are merged, so only the last one starting before `end` can overlap
+    return index > 0 and intervals[index - 1][1] > start
+
+
+# ----------------- working hours -----------------
+
+@dataclass(frozen=True)
+class WorkingHours:
+    timezone: str
+    start: time = DEFAULT_WORKING_START
+    end: time = DEFAULT_WORKING_END
+    days: Tuple[int, ...] = DEFAULT_WORKING_DAYS
+
+    def intervals(self, window_start: datetime, window_end: datetime) -> List[Interval]:
+        """Working time inside the window, in UTC"""
+        zone = get_zone(self.timezone)
+        day = window_start.astimezone(zone).date() - timedelta(days=1)
+        last = window_end.astimezone(zone).date()
+        result: List[Interval] = []
+        while day <= last:
+            if day.weekday() in self.days:
+                start = datetime.combine(day, self.start, tzinfo=zone)
+                end = datetime.combine(day, self.end, tzinfo=zone)
+                if end <= start:
+                    end = datetime.combine(day + timedelta(days=1), self.end, tzinfo=zone)
+                start, end = max(as_utc(start), window_start), min(as_utc(end), window_end)
+                if start < end:
+                    result.append((start, end))
+            day += timedelta(days=1)
+        return merge_intervals(result)
+
+
+def _parse_time(value: Any, default: time) -> time:
+    try:
+        return time.fromisoformat(value) if isinstance(value, str) else default
+    except ValueError:
+        return default
+
+
+def working_hours_for(user: User, calendar_timezone: Optional[str] = None) -> WorkingHours:
+    prefs = (user.preferences or {}).get("working_hours") or {}
+    try:
+        days = tuple(sorted({int(d) % 7 for d in prefs["days"]})) if prefs.get("days") else DEFAULT_WORKING_DAYS
+    except (TypeError, ValueError):
+        days = DEFAULT_WORKING_DAYS
+    return WorkingHours(
+        timezone=user.timezone or calendar_timezone or "UTC",
+        start=_parse_time(prefs.get("start"), DEFAULT_WORKING_START),
+        end=_parse_time(prefs.get("end"), DEFAULT_WORKING_END),
+        days=days,
+    )
+
+
+async def load_working_hours(session: AsyncSession, user_ids: Sequence[UUID]) -> Dict[UUID, WorkingHours]:
+    users = (await session.execute(
+        select(User.id, User.timezone, User.preferences).where(User.id.in_(user_ids))
+    )).all()
+    calendar_zones = dict((await session.execute(
+        select(Calendar.owner_id, Calendar.timezone).where(
+            Calendar.owner_id.in_(user_ids),
+            Calendar.is_default.is_(True),
+            Calendar.is_deleted.is_(False),
+        )
+    )).all())
+    return {user.id: working_hours_for(user, calendar_zones.get(user.id)) for user in users}
+
+
+# ----------------- busy time -----------------
+
+@dataclass
+class FreeBusy:
+    busy: List[Interval] = field(default_factory=list)
+    tentative: List[Interval] = field(default_factory=list)
+
+
+async def get_free_busy(
+    session: AsyncSession, user_ids: Sequence[UUID], start: datetime, end: datetime
+) -> Dict[UUID, FreeBusy]:
+    """Merged busy and tentative intervals per user within [start, end)"""
+    start, end = as_utc(start), as_utc(end)
+    user_ids = list(dict.fromkeys(user_ids))
+    attended = select(EventAttendee.event_id).where(
+        EventAttendee.user_id.in_(user_ids),
+        EventAttendee.status != "declined",
+    )
+    statement = window_statement(
+        lambda events: or_(
+            events.c.id.in_(attended),
+            events.c.parent_event_id.in_(attended),
+            events.c.creator_id.in_(user_ids),
+        ),
+        start, end,
+    )
+    rows = (await session.execute(statement)).all()
+
+    # Attendance is defined on the series; exceptions inherit it
+    root_ids = {row.parent_event_id or row.id for row in rows}
+    attendance: Dict[UUID, Dict[UUID, str]] = {}
+    if root_ids:
+        for event_id, user_id, status, is_organizer in (await session.execute(
+            select(
+                EventAttendee.event_id, EventAttendee.user_id, EventAttendee.status, EventAttendee.is_organizer,
+            ).where(
+                EventAttendee.event_id.in_(root_ids),
+                EventAttendee.user_id.in_(user_ids),
+            )
+        )).all():
+            attendance.setdefault(event_id, {})[user_id] = "accepted" if is_organizer else status
+
+    busy: Dict[UUID, List[Interval]] = {user_id: [] for user_id in user_ids}
+    tentative: Dict[UUID, List[Interval]] = {user_id: [] for user_id in user_ids}
+    creators = {row.id: row.creator_id for row in rows}
+    for row, occ_start, occ_end, _ in expand_rows(rows, start, end):
+        if row.status == EventStatus.CANCELLED or occ_end <= occ_start:
+            continue
+        root_id = row.parent_event_id or row.id
+        participants = dict(attendance.get(root_id, {}))
+        creator_id = creators.get(root_id, row.creator_id)
+        if creator_id in busy and creator_id not in participants:
+            participants[creator_id] = "accepted"
+        for user_id, status in participants.items():
+            if status == "declined":
+                continue
+            firm = status == "accepted" and row.status != EventStatus.TENTATIVE
+            (busy if firm else tentative)[user_id].append((max(occ_start, start), min(occ_end, end)))
+
+    result = {}
+    for user_id in user_ids:
+        merged_busy = merge_intervals(busy[user_id])
+        result[user_id] = FreeBusy(
+            busy=merged_busy,
+            tentative=subtract_intervals(merge_intervals(tentative[user_id]), merged_busy),
+        )
+    return result
+
+
+# ----------------- slot search -----------------
+
+@dataclass
+class Slot:
+    start: datetime
+    end: datetime
+    available_optional: List[UUID]
+    unavailable_optional: List[UUID]
+    tentative_conflicts: List[UUID]
+
+    @property
+    def rank(self) -> Tuple[int, int, datetime]:
+        return (len(self.tentative_conflicts), len(self.unavailable_optional), self.start)
+
+
+def _align_up(value: datetime, step: timedelta) -> datetime:
+    remainder = (value - _EPOCH) % step
+    return value if not remainder else value + (step - remainder)
+
+
+def find_slots(
+    free_busy: Dict[UUID, FreeBusy],
+    required: Sequence[UUID],
+    optional: Sequence[UUID],
+    start: datetime,
+    end: datetime,
+    duration: timedelta,
+    step: timedelta,
+    working_hours: Optional[Dict[UUID, WorkingHours]] = None,
+    limit: int = 10,
+) -> List[Slot]:
+    """
+    Slots of `duration` where every required attendee is free (and within
+    their working hours), ranked by tentative conflicts, unavailable
+    optional attendees, then time.
+    """
+    start, end = as_utc(start), as_utc(end)
+    open_time = [(start, end)]
+    if working_hours:
+        for user_id in required:
+            if user_id in working_hours:
+                open_time = intersect_intervals(open_time, working_hours[user_id].intervals(start, end))
+    blocked = merge_intervals(interval for user_id in required for interval in free_busy[user_id].busy)
+    free = subtract_intervals(open_time, blocked)
+
+    def soft(user_ids: Sequence[UUID], kind: str):
+        lists = {user_id: getattr(free_busy[user_id], kind) for user_id in user_ids}
+        return {user_id: (intervals, [s for s, _ in intervals]) for user_id, intervals in lists.items()}
+
+    tentative = soft(required, "tentative")
+    optional_busy = {
+        user_id: (merged, [s for s, _ in merged])
+        for user_id in optional
+        for merged in [merge_intervals(free_busy[user_id].busy + free_busy[user_id].tentative)]
+    }
+
+    slots: List[Slot] = []
+    for free_start, free_end in free:
+        slot_start = _align_up(free_start, step)
+        while slot_start + duration <= free_end and len(slots) < MAX_SLOT_CANDIDATES:
+            slot_end = slot_start + duration
+            available, unavailable = [], []
+            for user_id, (intervals, starts) in optional_busy.items():
+                (unavailable if _overlaps_any(intervals, starts, slot_start, slot_end) else available).append(user_id)
+            slots.append(Slot(
+                start=slot_start,
+                end=slot_end,
+                available_optional=available,
+                unavailable_optional=unavailable,
+                tentative_conflicts=[
+                    user_id for user_id, (intervals, starts) in tentative.items()
+                    if _overlaps_any(intervals, starts, slot_start, slot_end)
+                ],
+            ))
+            slot_start += step
+
+    slots.sort(key=lambda slot: slot.rank)
+    return slots[:limit]
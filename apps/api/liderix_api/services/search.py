@@ -0,0 +1,149 @@
+# apps/api/liderix_api/services/search.py
+"""
+Index-backed search helpers.
+
+Tasks, projects and users carry a generated `search_vector` tsvector column
+(GIN-indexed) and trigram GIN indexes on their short name column. Queries
+are turned into prefix tsqueries, so "deplo" matches "deployment", and the
+trigram `%` operator catches typos. Both predicates are index-backed and
+combine into a single bitmap scan; rank blends ts_rank_cd with trigram
+similarity.
+
+The 'simple' text search configuration is used on purpose: content is mixed
+Russian/English, and stemming for one language breaks matches in the other.
+"""
+from __future__ import annotations
+
+import re
+from typing import Any, List, NamedTuple, Optional
+from uuid import UUID
+
+from sqlalchemy import select, func, and_, or_, case, literal_column
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from liderix_api.models.users import User
+from liderix_api.models.memberships import Membership, MembershipStatus
+
+SEARCH_CONFIG = literal_column("'simple'::regconfig")
+HIGHLIGHT_OPTIONS = "StartSel=<mark>, StopSel=</mark>, MaxWords=20, MinWords=5, MaxFragments=2"
+
+# Longer queries do not improve ranking but make tsqueries more expensive
+MAX_QUERY_TOKENS = 8
+
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+# Applied in order ("&" first); the parser reads the entities as single tokens
+_HTML_ESCAPES = (("&", "&amp;"), ("<", "&lt;"), (">", "&gt;"), ('"', "&quot;"), ("'", "&#39;"))
+
+
+class SearchTerms(NamedTuple):
+    criteria: Any
+    rank: Any
+    tsquery: Any
+
+
+def prefix_tsquery(text: str) -> Optional[Any]:
+    """`foo ba` -> to_tsquery('foo:* & ba:*'); None when nothing searchable is left"""
+    tokens = _TOKEN_RE.findall((text or "").lower())[:MAX_QUERY_TOKENS]
+    if not tokens:
+        return None
+    return func.to_tsquery(SEARCH_CONFIG, " & ".join(f"{token}:*" for token in tokens))
+
+
+def text_search(vector, trigram_column, text: str) -> Optional[SearchTerms]:
+    """
+    Index-backed match of `text` against a tsvector column plus a trigram
+    column. Returns None when the query has no searchable tokens.
+    """
+    tsquery = prefix_tsquery(text)
+    if tsquery is None:
+        return None
+
+    term = text.strip().lower()
+    criteria = or_(
+        vector.op("@@")(tsquery),
+        func.lower(trigram_column).op("%")(term),
+    )
+    rank = func.ts_rank_cd(vector, tsquery) + func.similarity(func.lower(trigram_column), term)
+    return SearchTerms(criteria, rank, tsquery)
+
+
+def html_escape(column) -> Any:
+    """SQL counterpart of html.escape()"""
+    escaped = func.coalesce(column, "")
+    for char, entity in _HTML_ESCAPES:
+        escaped = func.replace(escaped, char, entity)
+    return escaped
+
+
+def headline(column, tsquery) -> Any:
+    """
+    Highlighted snippet (<mark>…</mark>) of `column` for the matched terms.
+    The text is HTML-escaped first, so the only markup in the result is the
+    <mark> tags and it can be rendered as HTML.
+    """
+    return func.ts_headline(SEARCH_CONFIG, html_escape(column), tsquery, HIGHLIGHT_OPTIONS)
+
+
+async def autocomplete_users(
+    session: AsyncSession,
+    text: str,
+    viewer_id: Optional[UUID],
+    limit: int = 10,
+) -> List[Any]:
+    """
+    Prefix autocomplete for the @-mention picker.
+
+    Restricted to active members of the organizations `viewer_id` is an
+    active member of (pass None for an unscoped search). Username prefix
+    hits come first, then by rank.
+    """
+    terms = text_search(User.search_vector, User.username, text)
+    if terms is None:
+        return []
+
+    term = text.strip().lower()
+    username_prefix = case(
+        (func.lower(User.username).startswith(term, autoescape=True), 1),
+        else_=0,
+    )
+
+    stmt = (
+        select(
+            User.id,
+            User.username,
+            User.email,
+            User.first_name,
+            User.last_name,
+            User.full_name,
+            User.avatar_url,
+        )
+        .where(
+            and_(
+                User.deleted_at.is_(None),
+                User.is_active == True,
+                terms.criteria,
+            )
+        )
+        .order_by(username_prefix.desc(), terms.rank.desc(), User.username)
+        .limit(limit)
+    )
+
+    if viewer_id is not None:
+        viewer_orgs = select(Membership.org_id).where(
+            and_(
+                Membership.user_id == viewer_id,
+                Membership.status == MembershipStatus.ACTIVE,
+                Membership.deleted_at.is_(None),
+            )
+        )
+        colleagues = select(Membership.user_id).where(
+            and_(
+                Membership.org_id.in_(viewer_orgs),
+                Membership.status == MembershipStatus.ACTIVE,
+                Membership.deleted_at.is_(None),
+            )
+        )
+        stmt = stmt.where(User.id.in_(colleagues))
+
+    return (await session.execute(stmt)).all()
@@ -0,0 +1,392 @@
+# apps/api/liderix_api/services/storage.py
+"""
+Object storage backends.
+
+Two implementations of the same small interface:
+- LocalStorage: files under STORAGE_LOCAL_ROOT (blocking I/O runs in threads)
+- S3Storage: any S3-compatible service (AWS, MinIO, ...), path-style
+  addressing, SigV4-signed requests over aiohttp; large objects go up as
+  multipart uploads, so memory use is bounded by S3_PART_SIZE
+
+Writes take an async iterator of chunks, so callers can stream request
+bodies straight through. Keys under "public/" are meant to be readable
+without auth (avatars); public_url() only makes sense for those.
+"""
+from __future__ import annotations
+
+import asyncio
+import datetime as dt
+import hashlib
+import hmac
+import logging
+import os
+import shutil
+import uuid
+from abc import ABC, abstractmethod
+from typing import AsyncIterator, Dict, List, Optional, Tuple
+from urllib.parse import quote
+from xml.etree import ElementTree
+
+import aiohttp
+from yarl import URL
+
+from liderix_api.config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+PUBLIC_PREFIX = "public/"
+READ_CHUNK_SIZE = 1024 * 1024
+
+
+class StorageError(Exception):
+    pass
+
+
+class StorageBackend(ABC):
+    name: str
+    bucket: Optional[str] = None
+    region: Optional[str] = None
+
+    @abstractmethod
+    async def write_stream(self, key: str, chunks: AsyncIterator[bytes], content_type: Optional[str] = None) -> None:
+        """Store chunks under key. On error nothing is left behind."""
+
+    @abstractmethod
+    def read_stream(self, key: str, chunk_size: int = READ_CHUNK_SIZE) -> AsyncIterator[bytes]:
+        """Chunks of a stored object; StorageError when it does not exist."""
+
+    @abstractmethod
+    async def move(self, src: str, dst: str) -> None:
+        ...
+
+    @abstractmethod
+    async def exists(self, key: str) -> bool:
+        ...
+
+    @abstractmethod
+    async def delete(self, key: str) -> None:
+        ...
+
+    def public_url(self, key: str) -> str:
+        if not key.startswith(PUBLIC_PREFIX):
+            raise StorageError(f"{key} is not a public object")
+        return f"{settings.STORAGE_PUBLIC_URL.rstrip('/')}/{key[len(PUBLIC_PREFIX):]}"
+
+    async def close(self) -> None:
+        pass
+
+
+# ----------------- local disk -----------------
+
+class LocalStorage(StorageBackend):
+    name = "local"
+
+    def __init__(self, root: str):
+        self.root = os.path.abspath(root)
+
+    def path(self, key: str) -> str:
+        path = os.path.abspath(os.path.join(self.root, key))
+        if not path.startswith(self.root + os.sep):
+            raise StorageError(f"Invalid storage key: {key}")
+        return path
+
+    async def write_stream(self, key: str, chunks: AsyncIterator[bytes], content_type: Optional[str] = None) -> None:
+        path = self.path(key)
+        await asyncio.to_thread(os.makedirs, os.path.dirname(path), exist_ok=True)
+        partial = f"{path}.{uuid.uuid4().hex}.part"
+        handle = await asyncio.to_thread(open, partial, "wb")
+        try:
+            async for chunk in chunks:
+                await asyncio.to_thread(handle.write, chunk)
+            await asyncio.to_thread(handle.close)
+            await asyncio.to_thread(os.replace, partial, path)
+        except BaseException:
+            await asyncio.to_thread(handle.close)
+            await asyncio.to_thread(_remove_quietly, partial)
+            raise
+
+    async def read_stream(self, key: str, chunk_size: int = READ_CHUNK_SIZE) -> AsyncIterator[bytes]:
+        try:
+            handle = await asyncio.to_thread(open, self.path(key), "rb")
+        except FileNotFoundError:
+            raise StorageError(f"No such object: {key}")
+        try:
+            while chunk := await asyncio.to_thread(handle.read, chunk_size):
+                yield chunk
+        finally:
+            await asyncio.to_thread(handle.close)
+
+    async def move(self, src: str, dst: str) -> None:
+        target = self.path(dst)
+        await asyncio.to_thread(os.makedirs, os.path.dirname(target), exist_ok=True)
+        await asyncio.to_thread(shutil.move, self.path(src), target)
+
+    async def exists(self, key: str) -> bool:
+        return await asyncio.to_thread(os.path.exists, self.path(key))
+
+    async def delete(self, key: str) -> None:
+        await asyncio.to_thread(_remove_quietly, self.path(key))
+
+
+def _remove_quietly(path: str) -> None:
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+
+# ----------------- S3-compatible -----------------
+
+UNSIGNED_PAYLOAD = "UNSIGNED-PAYLOAD"
+# S3 requires >= 5 MiB for every part but the last
+MIN_PART_SIZE = 5 * 1024 * 1024
+
+
+def _hmac(key: bytes, msg: str) -> bytes:
+    return hmac.new(key, msg.encode(), hashlib.sha256).digest()
+
+
+class S3Storage(StorageBackend):
+    name = "s3"
+
+    def __init__(
+        self,
+        endpoint_url: str,
+        bucket: str,
+        access_key: str,
+        secret_key: str,
+        region: str = "us-east-1",
+        part_size: int = 8 * 1024 * 1024,
+    ):
+        self.endpoint_url = endpoint_url.rstrip("/")
+        self.host = self.endpoint_url.split("://", 1)[-1]
+        self.bucket = bucket
+        self.access_key = access_key
+        self.secret_key = secret_key
+        self.region = region
+        self.part_size = max(part_size, MIN_PART_SIZE)
+        self._session: Optional[aiohttp.ClientSession] = None
+
+    # ----- signing -----
+
+    def _canonical_uri(self, key: str) -> str:
+        return "/" + quote(f"{self.bucket}/{key}", safe="/-_.~")
+
+    @staticmethod
+    def _canonical_query(params: Dict[str, str]) -> str:
+        return "&".join(
+            f"{quote(k, safe='-_.~')}={quote(str(v), safe='-_.~')}" for k, v in sorted(params.items())
+        )
+
+    def _scope(self, date: str) -> str:
+        return f"{date}/{self.region}/s3/aws4_request"
+
+    def _signature(self, date: str, string_to_sign: str) -> str:
+        key = _hmac(f"AWS4{self.secret_key}".encode(), date)
+        for part in (self.region, "s3", "aws4_request"):
+            key = _hmac(key, part)
+        return hmac.new(key, string_to_sign.encode(), hashlib.sha256).hexdigest()
+
+    def _string_to_sign(self, amz_date: str, canonical_request: str) -> str:
+        return "\n".join([
+            "AWS4-HMAC-SHA256",
+            amz_date,
+            self._scope(amz_date[:8]),
+            hashlib.sha256(canonical_request.encode()).hexdigest(),
+        ])
+
+    def _signed_headers(
+        self, method: str, key: str, params: Dict[str, str], headers: Dict[str, str]
+    ) -> Dict[str, str]:
+        amz_date = dt.datetime.now(dt.timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+        headers = {
+            **{k.lower(): v for k, v in headers.items()},
+            "host": self.host,
+            "x-amz-date": amz_date,
+            "x-amz-content-sha256": UNSIGNED_PAYLOAD,
+        }
+        names = sorted(headers)
+        canonical_request = "\n".join([
+            method,
+            self._canonical_uri(key),
+            self._canonical_query(params),
+            "".join(f"{name}:{headers[name].strip()}\n" for name in names),
+            ";".join(names),
+            UNSIGNED_PAYLOAD,
+        ])
+        signature = self._signature(amz_date[:8], self._string_to_sign(amz_date, canonical_request))
+        headers["authorization"] = (
+            f"AWS4-HMAC-SHA256 Credential={self.access_key}/{self._scope(amz_date[:8])}, "
+            f"SignedHeaders={';'.join(names)}, Signature={signature}"
+        )
+        return headers
+
+    def presigned_url(self, key: str, expires_in: int = 300, params: Optional[Dict[str, str]] = None) -> str:
+        """Pre-signed GET URL (extra params, e.g. response-content-disposition, are signed too)"""
+        amz_date = dt.datetime.now(dt.timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+        query = {
+            **(params or {}),
+            "X-Amz-Algorithm": "AWS4-HMAC-SHA256",
+            "X-Amz-Credential": f"{self.access_key}/{self._scope(amz_date[:8])}",
+            "X-Amz-Date": amz_date,
+            "X-Amz-Expires": str(expires_in),
+            "X-Amz-SignedHeaders": "host",
+        }
+        canonical_request = "\n".join([
+            "GET",
+            self._canonical_uri(key),
+            self._canonical_query(query),
+            f"host:{self.host}\n",
+            "host",
+            UNSIGNED_PAYLOAD,
+        ])
+        signature = self._signature(amz_date[:8], self._string_to_sign(amz_date, canonical_request))
+        query["X-Amz-Signature"] = signature
+        return f"{self.endpoint_url}{self._canonical_uri(key)}?{self._canonical_query(query)}"
+
+    # ----- transport -----
+
+    async def _http(self) -> aiohttp.ClientSession:
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=None, sock_read=60))
+        return self._session
+
+    async def _request(
+        self,
+        method: str,
+        key: str,
+        params: Optional[Dict[str, str]] = None,
+        headers: Optional[Dict[str, str]] = None,
+        data: Optional[bytes] = None,
+        ok: Tuple[int, ...] = (200,),
+    ) -> Tuple[int, Dict[str, str], bytes]:
+        params = params or {}
+        signed = self._signed_headers(method, key, params, headers or {})
+        url = f"{self.endpoint_url}{self._canonical_uri(key)}"
+        if params:
+            url = f"{url}?{self._canonical_query(params)}"
+        http = await self._http()
+        # URL is already encoded exactly as signed
+        async with http.request(method, URL(url, encoded=True), headers=signed, data=data) as resp:
+            body = await resp.read()
+            if resp.status not in ok:
+                raise StorageError(f"S3 {method} {key}: HTTP {resp.status} {body[:300]!r}")
+            return resp.status, dict(resp.headers), body
+
+    async def _put(self, key: str, data: bytes, content_type: Optional[str]) -> None:
+        headers = {"content-type": content_type} if content_type else {}
+        await self._request("PUT", key, headers=headers, data=data)
+
+    async def write_stream(self, key: str, chunks: AsyncIterator[bytes], content_type: Optional[str] = None) -> None:
+        buffer = bytearray()
+        upload_id: Optional[str] = None
+        parts: List[Tuple[int, str]] = []
+
+        async def flush_part(data: bytes) -> None:
+            nonlocal upload_id
+            if upload_id is None:
+                headers = {"content-type": content_type} if content_type else {}
+                _, _, body = await self._request("POST", key, params={"uploads": ""}, headers=headers)
+                upload_id = _xml_text(body, "UploadId")
+            number = len(parts) + 1
+            _, resp_headers, _ = await self._request(
+                "PUT", key, params={"partNumber": str(number), "uploadId": upload_id}, data=data
+            )
+            parts.append((number, resp_headers.get("ETag", "")))
+
+        try:
+            async for chunk in chunks:
+                buffer += chunk
+                while len(buffer) >= self.part_size:
+                    await flush_part(bytes(buffer[:self.part_size]))
+                    del buffer[:self.part_size]
+
+            if upload_id is None:
+                # Small object: single PUT
+                await self._put(key, bytes(buffer), content_type)
+                return
+            if buffer:
+                await flush_part(bytes(buffer))
+
+            manifest = "".join(
+                f"<Part><PartNumber>{number}</PartNumber><ETag>{etag}</ETag></Part>" for number, etag in parts
+            )
+            await self._request(
+                "POST", key, params={"uploadId": upload_id},
+                data=f"<CompleteMultipartUpload>{manifest}</CompleteMultipartUpload>".encode(),
+            )
+        except BaseException:
+            if upload_id is not None:
+                try:
+                    await self._request("DELETE", key, params={"uploadId": upload_id}, ok=(200, 204, 404))
+                except Exception as e:
+                    logger.warning("Failed to abort multipart upload %s: %s", upload_id, e)
+            raise
+
+    async def read_stream(self, key: str, chunk_size: int = READ_CHUNK_SIZE) -> AsyncIterator[bytes]:
+        signed = self._signed_headers("GET", key, {}, {})
+        http = await self._http()
+        url = URL(f"{self.endpoint_url}{self._canonical_uri(key)}", encoded=True)
+        async with http.get(url, headers=signed) as resp:
+            if resp.status != 200:
+                body = await resp.read()
+                raise StorageError(f"S3 GET {key}: HTTP {resp.status} {body[:300]!r}")
+            async for chunk in resp.content.iter_chunked(chunk_size):
+                yield chunk
+
+    async def move(self, src: str, dst: str) -> None:
+        await self._request("PUT", dst, headers={"x-amz-copy-source": self._canonical_uri(src)})
+        await self.delete(src)
+
+    async def exists(self, key: str) -> bool:
+        status, _, _ = await self._request("HEAD", key, ok=(200, 404))
+        return status == 200
+
+    async def delete(self, key: str) -> None:
+        await self._request("DELETE", key, ok=(200, 204, 404))
+
+    def public_url(self, key: str) -> str:
+        if not key.startswith(PUBLIC_PREFIX):
+            raise StorageError(f"{key} is not a public object")
+        # Bucket policy must allow anonymous reads of public/*
+        if settings.S3_PUBLIC_URL:
+            return f"{settings.S3_PUBLIC_URL.rstrip('/')}/{key}"
+        return f"{self.endpoint_url}{self._canonical_uri(key)}"
+
+    async def close(self) -> None:
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+
+def _xml_text(body: bytes, tag: str) -> str:
+    for element in ElementTree.fromstring(body).iter():
+        if element.tag.rsplit("}", 1)[-1] == tag:
+            return element.text or ""
+    raise StorageError(f"S3 response has no {tag}")
+
+
+# ----------------- configured backend -----------------
+
+_backend: Optional[StorageBackend] = None
+
+
+def get_storage() -> StorageBackend:
+    global _backend
+    if _backend is None:
+        if settings.STORAGE_BACKEND == "s3":
+            _backend = S3Storage(
+                endpoint_url=settings.S3_ENDPOINT_URL,
+                bucket=settings.S3_BUCKET,
+                access_key=settings.S3_ACCESS_KEY_ID,
+                secret_key=settings.S3_SECRET_ACCESS_KEY,
+                region=settings.S3_REGION,
+            )
+        else:
+            _backend = LocalStorage(settings.STORAGE_LOCAL_ROOT)
+    return _backend
+
+
+async def close_storage() -> None:
+    if _backend is not None:
+        await _backend.close()
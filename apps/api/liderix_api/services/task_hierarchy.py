@@ -0,0 +1,229 @@
+# apps/api/liderix_api/services/task_hierarchy.py
+"""
+Task subtree loading with rolled-up estimates/progress.
+
+The whole subtree is fetched with one recursive CTE (depth limit enforced in
+SQL, cycle-safe via the visited path), rollups are computed in a single
+post-order pass, and the result is cached per root in Redis. Any change to a
+task invalidates the cached trees of the task and all of its ancestors.
+"""
+from __future__ import annotations
+
+import logging
+from typing import Any, Dict, Iterable, List, Optional, Set
+from uuid import UUID
+
+from redis.asyncio import Redis
+from sqlalchemy import select, literal, func, exists, case, and_, all_
+from sqlalchemy.dialects.postgresql import array
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from liderix_api.config.settings import settings
+from liderix_api.models.tasks import Task
+from liderix_api.schemas.tasks import TaskHierarchyNode, TaskHierarchyResponse, TaskRollup
+
+logger = logging.getLogger(__name__)
+
+redis = Redis.from_url(settings.REDIS_URL)
+
+HIERARCHY_CACHE_TTL_SEC = 300
+MAX_HIERARCHY_DEPTH = 20
+# Upper bound for the ancestor walk (protects against corrupted parent cycles)
+MAX_ANCESTOR_DEPTH = 50
+
+
+def _cache_key(root_id: UUID) -> str:
+    return f"task_hierarchy:{root_id}"
+
+
+def _enum_value(value: Any) -> Any:
+    return getattr(value, "value", value)
+
+
+async def _fetch_subtree(session: AsyncSession, root_id: UUID, max_depth: int) -> List[Any]:
+    tasks = Task.__table__
+    child = tasks.alias("child")
+
+    tree = (
+        select(
+            tasks.c.id,
+            tasks.c.parent_task_id,
+            tasks.c.title,
+            tasks.c.status,
+            tasks.c.priority,
+            tasks.c.assignee_id,
+            tasks.c.estimated_hours,
+            tasks.c.actual_hours,
+            tasks.c.story_points,
+            tasks.c.progress_percentage,
+            literal(0).label("depth"),
+            array([tasks.c.id]).label("path"),
+        )
+        .where(tasks.c.id == root_id, tasks.c.deleted_at.is_(None))
+        .cte("task_tree", recursive=True)
+    )
+    tree = tree.union_all(
+        select(
+            child.c.id,
+            child.c.parent_task_id,
+            child.c.title,
+            child.c.status,
+            child.c.priority,
+            child.c.assignee_id,
+            child.c.estimated_hours,
+            child.c.actual_hours,
+            child.c.story_points,
+            child.c.progress_percentage,
+            (tree.c.depth + 1).label("depth"),
+            func.array_append(tree.c.path, child.c.id).label("path"),
+        )
+        .where(
+            child.c.parent_task_id == tree.c.id,
+            child.c.deleted_at.is_(None),
+            tree.c.depth < max_depth,
+            child.c.id != all_(tree.c.path),
+        )
+    )
+
+    # Leaves cut off by the depth limit are flagged so the client can drill down
+    grandchild = tasks.alias("grandchild")
+    has_more = case(
+        (
+            tree.c.depth == max_depth,
+            exists().where(
+                and_(grandchild.c.parent_task_id == tree.c.id, grandchild.c.deleted_at.is_(None))
+            ),
+        ),
+        else_=False,
+    ).label("has_more_children")
+
+    result = await session.execute(
+        select(tree, has_more).order_by(tree.c.depth)
+    )
+    return result.all()
+
+
+def _build_tree(rows: List[Any]) -> TaskHierarchyNode:
+    nodes: Dict[UUID, TaskHierarchyNode] = {}
+    order: List[UUID] = []
+
+    for row in rows:
+        nodes[row.id] = TaskHierarchyNode(
+            id=row.id,
+            parent_task_id=row.parent_task_id,
+            title=row.title,
+            status=_enum_value(row.status),
+            priority=_enum_value(row.priority),
+            assignee_id=row.assignee_id,
+            depth=row.depth,
+            estimated_hours=row.estimated_hours,
+            actual_hours=row.actual_hours,
+            story_points=row.story_points,
+            progress_percentage=row.progress_percentage or 0,
+            has_more_children=bool(row.has_more_children),
+        )
+        order.append(row.id)
+
+    root = nodes[order[0]]
+    for node_id in order[1:]:
+        node = nodes[node_id]
+        nodes[node.parent_task_id].children.append(node)
+
+    # Post-order rollup: rows are ordered by depth, so walking backwards visits
+    # children before their parents
+    weights: Dict[UUID, float] = {}
+    weighted_progress: Dict[UUID, float] = {}
+    for node_id in reversed(order):
+        node = nodes[node_id]
+        weight = node.estimated_hours if node.estimated_hours else 1.0
+        rollup = TaskRollup(
+            estimated_hours=node.estimated_hours or 0.0,
+            actual_hours=node.actual_hours or 0.0,
+            story_points=node.story_points or 0,
+        )
+        total_weight = weight
+        total_progress = node.progress_percentage * weight
+        for child in node.children:
+            rollup.estimated_hours += child.rollup.estimated_hours
+            rollup.actual_hours += child.rollup.actual_hours
+            rollup.story_points += child.rollup.story_points
+            rollup.descendants_count += child.rollup.descendants_count + 1
+            if child.status == "done":
+                rollup.completed_descendants += 1
+            rollup.completed_descendants += child.rollup.completed_descendants
+            total_weight += weights[child.id]
+            total_progress += weighted_progress[child.id]
+        weights[node_id] = total_weight
+        weighted_progress[node_id] = total_progress
+        rollup.progress_percentage = round(total_progress / total_weight, 2)
+        node.rollup = rollup
+
+    return root
+
+
+async def get_task_hierarchy(
+    session: AsyncSession, root_id: UUID, max_depth: int = 10
+) -> Optional[TaskHierarchyResponse]:
+    """Return the subtree under `root_id` with rollups (cached per root and depth)."""
+    max_depth = max(0, min(max_depth, MAX_HIERARCHY_DEPTH))
+    field = str(max_depth)
+
+    try:
+        cached = await redis.hget(_cache_key(root_id), field)
+        if cached:
+            return TaskHierarchyResponse.model_validate_json(cached)
+    except Exception as e:
+        logger.warning(f"Task hierarchy cache read failed for {root_id}: {e}")
+
+    rows = await _fetch_subtree(session, root_id, max_depth)
+    if not rows:
+        return None
+
+    response = TaskHierarchyResponse(
+        root=_build_tree(rows),
+        total_nodes=len(rows),
+        max_depth=max_depth,
+        truncated=any(row.has_more_children for row in rows),
+    )
+
+    try:
+        key = _cache_key(root_id)
+        await redis.hset(key, field, response.model_dump_json())
+        await redis.expire(key, HIERARCHY_CACHE_TTL_SEC)
+    except Exception as e:
+        logger.warning(f"Task hierarchy cache write failed for {root_id}: {e}")
+
+    return response
+
+
+async def get_ancestor_ids(session: AsyncSession, task_ids: Iterable[UUID]) -> Set[UUID]:
+    """Ids of the given tasks plus all their ancestors (one recursive CTE)."""
+    ids = list({task_id for task_id in task_ids if task_id})
+    if not ids:
+        return set()
+
+    tasks = Task.__table__
+    parent = tasks.alias("parent")
+
+    up = (
+        select(tasks.c.id, tasks.c.parent_task_id, literal(0).label("depth"))
+        .where(tasks.c.id.in_(ids))
+        .cte("task_ancestors", recursive=True)
+    )
+    up = up.union_all(
+        select(parent.c.id, parent.c.parent_task_id, (up.c.depth + 1).label("depth"))
+        .where(parent.c.id == up.c.parent_task_id, up.c.depth < MAX_ANCESTOR_DEPTH)
+    )
+
+    result = await session.scalars(select(up.c.id).distinct())
+    return set(result) | set(ids)
+
+
+async def invalidate_task_hierarchy(session: AsyncSession, task_ids: Iterable[UUID]) -> None:
+    """Drop cached trees for every root that may contain one of `task_ids`."""
+    try:
+        affected = await get_ancestor_ids(session, task_ids)
+        if affected:
+            await redis.delete(*[_cache_key(task_id) for task_id in affected])
+    except Exception as e:
+        logger.warning(f"Task hierarchy cache invalidation failed: {e}")
@@ -0,0 +1,584 @@
+# apps/api/liderix_api/services/task_import.py
+"""
+Bulk task import from CSV/XLSX files.
+
+Pipeline (runs as a tasks.import background job, services/jobs.py):
+  1. The request handler streams the upload into storage (imports/...) and
+     enqueues the job; the answer is 202 with the job id.
+  2. The worker copies the file to a temp dir. A first pass checks the header
+     and the row limit, so an oversized file fails before anything is inserted.
+  3. The file is parsed row by row (streaming, in a worker thread, one batch at
+     a time); local fields are validated in Python.
+  4. Every batch is COPY'd into a temporary staging table.
+  5. Assignee emails and project names are resolved with set-based UPDATE ... FROM
+     lookups, invalid rows are flagged in the staging table (deferred validation).
+     A project name shared by several projects of the org is a row error.
+  6. Valid rows are inserted into `tasks` with a single INSERT ... SELECT.
+Progress goes to the job; processed/inserted counts and per-row errors are
+the job result (GET /jobs/{id}). Task ids are derived from the job id and the
+row number and inserted with ON CONFLICT DO NOTHING, so a retried job skips
+the batches an earlier attempt committed.
+"""
+from __future__ import annotations
+
+import asyncio
+import csv
+import itertools
+import json
+import logging
+import os
+import shutil
+import tempfile
+from datetime import datetime, timezone, date
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional, Tuple
+from uuid import UUID, uuid4, uuid5
+
+from fastapi import UploadFile
+from sqlalchemy import (
+    Column, Integer, String, Text, DateTime, Float, MetaData, Table,
+    and_, cast, exists, func, literal, select, update, false,
+)
+from sqlalchemy.dialects.postgresql import UUID as PG_UUID, JSONB, insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import aliased
+from sqlalchemy.schema import CreateTable
+
+from liderix_api.db import LiderixAsyncSessionLocal
+from liderix_api.enums import TaskStatus, TaskPriority, TaskType, MembershipStatus
+from liderix_api.models.memberships import Membership
+from liderix_api.models.project_members import ProjectMember
+from liderix_api.models.projects import Project
+from liderix_api.models.tasks import Task
+from liderix_api.models.users import User
+from liderix_api.services.jobs import JobCancelled, JobContext, JobFailed, job_handler
+from liderix_api.services.storage import get_storage
+
+logger = logging.getLogger(__name__)
+
+TASK_IMPORT_JOB = "tasks.import"
+IMPORT_KEY_PREFIX = "imports/"
+
+MAX_IMPORT_FILE_SIZE = 50 * 1024 * 1024  # 50MB
+MAX_IMPORT_ROWS = 100_000
+IMPORT_BATCH_SIZE = 5_000
+MAX_REPORTED_ERRORS = 500
+SPOOL_CHUNK_SIZE = 1024 * 1024
+
+SUPPORTED_FORMATS = {".csv": "csv", ".xlsx": "xlsx"}
+
+# Header aliases -> canonical column
+HEADER_ALIASES = {
+    "title": "title",
+    "name": "title",
+    "summary": "title",
+    "description": "description",
+    "status": "status",
+    "priority": "priority",
+    "type": "task_type",
+    "task_type": "task_type",
+    "assignee": "assignee_email",
+    "assignee_email": "assignee_email",
+    "project": "project_name",
+    "project_name": "project_name",
+    "due_date": "due_date",
+    "due": "due_date",
+    "start_date": "start_date",
+    "start": "start_date",
+    "estimated_hours": "estimated_hours",
+    "estimate": "estimated_hours",
+    "story_points": "story_points",
+    "points": "story_points",
+    "tags": "tags",
+    "labels": "tags",
+}
+
+_WRITE_ROLES = ("owner", "admin", "member")
+
+_metadata = MetaData()
+
+# Temporary per-batch staging table (dropped on commit)
+task_import_staging = Table(
+    "task_import_staging",
+    _metadata,
+    Column("row_no", Integer, nullable=False),
+    Column("id", PG_UUID(as_uuid=True), nullable=False),
+    Column("title", String(500), nullable=False),
+    Column("description", Text),
+    Column("status", String(32), nullable=False),
+    Column("priority", String(32), nullable=False),
+    Column("task_type", String(32), nullable=False),
+    Column("assignee_email", String(255)),
+    Column("project_name", String(200)),
+    Column("due_date", DateTime(timezone=True)),
+    Column("start_date", DateTime(timezone=True)),
+    Column("estimated_hours", Float),
+    Column("story_points", Integer),
+    Column("tags", JSONB),
+    Column("assignee_id", PG_UUID(as_uuid=True)),
+    Column("project_id", PG_UUID(as_uuid=True)),
+    Column("error", Text),
+    prefixes=["TEMPORARY"],
+    postgresql_on_commit="DROP",
+)
+
+_COPY_COLUMNS = [
+    "row_no", "id", "title", "description", "status", "priority", "task_type",
+    "assignee_email", "project_name", "due_date", "start_date",
+    "estimated_hours", "story_points", "tags",
+]
+
+
+class ImportRowError(ValueError):
+    pass
+
+
+# ----------------- upload -----------------
+
+async def store_upload(file: UploadFile) -> Tuple[str, str]:
+    """
+    Stream the upload into storage for the import job (never holding it in
+    memory). Returns (storage key, format). Raises ValueError on unsupported
+    type or oversize file.
+    """
+    ext = os.path.splitext(file.filename or "")[1].lower()
+    fmt = SUPPORTED_FORMATS.get(ext)
+    if not fmt:
+        raise ValueError("Only .csv and .xlsx files are supported")
+
+    size = 0
+
+    async def bounded() -> AsyncIterator[bytes]:
+        nonlocal size
+        while chunk := await file.read(SPOOL_CHUNK_SIZE):
+            size += len(chunk)
+            if size > MAX_IMPORT_FILE_SIZE:
+                raise ValueError(
+                    f"File must be smaller than {MAX_IMPORT_FILE_SIZE // (1024 * 1024)}MB"
+                )
+            yield chunk
+
+    storage = get_storage()
+    key = f"{IMPORT_KEY_PREFIX}{uuid4().hex}{ext}"
+    try:
+        await storage.write_stream(key, bounded())
+    except Exception:
+        await storage.delete(key)
+        raise
+    return key, fmt
+
+
+async def _download(key: str, directory: str) -> str:
+    path = os.path.join(directory, "source" + os.path.splitext(key)[1])
+    handle = await asyncio.to_thread(open, path, "wb")
+    try:
+        async for chunk in get_storage().read_stream(key):
+            await asyncio.to_thread(handle.write, chunk)
+    finally:
+        await asyncio.to_thread(handle.close)
+    return path
+
+
+# ----------------- parsing -----------------
+
+def _iter_csv(path: str) -> Iterator[List[Any]]:
+    with open(path, "r", encoding="utf-8-sig", newline="") as fh:
+        yield from csv.reader(fh)
+
+
+def _iter_xlsx(path: str) -> Iterator[List[Any]]:
+    try:
+        from openpyxl import load_workbook
+    except ImportError:
+        raise ValueError("XLSX import requires openpyxl to be installed")
+
+    wb = load_workbook(path, read_only=True, data_only=True)
+    try:
+        for values in wb.active.iter_rows(values_only=True):
+            yield list(values)
+    finally:
+        wb.close()
+
+
+def _clean(value: Any) -> Optional[str]:
+    if value is None:
+        return None
+    text = str(value).strip()
+    return text or None
+
+
+def _parse_enum(enum_cls, value: Any, default) -> str:
+    text = _clean(value)
+    if text is None:
+        return default.name
+    key = text.lower().replace(" ", "_").replace("-", "_")
+    for member in enum_cls:
+        if member.value == key or member.name.lower() == key:
+            # ORM stores enum names (SQLEnum default)
+            return member.name
+    raise ImportRowError(f"Invalid {enum_cls.__name__} value: {text}")
+
+
+def _parse_datetime(value: Any, field: str) -> Optional[datetime]:
+    if value is None or value == "":
+        return None
+    if isinstance(value, datetime):
+        dt = value
+    elif isinstance(value, date):
+        dt = datetime(value.year, value.month, value.day)
+    else:
+        try:
+            dt = datetime.fromisoformat(str(value).strip())
+        except ValueError:
+            raise ImportRowError(f"Invalid {field}: {value}")
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return dt
+
+
+def _parse_number(value: Any, field: str, cast_to, minimum: float = 0, maximum: Optional[float] = None):
+    text = _clean(value)
+    if text is None:
+        return None
+    try:
+        number = cast_to(float(text)) if cast_to is int else cast_to(text)
+    except ValueError:
+        raise ImportRowError(f"Invalid {field}: {text}")
+    if number < minimum or (maximum is not None and number > maximum):
+        raise ImportRowError(f"{field} out of range: {text}")
+    return number
+
+
+def _parse_row(row_no: int, row: Dict[str, Any], job_id: UUID) -> tuple:
+    title = _clean(row.get("title"))
+    if not title:
+        raise ImportRowError("Title is required")
+    if len(title) > 500:
+        raise ImportRowError("Title must be at most 500 characters")
+
+    email = _clean(row.get("assignee_email"))
+    project_name = _clean(row.get("project_name"))
+    tags_raw = _clean(row.get("tags"))
+    tags = [t.strip() for t in tags_raw.split(",") if t.strip()] if tags_raw else []
+
+    return (
+        row_no,
+        uuid5(job_id, str(row_no)),
+        title,
+        _clean(row.get("description")),
+        _parse_enum(TaskStatus, row.get("status"), TaskStatus.TODO),
+        _parse_enum(TaskPriority, row.get("priority"), TaskPriority.MEDIUM),
+        _parse_enum(TaskType, row.get("task_type"), TaskType.TASK),
+        email.lower() if email else None,
+        project_name.lower() if project_name else None,
+        _parse_datetime(row.get("due_date"), "due_date"),
+        _parse_datetime(row.get("start_date"), "start_date"),
+        _parse_number(row.get("estimated_hours"), "estimated_hours", float),
+        _parse_number(row.get("story_points"), "story_points", int, 0, 100),
+        json.dumps(tags),
+    )
+
+
+def _iter_file(path: str, fmt: str) -> Iterator[List[Any]]:
+    return _iter_xlsx(path) if fmt == "xlsx" else _iter_csv(path)
+
+
+def _header_columns(rows: Iterator[List[Any]]) -> List[Optional[str]]:
+    header = next(rows, None)
+    if not header:
+        raise ValueError("File is empty")
+
+    columns = [HEADER_ALIASES.get(str(h or "").strip().lower().replace(" ", "_")) for h in header]
+    if "title" not in columns:
+        raise ValueError("File must contain a 'title' column")
+    return columns
+
+
+def _is_blank(values: List[Any]) -> bool:
+    return not any(v not in (None, "") for v in values)
+
+
+def check_import_file(path: str, fmt: str) -> int:
+    """
+    First pass over the file: validates the header and counts the non-empty
+    rows. Raises ValueError before anything is inserted when the file is over
+    MAX_IMPORT_ROWS.
+    """
+    rows = _iter_file(path, fmt)
+    try:
+        _header_columns(rows)
+        count = 0
+        for values in rows:
+            if not _is_blank(values):
+                count += 1
+                if count > MAX_IMPORT_ROWS:
+                    raise ValueError(f"Import is limited to {MAX_IMPORT_ROWS} rows")
+        return count
+    finally:
+        rows.close()
+
+
+def iter_import_rows(path: str, fmt: str, job_id: UUID) -> Iterator[Tuple[int, Optional[tuple], Optional[str]]]:
+    """
+    Stream (row_no, record, error) from the file. Row numbers are 1-based and
+    count the header line, so they match what users see in a spreadsheet.
+    """
+    rows = _iter_file(path, fmt)
+    try:
+        columns = _header_columns(rows)
+        for row_no, values in enumerate(rows, start=2):
+            if _is_blank(values):
+                continue
+            mapped = {col: val for col, val in zip(columns, values) if col}
+            try:
+                yield row_no, _parse_row(row_no, mapped, job_id), None
+            except ImportRowError as e:
+                yield row_no, None, str(e)
+    finally:
+        rows.close()
+
+
+def _next_rows(rows: Iterator[Any], size: int) -> List[Any]:
+    return list(itertools.islice(rows, size))
+
+
+# ----------------- set-based load -----------------
+
+async def _load_batch(
+    session: AsyncSession,
+    records: List[tuple],
+    org_id: UUID,
+    user_id: UUID,
+    is_admin: bool,
+    job_id: UUID,
+) -> Tuple[int, List[Dict[str, Any]]]:
+    """
+    COPY a batch into staging, resolve/validate in SQL and insert valid rows.
+    Returns the number of valid rows (inserted now or by an earlier attempt).
+    """
+    s = task_import_staging.c
+
+    await session.execute(CreateTable(task_import_staging))
+
+    conn = await session.connection()
+    raw = await conn.get_raw_connection()
+    await raw.driver_connection.copy_records_to_table(
+        task_import_staging.name, records=records, columns=_COPY_COLUMNS
+    )
+
+    # Bulk lookups: assignees must be active members of the org
+    await session.execute(
+        update(task_import_staging)
+        .values(assignee_id=User.id)
+        .where(
+            func.lower(User.email) == s.assignee_email,
+            User.deleted_at.is_(None),
+            User.is_active.is_(True),
+            exists().where(
+                Membership.user_id == User.id,
+                Membership.org_id == org_id,
+                Membership.deleted_at.is_(None),
+                Membership.status == MembershipStatus.ACTIVE,
+            ),
+        )
+    )
+    # Project names are not unique: only a name matching exactly one project resolves
+    same_name = aliased(Project)
+    await session.execute(
+        update(task_import_staging)
+        .values(project_id=Project.id)
+        .where(
+            func.lower(Project.name) == s.project_name,
+            Project.org_id == org_id,
+            Project.deleted_at.is_(None),
+            ~exists().where(
+                func.lower(same_name.name) == s.project_name,
+                same_name.org_id == org_id,
+                same_name.deleted_at.is_(None),
+                same_name.id != Project.id,
+            ),
+        )
+    )
+
+    # Deferred validation - first failing rule wins
+    checks = [
+        (
+            and_(s.assignee_email.isnot(None), s.assignee_id.is_(None)),
+            "Assignee not found or not an active member of the organization",
+        ),
+        (
+            and_(
+                s.project_id.is_(None),
+                select(func.count())
+                .where(
+                    func.lower(Project.name) == s.project_name,
+                    Project.org_id == org_id,
+                    Project.deleted_at.is_(None),
+                )
+                .scalar_subquery() > 1,
+            ),
+            "Project name matches several projects in the organization",
+        ),
+        (
+            and_(s.project_name.isnot(None), s.project_id.is_(None)),
+            "Project not found in organization",
+        ),
+        (
+            and_(
+                s.assignee_id.isnot(None),
+                s.project_id.isnot(None),
+                ~exists().where(
+                    ProjectMember.project_id == s.project_id,
+                    ProjectMember.user_id == s.assignee_id,
+                    ProjectMember.deleted_at.is_(None),
+                ),
+            ),
+            "Assigned user must be a member of the project",
+        ),
+    ]
+    if not is_admin:
+        checks.append((
+            and_(
+                s.project_id.isnot(None),
+                ~exists().where(
+                    ProjectMember.project_id == s.project_id,
+                    ProjectMember.user_id == user_id,
+                    ProjectMember.role.in_(_WRITE_ROLES),
+                    ProjectMember.deleted_at.is_(None),
+                ),
+            ),
+            "You don't have permission to create tasks in this project",
+        ))
+    for condition, message in checks:
+        await session.execute(
+            update(task_import_staging)
+            .values(error=message)
+            .where(s.error.is_(None), condition)
+        )
+
+    # Single set-based insert of every valid row
+    tasks = Task.__table__
+    now = func.now()
+    insert_columns = {
+        "id": s.id,
+        "org_id": literal(org_id, PG_UUID(as_uuid=True)),
+        "project_id": s.project_id,
+        "title": s.title,
+        "description": s.description,
+        "status": cast(s.status, tasks.c.status.type),
+        "priority": cast(s.priority, tasks.c.priority.type),
+        "task_type": cast(s.task_type, tasks.c.task_type.type),
+        "assignee_id": s.assignee_id,
+        "creator_id": literal(user_id, PG_UUID(as_uuid=True)),
+        "due_date": s.due_date,
+        "start_date": s.start_date,
+        "estimated_hours": s.estimated_hours,
+        "story_points": s.story_points,
+        "progress_percentage": literal(0),
+        "is_recurring": false(),
+        "tags": s.tags,
+        "custom_fields": cast(literal("{}"), JSONB),
+        "meta_data": cast(literal(json.dumps({"import_job": str(job_id)})), JSONB),
+        "is_deleted": false(),
+        "created_at": now,
+        "updated_at": now,
+    }
+    # Rows committed by an earlier attempt of the job keep their ids
+    await session.execute(
+        pg_insert(tasks).from_select(
+            list(insert_columns),
+            select(*insert_columns.values()).where(s.error.is_(None)),
+        ).on_conflict_do_nothing(index_elements=[tasks.c.id])
+    )
+    inserted = await session.scalar(select(func.count()).where(s.error.is_(None))) or 0
+
+    failed = await session.execute(
+        select(s.row_no, s.error).where(s.error.isnot(None)).order_by(s.row_no)
+    )
+    errors = [{"row": row_no, "error": error} for row_no, error in failed]
+
+    # Drops the staging table (ON COMMIT DROP)
+    await session.commit()
+    return inserted, errors
+
+
+@job_handler(TASK_IMPORT_JOB)
+async def run_task_import(job: JobContext) -> Dict[str, Any]:
+    """
+    tasks.import job: payload has the storage key and format of the file, the
+    organization and the importing user. The file is removed from storage once
+    the job is done (succeeded, failed for good or cancelled).
+    """
+    payload = job.payload
+    key, fmt = payload["key"], payload["format"]
+    org_id, user_id = UUID(payload["org_id"]), UUID(payload["user_id"])
+    is_admin = bool(payload.get("is_admin"))
+    processed = inserted = failed = 0
+    errors: List[Dict[str, Any]] = []
+
+    def add_errors(items: List[Dict[str, Any]]) -> None:
+        room = MAX_REPORTED_ERRORS - len(errors)
+        if room > 0:
+            errors.extend(items[:room])
+
+    directory = await asyncio.to_thread(tempfile.mkdtemp, prefix="task_import_")
+    done = False
+    try:
+        path = await _download(key, directory)
+        # File parsing is blocking (csv, openpyxl): keep it off the event loop
+        try:
+            total = await asyncio.to_thread(check_import_file, path, fmt)
+        except ValueError as e:
+            raise JobFailed(str(e))
+        except Exception as e:
+            raise JobFailed(f"Could not read the file: {e}")
+
+        async with LiderixAsyncSessionLocal() as session:
+            rows = iter_import_rows(path, fmt, job.id)
+            try:
+                while parsed := await asyncio.to_thread(_next_rows, rows, IMPORT_BATCH_SIZE):
+                    batch: List[tuple] = []
+                    for row_no, record, error in parsed:
+                        processed += 1
+                        if error:
+                            failed += 1
+                            add_errors([{"row": row_no, "error": error}])
+                        else:
+                            batch.append(record)
+                    if batch:
+                        batch_inserted, batch_errors = await _load_batch(
+                            session, batch, org_id, user_id, is_admin, job.id
+                        )
+                        inserted += batch_inserted
+                        failed += len(batch_errors)
+                        add_errors(batch_errors)
+                    await job.progress(100 * processed // max(total, 1), f"{processed}/{total} rows")
+            finally:
+                rows.close()
+
+        done = True
+        logger.info(f"Task import {job.id} finished: {inserted} inserted, {failed} failed")
+        errors.sort(key=lambda item: item["row"])
+        return {
+            "filename": payload.get("filename"),
+            "total_rows": total,
+            "processed_rows": processed,
+            "inserted": inserted,
+            "failed": failed,
+            "errors": errors,
+        }
+    except (JobFailed, JobCancelled):
+        done = True
+        raise
+    except asyncio.CancelledError:
+        done = job.cancel_requested
+        raise
+    except Exception:
+        done = job.last_attempt
+        raise
+    finally:
+        await asyncio.to_thread(shutil.rmtree, directory, True)
+        if done:
+            try:
+                await get_storage().delete(key)
+            except Exception as e:
+                logger.warning(f"Failed to delete import file {key}: {e}")
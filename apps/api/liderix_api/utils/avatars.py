@@ -0,0 +1,24 @@
+# apps/api/liderix_api/utils/avatars.py
+"""
+Avatar URL helpers shared by schemas and services.
+
+Avatars are stored as square WebP variants next to the original
+({original}.{size}.webp, see services/images.py); avatar_url points at the
+largest one. Kept free of app imports so schemas can use it.
+"""
+from __future__ import annotations
+
+import re
+from typing import Optional
+
+AVATAR_SIZES = (32, 64, 128, 256)
+AVATAR_THUMBNAIL_SIZE = 64
+
+AVATAR_VARIANT_RE = re.compile(r"\.(\d+)\.webp$")
+
+
+def avatar_thumbnail_url(avatar_url: Optional[str], size: int = AVATAR_THUMBNAIL_SIZE) -> Optional[str]:
+    """URL of a smaller avatar variant; avatars without variants are returned as is"""
+    if not avatar_url or size not in AVATAR_SIZES or not AVATAR_VARIANT_RE.search(avatar_url):
+        return avatar_url
+    return AVATAR_VARIANT_RE.sub(f".{size}.webp", avatar_url)
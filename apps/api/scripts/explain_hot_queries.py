@@ -0,0 +1,326 @@
+#!/usr/bin/env python3
+"""
+EXPLAIN the hot query shapes and fail if any of them plans a sequential scan.
+
+Run against a scratch database that has all migrations applied:
+
+    LIDERIX_DB_URL=postgresql+asyncpg://... python scripts/explain_hot_queries.py --seed
+
+--seed fills the database with deterministic synthetic data (1M tasks at
+--scale 1.0) and ANALYZEs it; never point it at production. Without
+--seed the existing data is used as is. Exit code 1 when a watched table
+is read with a Seq Scan, 0 otherwise.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Tuple
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from sqlalchemy import select, text, and_, or_, func, literal  # noqa: E402
+from sqlalchemy.dialects import postgresql  # noqa: E402
+from sqlalchemy.ext.asyncio import AsyncSession  # noqa: E402
+
+from liderix_api.db import LiderixAsyncSessionLocal  # noqa: E402
+from liderix_api.enums import (  # noqa: E402
+    TaskStatus, TaskPriority, TaskType, MembershipRole, MembershipStatus, ProjectStatus, UserRole,
+)
+from liderix_api.models.memberships import Membership  # noqa: E402
+from liderix_api.models.project_members import ProjectMember  # noqa: E402
+from liderix_api.models.projects import Project  # noqa: E402
+from liderix_api.models.responsibility_scopes import ResponsibilityScope  # noqa: E402
+from liderix_api.models.tasks import Task, TaskComment  # noqa: E402
+from liderix_api.models.users import User  # noqa: E402
+from liderix_api.services.search import text_search  # noqa: E402
+
+WATCHED_TABLES = {
+    "users", "memberships", "project_members", "projects",
+    "tasks", "task_comments", "responsibility_scopes",
+}
+
+# Row counts at --scale 1.0
+BASE_COUNTS = {
+    "users": 100_000,
+    "organizations": 1_000,
+    "projects": 20_000,
+    "tasks": 1_000_000,
+    "comments": 500_000,
+}
+
+
+# ----------------- seeding -----------------
+
+def _uuid(prefix: str, expr: str) -> str:
+    """Deterministic UUID so related rows can be computed instead of looked up"""
+    return f"md5('{prefix}-' || ({expr})::text)::uuid"
+
+
+def _pick(values: List[str], expr: str, sql_type: str) -> str:
+    labels = ", ".join(f"'{value}'" for value in values)
+    return f"((ARRAY[{labels}])[1 + ({expr}) % {len(values)}])::{sql_type}"
+
+
+async def _column_type(session: AsyncSession, table: str, column: str) -> str:
+    return await session.scalar(
+        text(
+            "SELECT format_type(a.atttypid, a.atttypmod) FROM pg_attribute a "
+            "WHERE a.attrelid = to_regclass(:table) AND a.attname = :column"
+        ),
+        {"table": table, "column": column},
+    )
+
+
+async def seed(session: AsyncSession, scale: float) -> None:
+    counts = {name: max(10, int(value * scale)) for name, value in BASE_COUNTS.items()}
+    users, orgs, projects = counts["users"], counts["organizations"], counts["projects"]
+    tasks, comments = counts["tasks"], counts["comments"]
+
+    user_role = await _column_type(session, "users", "role")
+    member_role = await _column_type(session, "memberships", "role")
+    member_status = await _column_type(session, "memberships", "status")
+    project_status = await _column_type(session, "projects", "status")
+    task_status = await _column_type(session, "tasks", "status")
+    task_priority = await _column_type(session, "tasks", "priority")
+    task_type = await _column_type(session, "tasks", "task_type")
+
+    statements = [
+        f"""
+        INSERT INTO users (id, username, email, hashed_password, first_name, last_name,
+                           is_active, is_verified, role, is_admin, is_deleted)
+        SELECT {_uuid('user', 'g')}, 'seed_user_' || g, 'seed_user_' || g || '@example.test', 'x',
+               'First' || g, 'Last' || g, true, true, '{UserRole.MEMBER.name}'::{user_role}, false, false
+        FROM generate_series(1, {users}) g
+        ON CONFLICT DO NOTHING
+        """,
+        f"""
+        INSERT INTO organizations (id, owner_id, name, slug, is_deleted)
+        SELECT {_uuid('org', 'g')}, {_uuid('user', f'1 + g % {users}')},
+               'Seed org ' || g, 'seed-org-' || g, false
+        FROM generate_series(1, {orgs}) g
+        ON CONFLICT DO NOTHING
+        """,
+        # Every user belongs to two organizations
+        f"""
+        INSERT INTO memberships (id, org_id, user_id, role, status, is_deleted)
+        SELECT {_uuid('membership', "u || '-' || k")},
+               {_uuid('org', f'1 + (u + k * ({orgs} / 2)) % {orgs}')},
+               {_uuid('user', 'u')},
+               {_pick([MembershipRole.MEMBER.name, MembershipRole.ADMIN.name], 'u', member_role)},
+               {_pick([MembershipStatus.ACTIVE.name] * 9 + [MembershipStatus.SUSPENDED.name], 'u', member_status)},
+               false
+        FROM generate_series(1, {users}) u, generate_series(0, 1) k
+        ON CONFLICT DO NOTHING
+        """,
+        f"""
+        INSERT INTO projects (id, org_id, name, status, is_public, is_deleted, deleted_at)
+        SELECT {_uuid('project', 'g')}, {_uuid('org', f'1 + g % {orgs}')}, 'Seed project ' || g,
+               {_pick([ProjectStatus.ACTIVE.name, ProjectStatus.DRAFT.name, ProjectStatus.COMPLETED.name], 'g', project_status)},
+               g % 3 = 0, false, CASE WHEN g % 40 = 0 THEN now() END
+        FROM generate_series(1, {projects}) g
+        ON CONFLICT DO NOTHING
+        """,
+        # Ten members per project, the first one owns it
+        f"""
+        INSERT INTO project_members (id, project_id, org_id, user_id, role, is_deleted)
+        SELECT {_uuid('project-member', "p || '-' || k")}, {_uuid('project', 'p')},
+               {_uuid('org', f'1 + p % {orgs}')}, {_uuid('user', f'1 + (p * 10 + k) % {users}')},
+               CASE WHEN k = 0 THEN 'owner' ELSE 'member' END, false
+        FROM generate_series(1, {projects}) p, generate_series(0, 9) k
+        ON CONFLICT DO NOTHING
+        """,
+        f"""
+        INSERT INTO tasks (id, org_id, project_id, title, description, status, priority, task_type,
+                           assignee_id, creator_id, progress_percentage, is_recurring, is_deleted,
+                           deleted_at, updated_at)
+        SELECT {_uuid('task', 'g')}, {_uuid('org', f'1 + (1 + g % {projects}) % {orgs}')},
+               {_uuid('project', f'1 + g % {projects}')},
+               'Seed task ' || g || ' ' || md5(g::text), 'Generated description ' || md5((g * 7)::text),
+               {_pick([s.name for s in TaskStatus], 'g', task_status)},
+               {_pick([p.name for p in TaskPriority], 'g', task_priority)},
+               '{TaskType.TASK.name}'::{task_type},
+               {_uuid('user', f'1 + (g * 7) % {users}')}, {_uuid('user', f'1 + (g * 13) % {users}')},
+               0, false, false, CASE WHEN g % 50 = 0 THEN now() END,
+               now() - (g % 10000) * interval '1 minute'
+        FROM generate_series(1, {tasks}) g
+        ON CONFLICT DO NOTHING
+        """,
+        f"""
+        INSERT INTO responsibility_scopes (id, org_id, user_id, object_type, object_id, permissions, is_deleted)
+        SELECT {_uuid('scope', 'u')}, {_uuid('org', f'1 + u % {orgs}')}, {_uuid('user', 'u')},
+               (ARRAY['brand', 'location', 'metric'])[1 + u % 3], NULL, '{{"read": true}}'::jsonb, false
+        FROM generate_series(1, {users} / 2) u
+        ON CONFLICT DO NOTHING
+        """,
+        # Threads of four: every 4th comment starts a thread, the next three reply to it
+        f"""
+        INSERT INTO task_comments (id, task_id, user_id, parent_comment_id, content, content_type,
+                                   is_internal, is_deleted, created_at)
+        SELECT {_uuid('comment', 'g')}, {_uuid('task', f'1 + (g / 4) % {tasks}')},
+               {_uuid('user', f'1 + g % {users}')},
+               CASE WHEN g % 4 = 0 THEN NULL ELSE {_uuid('comment', 'g - g % 4')} END,
+               'Seed comment ' || g, 'text', false, false, now() - g * interval '1 second'
+        FROM generate_series(4, {comments} + 3) g
+        ON CONFLICT DO NOTHING
+        """,
+    ]
+
+    for statement in statements:
+        table = statement.split("INSERT INTO", 1)[1].split()[0]
+        started = time.perf_counter()
+        await session.execute(text(statement))
+        await session.commit()
+        print(f"  seeded {table:<22} {time.perf_counter() - started:7.1f}s")
+
+    for table in sorted(WATCHED_TABLES | {"organizations"}):
+        await session.execute(text(f"ANALYZE {table}"))
+    await session.commit()
+
+
+# ----------------- hot queries -----------------
+
+def _sample_uuid(prefix: str, n: int):
+    import hashlib
+    import uuid
+
+    return uuid.UUID(hashlib.md5(f"{prefix}-{n}".encode()).hexdigest())
+
+
+def hot_queries() -> List[Tuple[str, Any]]:
+    """Query shapes used on hot paths (kept in sync with the routes they mirror)"""
+    user_id = _sample_uuid("user", 42)
+    org_id = _sample_uuid("org", 42 % BASE_COUNTS["organizations"] + 1)
+    project_id = _sample_uuid("project", 42)
+    task_id = _sample_uuid("task", 42)
+
+    my_projects = select(ProjectMember.project_id).where(
+        ProjectMember.user_id == user_id, ProjectMember.deleted_at.is_(None)
+    )
+    my_orgs = select(Membership.org_id).where(
+        Membership.user_id == user_id,
+        Membership.deleted_at.is_(None),
+        Membership.status == MembershipStatus.ACTIVE,
+    )
+    search = text_search(User.search_vector, User.username, "seed_user_42")
+
+    return [
+        ("guards.tenant_guard membership", select(Membership).where(
+            Membership.org_id == org_id,
+            Membership.user_id == user_id,
+            Membership.deleted_at.is_(None),
+        )),
+        ("tasks.list_tasks my orgs", my_orgs),
+        ("tasks.list_tasks my projects", my_projects),
+        ("tasks.list_tasks page", select(Task.id, Task.title, Task.status, Task.updated_at).where(
+            Task.deleted_at.is_(None),
+            or_(
+                Task.creator_id == user_id,
+                Task.assignee_id == user_id,
+                Task.project_id.in_(my_projects),
+            ),
+        ).order_by(Task.updated_at.desc()).limit(20)),
+        ("tasks assigned by status", select(Task.id, Task.title, Task.updated_at).where(
+            Task.assignee_id == user_id,
+            Task.status == TaskStatus.IN_PROGRESS,
+            Task.deleted_at.is_(None),
+        ).order_by(Task.updated_at.desc()).limit(20)),
+        ("tasks of project by status", select(Task.id, Task.title, Task.updated_at).where(
+            Task.project_id == project_id,
+            Task.status == TaskStatus.TODO,
+            Task.deleted_at.is_(None),
+        ).order_by(Task.updated_at.desc()).limit(20)),
+        ("guards._has_scope_permission", select(ResponsibilityScope).where(
+            ResponsibilityScope.org_id == org_id,
+            ResponsibilityScope.user_id == user_id,
+            ResponsibilityScope.object_type == "brand",
+            or_(ResponsibilityScope.object_id.is_(None), ResponsibilityScope.object_id == project_id),
+            ResponsibilityScope.deleted_at.is_(None),
+        )),
+        ("projects.list_projects org page", select(Project.id, Project.name, Project.updated_at).where(
+            Project.deleted_at.is_(None),
+            or_(
+                Project.id.in_(select(ProjectMember.project_id).where(
+                    ProjectMember.user_id == user_id, ProjectMember.deleted_at.is_(None)
+                )),
+                and_(Project.org_id.in_(my_orgs), Project.is_public == True),
+            ),
+        ).order_by(Project.updated_at.desc()).limit(20)),
+        ("memberships.list_memberships page", select(Membership.id, Membership.user_id).where(
+            Membership.org_id == org_id, Membership.deleted_at.is_(None),
+        ).order_by(Membership.created_at.desc()).limit(20)),
+        ("tasks.get_task_comments threads", select(TaskComment.id, TaskComment.created_at).where(
+            TaskComment.task_id == task_id,
+            TaskComment.parent_comment_id.is_(None),
+            TaskComment.deleted_at.is_(None),
+        ).order_by(TaskComment.created_at, TaskComment.id).limit(21)),
+        ("tasks.get_comment_replies", select(TaskComment.id, TaskComment.created_at).where(
+            TaskComment.task_id == task_id,
+            TaskComment.parent_comment_id == _sample_uuid("comment", 168),
+            TaskComment.deleted_at.is_(None),
+        ).order_by(TaskComment.created_at, TaskComment.id).limit(51)),
+        ("users.search_users autocomplete", select(User.id, User.username).where(
+            User.deleted_at.is_(None),
+            User.is_active == True,
+            search.criteria,
+            User.id.in_(select(Membership.user_id).where(
+                Membership.org_id.in_(my_orgs),
+                Membership.status == MembershipStatus.ACTIVE,
+                Membership.deleted_at.is_(None),
+            )),
+        ).order_by(search.rank.desc()).limit(10)),
+    ]
+
+
+def _walk(plan: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+    yield plan
+    for child in plan.get("Plans", []):
+        yield from _walk(child)
+
+
+async def explain(session: AsyncSession, statement, analyze: bool) -> Dict[str, Any]:
+    sql = str(statement.compile(dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True}))
+    options = "ANALYZE, BUFFERS, FORMAT JSON" if analyze else "FORMAT JSON"
+    raw = await session.scalar(text(f"EXPLAIN ({options}) {sql}"))
+    return (json.loads(raw) if isinstance(raw, str) else raw)[0]
+
+
+async def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--seed", action="store_true", help="insert synthetic rows before checking")
+    parser.add_argument("--scale", type=float, default=1.0, help="seed size multiplier (1.0 = 1M tasks)")
+    parser.add_argument("--analyze", action="store_true", help="use EXPLAIN ANALYZE and report timings")
+    args = parser.parse_args()
+
+    failures = 0
+    async with LiderixAsyncSessionLocal() as session:
+        if args.seed:
+            print(f"Seeding (scale={args.scale})...")
+            await seed(session, args.scale)
+
+        for name, statement in hot_queries():
+            result = await explain(session, statement, args.analyze)
+            seq_scans = sorted({
+                node.get("Relation Name")
+                for node in _walk(result["Plan"])
+                if node["Node Type"] == "Seq Scan" and node.get("Relation Name") in WATCHED_TABLES
+            })
+            timing = f" {result['Execution Time']:8.2f} ms" if args.analyze else ""
+            if seq_scans:
+                failures += 1
+                print(f"FAIL {name:<40}{timing}  seq scan on {', '.join(seq_scans)}")
+            else:
+                print(f"ok   {name:<40}{timing}")
+
+    if failures:
+        print(f"\n{failures} hot quer{'y' if failures == 1 else 'ies'} fell back to sequential scans")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
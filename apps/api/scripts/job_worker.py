@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+"""
+Run background job workers outside the API process.
+
+    LIDERIX_DB_URL=postgresql+asyncpg://... python scripts/job_worker.py --workers 4
+
+Claims jobs from the same `jobs` table as the in-process workers
+(services/jobs.py); run as many of these as needed and set JOBS_ENABLED=false
+on the API to keep bulk work off the web servers. SIGTERM/SIGINT stop it:
+running jobs are cancelled and go back to the queue.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import logging
+import signal
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from liderix_api.config.settings import settings  # noqa: E402
+from liderix_api.services.change_log import start_change_log_writer, stop_change_log_writer  # noqa: E402
+from liderix_api.services.invalidation import invalidation_bus  # noqa: E402
+from liderix_api.services.jobs import job_runner, load_handlers  # noqa: E402
+
+
+async def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--workers", type=int, default=settings.JOB_WORKERS, help="concurrent jobs")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+    load_handlers()
+
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGTERM, signal.SIGINT):
+        loop.add_signal_handler(sig, stop.set)
+
+    # Jobs evict caches on the API workers and write change history like requests do
+    invalidation_bus.start()
+    start_change_log_writer()
+    job_runner.start(args.workers)
+    logging.getLogger("job_worker").info("Job worker started with %d workers", args.workers)
+    try:
+        await stop.wait()
+    finally:
+        await job_runner.stop()
+        await stop_change_log_writer()
+        await invalidation_bus.stop()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
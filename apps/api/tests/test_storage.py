@@ -0,0 +1,327 @@
+"""
+Storage backends and the streaming upload path (services/storage.py,
+services/file_upload.store_stream).
+
+S3Storage runs against an in-process S3 stand-in that checks every SigV4
+signature the way S3/MinIO do, so signing and URL encoding are exercised
+without network access or credentials.
+"""
+import asyncio
+import hashlib
+import hmac
+import os
+import uuid
+from typing import AsyncIterator, Dict, List
+from urllib.parse import quote, unquote
+
+import pytest
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from liderix_api.services.file_upload import FileTooLarge, store_stream
+from liderix_api.services.storage import LocalStorage, S3Storage, StorageError
+
+ACCESS_KEY = "AKIDEXAMPLE"
+SECRET_KEY = "wJalrXUtnFEMI/K7MDENG+bPxRfiCYEXAMPLEKEY"
+BUCKET = "test-bucket"
+REGION = "eu-central-1"
+MIB = 1024 * 1024
+
+
+async def _chunks(data: bytes, size: int = 64 * 1024, consumed: List[int] = None) -> AsyncIterator[bytes]:
+    for start in range(0, len(data), size):
+        if consumed is not None:
+            consumed.append(start)
+        yield data[start:start + size]
+
+
+async def _read(storage, key: str) -> bytes:
+    return b"".join([chunk async for chunk in storage.read_stream(key)])
+
+
+def _files(root) -> List[str]:
+    return sorted(
+        os.path.relpath(os.path.join(dirpath, name), root)
+        for dirpath, _, names in os.walk(root) for name in names
+    )
+
+
+# ----------------- LocalStorage -----------------
+
+def test_local_round_trip(tmp_path):
+    async def scenario():
+        storage = LocalStorage(str(tmp_path))
+        data = os.urandom(3 * MIB + 123)
+        await storage.write_stream("files/a/object.bin", _chunks(data))
+
+        assert await storage.exists("files/a/object.bin")
+        assert await _read(storage, "files/a/object.bin") == data
+
+        await storage.move("files/a/object.bin", "files/b/moved.bin")
+        assert not await storage.exists("files/a/object.bin")
+        assert await _read(storage, "files/b/moved.bin") == data
+
+        await storage.delete("files/b/moved.bin")
+        await storage.delete("files/b/moved.bin")  # deleting twice is fine
+        assert not await storage.exists("files/b/moved.bin")
+        with pytest.raises(StorageError):
+            await _read(storage, "files/b/moved.bin")
+
+    asyncio.run(scenario())
+
+
+def test_local_rejects_keys_outside_root(tmp_path):
+    storage = LocalStorage(str(tmp_path / "root"))
+    with pytest.raises(StorageError):
+        storage.path("../outside.txt")
+
+
+def test_store_stream_deduplicates(tmp_path):
+    async def scenario():
+        storage = LocalStorage(str(tmp_path))
+        data = b"same content" * 1000
+        first = await store_stream(_chunks(data, 1000), "files/org", storage=storage, max_size=len(data))
+        second = await store_stream(_chunks(data, 777), "files/org", storage=storage, max_size=len(data))
+
+        assert first.sha256 == hashlib.sha256(data).hexdigest()
+        assert first.size == len(data)
+        assert first.key == second.key
+        assert first.key.startswith(f"files/org/{first.sha256[:2]}/{first.sha256[2:4]}/")
+        assert not first.deduplicated and second.deduplicated
+        # One stored copy, no temporary objects left over
+        assert _files(tmp_path) == [first.key]
+        assert await _read(storage, first.key) == data
+
+    asyncio.run(scenario())
+
+
+def test_store_stream_stops_mid_stream_when_too_large(tmp_path):
+    async def scenario():
+        storage = LocalStorage(str(tmp_path))
+        data = os.urandom(4 * MIB)
+        consumed: List[int] = []
+        with pytest.raises(FileTooLarge) as exc:
+            await store_stream(
+                _chunks(data, 64 * 1024, consumed), "files/org", storage=storage, max_size=MIB,
+            )
+        assert exc.value.limit == MIB
+        # Reading stopped at the chunk that crossed the limit
+        assert len(consumed) == MIB // (64 * 1024) + 1
+        # The partial object was removed
+        assert _files(tmp_path) == []
+
+    asyncio.run(scenario())
+
+
+# ----------------- S3Storage against a stand-in -----------------
+
+def _canonical_query(pairs: List[tuple]) -> str:
+    return "&".join(f"{quote(k, safe='-_.~')}={quote(v, safe='-_.~')}" for k, v in sorted(pairs))
+
+
+def _signing_key(date: str) -> bytes:
+    key = f"AWS4{SECRET_KEY}".encode()
+    for part in (date, REGION, "s3", "aws4_request"):
+        key = hmac.new(key, part.encode(), hashlib.sha256).digest()
+    return key
+
+
+def _expected_signature(request: web.Request, query: List[tuple], signed_headers: List[str], amz_date: str) -> str:
+    canonical_request = "\n".join([
+        request.method,
+        request.raw_path.split("?", 1)[0],
+        _canonical_query(query),
+        "".join(f"{name}:{request.headers.get(name, '').strip()}\n" for name in signed_headers),
+        ";".join(signed_headers),
+        request.headers.get("x-amz-content-sha256", "UNSIGNED-PAYLOAD"),
+    ])
+    string_to_sign = "\n".join([
+        "AWS4-HMAC-SHA256",
+        amz_date,
+        f"{amz_date[:8]}/{REGION}/s3/aws4_request",
+        hashlib.sha256(canonical_request.encode()).hexdigest(),
+    ])
+    return hmac.new(_signing_key(amz_date[:8]), string_to_sign.encode(), hashlib.sha256).hexdigest()
+
+
+def _verify_signature(request: web.Request) -> bool:
+    raw_query = request.raw_path.split("?", 1)[1] if "?" in request.raw_path else ""
+    query = [
+        (unquote(name), unquote(value))
+        for name, _, value in (item.partition("=") for item in raw_query.split("&") if item)
+    ]
+    params = dict(query)
+    if "X-Amz-Signature" in params:
+        # Pre-signed URL
+        query = [(k, v) for k, v in query if k != "X-Amz-Signature"]
+        signed_headers = params["X-Amz-SignedHeaders"].split(";")
+        expected = _expected_signature(request, query, signed_headers, params["X-Amz-Date"])
+        return params["X-Amz-Credential"].startswith(f"{ACCESS_KEY}/") and hmac.compare_digest(
+            expected, params["X-Amz-Signature"]
+        )
+    auth = request.headers.get("Authorization", "")
+    if not auth.startswith("AWS4-HMAC-SHA256 "):
+        return False
+    fields = dict(item.strip().split("=", 1) for item in auth[len("AWS4-HMAC-SHA256 "):].split(","))
+    expected = _expected_signature(
+        request, query, fields["SignedHeaders"].split(";"), request.headers["x-amz-date"]
+    )
+    return fields["Credential"].startswith(f"{ACCESS_KEY}/") and hmac.compare_digest(expected, fields["Signature"])
+
+
+class FakeS3:
+    """Just enough of the S3 REST API for S3Storage, path-style addressing"""
+
+    def __init__(self):
+        self.objects: Dict[str, bytes] = {}
+        self.uploads: Dict[str, Dict[int, bytes]] = {}
+        self.requests: List[str] = []
+        self.app = web.Application(client_max_size=64 * MIB)
+        self.app.router.add_route("*", "/{tail:.*}", self.handle)
+
+    async def handle(self, request: web.Request) -> web.Response:
+        if not _verify_signature(request):
+            return web.Response(status=403, text="<Error><Code>SignatureDoesNotMatch</Code></Error>")
+        bucket, _, key = unquote(request.path).lstrip("/").partition("/")
+        if bucket != BUCKET:
+            return web.Response(status=404, text="<Error><Code>NoSuchBucket</Code></Error>")
+        query = request.query
+        self.requests.append(f"{request.method} {'?'.join(sorted(query)) or 'object'}")
+
+        if request.method == "POST" and "uploads" in query:
+            upload_id = uuid.uuid4().hex
+            self.uploads[upload_id] = {}
+            return web.Response(text=f"<InitiateMultipartUploadResult><UploadId>{upload_id}</UploadId></InitiateMultipartUploadResult>")
+        if request.method == "POST" and "uploadId" in query:
+            parts = self.uploads.pop(query["uploadId"])
+            ordered = [parts[number] for number in sorted(parts)]
+            if any(len(part) < 5 * MIB for part in ordered[:-1]):
+                return web.Response(status=400, text="<Error><Code>EntityTooSmall</Code></Error>")
+            self.objects[key] = b"".join(ordered)
+            return web.Response(text="<CompleteMultipartUploadResult/>")
+        if request.method == "PUT" and "partNumber" in query:
+            self.uploads[query["uploadId"]][int(query["partNumber"])] = await request.read()
+            return web.Response(headers={"ETag": f'"{uuid.uuid4().hex}"'})
+        if request.method == "PUT" and "x-amz-copy-source" in request.headers:
+            source = unquote(request.headers["x-amz-copy-source"]).lstrip("/").partition("/")[2]
+            if source not in self.objects:
+                return web.Response(status=404, text="<Error><Code>NoSuchKey</Code></Error>")
+            self.objects[key] = self.objects[source]
+            return web.Response(text="<CopyObjectResult/>")
+        if request.method == "PUT":
+            self.objects[key] = await request.read()
+            return web.Response()
+        if request.method == "DELETE":
+            if "uploadId" in query:
+                self.uploads.pop(query["uploadId"], None)
+            else:
+                self.objects.pop(key, None)
+            return web.Response(status=204)
+        if request.method in ("GET", "HEAD"):
+            if key not in self.objects:
+                return web.Response(status=404)
+            return web.Response(body=self.objects[key] if request.method == "GET" else None)
+        return web.Response(status=405)
+
+
+def _run_s3(scenario, secret_key: str = SECRET_KEY):
+    async def main():
+        fake = FakeS3()
+        server = TestServer(fake.app)
+        await server.start_server()
+        storage = S3Storage(
+            endpoint_url=str(server.make_url("")), bucket=BUCKET,
+            access_key=ACCESS_KEY, secret_key=secret_key, region=REGION, part_size=5 * MIB,
+        )
+        try:
+            await scenario(storage, fake)
+        finally:
+            await storage.close()
+            await server.close()
+
+    asyncio.run(main())
+
+
+def test_s3_round_trip_with_signed_requests():
+    async def scenario(storage: S3Storage, fake: FakeS3):
+        # Key with characters that need URI encoding
+        key = "files/org/отчёт 2026+final.txt"
+        await storage.write_stream(key, _chunks(b"hello s3"), "text/plain")
+        assert fake.objects[key] == b"hello s3"
+        assert await storage.exists(key)
+        assert await _read(storage, key) == b"hello s3"
+
+        await storage.move(key, "files/org/moved.txt")
+        assert not await storage.exists(key)
+        assert await _read(storage, "files/org/moved.txt") == b"hello s3"
+
+        await storage.delete("files/org/moved.txt")
+        assert fake.objects == {}
+
+    _run_s3(scenario)
+
+
+def test_s3_multipart_upload():
+    async def scenario(storage: S3Storage, fake: FakeS3):
+        data = os.urandom(12 * MIB + 17)
+        await storage.write_stream("big.bin", _chunks(data, MIB))
+        assert fake.objects["big.bin"] == data
+        assert fake.requests.count("PUT partNumber?uploadId") == 3
+        assert fake.uploads == {}
+
+    _run_s3(scenario)
+
+
+def test_s3_multipart_aborted_when_stream_fails():
+    async def scenario(storage: S3Storage, fake: FakeS3):
+        async def failing() -> AsyncIterator[bytes]:
+            for _ in range(6):
+                yield os.urandom(MIB)
+            raise RuntimeError("client went away")
+
+        with pytest.raises(RuntimeError):
+            await storage.write_stream("broken.bin", failing())
+        assert "broken.bin" not in fake.objects
+        assert fake.uploads == {}
+
+    _run_s3(scenario)
+
+
+def test_s3_store_stream_limit_and_dedup():
+    async def scenario(storage: S3Storage, fake: FakeS3):
+        data = os.urandom(MIB)
+        first = await store_stream(_chunks(data), "files/org", storage=storage, max_size=len(data))
+        second = await store_stream(_chunks(data), "files/org", storage=storage, max_size=len(data))
+        assert second.deduplicated and second.key == first.key
+        assert list(fake.objects) == [first.key]
+
+        with pytest.raises(FileTooLarge):
+            await store_stream(_chunks(os.urandom(7 * MIB)), "files/org", storage=storage, max_size=6 * MIB)
+        assert list(fake.objects) == [first.key]
+        assert fake.uploads == {}
+
+    _run_s3(scenario)
+
+
+def test_s3_presigned_url():
+    async def scenario(storage: S3Storage, fake: FakeS3):
+        fake.objects["files/report.pdf"] = b"%PDF"
+        url = storage.presigned_url(
+            "files/report.pdf", params={"response-content-disposition": 'attachment; filename="r.pdf"'},
+        )
+        http = await storage._http()
+        async with http.get(url) as resp:
+            assert resp.status == 200
+            assert await resp.read() == b"%PDF"
+        async with http.get(url.replace("X-Amz-Expires=300", "X-Amz-Expires=301")) as resp:
+            assert resp.status == 403
+
+    _run_s3(scenario)
+
+
+def test_s3_wrong_secret_is_rejected():
+    async def scenario(storage: S3Storage, fake: FakeS3):
+        with pytest.raises(StorageError, match="HTTP 403"):
+            await storage.write_stream("x.txt", _chunks(b"x"))
+
+    _run_s3(scenario, secret_key="not-the-secret")